@@ -1,24 +1,83 @@
 ## app/api/v1/endpoints/agents.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+import logging
+import tempfile
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request, Body
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile
+from typing import AsyncIterator, BinaryIO, List, Any, Dict
 
-from app.schemas.agent import AgentCreate, Agent
+from app.schemas.agent import AgentCreate, Agent, ClassifyRequest
 from app.services.agent_service import AgentService
-from app.db.session import get_db
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
+from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
+from app.core.batching import batching_stats
+from app.core.inference_pool import InferenceQueueFull, inference_pool
+from app.core.prediction_cache import prediction_cache
 
 router = APIRouter()
 
+logger = logging.getLogger("app.api.v1.endpoints.agents")
+
 @router.post('/', response_model=Agent, status_code=201)
-async def create_agent(agent: AgentCreate, db: Session = Depends(get_db)):
+async def create_agent(agent: AgentCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new agent.
     """
-    return await AgentService.create_agent(db, agent.name, agent.model)
+    return await AgentService.create_agent(db, agent.name, agent.model, agent.backend)
+
+@router.get('/stats/batching')
+async def get_batching_stats():
+    """
+    Get the queue depth and batch-size histogram of each model's batching engine.
+    """
+    return batching_stats()
+
+@router.get('/stats/prediction-cache')
+async def get_prediction_cache_stats():
+    """
+    Get the hit and miss counters of the prediction cache.
+    """
+    return prediction_cache.stats()
+
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_agents(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create agents or update them by name, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(AgentCreate, items, result)
+    return await AgentService.bulk_upsert_agents(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_agents(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete agents by name in bulk.
+    """
+    deleted = await AgentService.bulk_delete_agents(db=db, names=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_agents(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list agents one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await AgentService.list_agents(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get('/{name}', response_model=Agent)
-async def get_agent(name: str, db: Session = Depends(get_db)):
+async def get_agent(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get an agent by name.
     """
@@ -28,8 +87,92 @@ async def get_agent(name: str, db: Session = Depends(get_db)):
     return agent
 
 @router.delete('/{name}', status_code=204)
-async def delete_agent(name: str, db: Session = Depends(get_db)):
+async def delete_agent(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Delete an agent by name.
     """
     await AgentService.delete_agent(db, name)
+
+NDJSON_MEDIA_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/ndjson')
+# Uploads larger than this are spooled to disk instead of being held in memory
+UPLOAD_SPOOL_MAX_SIZE = 1024 * 1024
+
+def _parse_text(line: bytes) -> str:
+    item = orjson.loads(line)
+    if isinstance(item, dict):
+        item = item.get('text')
+    if not isinstance(item, str):
+        raise ValueError('Each NDJSON line must be a string or an object with a "text" field')
+    return item
+
+async def _spool_body(request: Request) -> BinaryIO:
+    # The body has to be read before the response starts streaming, since the
+    # streaming response consumes the receive channel to watch for disconnects.
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+async def _ndjson_texts(upload: BinaryIO) -> AsyncIterator[str]:
+    for line in upload:
+        if line.strip():
+            yield _parse_text(line)
+
+async def _list_texts(texts: List[str]) -> AsyncIterator[str]:
+    for text in texts:
+        yield text
+
+async def _ndjson_predictions(model: str, backend: str, texts: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    try:
+        async for item in AgentService.classify_texts(model, texts, backend):
+            yield orjson.dumps(item) + b'\n'
+    # The status code is already sent once streaming starts, errors are reported in-band
+    except ValueError as e:
+        yield orjson.dumps({'error': str(e)}) + b'\n'
+    except InferenceQueueFull as e:
+        # Only the first chunk is covered by the saturation check before streaming
+        yield orjson.dumps({'error': 'Too many inference requests, retry later.', 'retry_after': e.retry_after}) + b'\n'
+    except Exception as e:
+        logger.error(f"Classification failed for model {model}: {e}")
+        yield orjson.dumps({'error': 'An internal server error occurred.'}) + b'\n'
+
+@router.post('/{name}/classify')
+async def classify(name: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Classify a list or an NDJSON upload of texts with the agent's model.
+
+    The body is either a JSON object {"texts": [...]}, a JSON list of texts, an NDJSON
+    body, or a multipart upload with an NDJSON "file" field. NDJSON lines hold a text
+    or a {"text": ...} object. Predictions are streamed back as NDJSON lines
+    {"index": ..., "predictions": ...} while chunks complete.
+    """
+    agent = await AgentService.get_agent(db, name)
+    if not agent:
+        raise HTTPException(status_code=404, detail='Agent not found')
+    if inference_pool.is_saturated():
+        raise InferenceQueueFull(inference_pool.retry_after)
+    content_type = request.headers.get('content-type', '').split(';')[0].strip()
+    upload = None
+    if content_type == 'multipart/form-data':
+        form = await request.form()
+        if not isinstance(form.get('file'), UploadFile):
+            raise HTTPException(status_code=400, detail='Invalid classify request: missing "file" upload')
+        upload = form['file'].file
+    elif content_type in NDJSON_MEDIA_TYPES:
+        upload = await _spool_body(request)
+    if upload is not None:
+        texts = _ndjson_texts(upload)
+    else:
+        try:
+            body = orjson.loads(await request.body())
+            if isinstance(body, list):
+                body = {'texts': body}
+            texts = _list_texts(ClassifyRequest.parse_obj(body).texts)
+        except (orjson.JSONDecodeError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid classify request: {e}")
+    return StreamingResponse(
+        _ndjson_predictions(agent.model, agent.backend, texts),
+        media_type='application/x-ndjson',
+        background=BackgroundTask(upload.close) if upload is not None else None,
+    )
@@ -1,10 +1,13 @@
 ## app/api/v1/endpoints/ethics.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional
 
-from app.schemas.ethics import EthicsCreate, Ethics
+from app.api.v1.responses import page_response
+from app.core.config import settings
+from app.db.pagination import InvalidListQuery
+from app.schemas.ethics import EthicsCreate, Ethics, EthicsPage
 from app.services.ethics_service import EthicsService
 from app.db.session import get_async_db
 
@@ -28,20 +31,27 @@ async def apply_ethics(ethics: EthicsCreate, db: AsyncSession = Depends(get_asyn
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error applying ethics principles: {e}")
 
-@router.get('/', response_model=List[Ethics])
-async def get_all_ethics(db: AsyncSession = Depends(get_async_db)):
+@router.get('/', response_model=EthicsPage)
+async def get_all_ethics(
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Asynchronously get all applied ethics principles.
+    Asynchronously get applied ethics principles one page at a time.
     
     Args:
+        limit (int): The maximum number of ethics on the page.
+        cursor (Optional[str]): The next_cursor of the previous page.
         db (AsyncSession): Dependency injection of the database session.
 
     Returns:
-        List[Ethics]: A list of all applied ethics principles.
+        EthicsPage: The applied ethics principles on the page and the cursor of the next page.
     """
     try:
-        ethics_list = await EthicsService.get_all_ethics(db=db)
-        return ethics_list
+        return page_response(await EthicsService.get_all_ethics(db=db, limit=limit, cursor=cursor))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving ethics principles: {e}")
 
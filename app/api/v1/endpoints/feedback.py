@@ -1,12 +1,18 @@
 ## app/api/v1/endpoints/feedback.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Any, Dict
 
-from app.schemas.feedback import FeedbackCreate, Feedback
+from app.schemas.feedback import FeedbackCreate, Feedback, FeedbackSimilarity
 from app.services.feedback_service import FeedbackService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -16,11 +22,49 @@ async def create_feedback(feedback: FeedbackCreate, db: AsyncSession = Depends(g
     Asynchronously create a new feedback entry.
     """
     try:
-        new_feedback = await FeedbackService.create_feedback(db=db, user=feedback.user, content=feedback.content)
+        new_feedback = await FeedbackService.create_feedback(db=db, user=feedback.user, content=feedback.content, item=feedback.item, rating=feedback.rating)
         return new_feedback
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating feedback: {e}")
 
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_create_feedbacks(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create feedback entries in bulk, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(FeedbackCreate, items, result)
+    return await FeedbackService.bulk_create_feedbacks(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_feedbacks(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete feedback entries by user in bulk.
+    """
+    deleted = await FeedbackService.bulk_delete_feedbacks(db=db, users=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_feedbacks(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list feedback entries one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await FeedbackService.list_feedbacks(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/similar', response_model=List[FeedbackSimilarity])
+async def search_similar_feedbacks(
+    q: str = Query(..., min_length=1, description="The text the feedback entries are compared with."),
+    k: int = Query(10, ge=1, le=100, description="The maximum number of feedback entries."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously find the feedback entries closest in meaning to a text, most similar first.
+    """
+    return await FeedbackService.search_similar_feedbacks(db=db, text=q, k=k)
+
 @router.get('/{user}', response_model=List[Feedback])
 async def get_feedback(user: str, db: AsyncSession = Depends(get_async_db)):
     """
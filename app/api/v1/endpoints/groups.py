@@ -1,15 +1,31 @@
 ## app/api/v1/endpoints/groups.py
 
-from fastapi import APIRouter, HTTPException, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Body, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import AsyncIterator, List, Any, Dict, Optional
 
-from app.schemas.group import GroupCreate, Group
+from app.schemas.group import GroupCreate, Group, GroupMembers, GroupMembersAdded, GroupMembersRemoved, GroupProcessRequest, GroupProcessResult, GroupEnsembleRequest, GroupEnsembleResult, GroupWeights, GroupWeightsUpdated
 from app.services.group_service import GroupService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import FastJSONResponse, page_response
+from app.core.config import settings
+from app.core.inference_pool import InferenceQueueFull, inference_pool
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
+async def _group_response(db: AsyncSession, group: Any) -> Dict[str, Any]:
+    # Large groups are not loaded whole, the members past the first page are listed at /groups/{name}/members
+    page = await GroupService.list_members(db=db, name=group.name, limit=settings.PAGE_SIZE_DEFAULT)
+    members = [item["member"] for item in page.items] if page is not None else []
+    return {"name": group.name, "members": members, "members_next_cursor": page.next_cursor if page is not None else None, "member_count": group.member_count}
+
 @router.post('/', response_model=Group, status_code=201)
 async def create_group(group: GroupCreate, db: AsyncSession = Depends(get_async_db)):
     """
@@ -17,9 +33,141 @@ async def create_group(group: GroupCreate, db: AsyncSession = Depends(get_async_
     """
     try:
         new_group = await GroupService.create_group(db=db, name=group.name, members=group.members)
-        return new_group
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating group: {e}")
+    return await _group_response(db, new_group)
+
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_groups(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create groups or update them by name, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(GroupCreate, items, result)
+    return await GroupService.bulk_upsert_groups(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_groups(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete groups by name in bulk.
+    """
+    deleted = await GroupService.bulk_delete_groups(db=db, names=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_groups(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list groups one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await GroupService.list_groups(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/by-member/{member}', response_model=Page)
+async def list_groups_by_member(
+    member: str,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="The maximum number of groups on the page."),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously list the names of the groups a member belongs to, one page at a time.
+    """
+    try:
+        return page_response(await GroupService.list_groups_by_member(db=db, member=member, limit=limit, cursor=cursor))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/{name}/members', response_model=Page)
+async def list_members(
+    name: str,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="The maximum number of members on the page."),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously list the members of a group in the order they were added, one page at a time.
+    """
+    try:
+        page = await GroupService.list_members(db=db, name=name, limit=limit, cursor=cursor)
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return page_response(page)
+
+@router.post('/{name}/members', response_model=GroupMembersAdded)
+async def add_members(name: str, request: GroupMembers, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously add members to a group in bulk.
+    """
+    added = await GroupService.add_members(db=db, name=name, members=request.members)
+    if added is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return {"added": added}
+
+@router.post('/{name}/members/delete', response_model=GroupMembersRemoved)
+async def remove_members(name: str, request: GroupMembers, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously remove members from a group in bulk.
+    """
+    removed = await GroupService.remove_members(db=db, name=name, members=request.members)
+    if removed is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return {"removed": removed}
+
+async def _ndjson_answers(answers: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for answer in answers:
+        yield orjson.dumps(answer) + b'\n'
+
+@router.post('/{name}/process', response_model=GroupProcessResult)
+async def process_text(name: str, request: GroupProcessRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously run a text through every agent of a group concurrently.
+
+    Each agent gets its own timeout, agents that miss it are reported with a "timeout"
+    status while the others' answers are kept. With "stream", each answer is sent as
+    an NDJSON line as soon as it arrives.
+    """
+    agents = await GroupService.get_member_agents(db=db, name=name)
+    if agents is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    if inference_pool.is_saturated():
+        raise InferenceQueueFull(inference_pool.retry_after)
+    answers = GroupService.process_text(agents, request.text, request.timeout or settings.GROUP_AGENT_TIMEOUT)
+    if request.stream:
+        return StreamingResponse(_ndjson_answers(answers), media_type='application/x-ndjson')
+    results = [answer async for answer in answers]
+    return {"group": name, "results": results, "complete": all(answer["status"] == "ok" for answer in results)}
+
+@router.put('/{name}/weights', response_model=GroupWeightsUpdated)
+async def set_member_weights(name: str, request: GroupWeights, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously set the weights of members' agents in the group's ensemble predictions.
+    """
+    updated = await GroupService.set_member_weights(db=db, name=name, weights=request.weights)
+    if updated is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return {"updated": updated}
+
+@router.post('/{name}/ensemble', response_model=GroupEnsembleResult)
+async def ensemble_classify(name: str, request: GroupEnsembleRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously classify texts with every agent of a group and combine their predictions.
+
+    Labels and scores are returned as two lists in the order of the texts.
+    """
+    if inference_pool.is_saturated():
+        raise InferenceQueueFull(inference_pool.retry_after)
+    try:
+        result = await GroupService.ensemble_classify(db=db, name=name, texts=request.texts, scheme=request.scheme)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail='Group not found')
+    # The score array is serialized by orjson directly, skip response_model validation
+    return FastJSONResponse(result)
 
 @router.get('/{name}', response_model=Group)
 async def get_group(name: str, db: AsyncSession = Depends(get_async_db)):
@@ -28,11 +176,11 @@ async def get_group(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     try:
         group = await GroupService.get_group(db=db, name=name)
-        if not group:
-            raise HTTPException(status_code=404, detail='Group not found')
-        return group
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving group: {e}")
+    if not group:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return await _group_response(db, group)
 
 @router.delete('/{name}', status_code=204)
 async def delete_group(name: str, db: AsyncSession = Depends(get_async_db)):
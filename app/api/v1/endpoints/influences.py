@@ -6,7 +6,11 @@ from typing import List
 
 from app.schemas.influence import InfluenceCreate, Influence
 from app.services.influence_service import InfluenceService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -21,16 +25,15 @@ async def create_influence(influence: InfluenceCreate, db: AsyncSession = Depend
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating influence: {e}")
 
-@router.get('/', response_model=List[Influence])
-async def get_all_influences(db: AsyncSession = Depends(get_async_db)):
+@router.get('/', response_model=Page)
+async def get_all_influences(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
     """
-    Asynchronously get all influences.
+    Asynchronously list influences one page at a time, with optional field projection and filters.
     """
     try:
-        influences = await InfluenceService.get_all_influences(db=db)
-        return influences
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error retrieving influences: {e}")
+        return page_response(await InfluenceService.get_all_influences(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get('/{name}', response_model=Influence)
 async def get_influence(name: str, db: AsyncSession = Depends(get_async_db)):
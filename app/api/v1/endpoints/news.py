@@ -1,12 +1,19 @@
 ## app/api/v1/endpoints/news.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Any, Dict, Optional
 
-from app.schemas.news import NewsCreate, News
+from app.schemas.news import NewsCreate, News, NewsSimilarity
 from app.services.news_service import NewsService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.core.config import settings
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -21,6 +28,73 @@ async def create_news(news: NewsCreate, db: AsyncSession = Depends(get_async_db)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating news: {e}")
 
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_news(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create news articles or update them by title, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(NewsCreate, items, result)
+    return await NewsService.bulk_upsert_news(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_news(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete news articles by title in bulk.
+    """
+    deleted = await NewsService.bulk_delete_news(db=db, titles=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_news(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list news articles one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await NewsService.list_news(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/search', response_model=Page)
+async def search_news(
+    q: str = Query(..., min_length=1, description="The search terms, all of which must match the title or content."),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="The maximum number of matches on the page."),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously search news articles by title and content, best matches first, with the matched terms highlighted in a snippet.
+    """
+    try:
+        return page_response(await NewsService.search_news(db=db, query=q, limit=limit, cursor=cursor))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/similar', response_model=List[NewsSimilarity])
+async def search_similar_news(
+    q: str = Query(..., min_length=1, description="The text the news articles are compared with."),
+    k: int = Query(10, ge=1, le=100, description="The maximum number of news articles."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously find the news articles closest in meaning to a text, most similar first.
+    """
+    return await NewsService.search_similar_news(db=db, text=q, k=k)
+
+@router.get('/{title}/similar', response_model=List[NewsSimilarity])
+async def get_similar_news(
+    title: str,
+    k: int = Query(10, ge=1, le=100, description="The maximum number of news articles."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously find the news articles closest in meaning to a news article, most similar first.
+    """
+    similar = await NewsService.get_similar_news(db=db, title=title, k=k)
+    if similar is None:
+        raise HTTPException(status_code=404, detail='News not found')
+    return similar
+
 @router.get('/{title}', response_model=News)
 async def get_news(title: str, db: AsyncSession = Depends(get_async_db)):
     """
@@ -28,11 +102,11 @@ async def get_news(title: str, db: AsyncSession = Depends(get_async_db)):
     """
     try:
         news = await NewsService.get_news(db=db, title=title)
-        if not news:
-            raise HTTPException(status_code=404, detail='News not found')
-        return news
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving news: {e}")
+    if not news:
+        raise HTTPException(status_code=404, detail='News not found')
+    return news
 
 @router.delete('/{title}', status_code=204)
 async def delete_news(title: str, db: AsyncSession = Depends(get_async_db)):
@@ -1,12 +1,19 @@
 ## app/api/v1/endpoints/recommendations.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Any, Dict
 
-from app.schemas.recommendation import RecommendationCreate, Recommendation
+from app.schemas.recommendation import RecommendationCreate, Recommendation, RecommendedItem
 from app.services.recommendation_service import RecommendationService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.core.config import settings
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -21,6 +28,44 @@ async def create_recommendation(recommendation: RecommendationCreate, db: AsyncS
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating recommendation: {e}")
 
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_recommendations(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create recommendations or update them by title, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(RecommendationCreate, items, result)
+    return await RecommendationService.bulk_upsert_recommendations(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_recommendations(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete recommendations by title in bulk.
+    """
+    deleted = await RecommendationService.bulk_delete_recommendations(db=db, titles=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_recommendations(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list recommendations one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await RecommendationService.list_recommendations(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/for/{user}', response_model=List[RecommendedItem])
+async def recommend_for_user(
+    user: str,
+    limit: int = Query(settings.RECOMMENDER_TOP_K, ge=1, le=settings.RECOMMENDER_TOP_K, description="The maximum number of recommendations."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously get the recommendations computed for a user from their feedback, best first.
+    """
+    return await RecommendationService.recommend_for_user(db=db, user=user, limit=limit)
+
 @router.get('/{title}', response_model=Recommendation)
 async def get_recommendation(title: str, db: AsyncSession = Depends(get_async_db)):
     """
@@ -28,11 +73,11 @@ async def get_recommendation(title: str, db: AsyncSession = Depends(get_async_db
     """
     try:
         recommendation = await RecommendationService.get_recommendation(db=db, title=title)
-        if not recommendation:
-            raise HTTPException(status_code=404, detail='Recommendation not found')
-        return recommendation
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving recommendation: {e}")
+    if not recommendation:
+        raise HTTPException(status_code=404, detail='Recommendation not found')
+    return recommendation
 
 @router.delete('/{title}', status_code=204)
 async def delete_recommendation(title: str, db: AsyncSession = Depends(get_async_db)):
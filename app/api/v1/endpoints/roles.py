@@ -1,17 +1,21 @@
 ## app/api/v1/endpoints/roles.py
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 
 from app.schemas.role import RoleCreate, Role
 from app.services.role_service import RoleService
-from app.db.session import get_db
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.db.pagination import InvalidListQuery
+from app.db.session import get_async_db
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
 @router.post('/', response_model=Role, status_code=201)
-async def create_role(role: RoleCreate, db: Session = Depends(get_db)):
+async def create_role(role: RoleCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Asynchronously create a new role.
     """
@@ -21,19 +25,31 @@ async def create_role(role: RoleCreate, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Role could not be created. Error: {str(e)}")
 
+@router.get('/', response_model=Page)
+async def list_roles(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list roles one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await RoleService.list_roles(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get('/{name}', response_model=Role)
-async def get_role(name: str, db: Session = Depends(get_db)):
+async def get_role(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Asynchronously get a role by name.
     """
     try:
         role = await RoleService.get_role(db, name)
+        if not role:
+            raise HTTPException(status_code=404, detail='Role not found')
         return role
     except NoResultFound:
         raise HTTPException(status_code=404, detail='Role not found')
 
 @router.delete('/{name}', status_code=204)
-async def delete_role(name: str, db: Session = Depends(get_db)):
+async def delete_role(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Asynchronously delete a role by name.
     """
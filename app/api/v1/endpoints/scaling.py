@@ -6,7 +6,11 @@ from typing import List
 
 from app.schemas.scaling import ScalingCreate, Scaling
 from app.services.scaling_service import ScalingService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -27,3 +31,13 @@ async def apply_scaling(scaling: ScalingCreate, db: AsyncSession = Depends(get_a
         return new_scaling
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error applying scaling strategy: {e}")
+
+@router.get('/', response_model=Page)
+async def list_scalings(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list scaling strategies one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await ScalingService.list_scalings(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
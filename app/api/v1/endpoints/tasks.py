@@ -1,61 +1,171 @@
 ## app/api/v1/endpoints/tasks.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List
 from sqlalchemy.exc import NoResultFound
 
-from app.schemas.task import TaskCreate, Task, TaskUpdate
+from app.schemas.task import PipelineRun, PipelineRunCreate, TaskCreate, Task, TaskUpdate, TaskRun, TaskRunCreate
 from app.services.task_service import TaskService
-from app.db.session import get_db
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.core.config import settings
+from app.core.task_dag import TaskCycleError
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
+from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
 @router.post('/', response_model=Task, status_code=201)
-def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new task.
     """
     try:
-        created_task = TaskService.create_task(db, task.name, task.action)
+        created_task = await TaskService.create_task(db, task.name, task.action, task.depends_on)
         return created_task
+    except TaskCycleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create task: {str(e)}")
 
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_tasks(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create tasks or update them by name, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(TaskCreate, items, result)
+    return await TaskService.bulk_upsert_tasks(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_tasks(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete tasks by name in bulk.
+    """
+    deleted = await TaskService.bulk_delete_tasks(db=db, names=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_tasks(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list tasks one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await TaskService.list_tasks(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post('/{name}/runs', response_model=TaskRun, status_code=202)
+async def enqueue_run(name: str, run: TaskRunCreate = Body(default=TaskRunCreate()), db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue a run of the task's action, executed by the task workers.
+    """
+    queued = await TaskService.enqueue_run(db, name, run.payload, run.priority, run.max_attempts)
+    if not queued:
+        raise HTTPException(status_code=404, detail='Task not found')
+    return queued
+
+@router.get('/{name}/runs', response_model=Page)
+async def list_runs(name: str, params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    List the runs of a task one page at a time, oldest first, e.g. ?status=failed.
+    """
+    try:
+        return page_response(await TaskService.list_runs(db=db, name=name, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/{name}/runs/{run_id}', response_model=TaskRun)
+async def get_run(name: str, run_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the status of a run of a task.
+    """
+    run = await TaskService.get_run(db, name, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail='Task run not found')
+    return run
+
+@router.post('/{name}/pipelines', response_model=PipelineRun, status_code=202)
+async def start_pipeline(name: str, pipeline: PipelineRunCreate = Body(default=PipelineRunCreate()), db: AsyncSession = Depends(get_async_db)):
+    """
+    Run the task after every task it transitively depends on, running independent tasks concurrently.
+
+    Each task receives the payload and, under "inputs", the results of the tasks it depends on.
+    """
+    try:
+        started = await TaskService.start_pipeline(db, name, pipeline.payload, pipeline.parallelism or settings.PIPELINE_PARALLELISM)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not started:
+        raise HTTPException(status_code=404, detail='Task not found')
+    return started
+
+@router.get('/{name}/pipelines/{pipeline_id}', response_model=PipelineRun)
+async def get_pipeline(name: str, pipeline_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the status of a pipeline run and of each of its tasks.
+    """
+    pipeline = await TaskService.get_pipeline(db, name, pipeline_id)
+    if not pipeline:
+        raise HTTPException(status_code=404, detail='Pipeline run not found')
+    return pipeline
+
+@router.post('/{name}/pipelines/{pipeline_id}/resume', response_model=PipelineRun, status_code=202)
+async def resume_pipeline(name: str, pipeline_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Resume a failed or interrupted pipeline run from its tasks that did not succeed.
+    """
+    try:
+        pipeline = await TaskService.resume_pipeline(db, name, pipeline_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not pipeline:
+        raise HTTPException(status_code=404, detail='Pipeline run not found')
+    return pipeline
+
 @router.get('/{name}', response_model=Task)
-def get_task(name: str, db: Session = Depends(get_db)):
+async def get_task(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get a task by name.
     """
     try:
-        task = TaskService.get_task(db, name)
-        if not task:
-            raise HTTPException(status_code=404, detail='Task not found')
-        return task
+        task = await TaskService.get_task(db, name)
     except NoResultFound:
         raise HTTPException(status_code=404, detail='Task not found')
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    if not task:
+        raise HTTPException(status_code=404, detail='Task not found')
+    return task
 
 @router.put('/{name}', response_model=Task)
-def update_task(name: str, task_update: TaskUpdate, db: Session = Depends(get_db)):
+async def update_task(name: str, task_update: TaskUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update a task by name.
     """
     try:
-        updated_task = TaskService.update_task(db, name, task_update)
-        return updated_task
+        updated_task = await TaskService.update_task(db, name, task_update.action, task_update.depends_on)
     except NoResultFound:
         raise HTTPException(status_code=404, detail='Task not found')
+    except TaskCycleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update task: {str(e)}")
+    if not updated_task:
+        raise HTTPException(status_code=404, detail='Task not found')
+    return updated_task
 
 @router.delete('/{name}', status_code=204)
-def delete_task(name: str, db: Session = Depends(get_db)):
+async def delete_task(name: str, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a task by name.
     """
     try:
-        TaskService.delete_task(db, name)
+        await TaskService.delete_task(db, name)
     except NoResultFound:
         raise HTTPException(status_code=404, detail='Task not found')
     except Exception as e:
@@ -1,12 +1,19 @@
 ## app/api/v1/endpoints/training.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Any, Dict, Optional
 
-from app.schemas.training import TrainingCreate, Training
+from app.schemas.training import TrainingCreate, Training, TrainingSimilarity
 from app.services.training_service import TrainingService
+from app.api.v1.params import ListParams, list_params
+from app.api.v1.responses import page_response
+from app.core.config import settings
+from app.db.bulk import BulkResult, validate_items
+from app.db.pagination import InvalidListQuery
 from app.db.session import get_async_db
+from app.schemas.bulk import BulkDelete, BulkDeleteResult, BulkResult as BulkResultSchema
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -21,6 +28,73 @@ async def create_training(training: TrainingCreate, db: AsyncSession = Depends(g
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating training: {e}")
 
+@router.post('/bulk', response_model=BulkResultSchema)
+async def bulk_upsert_trainings(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously create trainings or update them by title, reporting failures per item.
+    """
+    result = BulkResult()
+    rows = validate_items(TrainingCreate, items, result)
+    return await TrainingService.bulk_upsert_trainings(db=db, rows=rows, result=result)
+
+@router.post('/bulk/delete', response_model=BulkDeleteResult)
+async def bulk_delete_trainings(request: BulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously delete trainings by title in bulk.
+    """
+    deleted = await TrainingService.bulk_delete_trainings(db=db, titles=request.keys)
+    return {"deleted": deleted}
+
+@router.get('/', response_model=Page)
+async def list_trainings(params: ListParams = Depends(list_params), db: AsyncSession = Depends(get_async_db)):
+    """
+    Asynchronously list trainings one page at a time, with optional field projection and filters.
+    """
+    try:
+        return page_response(await TrainingService.list_trainings(db=db, limit=params.limit, cursor=params.cursor, fields=params.fields, filters=params.filters))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/search', response_model=Page)
+async def search_trainings(
+    q: str = Query(..., min_length=1, description="The search terms, all of which must match the title or content."),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="The maximum number of matches on the page."),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously search trainings by title and content, best matches first, with the matched terms highlighted in a snippet.
+    """
+    try:
+        return page_response(await TrainingService.search_trainings(db=db, query=q, limit=limit, cursor=cursor))
+    except InvalidListQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get('/similar', response_model=List[TrainingSimilarity])
+async def search_similar_trainings(
+    q: str = Query(..., min_length=1, description="The text the trainings are compared with."),
+    k: int = Query(10, ge=1, le=100, description="The maximum number of trainings."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously find the trainings closest in meaning to a text, most similar first.
+    """
+    return await TrainingService.search_similar_trainings(db=db, text=q, k=k)
+
+@router.get('/{title}/similar', response_model=List[TrainingSimilarity])
+async def get_similar_trainings(
+    title: str,
+    k: int = Query(10, ge=1, le=100, description="The maximum number of trainings."),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Asynchronously find the trainings closest in meaning to a training, most similar first.
+    """
+    similar = await TrainingService.get_similar_trainings(db=db, title=title, k=k)
+    if similar is None:
+        raise HTTPException(status_code=404, detail='Training not found')
+    return similar
+
 @router.get('/{title}', response_model=Training)
 async def get_training(title: str, db: AsyncSession = Depends(get_async_db)):
     """
@@ -28,11 +102,11 @@ async def get_training(title: str, db: AsyncSession = Depends(get_async_db)):
     """
     try:
         training = await TrainingService.get_training(db=db, title=title)
-        if not training:
-            raise HTTPException(status_code=404, detail='Training not found')
-        return training
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving training: {e}")
+    if not training:
+        raise HTTPException(status_code=404, detail='Training not found')
+    return training
 
 @router.delete('/{title}', status_code=204)
 async def delete_training(title: str, db: AsyncSession = Depends(get_async_db)):
@@ -0,0 +1,46 @@
+## app/api/v1/params.py
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from fastapi import Query, Request
+
+from app.core.config import settings
+
+@dataclass
+class ListParams:
+    """
+    Paging, projection and filtering parameters of a list endpoint.
+    """
+    limit: int = settings.PAGE_SIZE_DEFAULT
+    cursor: Optional[str] = None
+    fields: Optional[List[str]] = None
+    filters: Dict[str, Any] = field(default_factory=dict)
+
+def list_params(
+    request: Request,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="The maximum number of items on the page."),
+    cursor: Optional[str] = Query(None, description="The next_cursor of the previous page."),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, all fields by default."),
+) -> ListParams:
+    """
+    Dependency parsing the parameters of a list endpoint.
+
+    Every other query parameter is a filter, e.g. ?title=x or ?id__gt=10.
+
+    Args:
+        request (Request): The incoming request.
+        limit (int): The maximum number of items on the page.
+        cursor (Optional[str]): The cursor of the page.
+        fields (Optional[str]): The comma-separated fields to return.
+
+    Returns:
+        ListParams: The parsed parameters.
+    """
+    filters = {key: value for key, value in request.query_params.items() if key not in ("limit", "cursor", "fields")}
+    return ListParams(
+        limit=limit,
+        cursor=cursor,
+        fields=[name.strip() for name in fields.split(",") if name.strip()] if fields else None,
+        filters=filters,
+    )
@@ -0,0 +1,37 @@
+## app/api/v1/responses.py
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from app.db.pagination import Page
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON response rendered with orjson, the default response class of the app.
+
+    Values orjson cannot serialize natively, e.g. Decimal or pydantic models, fall
+    back to FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+def page_response(page: Page) -> FastJSONResponse:
+    """
+    Render a page of a list endpoint straight from its rows.
+
+    Returning a response skips the validation of the route's response_model, which
+    would otherwise build and encode a pydantic model per row; the rows are plain
+    dicts of column values that orjson serializes directly, and the response_model
+    still documents the endpoint.
+
+    Args:
+        page (Page): The page returned by the service.
+
+    Returns:
+        FastJSONResponse: The rendered page.
+    """
+    return FastJSONResponse({"items": page.items, "next_cursor": page.next_cursor})
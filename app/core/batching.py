@@ -0,0 +1,236 @@
+## app/core/batching.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+
+from app.core.config import settings
+from app.core.inference_pool import InferencePool, InferenceQueueFull, inference_pool
+from app.core.metrics import observe_inference
+from app.core.model_registry import model_registry
+from app.core.prediction_cache import predict_with_cache
+from app.core.tracing import tracer
+
+logger = logging.getLogger("app.core.batching")
+
+# Upper bounds of the batch-size histogram buckets, the last bucket catches everything above
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def run_registry_pipeline(model_name_or_path: str, texts: List[str], backend: str = "torch") -> List[Any]:
+    """
+    Run the shared pipeline of a model over the texts of a batch that are not cached yet.
+
+    Args:
+        model_name_or_path (str): The name or path of the model.
+        texts (List[str]): The texts to be processed.
+        backend (str): The inference backend of the model.
+
+    Returns:
+        List[Any]: The predictions for each text, in the same order as the texts.
+    """
+    nlp_pipeline = model_registry.acquire(model_name_or_path, backend)
+    start = time.perf_counter()
+    try:
+        with tracer.start_as_current_span("inference", attributes={"model": model_name_or_path, "backend": backend, "batch_size": len(texts)}):
+            predictions = predict_with_cache(nlp_pipeline, model_name_or_path, backend, texts)
+    except Exception:
+        observe_inference(model_name_or_path, backend, len(texts), time.perf_counter() - start, failed=True)
+        raise
+    finally:
+        model_registry.release(model_name_or_path, backend)
+    observe_inference(model_name_or_path, backend, len(texts), time.perf_counter() - start)
+    return predictions
+
+
+class BatchingEngine:
+    """
+    Collect concurrent requests for the same model into a single pipeline call.
+
+    A batch is flushed as soon as it reaches max_batch_size items, or max_wait_ms
+    after its first item arrived, whichever comes first. At most one batch per
+    worker of the inference pool is in flight; while they all run, new texts keep
+    accumulating so the next batch is larger.
+
+    A batch serves several requests, so it is traced in a trace of its own,
+    linked to the span of every request it serves.
+    """
+
+    def __init__(
+        self,
+        model_name_or_path: str,
+        backend: str = "torch",
+        max_batch_size: int = settings.BATCH_MAX_SIZE,
+        max_wait_ms: float = settings.BATCH_MAX_WAIT_MS,
+        max_queue: int = settings.BATCH_MAX_QUEUE,
+        infer: Callable[[str, List[str], str], List[Any]] = run_registry_pipeline,
+        pool: InferencePool = inference_pool,
+    ):
+        """
+        Initialize a BatchingEngine instance.
+
+        Args:
+            model_name_or_path (str): The name or path of the model served by this engine.
+            backend (str): The inference backend of the model.
+            max_batch_size (int): The maximum number of texts per pipeline call.
+            max_wait_ms (float): The maximum time in milliseconds to wait for a batch to fill up.
+            max_queue (int): The maximum number of texts waiting to be batched.
+            infer (Callable[[str, List[str], str], List[Any]]): The function running the model over a batch.
+            pool (InferencePool): The worker pool the batches are run in.
+        """
+        self.model_name_or_path = model_name_or_path
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue = max_queue
+        self._infer = infer
+        self._pool = pool
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batch_size_histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Get the number of texts waiting to be batched.
+
+        Returns:
+            int: The current queue depth.
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, text: str) -> Any:
+        """
+        Submit a text and wait for its own prediction from the batch it ends up in.
+
+        Args:
+            text (str): The text to be processed.
+
+        Returns:
+            Any: The prediction for the text.
+
+        Raises:
+            InferenceQueueFull: If too many texts are already waiting.
+        """
+        queue = self._ensure_worker()
+        if queue.qsize() >= self.max_queue:
+            raise InferenceQueueFull(self._pool.retry_after)
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((text, future, trace.get_current_span().get_span_context()))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future, trace.SpanContext]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self._pool.max_workers)
+        while True:
+            await slots.acquire()
+            batch = await self._collect()
+            self._record(len(batch))
+            dispatch = loop.create_task(self._dispatch(batch))
+            dispatch.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future, trace.SpanContext]]) -> None:
+        texts = [text for text, _, _ in batch]
+        links = [trace.Link(span_context) for _, _, span_context in batch if span_context.is_valid]
+        attributes = {"model": self.model_name_or_path, "backend": self.backend, "batch_size": len(batch)}
+        try:
+            with tracer.start_as_current_span("inference.batch", context=Context(), links=links, attributes=attributes):
+                predictions = await self._pool.run(self._infer, self.model_name_or_path, texts, self.backend)
+            # A short result would leave the callers without a prediction waiting forever
+            if len(predictions) != len(batch):
+                raise ValueError(f"Got {len(predictions)} predictions for a batch of {len(batch)} texts")
+        except Exception as e:
+            if not isinstance(e, InferenceQueueFull):
+                logger.error(f"Batch inference failed for model {self.model_name_or_path}: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+    def _record(self, batch_size: int) -> None:
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if batch_size <= bound), len(BATCH_SIZE_BUCKETS))
+        self.batch_size_histogram[bucket] += 1
+        self.batches += 1
+        self.items += batch_size
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the queue depth and batch-size histogram of the engine.
+
+        Returns:
+            Dict[str, Any]: The engine statistics.
+        """
+        labels = [str(bound) for bound in BATCH_SIZE_BUCKETS] + ["+Inf"]
+        return {
+            "queue_depth": self.queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "batch_size_histogram": dict(zip(labels, self.batch_size_histogram)),
+        }
+
+
+_engines: Dict[Tuple[str, str], BatchingEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_batching_engine(model_name_or_path: str, backend: str = "torch") -> BatchingEngine:
+    """
+    Get the batching engine shared by every agent using the given model and backend.
+
+    Args:
+        model_name_or_path (str): The name or path of the model.
+        backend (str): The inference backend of the model.
+
+    Returns:
+        BatchingEngine: The batching engine of the model.
+    """
+    key = (model_name_or_path, backend)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = BatchingEngine(model_name_or_path, backend)
+        return engine
+
+
+def batching_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the statistics of every batching engine.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The statistics of each engine, keyed by "backend:model".
+    """
+    with _engines_lock:
+        engines = list(_engines.values())
+    return {f"{engine.backend}:{engine.model_name_or_path}": engine.stats() for engine in engines}
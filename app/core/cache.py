@@ -0,0 +1,193 @@
+## app/core/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache with a size bound, LRU eviction and per-entry TTLs.
+    """
+
+    def __init__(self, max_size: int, ttl: float = 0):
+        """
+        Initialize an LRUCache instance.
+
+        Args:
+            max_size (int): The maximum number of entries, 0 disables the cache.
+            ttl (float): The default time to live of an entry in seconds, 0 keeps entries until evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (str): The key of the value.
+
+        Returns:
+            Optional[Any]: The value or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in the cache, evicting the least recently used entries if full.
+
+        Args:
+            key (str): The key of the value.
+            value (Any): The value to be stored.
+            ttl (Optional[float]): The time to live in seconds, defaults to the cache TTL.
+        """
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a value from the cache.
+
+        Args:
+            key (str): The key of the value.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every value from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InMemorySharedCache:
+    """
+    Local stand-in for a shared cache tier, storing bytes in a dict of this process.
+    """
+
+    def __init__(self):
+        """
+        Initialize an InMemorySharedCache instance.
+        """
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float = 0) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl if ttl else 0, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskSharedCache:
+    """
+    Shared cache tier stored on local disk with diskcache, shared by the workers of a node.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize a DiskSharedCache instance.
+
+        Args:
+            directory (str): The directory the cache is stored in.
+        """
+        import diskcache
+
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float = 0) -> None:
+        self._cache.set(key, value, expire=ttl or None)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class RedisSharedCache:
+    """
+    Shared cache tier stored in Redis, shared by every node.
+    """
+
+    def __init__(self, url: str):
+        """
+        Initialize a RedisSharedCache instance.
+
+        Args:
+            url (str): The URL of the Redis server.
+        """
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float = 0) -> None:
+        self._client.set(key, value, ex=int(ttl) or None)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+
+def create_shared_cache(backend: str, directory: str = "") -> Optional[Any]:
+    """
+    Create a shared cache tier.
+
+    Args:
+        backend (str): The kind of tier: "none", "memory", "disk" or "redis".
+        directory (str): The directory of the disk tier.
+
+    Returns:
+        Optional[Any]: The shared cache tier, or None if disabled.
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemorySharedCache()
+    if backend == "disk":
+        return DiskSharedCache(directory)
+    if backend == "redis":
+        return RedisSharedCache(settings.REDIS_URL)
+    raise ValueError(f"Unknown shared cache backend: {backend}")
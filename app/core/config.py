@@ -1,5 +1,7 @@
 ## app/core/config.py
 
+from typing import Dict, List
+
 from pydantic import BaseSettings, Field
 
 class Settings(BaseSettings):
@@ -7,6 +9,28 @@ class Settings(BaseSettings):
     VERSION: str = Field(default="1.0.0", env="VERSION")
     API_V1_STR: str = Field(default="/api/v1", env="API_V1_STR")
     DATABASE_URL: str = Field(default="sqlite:///./test.db", env="DATABASE_URL")
+    DATABASE_POOL_SIZE: int = Field(default=10, env="DATABASE_POOL_SIZE")
+    DATABASE_MAX_OVERFLOW: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    DATABASE_POOL_TIMEOUT: float = Field(default=30, env="DATABASE_POOL_TIMEOUT")
+    DATABASE_POOL_RECYCLE: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")
+    DATABASE_ECHO: bool = Field(default=False, env="DATABASE_ECHO")
+    PAGE_SIZE_DEFAULT: int = Field(default=50, env="PAGE_SIZE_DEFAULT")
+    PAGE_SIZE_MAX: int = Field(default=1000, env="PAGE_SIZE_MAX")
+    BULK_CHUNK_SIZE: int = Field(default=500, env="BULK_CHUNK_SIZE")
+    METRICS_ENABLED: bool = Field(default=True, env="METRICS_ENABLED")
+    METRICS_MAX_MODEL_LABELS: int = Field(default=20, env="METRICS_MAX_MODEL_LABELS")
+    TRACING_ENABLED: bool = Field(default=False, env="TRACING_ENABLED")
+    TRACING_EXPORTER: str = Field(default="otlp", env="TRACING_EXPORTER")
+    TRACING_SAMPLER: str = Field(default="parentbased_traceidratio", env="TRACING_SAMPLER")
+    TRACING_SAMPLE_RATIO: float = Field(default=0.1, env="TRACING_SAMPLE_RATIO")
+    OTEL_SERVICE_NAME: str = Field(default="nlp-service-api", env="OTEL_SERVICE_NAME")
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = Field(default="http://localhost:4317", env="OTEL_EXPORTER_OTLP_ENDPOINT")
+    LOG_FORMAT: str = Field(default="json", env="LOG_FORMAT")
+    LOG_QUEUE_ENABLED: bool = Field(default=True, env="LOG_QUEUE_ENABLED")
+    LOG_QUEUE_SIZE: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(default={}, env="LOG_SAMPLE_RATES")
+    LOG_ERROR_RATE_LIMIT: int = Field(default=10, env="LOG_ERROR_RATE_LIMIT")
+    LOG_ERROR_RATE_INTERVAL: float = Field(default=60.0, env="LOG_ERROR_RATE_INTERVAL")
     SECRET_KEY: str = Field(default="supersecretkey", env="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     ALGORITHM: str = Field(default="HS256", env="ALGORITHM")
@@ -15,6 +39,64 @@ class Settings(BaseSettings):
     ELASTICSEARCH_URL: str = Field(default="http://localhost:9200", env="ELASTICSEARCH_URL")
     PROMETHEUS_URL: str = Field(default="http://localhost:9090", env="PROMETHEUS_URL")
     GRAFANA_URL: str = Field(default="http://localhost:3000", env="GRAFANA_URL")
+    MODEL_REGISTRY_MEMORY_BUDGET_MB: int = Field(default=0, env="MODEL_REGISTRY_MEMORY_BUDGET_MB")
+    MODEL_WARMUP: List[str] = Field(default=[], env="MODEL_WARMUP")
+    MODEL_WARMUP_BACKGROUND: bool = Field(default=True, env="MODEL_WARMUP_BACKGROUND")
+    BATCH_MAX_SIZE: int = Field(default=32, env="BATCH_MAX_SIZE")
+    BATCH_MAX_WAIT_MS: float = Field(default=5.0, env="BATCH_MAX_WAIT_MS")
+    BATCH_MAX_QUEUE: int = Field(default=1024, env="BATCH_MAX_QUEUE")
+    CLASSIFY_CHUNK_SIZE: int = Field(default=64, env="CLASSIFY_CHUNK_SIZE")
+    GROUP_AGENT_TIMEOUT: float = Field(default=5.0, env="GROUP_AGENT_TIMEOUT")
+    TASK_WORKERS_ENABLED: bool = Field(default=True, env="TASK_WORKERS_ENABLED")
+    TASK_WORKER_CONCURRENCY: int = Field(default=4, env="TASK_WORKER_CONCURRENCY")
+    TASK_WORKER_KIND: str = Field(default="async", env="TASK_WORKER_KIND")
+    TASK_POLL_INTERVAL: float = Field(default=1.0, env="TASK_POLL_INTERVAL")
+    TASK_VISIBILITY_TIMEOUT: float = Field(default=300, env="TASK_VISIBILITY_TIMEOUT")
+    TASK_RUN_TIMEOUT: float = Field(default=3600, env="TASK_RUN_TIMEOUT")
+    TASK_MAX_ATTEMPTS: int = Field(default=3, env="TASK_MAX_ATTEMPTS")
+    TASK_RETRY_BACKOFF: float = Field(default=1.0, env="TASK_RETRY_BACKOFF")
+    TASK_RETRY_BACKOFF_MAX: float = Field(default=300, env="TASK_RETRY_BACKOFF_MAX")
+    TASK_TRANSPORT: str = Field(default="local", env="TASK_TRANSPORT")
+    KAFKA_TASK_TOPIC: str = Field(default="task-runs", env="KAFKA_TASK_TOPIC")
+    PIPELINE_PARALLELISM: int = Field(default=4, env="PIPELINE_PARALLELISM")
+    PIPELINE_POLL_INTERVAL: float = Field(default=0.5, env="PIPELINE_POLL_INTERVAL")
+    SEARCH_BACKEND: str = Field(default="database", env="SEARCH_BACKEND")
+    SEARCH_LANGUAGE: str = Field(default="english", env="SEARCH_LANGUAGE")
+    SEARCH_SNIPPET_TOKENS: int = Field(default=16, env="SEARCH_SNIPPET_TOKENS")
+    SEARCH_MAX_CANDIDATES: int = Field(default=2000, env="SEARCH_MAX_CANDIDATES")
+    SEARCH_INDEX_PREFIX: str = Field(default="", env="SEARCH_INDEX_PREFIX")
+    EMBEDDINGS_ENABLED: bool = Field(default=True, env="EMBEDDINGS_ENABLED")
+    EMBEDDING_MODEL: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", env="EMBEDDING_MODEL")
+    EMBEDDING_DIM: int = Field(default=384, env="EMBEDDING_DIM")
+    EMBEDDING_BATCH_SIZE: int = Field(default=64, env="EMBEDDING_BATCH_SIZE")
+    EMBEDDING_FLUSH_INTERVAL: float = Field(default=1.0, env="EMBEDDING_FLUSH_INTERVAL")
+    VECTOR_INDEX_DIR: str = Field(default="cache/vectors", env="VECTOR_INDEX_DIR")
+    VECTOR_INDEX_INITIAL_SIZE: int = Field(default=10000, env="VECTOR_INDEX_INITIAL_SIZE")
+    VECTOR_INDEX_M: int = Field(default=16, env="VECTOR_INDEX_M")
+    VECTOR_INDEX_EF_CONSTRUCTION: int = Field(default=200, env="VECTOR_INDEX_EF_CONSTRUCTION")
+    VECTOR_INDEX_EF_SEARCH: int = Field(default=64, env="VECTOR_INDEX_EF_SEARCH")
+    VECTOR_INDEX_PERSIST_INTERVAL: float = Field(default=30.0, env="VECTOR_INDEX_PERSIST_INTERVAL")
+    RECOMMENDER_FACTORS: int = Field(default=64, env="RECOMMENDER_FACTORS")
+    RECOMMENDER_TOP_K: int = Field(default=20, env="RECOMMENDER_TOP_K")
+    RECOMMENDER_BATCH_SIZE: int = Field(default=500, env="RECOMMENDER_BATCH_SIZE")
+    RECOMMENDER_MODEL_PATH: str = Field(default="cache/recommender.npz", env="RECOMMENDER_MODEL_PATH")
+    INFERENCE_WORKERS: int = Field(default=2, env="INFERENCE_WORKERS")
+    INFERENCE_MAX_QUEUE: int = Field(default=64, env="INFERENCE_MAX_QUEUE")
+    INFERENCE_POOL_KIND: str = Field(default="thread", env="INFERENCE_POOL_KIND")
+    INFERENCE_TORCH_THREADS: int = Field(default=0, env="INFERENCE_TORCH_THREADS")
+    INFERENCE_RETRY_AFTER: int = Field(default=1, env="INFERENCE_RETRY_AFTER")
+    ONNX_CACHE_DIR: str = Field(default="models/onnx", env="ONNX_CACHE_DIR")
+    ONNX_OPSET: int = Field(default=14, env="ONNX_OPSET")
+    PREDICTION_CACHE_SIZE: int = Field(default=10000, env="PREDICTION_CACHE_SIZE")
+    PREDICTION_CACHE_TTL: float = Field(default=3600, env="PREDICTION_CACHE_TTL")
+    PREDICTION_CACHE_BACKEND: str = Field(default="none", env="PREDICTION_CACHE_BACKEND")
+    PREDICTION_CACHE_DIR: str = Field(default="cache/predictions", env="PREDICTION_CACHE_DIR")
+    ENTITY_CACHE_SIZE: int = Field(default=10000, env="ENTITY_CACHE_SIZE")
+    ENTITY_CACHE_TTL: float = Field(default=60, env="ENTITY_CACHE_TTL")
+    ENTITY_CACHE_BACKEND: str = Field(default="none", env="ENTITY_CACHE_BACKEND")
+    ENTITY_CACHE_DIR: str = Field(default="cache/entities", env="ENTITY_CACHE_DIR")
+    ENTITY_CACHE_BUS: str = Field(default="local", env="ENTITY_CACHE_BUS")
+    ENTITY_CACHE_CHANNEL: str = Field(default="entity-cache-invalidations", env="ENTITY_CACHE_CHANNEL")
 
     class Config:
         env_file = ".env"
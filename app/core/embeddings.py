@@ -0,0 +1,362 @@
+## app/core/embeddings.py
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.inference_pool import InferenceQueueFull, inference_pool
+from app.core.model_registry import ModelRegistry
+from app.core.vector_index import VectorIndex
+from app.db.session import AsyncSessionLocal
+from app.models.feedback import Feedback
+from app.models.news import News
+from app.models.training import Training
+
+logger = logging.getLogger("app.core.embeddings")
+
+
+def load_embedding_model(model_name_or_path: str, backend: str = "torch") -> Any:
+    """
+    Load a sentence embedding model.
+
+    sentence-transformers is imported here rather than at module load, so that
+    a worker only pays for it once it embeds a text.
+
+    Args:
+        model_name_or_path (str): The name or path of the model to be loaded.
+        backend (str): The inference backend, only "torch" is supported.
+
+    Returns:
+        Any: The loaded model.
+    """
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name_or_path, device="cpu")
+
+
+embedding_registry = ModelRegistry(loader=load_embedding_model)
+
+
+def embed_texts(texts: List[str], model_name_or_path: str = settings.EMBEDDING_MODEL) -> np.ndarray:
+    """
+    Embed texts with the shared embedding model.
+
+    Args:
+        texts (List[str]): The texts to be embedded.
+        model_name_or_path (str): The name or path of the embedding model.
+
+    Returns:
+        np.ndarray: The normalized embeddings, one row per text.
+    """
+    model = embedding_registry.acquire(model_name_or_path)
+    try:
+        vectors = model.encode(texts, batch_size=settings.EMBEDDING_BATCH_SIZE, normalize_embeddings=True)
+    finally:
+        embedding_registry.release(model_name_or_path)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+@dataclass
+class EmbeddingSource:
+    """
+    The columns of a model embedded for semantic search.
+
+    Attributes:
+        key (str): The column identifying a row in the results, e.g. the title.
+        columns (Sequence[str]): The text columns joined into the embedded text.
+    """
+    key: str
+    columns: Sequence[str]
+
+
+# Models embedded for semantic search
+EMBEDDING_SOURCES: Dict[Any, EmbeddingSource] = {
+    News: EmbeddingSource("title", ("title", "content")),
+    Training: EmbeddingSource("title", ("title", "content")),
+    Feedback: EmbeddingSource("user", ("content",)),
+}
+
+
+class EmbeddingIndexer:
+    """
+    Keep an HNSW index of the embeddings of each model in EMBEDDING_SOURCES up to date with the database.
+
+    The services submit the ids of the rows they write, and a background loop
+    embeds them in batches of up to batch_size rows, off the event loop in the
+    inference pool, at most flush_interval seconds after they were submitted.
+    Rows found deleted when their batch is embedded are removed from the index.
+    On start, rows missing from the persisted indexes, e.g. written while the
+    service was down, are submitted again.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker = AsyncSessionLocal,
+        directory: str = settings.VECTOR_INDEX_DIR,
+        embed: Callable[[List[str]], np.ndarray] = embed_texts,
+        dim: int = settings.EMBEDDING_DIM,
+        batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        flush_interval: float = settings.EMBEDDING_FLUSH_INTERVAL,
+        persist_interval: float = settings.VECTOR_INDEX_PERSIST_INTERVAL,
+    ):
+        """
+        Initialize an EmbeddingIndexer instance.
+
+        Args:
+            sessions (async_sessionmaker): The factory of the sessions the rows are read with.
+            directory (str): The directory the index of each model is persisted in.
+            embed (Callable[[List[str]], np.ndarray]): The function embedding texts into normalized vectors.
+            dim (int): The dimension of the embeddings.
+            batch_size (int): The maximum number of rows embedded at once.
+            flush_interval (float): The maximum number of seconds a submitted row waits to be embedded.
+            persist_interval (float): The number of seconds between writes of the indexes to disk.
+        """
+        self.sessions = sessions
+        self.directory = directory
+        self.embed = embed
+        self.dim = dim
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.persist_interval = persist_interval
+        self._indexes: Dict[Any, VectorIndex] = {}
+        self._pending: Dict[Any, Set[int]] = {model: set() for model in EMBEDDING_SOURCES}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loading: Optional[asyncio.Lock] = None
+        self._flushing: Optional[asyncio.Lock] = None
+
+    def index(self, model: Any) -> VectorIndex:
+        """
+        Get the index of a model, loading it from disk on first use.
+
+        Loading blocks for as long as reading the index takes, code running on the
+        event loop uses load_index instead.
+
+        Args:
+            model (Any): The ORM model.
+
+        Returns:
+            VectorIndex: The index of the embeddings of the rows of the model.
+        """
+        if model not in self._indexes:
+            self._indexes[model] = VectorIndex(os.path.join(self.directory, model.__table__.name), self.dim)
+        return self._indexes[model]
+
+    async def load_index(self, model: Any) -> VectorIndex:
+        """
+        Get the index of a model, loading it from disk in a thread on first use.
+
+        start() loads every index, so requests only load one while the indexer is stopped.
+
+        Args:
+            model (Any): The ORM model.
+
+        Returns:
+            VectorIndex: The index of the embeddings of the rows of the model.
+        """
+        if model not in self._indexes:
+            if self._loading is None:
+                self._loading = asyncio.Lock()
+            # A persisted index can take seconds to read, concurrent requests wait for the same load
+            async with self._loading:
+                if model not in self._indexes:
+                    await asyncio.to_thread(self.index, model)
+        return self._indexes[model]
+
+    def submit(self, model: Any, ids: Iterable[int]) -> None:
+        """
+        Queue rows written or deleted to be embedded or removed, a no-op unless the indexer is running.
+
+        Args:
+            model (Any): The ORM model.
+            ids (Iterable[int]): The ids of the rows.
+        """
+        if self._task is None:
+            return
+        self._pending[model].update(ids)
+        if len(self._pending[model]) >= self.batch_size:
+            self._wake.set()
+
+    async def row_ids(self, db: AsyncSession, model: Any, keys: Sequence[Any]) -> List[int]:
+        """
+        Get the ids of the rows of a model with the given keys, to be submitted after a bulk write.
+
+        Args:
+            db (AsyncSession): The database session.
+            model (Any): The ORM model.
+            keys (Sequence[Any]): The values of the key column of the rows.
+
+        Returns:
+            List[int]: The ids of the rows, none unless the indexer is running.
+        """
+        if self._task is None:
+            return []
+        column = getattr(model, EMBEDDING_SOURCES[model].key)
+        ids = []
+        for start in range(0, len(keys), settings.BULK_CHUNK_SIZE):
+            result = await db.execute(select(model.id).where(column.in_(keys[start:start + settings.BULK_CHUNK_SIZE])))
+            ids.extend(result.scalars())
+        return ids
+
+    async def start(self) -> None:
+        """
+        Load the indexes, submit the rows missing from them and start embedding submitted rows in the background.
+        """
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        async with self.sessions() as db:
+            for model in EMBEDDING_SOURCES:
+                index = await self.load_index(model)
+                ids = set((await db.execute(select(model.id))).scalars())
+                indexed = set(await asyncio.to_thread(index.ids))
+                self._pending[model].update(ids - indexed)
+                await asyncio.to_thread(index.delete, list(indexed - ids))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background loop, embed the rows still pending and write the indexes to disk.
+
+        Rows that fail to be embedded are left out of the indexes until they are written again,
+        or until the next start if they are new.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to embed rows on shutdown: {e}")
+        for index in self._indexes.values():
+            await asyncio.to_thread(index.close)
+        self._indexes.clear()
+
+    async def _run(self) -> None:
+        persisted = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except InferenceQueueFull as e:
+                # The batches were queued again, leave the inference workers to the requests for a while
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.error(f"Failed to embed rows: {e}")
+            if time.monotonic() - persisted >= self.persist_interval:
+                for index in list(self._indexes.values()):
+                    await asyncio.to_thread(index.persist)
+                persisted = time.monotonic()
+
+    async def flush(self) -> None:
+        """
+        Embed the rows submitted so far, in batches of up to batch_size rows.
+
+        Rows taken by a flush already running, e.g. the background loop's, are
+        waited for, so that every row submitted before the call is indexed on return.
+        """
+        if self._flushing is None:
+            self._flushing = asyncio.Lock()
+        async with self._flushing:
+            for model, pending in list(self._pending.items()):
+                while pending:
+                    ids = [pending.pop() for _ in range(min(self.batch_size, len(pending)))]
+                    try:
+                        await self._apply(model, ids)
+                    except BaseException:
+                        # Including a cancellation by stop(), which embeds the pending rows again
+                        pending.update(ids)
+                        raise
+
+    async def _apply(self, model: Any, ids: List[int]) -> None:
+        source = EMBEDDING_SOURCES[model]
+        async with self.sessions() as db:
+            result = await db.execute(select(model.id, *(getattr(model, column) for column in source.columns)).where(model.id.in_(ids)))
+            rows = result.all()
+        index = await self.load_index(model)
+        deleted = set(ids) - {row[0] for row in rows}
+        if deleted:
+            await asyncio.to_thread(index.delete, list(deleted))
+        if rows:
+            vectors = await inference_pool.run(self.embed, [self._text(row[1:]) for row in rows])
+            await asyncio.to_thread(index.upsert, [row[0] for row in rows], vectors)
+
+    @staticmethod
+    def _text(values: Sequence[Optional[str]]) -> str:
+        return "\n".join(value for value in values if value)
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embed a query text in the inference pool.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            np.ndarray: The normalized embedding of the text.
+        """
+        return (await inference_pool.run(self.embed, [text]))[0]
+
+    async def similar(self, db: AsyncSession, model: Any, vector: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find the rows of a model whose embeddings are nearest to a vector.
+
+        Args:
+            db (AsyncSession): The database session.
+            model (Any): The ORM model.
+            vector (np.ndarray): The normalized query vector.
+            k (int): The maximum number of rows.
+            exclude (Optional[int]): The id of a row left out of the results, e.g. the row the vector is from.
+
+        Returns:
+            List[Dict[str, Any]]: The key and cosine similarity of each row, most similar first.
+        """
+        source = EMBEDDING_SOURCES[model]
+        # Queries wait for the batch being inserted by the indexer, off the event loop
+        neighbours = await asyncio.to_thread((await self.load_index(model)).query, vector, k, exclude)
+        if not neighbours:
+            return []
+        key = getattr(model, source.key)
+        result = await db.execute(select(model.id, key).where(model.id.in_([row_id for row_id, _ in neighbours])))
+        keys = dict(result.all())
+        # Rows deleted since they were indexed are skipped until their removal is applied
+        return [{source.key: keys[row_id], "score": score} for row_id, score in neighbours if row_id in keys]
+
+    async def similar_to(self, db: AsyncSession, model: Any, row: Any, k: int) -> List[Dict[str, Any]]:
+        """
+        Find the rows of a model most similar to one of its rows.
+
+        Args:
+            db (AsyncSession): The database session.
+            model (Any): The ORM model.
+            row (Any): The row, embedded on the fly if it is not indexed yet.
+            k (int): The maximum number of rows.
+
+        Returns:
+            List[Dict[str, Any]]: The key and cosine similarity of each other row, most similar first.
+        """
+        vector = await asyncio.to_thread((await self.load_index(model)).get, row.id)
+        if vector is None:
+            vector = await self.embed_query(self._text([getattr(row, column) for column in EMBEDDING_SOURCES[model].columns]))
+        return await self.similar(db, model, vector, k, exclude=row.id)
+
+
+embedding_indexer = EmbeddingIndexer()
@@ -0,0 +1,102 @@
+## app/core/ensemble.py
+
+from itertools import chain
+from operator import itemgetter
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+SCHEMES = ("majority", "weighted_average", "max_confidence")
+
+
+def stack_predictions(predictions: Sequence[Sequence[Any]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Stack the predictions of several models for the same texts into one score array.
+
+    Each prediction is a {"label", "score"} dict, or a list of them when the pipeline
+    returns several labels per text. Labels a model did not score for a text get a
+    score of 0. The dicts are unpacked with map and itemgetter, every other step is
+    vectorized.
+
+    Args:
+        predictions (Sequence[Sequence[Any]]): The predictions of each model, one per text in the same order.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The scores shaped (models, texts, labels) and the label of each column.
+    """
+    texts = len(predictions[0])
+    labels, scores, model_index, text_index = [], [], [], []
+    for model, model_predictions in enumerate(predictions):
+        if len(model_predictions) != texts:
+            raise ValueError(f"Expected {texts} predictions per model, got {len(model_predictions)}")
+        if texts and isinstance(model_predictions[0], dict):
+            entries, lengths = model_predictions, np.ones(texts, dtype=np.int64)
+        else:
+            entries = list(chain.from_iterable(model_predictions))
+            lengths = np.fromiter(map(len, model_predictions), dtype=np.int64, count=texts)
+        labels.append(np.array(list(map(itemgetter("label"), entries)), dtype=object))
+        scores.append(np.fromiter(map(itemgetter("score"), entries), dtype=np.float32, count=len(entries)))
+        model_index.append(np.full(len(entries), model, dtype=np.int64))
+        text_index.append(np.repeat(np.arange(texts), lengths))
+    vocabulary, label_index = np.unique(np.concatenate(labels), return_inverse=True)
+    stacked = np.zeros((len(predictions), texts, len(vocabulary)), dtype=np.float32)
+    stacked[np.concatenate(model_index), np.concatenate(text_index), label_index] = np.concatenate(scores)
+    return stacked, vocabulary.tolist()
+
+
+def combine(scores: np.ndarray, weights: np.ndarray, scheme: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Combine the scores of several models into one label and confidence per text.
+
+    "majority" counts the top label of each model as a vote of its weight, the
+    confidence being the share of the total weight the winner got. "weighted_average"
+    picks the label with the highest weighted mean score. "max_confidence" follows
+    the model most confident about its top label, regardless of the weights.
+
+    Args:
+        scores (np.ndarray): The scores shaped (models, texts, labels).
+        weights (np.ndarray): The weight of each model.
+        scheme (str): One of SCHEMES.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The index of the chosen label and its confidence, for each text.
+    """
+    models, texts, labels = scores.shape
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (models,) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Expected one non-negative weight per model, not all zero")
+    if scheme == "majority":
+        votes = scores.argmax(axis=2)
+        tally = np.bincount(
+            (np.arange(texts) * labels + votes).ravel(),
+            weights=np.repeat(weights, texts),
+            minlength=texts * labels,
+        ).reshape(texts, labels)
+        chosen = tally.argmax(axis=1)
+        return chosen, tally[np.arange(texts), chosen] / weights.sum()
+    if scheme == "weighted_average":
+        averaged = np.tensordot(weights / weights.sum(), scores, axes=1)
+        chosen = averaged.argmax(axis=1)
+        return chosen, averaged[np.arange(texts), chosen]
+    if scheme == "max_confidence":
+        top = scores.max(axis=2)
+        best = top.argmax(axis=0)
+        return scores.argmax(axis=2)[best, np.arange(texts)], top[best, np.arange(texts)]
+    raise ValueError(f"Unknown ensemble scheme: {scheme}")
+
+
+def ensemble_predictions(predictions: Sequence[Sequence[Any]], weights: Sequence[float], scheme: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Combine the predictions of several models for the same texts into one label and score per text.
+
+    Args:
+        predictions (Sequence[Sequence[Any]]): The predictions of each model, one per text in the same order.
+        weights (Sequence[float]): The weight of each model.
+        scheme (str): One of SCHEMES.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The label and the confidence of each text.
+    """
+    scores, vocabulary = stack_predictions(predictions)
+    chosen, confidence = combine(scores, np.asarray(weights), scheme)
+    return np.asarray(vocabulary, dtype=object)[chosen].tolist(), confidence.astype(np.float32)
@@ -0,0 +1,284 @@
+## app/core/entity_cache.py
+
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import DateTime, inspect
+
+from app.core.cache import LRUCache, create_shared_cache
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.entity_cache")
+
+
+class LocalInvalidationBus:
+    """
+    In-process stand-in for the invalidation channel, delivering each message to every other subscriber.
+
+    Several EntityCache instances sharing one bus behave like nodes sharing a Redis channel.
+    """
+
+    def __init__(self):
+        """
+        Initialize a LocalInvalidationBus instance.
+        """
+        self._subscribers: List[Callable[[bytes], None]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, message: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, callback: Callable[[bytes], None]) -> None:
+        with self._lock:
+            self._subscribers.append(callback)
+
+
+class RedisInvalidationBus:
+    """
+    Invalidation channel over Redis pub/sub, shared by every node.
+
+    Messages are received by a daemon thread of the Redis client.
+    """
+
+    def __init__(self, url: str, channel: str):
+        """
+        Initialize a RedisInvalidationBus instance.
+
+        Args:
+            url (str): The URL of the Redis server.
+            channel (str): The pub/sub channel of the invalidation messages.
+        """
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._pubsub = None
+
+    def publish(self, message: bytes) -> None:
+        self._client.publish(self.channel, message)
+
+    def subscribe(self, callback: Callable[[bytes], None]) -> None:
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: lambda message: callback(message["data"])})
+        self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+
+def create_invalidation_bus(kind: str) -> Any:
+    """
+    Create the channel invalidations are fanned out to the other nodes over.
+
+    Args:
+        kind (str): "local" to only reach caches of this process, or "redis".
+
+    Returns:
+        Any: The invalidation bus.
+    """
+    if kind == "local":
+        return LocalInvalidationBus()
+    if kind == "redis":
+        return RedisInvalidationBus(settings.REDIS_URL, settings.ENTITY_CACHE_CHANNEL)
+    raise ValueError(f"Unknown invalidation bus: {kind}")
+
+
+class EntityCache:
+    """
+    Two-tier read-through cache of model rows looked up by their key, e.g. agents by name.
+
+    The in-process LRU tier is checked first, then the optional shared tier, then
+    the database. Entries hold the column values of the row, so every lookup
+    returns a fresh instance that is not attached to a session. Writers invalidate
+    the entry in both tiers and publish the key on the bus, so the other nodes
+    drop it from their own in-process tier. A read racing a write can still put
+    the old row back, which the TTL bounds.
+    """
+
+    def __init__(self, local: LRUCache, shared: Optional[Any] = None, bus: Optional[Any] = None, ttl: float = 0):
+        """
+        Initialize an EntityCache instance.
+
+        Args:
+            local (LRUCache): The in-process tier.
+            shared (Optional[Any]): The shared tier, None to only cache in process.
+            bus (Optional[Any]): The invalidation channel shared with the other nodes, None for a single node.
+            ttl (float): The time to live of an entry in seconds, 0 keeps entries until evicted.
+        """
+        self.local = local
+        self.shared = shared
+        self.bus = bus
+        self.ttl = ttl
+        self.node_id = uuid.uuid4().hex
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        if bus is not None:
+            bus.subscribe(self._on_message)
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.max_size > 0 or self.shared is not None
+
+    @staticmethod
+    def key(model: Any, key: Any) -> str:
+        """
+        Build the cache key of a row.
+
+        Args:
+            model (Any): The mapped model class of the row.
+            key (Any): The value of the lookup key of the row.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"entity:{model.__tablename__}:{key}"
+
+    @staticmethod
+    def _dump(entity: Any, extra_fields: Sequence[str]) -> Dict[str, Any]:
+        values = {attribute.key: getattr(entity, attribute.key) for attribute in inspect(type(entity)).column_attrs}
+        for name in extra_fields:
+            values[name] = list(getattr(entity, name))
+        return values
+
+    @staticmethod
+    def _load(model: Any, values: Dict[str, Any]) -> Any:
+        values = dict(values)
+        # The shared tier stores JSON, turn the timestamps back into datetimes
+        for column in model.__table__.columns:
+            if isinstance(column.type, DateTime) and isinstance(values.get(column.key), str):
+                values[column.key] = datetime.fromisoformat(values[column.key])
+        return model(**values)
+
+    async def get(
+        self,
+        model: Any,
+        key: Any,
+        loader: Callable[[], Awaitable[Optional[Any]]],
+        extra_fields: Sequence[str] = (),
+    ) -> Optional[Any]:
+        """
+        Get a row from the cache, loading it with the loader on a miss.
+
+        Concurrent misses for the same row share one load. Missing rows are not cached.
+
+        Args:
+            model (Any): The mapped model class of the row.
+            key (Any): The value of the lookup key of the row.
+            loader (Callable[[], Awaitable[Optional[Any]]]): The database lookup of the row.
+            extra_fields (Sequence[str]): Non-column attributes to be cached too, e.g. association proxies.
+
+        Returns:
+            Optional[Any]: A detached instance of the row, or the loaded one on a miss, None if it does not exist.
+        """
+        if not self.enabled:
+            return await loader()
+        cache_key = self.key(model, key)
+        values = self.local.get(cache_key)
+        if values is not None:
+            with self._lock:
+                self.local_hits += 1
+            return self._load(model, values)
+        if self.shared is not None:
+            raw = await asyncio.to_thread(self.shared.get, cache_key)
+            if raw is not None:
+                values = orjson.loads(raw)
+                self.local.set(cache_key, values, self.ttl)
+                with self._lock:
+                    self.shared_hits += 1
+                return self._load(model, values)
+
+        with self._lock:
+            self.misses += 1
+        pending = self._loading.get(cache_key)
+        if pending is not None:
+            values = await asyncio.shield(pending)
+            return self._load(model, values) if values is not None else None
+        pending = asyncio.get_running_loop().create_future()
+        self._loading[cache_key] = pending
+        try:
+            entity = await loader()
+            values = self._dump(entity, extra_fields) if entity is not None else None
+            if values is not None:
+                self.local.set(cache_key, values, self.ttl)
+                if self.shared is not None:
+                    await asyncio.to_thread(self.shared.set, cache_key, orjson.dumps(values), self.ttl)
+            pending.set_result(values)
+            return entity
+        except BaseException as e:
+            pending.set_exception(e)
+            # Retrieve the exception so an unawaited future does not log it
+            pending.exception()
+            raise
+        finally:
+            self._loading.pop(cache_key, None)
+
+    async def invalidate(self, model: Any, *keys: Any) -> None:
+        """
+        Drop rows from both tiers of every node, after they were written or deleted.
+
+        Args:
+            model (Any): The mapped model class of the rows.
+            *keys (Any): The values of the lookup keys of the rows.
+        """
+        if not self.enabled or not keys:
+            return
+        cache_keys = [self.key(model, key) for key in keys]
+        for cache_key in cache_keys:
+            self.local.delete(cache_key)
+        with self._lock:
+            self.invalidations += len(cache_keys)
+        if self.shared is None and self.bus is None:
+            return
+        await asyncio.to_thread(self._invalidate_remote, cache_keys)
+
+    def _invalidate_remote(self, cache_keys: List[str]) -> None:
+        if self.shared is not None:
+            for cache_key in cache_keys:
+                self.shared.delete(cache_key)
+        if self.bus is not None:
+            try:
+                self.bus.publish(orjson.dumps({"node": self.node_id, "keys": cache_keys}))
+            except Exception as e:
+                logger.error(f"Failed to publish the invalidation of {len(cache_keys)} cached rows: {e}")
+
+    def _on_message(self, message: bytes) -> None:
+        payload = orjson.loads(message)
+        if payload["node"] == self.node_id:
+            return
+        for cache_key in payload["keys"]:
+            self.local.delete(cache_key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The cache statistics.
+        """
+        hits = self.local_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "local_size": len(self.local),
+        }
+
+
+entity_cache = EntityCache(
+    LRUCache(settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_TTL),
+    create_shared_cache(settings.ENTITY_CACHE_BACKEND, settings.ENTITY_CACHE_DIR),
+    create_invalidation_bus(settings.ENTITY_CACHE_BUS),
+    settings.ENTITY_CACHE_TTL,
+)
@@ -0,0 +1,153 @@
+## app/core/inference_pool.py
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.inference_pool")
+
+
+class InferenceQueueFull(Exception):
+    def __init__(self, retry_after: int):
+        """
+        Initialize an InferenceQueueFull exception.
+
+        Args:
+            retry_after (int): The number of seconds the client should wait before retrying.
+        """
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+def pin_torch_threads(num_threads: int) -> None:
+    """
+    Limit the number of intra-op threads torch uses in the current worker.
+
+    Args:
+        num_threads (int): The number of intra-op threads.
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+class InferencePool:
+    """
+    Bounded worker pool that runs CPU-bound inference off the event loop.
+
+    At most max_workers calls run at the same time and at most max_queue more wait
+    for a worker; further calls are rejected with InferenceQueueFull instead of
+    piling up behind the ones already waiting.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.INFERENCE_WORKERS,
+        max_queue: int = settings.INFERENCE_MAX_QUEUE,
+        kind: str = settings.INFERENCE_POOL_KIND,
+        torch_threads: int = settings.INFERENCE_TORCH_THREADS,
+        retry_after: int = settings.INFERENCE_RETRY_AFTER,
+    ):
+        """
+        Initialize an InferencePool instance.
+
+        Args:
+            max_workers (int): The number of workers running inference concurrently.
+            max_queue (int): The number of calls allowed to wait for a free worker.
+            kind (str): The kind of workers, either "thread" or "process".
+            torch_threads (int): The number of torch intra-op threads per worker, 0 splits the CPUs evenly.
+            retry_after (int): The Retry-After value in seconds reported when the queue is full.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown inference pool kind: {kind}")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // max_workers)
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                executor_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+                self._executor = executor_class(
+                    max_workers=self.max_workers,
+                    initializer=pin_torch_threads,
+                    initargs=(self.torch_threads,),
+                )
+                logger.info(f"Started {self.kind} inference pool with {self.max_workers} workers")
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        """
+        Get the number of calls running or waiting in the pool.
+
+        Returns:
+            int: The number of pending calls.
+        """
+        return self._pending
+
+    def is_saturated(self) -> bool:
+        """
+        Check whether the pool would reject a new call.
+
+        Returns:
+            bool: True if every worker is busy and the queue is full.
+        """
+        return self._pending >= self.max_workers + self.max_queue
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Asynchronously run a function in the pool.
+
+        With a process pool the function and its arguments must be picklable, and
+        models are loaded by the registry of each worker process. With a thread
+        pool the function runs in a copy of the caller's context, so its spans
+        are children of the caller's span.
+
+        Args:
+            fn (Callable[..., Any]): The function to be run.
+            *args (Any): The arguments passed to the function.
+
+        Returns:
+            Any: The result of the function.
+
+        Raises:
+            InferenceQueueFull: If every worker is busy and the queue is full.
+        """
+        executor = self._get_executor()
+        with self._lock:
+            if self.is_saturated():
+                raise InferenceQueueFull(self.retry_after)
+            self._pending += 1
+        if isinstance(executor, ThreadPoolExecutor):
+            fn, args = contextvars.copy_context().run, (fn, *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers of the pool, waiting for running calls to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+inference_pool = InferencePool()
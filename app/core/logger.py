@@ -1,6 +1,17 @@
+import copy
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
 
 # Define default settings for logger
 class LoggerSettings:
@@ -11,40 +22,236 @@ class LoggerSettings:
     BACKUP_COUNT: int = 5
     FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-# Ensure the logs directory exists
-log_dir = Path(LoggerSettings.LOG_DIR)
-log_dir.mkdir(exist_ok=True)
+# Attributes every LogRecord has, anything else on a record was passed with extra=
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
 
-# Define log file path
-log_file_path = log_dir / LoggerSettings.LOG_FILE
+# Parent of every app.* module logger, the handlers are attached here
+logger = logging.getLogger("app")
 
-# Set up the logger
-logger = logging.getLogger("NLP Service API")
-level = logging.getLevelName(LoggerSettings.LOG_LEVEL)
-logger.setLevel(level)
+# Listener thread writing the queued records, set while the queue mode is on
+_listener: Optional[QueueListener] = None
 
-# Create handlers
-console_handler = logging.StreamHandler()
-file_handler = RotatingFileHandler(log_file_path, maxBytes=LoggerSettings.MAX_BYTES, backupCount=LoggerSettings.BACKUP_COUNT)
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line, serialized with orjson.
+    """
 
-# Set level for handlers
-console_handler.setLevel(logging.INFO)
-file_handler.setLevel(level)
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES:
+                payload[name] = value
+        return orjson.dumps(payload, default=str).decode()
 
-# Create formatters and add them to handlers
-formatter = logging.Formatter(LoggerSettings.FORMAT)
-console_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a share of the records below WARNING of the given loggers.
 
-# Add handlers to the logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+    A rate applies to the logger it is configured for and to its children, the
+    most specific configured logger wins. Warnings and errors are always kept.
+    """
 
-def setup_logger():
+    def __init__(self, rates: Dict[str, float]):
+        """
+        Initialize a SamplingFilter instance.
+
+        Args:
+            rates (Dict[str, float]): The share of records kept, between 0 and 1, keyed by logger name.
+        """
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+            rate = self.rates[max(matches, key=len)] if matches else 1.0
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most limit copies of the same error message through per interval.
+
+    The first record let through after some copies were dropped carries their
+    number in its suppressed attribute.
+    """
+
+    def __init__(self, limit: int, interval: float, level: int = logging.ERROR, max_keys: int = 1000):
+        """
+        Initialize a RateLimitFilter instance.
+
+        Args:
+            limit (int): The maximum number of copies of a message per interval.
+            interval (float): The length of the interval in seconds.
+            level (int): The lowest level of the rate-limited records.
+            max_keys (int): The number of distinct messages tracked before expired ones are dropped.
+        """
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self.level = level
+        self.max_keys = max_keys
+        self._windows: Dict[Tuple[str, str], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+        key = (record.name, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                if window is None and len(self._windows) >= self.max_keys:
+                    self._expire(now)
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+    def _expire(self, now: float) -> None:
+        for key in [key for key, window in self._windows.items() if now - window[0] >= self.interval]:
+            del self._windows[key]
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Put records on a bounded queue for the listener thread, dropping them when it is full.
+
+    The message and traceback are rendered before queueing, as their arguments may
+    have changed by the time the listener writes them, but the record keeps its
+    other attributes so the listener's formatter can render them.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class FanOutHandler(logging.Handler):
+    """
+    Pass records on to several handlers, each one applying its own level.
+    """
+
+    def __init__(self, handlers: List[logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self) -> None:
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+def _create_handlers(log_dir: str, log_format: str) -> List[logging.Handler]:
+    level = logging.getLevelName(LoggerSettings.LOG_LEVEL)
+    Path(log_dir).mkdir(parents=True, exist_ok=True)
+    formatter = JsonFormatter() if log_format == "json" else logging.Formatter(LoggerSettings.FORMAT)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    file_handler = RotatingFileHandler(
+        Path(log_dir) / LoggerSettings.LOG_FILE, maxBytes=LoggerSettings.MAX_BYTES, backupCount=LoggerSettings.BACKUP_COUNT
+    )
+    file_handler.setLevel(level)
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [console_handler, file_handler]
+
+def setup_logger(
+    log_dir: str = LoggerSettings.LOG_DIR,
+    log_format: str = settings.LOG_FORMAT,
+    use_queue: bool = settings.LOG_QUEUE_ENABLED,
+    sample_rates: Optional[Dict[str, float]] = None,
+) -> logging.Logger:
     """
     Function to set up the logger. This function can be called at the start of the application.
+
+    In queue mode the app logger only puts records on a queue, and a listener
+    thread does the formatting and the console and file I/O, so logging never
+    blocks the event loop. Sampling and error rate limits are applied before
+    queueing. Calling it again replaces the previous setup.
+
+    Args:
+        log_dir (str): The directory of the log file.
+        log_format (str): "json" for one JSON object per line, "text" for plain lines.
+        use_queue (bool): Whether to write through the listener thread.
+        sample_rates (Optional[Dict[str, float]]): The share of records below WARNING kept per logger,
+            defaults to LOG_SAMPLE_RATES.
+
+    Returns:
+        logging.Logger: The app logger.
     """
+    global _listener
+    shutdown_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    handlers = _create_handlers(log_dir, log_format)
+    if use_queue:
+        front = DroppingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+        _listener = QueueListener(front.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        front = FanOutHandler(handlers)
+    front.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES if sample_rates is None else sample_rates))
+    front.addFilter(RateLimitFilter(settings.LOG_ERROR_RATE_LIMIT, settings.LOG_ERROR_RATE_INTERVAL))
+    logger.addHandler(front)
+
+    logger.setLevel(logging.getLevelName(LoggerSettings.LOG_LEVEL))
     logger.info("Logger is set up.")
+    return logger
+
+def shutdown_logger() -> None:
+    """
+    Stop the listener thread of the queue mode, writing the records still queued.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 # Example usage
 if __name__ == "__main__":
@@ -54,3 +261,4 @@ if __name__ == "__main__":
     logger.warning("This is a warning message")
     logger.error("This is an error message")
     logger.critical("This is a critical message")
+    shutdown_logger()
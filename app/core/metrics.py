@@ -0,0 +1,245 @@
+## app/core/metrics.py
+
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Set, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.tracing import tracer
+
+# Registry of every metric exposed at /metrics
+registry = CollectorRegistry()
+
+# Label value of everything past the cardinality limit of a label
+OVERFLOW_LABEL = "other"
+
+# Service method the current task is running, used to label its database queries
+current_service_method: ContextVar[Tuple[str, str]] = ContextVar("current_service_method", default=("none", "none"))
+
+
+class LabelLimiter:
+    """
+    Bound the number of distinct values of a metric label.
+
+    The first max_values values seen are kept, any later one is reported as
+    OVERFLOW_LABEL, so a label fed with user input cannot grow without limit.
+    """
+
+    def __init__(self, max_values: int):
+        """
+        Initialize a LabelLimiter instance.
+
+        Args:
+            max_values (int): The maximum number of distinct label values.
+        """
+        self.max_values = max_values
+        self._values: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        if value in self._values:
+            return value
+        with self._lock:
+            if len(self._values) < self.max_values:
+                self._values.add(value)
+                return value
+        return OVERFLOW_LABEL
+
+
+model_label = LabelLimiter(settings.METRICS_MAX_MODEL_LABELS)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route template.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served by route template.",
+    ["method", "route"],
+    registry=registry,
+)
+service_call_duration = Histogram(
+    "service_call_duration_seconds",
+    "Latency of service method calls.",
+    ["service", "method"],
+    registry=registry,
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Latency of database queries by the service method issuing them.",
+    ["service", "method"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+inference_duration = Histogram(
+    "inference_duration_seconds",
+    "Latency of model pipeline calls.",
+    ["model", "backend"],
+    registry=registry,
+)
+inference_batch_size = Histogram(
+    "inference_batch_size",
+    "Number of texts per model pipeline call.",
+    ["model", "backend"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+    registry=registry,
+)
+inference_errors = Counter(
+    "inference_errors_total",
+    "Failed model pipeline calls.",
+    ["model", "backend"],
+    registry=registry,
+)
+task_run_duration = Histogram(
+    "task_run_duration_seconds",
+    "Duration of task run attempts by action and outcome.",
+    ["action", "status"],
+    registry=registry,
+)
+
+
+def observe_inference(model_name_or_path: str, backend: str, batch_size: int, seconds: float, failed: bool = False) -> None:
+    """
+    Record a model pipeline call.
+
+    Args:
+        model_name_or_path (str): The name or path of the model.
+        backend (str): The inference backend of the model.
+        batch_size (int): The number of texts in the call.
+        seconds (float): The duration of the call.
+        failed (bool): Whether the call raised.
+    """
+    labels = (model_label(model_name_or_path), backend)
+    if failed:
+        inference_errors.labels(*labels).inc()
+        return
+    inference_duration.labels(*labels).observe(seconds)
+    inference_batch_size.labels(*labels).observe(batch_size)
+
+
+def observe_task_run(action: str, status: str, seconds: float) -> None:
+    """
+    Record a task run attempt.
+
+    Args:
+        action (str): The registered action of the run, "unknown" if the action is not registered.
+        status (str): "succeeded" or "failed".
+        seconds (float): The duration of the attempt.
+    """
+    task_run_duration.labels(action, status).observe(seconds)
+
+
+def instrument_service(cls: type) -> type:
+    """
+    Class decorator timing and tracing every async static method of a *Service class.
+
+    The method is also recorded as the current service method, so the database
+    queries it issues are labelled with it, and runs in a span the spans of its
+    queries are children of.
+
+    Args:
+        cls (type): The service class.
+
+    Returns:
+        type: The same class with its async static methods wrapped.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if not isinstance(attribute, staticmethod) or not inspect.iscoroutinefunction(attribute.__func__):
+            continue
+        setattr(cls, name, staticmethod(_timed(cls.__name__, name, attribute.__func__)))
+    return cls
+
+
+def _timed(service: str, method: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    histogram = service_call_duration.labels(service, method)
+    span_name = f"{service}.{method}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_service_method.set((service, method))
+        start = time.perf_counter()
+        try:
+            with tracer.start_as_current_span(span_name):
+                return await fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+            current_service_method.reset(token)
+
+    return wrapper
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    Time every query run through an engine.
+
+    Args:
+        engine (Any): The sync or async SQLAlchemy engine.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    # The start time lives on the execution context of the statement, so a failed
+    # statement leaves nothing behind on the pooled connection
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        db_query_duration.labels(*current_service_method.get()).observe(time.perf_counter() - context._query_start)
+
+
+class RuntimeCollector:
+    """
+    Collect queue depths and cache counters when /metrics is scraped, at no cost on the request path.
+    """
+
+    def collect(self) -> Iterator[Any]:
+        from app.core.batching import batching_stats
+        from app.core.entity_cache import entity_cache
+        from app.core.inference_pool import inference_pool
+        from app.core.prediction_cache import prediction_cache
+
+        queue_depth = GaugeMetricFamily(
+            "inference_queue_depth", "Texts waiting to be batched per model.", labels=["model", "backend"]
+        )
+        depths = {}
+        for key, stats in batching_stats().items():
+            backend, _, model = key.partition(":")
+            labels = (model_label(model), backend)
+            depths[labels] = depths.get(labels, 0) + stats["queue_depth"]
+        for labels, depth in depths.items():
+            queue_depth.add_metric(list(labels), depth)
+        yield queue_depth
+
+        yield GaugeMetricFamily(
+            "inference_pool_pending", "Calls running or waiting in the inference pool.", value=inference_pool.pending
+        )
+
+        stats = prediction_cache.stats()
+        hits = CounterMetricFamily("prediction_cache_hits", "Prediction cache hits by tier.", labels=["tier"])
+        hits.add_metric(["local"], stats["local_hits"])
+        hits.add_metric(["shared"], stats["shared_hits"])
+        yield hits
+        yield CounterMetricFamily("prediction_cache_misses", "Prediction cache misses.", value=stats["misses"])
+        yield GaugeMetricFamily("prediction_cache_hit_ratio", "Share of prediction cache lookups that hit.", value=stats["hit_ratio"])
+
+        stats = entity_cache.stats()
+        hits = CounterMetricFamily("entity_cache_hits", "Entity cache hits by tier.", labels=["tier"])
+        hits.add_metric(["local"], stats["local_hits"])
+        hits.add_metric(["shared"], stats["shared_hits"])
+        yield hits
+        yield CounterMetricFamily("entity_cache_misses", "Entity cache misses.", value=stats["misses"])
+        yield CounterMetricFamily("entity_cache_invalidations", "Entity cache rows invalidated by writes.", value=stats["invalidations"])
+        yield GaugeMetricFamily("entity_cache_hit_ratio", "Share of entity cache lookups that hit.", value=stats["hit_ratio"])
+
+
+registry.register(RuntimeCollector())
@@ -0,0 +1,271 @@
+## app/core/model_registry.py
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.tracing import trace_pipeline
+
+logger = logging.getLogger("app.core.model_registry")
+
+
+# Inference backends an agent can be served with
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Text run through a model once after warm-up loading, so lazy initialization happens before the first request
+WARM_UP_TEXT = "warm up"
+
+
+def parse_model_name(model_name: str) -> Tuple[str, str]:
+    """
+    Split a model name with an optional backend prefix, e.g. "onnx-int8:distilbert-base-uncased".
+
+    Args:
+        model_name (str): The name or path of the model, prefixed with its backend unless it is torch.
+
+    Returns:
+        Tuple[str, str]: The name or path of the model and its backend.
+    """
+    backend, _, model_name_or_path = model_name.partition(":")
+    if backend not in BACKENDS:
+        return model_name, "torch"
+    return model_name_or_path, backend
+
+
+def load_text_classification_pipeline(model_name_or_path: str, backend: str = "torch") -> Any:
+    """
+    Load a text-classification pipeline for the given model and backend.
+
+    transformers, torch and onnxruntime are imported here rather than at module
+    load, so that a worker only pays for them once it needs a model.
+
+    Args:
+        model_name_or_path (str): The name or path of the model to be loaded.
+        backend (str): The inference backend, one of BACKENDS.
+
+    Returns:
+        Any: The loaded pipeline.
+    """
+    if backend == "torch":
+        from transformers import pipeline
+
+        return trace_pipeline(pipeline("text-classification", model=model_name_or_path))
+    if backend in ("onnx", "onnx-int8"):
+        from app.core.onnx_backend import OnnxTextClassificationPipeline
+
+        return trace_pipeline(OnnxTextClassificationPipeline.from_pretrained(model_name_or_path, quantize=backend == "onnx-int8"))
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+
+def estimate_pipeline_size(nlp_pipeline: Any) -> int:
+    """
+    Estimate the memory footprint of a pipeline from its model parameters and buffers.
+
+    Args:
+        nlp_pipeline (Any): The pipeline to be measured.
+
+    Returns:
+        int: The estimated size in bytes, or 0 if it cannot be determined.
+    """
+    if hasattr(nlp_pipeline, "size_bytes"):
+        return nlp_pipeline.size_bytes
+    model = getattr(nlp_pipeline, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+    size = sum(p.numel() * p.element_size() for p in model.parameters())
+    if hasattr(model, "buffers"):
+        size += sum(b.numel() * b.element_size() for b in model.buffers())
+    return size
+
+
+class _RegistryEntry:
+    def __init__(self, pipeline: Any, size_bytes: int):
+        self.pipeline = pipeline
+        self.size_bytes = size_bytes
+        self.refcount = 0
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model once per backend and shares it between agents.
+
+    Entries are reference counted: an entry that is still acquired by an agent is
+    never evicted. Entries with no references are kept in LRU order and evicted
+    once the total estimated size exceeds the memory budget.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = 0,
+        loader: Callable[[str, str], Any] = load_text_classification_pipeline,
+        sizer: Callable[[Any], int] = estimate_pipeline_size,
+    ):
+        """
+        Initialize a ModelRegistry instance.
+
+        Args:
+            memory_budget_bytes (int): The memory budget for loaded models, 0 disables eviction.
+            loader (Callable[[str, str], Any]): The function used to load a model by name or path and backend.
+            sizer (Callable[[Any], int]): The function used to estimate the size of a loaded model.
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self._loader = loader
+        self._sizer = sizer
+        self._entries: "OrderedDict[Tuple[str, str], _RegistryEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def _get_or_load(self, model_name_or_path: str, backend: str, take_ref: bool) -> _RegistryEntry:
+        key = (model_name_or_path, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.refcount += int(take_ref)
+                return entry
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so that other models stay available,
+        # but only once per model even if several agents ask for it concurrently.
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.refcount += int(take_ref)
+                    return entry
+            logger.info(f"Loading model {model_name_or_path} with the {backend} backend")
+            nlp_pipeline = self._loader(model_name_or_path, backend)
+            entry = _RegistryEntry(nlp_pipeline, self._sizer(nlp_pipeline))
+            with self._lock:
+                entry.refcount += int(take_ref)
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self._evict()
+            return entry
+
+    def acquire(self, model_name_or_path: str, backend: str = "torch") -> Any:
+        """
+        Get the shared pipeline for a model, loading it on first use, and take a reference to it.
+
+        Args:
+            model_name_or_path (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+
+        Returns:
+            Any: The shared pipeline.
+        """
+        return self._get_or_load(model_name_or_path, backend, take_ref=True).pipeline
+
+    def release(self, model_name_or_path: str, backend: str = "torch") -> None:
+        """
+        Drop a reference to a model previously obtained with acquire.
+
+        Args:
+            model_name_or_path (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+        """
+        with self._lock:
+            entry = self._entries.get((model_name_or_path, backend))
+            if entry is None or entry.refcount == 0:
+                return
+            entry.refcount -= 1
+            self._evict()
+
+    def warm_up(self, model_names: Iterable[str]) -> List[str]:
+        """
+        Load the given models ahead of time without taking references to them.
+
+        Each model is run once over WARM_UP_TEXT after loading. A model is served
+        with the torch backend unless its name is prefixed with another backend,
+        e.g. "onnx-int8:distilbert-base-uncased".
+
+        Args:
+            model_names (Iterable[str]): The names or paths of the models to be loaded.
+
+        Returns:
+            List[str]: The names of the models that failed to load or run.
+        """
+        failed = []
+        for model_name in model_names:
+            model_name_or_path, backend = parse_model_name(model_name)
+            try:
+                nlp_pipeline = self._get_or_load(model_name_or_path, backend, take_ref=False).pipeline
+                if callable(nlp_pipeline):
+                    nlp_pipeline([WARM_UP_TEXT])
+            except Exception as e:
+                logger.error(f"Failed to warm up model {model_name}: {e}")
+                failed.append(model_name)
+        return failed
+
+    def missing_models(self, model_names: Iterable[str]) -> List[str]:
+        """
+        Get the models of a warm-up list that are not loaded, e.g. because they failed to load or were evicted.
+
+        Args:
+            model_names (Iterable[str]): The names or paths of the models, with an optional backend prefix as for warm_up.
+
+        Returns:
+            List[str]: The names of the models that are not loaded.
+        """
+        with self._lock:
+            return [model_name for model_name in model_names if parse_model_name(model_name) not in self._entries]
+
+    def _evict(self) -> None:
+        if self.memory_budget_bytes <= 0:
+            return
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refcount > 0:
+                continue
+            logger.info(f"Evicting model {key[0]} with the {key[1]} backend ({entry.size_bytes} bytes)")
+            del self._entries[key]
+            total -= entry.size_bytes
+
+    def refcount(self, model_name_or_path: str, backend: str = "torch") -> int:
+        """
+        Get the number of references currently held on a model.
+
+        Args:
+            model_name_or_path (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+
+        Returns:
+            int: The reference count, 0 if the model is not loaded.
+        """
+        with self._lock:
+            entry = self._entries.get((model_name_or_path, backend))
+            return entry.refcount if entry else 0
+
+    def loaded_models(self) -> Dict[Tuple[str, str], int]:
+        """
+        Get the loaded models in LRU order with their estimated sizes.
+
+        Returns:
+            Dict[Tuple[str, str], int]: The estimated size in bytes of each loaded (model, backend) pair.
+        """
+        with self._lock:
+            return {key: entry.size_bytes for key, entry in self._entries.items()}
+
+    def get(self, model_name_or_path: str, backend: str = "torch") -> Optional[Any]:
+        """
+        Get a loaded pipeline without loading it or taking a reference.
+
+        Args:
+            model_name_or_path (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+
+        Returns:
+            Optional[Any]: The pipeline or None if the model is not loaded.
+        """
+        with self._lock:
+            entry = self._entries.get((model_name_or_path, backend))
+            return entry.pipeline if entry else None
+
+
+model_registry = ModelRegistry(memory_budget_bytes=settings.MODEL_REGISTRY_MEMORY_BUDGET_MB * 1024 * 1024)
@@ -0,0 +1,219 @@
+## app/core/onnx_backend.py
+
+import inspect
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import onnxruntime as ort
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.onnx_backend")
+
+
+def _cache_dir_for(model_name_or_path: str, cache_dir: str) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name_or_path.strip("/"))
+    return Path(cache_dir) / slug
+
+
+def export_onnx(model_name_or_path: str, export_dir: Path, opset: int = settings.ONNX_OPSET) -> Path:
+    """
+    Export a transformers sequence-classification model to an ONNX graph.
+
+    The tokenizer and model config are saved next to the graph so that it can be
+    served without loading the torch weights again.
+
+    Args:
+        model_name_or_path (str): The name or path of the model to be exported.
+        export_dir (Path): The directory the graph is written to.
+        opset (int): The ONNX opset version.
+
+    Returns:
+        Path: The path of the exported graph.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    onnx_path = export_dir / "model.onnx"
+    logger.info(f"Exporting {model_name_or_path} to {onnx_path}")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name_or_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name_or_path)
+    model.eval()
+
+    # Only export the tokenizer outputs the model accepts, e.g. DistilBERT takes no token_type_ids
+    accepted = inspect.signature(model.forward).parameters
+    sample = {name: tensor for name, tensor in tokenizer(["export sample"], return_tensors="pt").items() if name in accepted}
+    input_names = list(sample)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample,),
+            str(onnx_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    tokenizer.save_pretrained(export_dir)
+    model.config.save_pretrained(export_dir)
+    return onnx_path
+
+
+def quantize_onnx(onnx_path: Path) -> Path:
+    """
+    Apply dynamic int8 quantization to the weights of an ONNX graph.
+
+    Args:
+        onnx_path (Path): The path of the graph to be quantized.
+
+    Returns:
+        Path: The path of the quantized graph.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = onnx_path.with_name("model.int8.onnx")
+    logger.info(f"Quantizing {onnx_path} to {quantized_path}")
+    quantize_dynamic(str(onnx_path), str(quantized_path), weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+class OnnxTextClassificationPipeline:
+    """
+    Text-classification pipeline served by ONNX Runtime on CPU.
+
+    It is called like a transformers text-classification pipeline: a single text
+    yields a list with one {"label", "score"} dict, a list of texts yields one
+    dict per text.
+    """
+
+    def __init__(self, session: ort.InferenceSession, tokenizer: Any, id2label: Dict[int, str], max_length: int = 512):
+        """
+        Initialize an OnnxTextClassificationPipeline instance.
+
+        Args:
+            session (ort.InferenceSession): The ONNX Runtime session of the graph.
+            tokenizer (Any): The tokenizer of the model.
+            id2label (Dict[int, str]): The label of each output class.
+            max_length (int): The maximum number of tokens per text.
+        """
+        self.session = session
+        self.tokenizer = tokenizer
+        self.id2label = id2label
+        self.max_length = max_length
+        self._input_names = [node.name for node in session.get_inputs()]
+        self.size_bytes = 0
+        self.revision = ""
+
+    @classmethod
+    def from_pretrained(
+        cls,
+        model_name_or_path: str,
+        quantize: bool = False,
+        cache_dir: str = settings.ONNX_CACHE_DIR,
+    ) -> "OnnxTextClassificationPipeline":
+        """
+        Load a pipeline from an exported graph, exporting and quantizing it first if needed.
+
+        model_name_or_path is either a transformers model, whose exported graph is
+        cached under cache_dir, or a directory that already holds a model.onnx graph
+        with its tokenizer and config.
+
+        Args:
+            model_name_or_path (str): The name or path of the model.
+            quantize (bool): Whether to serve the dynamically int8-quantized graph.
+            cache_dir (str): The directory exported graphs are cached in.
+
+        Returns:
+            OnnxTextClassificationPipeline: The loaded pipeline.
+        """
+        from transformers import AutoConfig, AutoTokenizer
+
+        export_dir = Path(model_name_or_path)
+        onnx_path = export_dir / "model.onnx"
+        if not onnx_path.exists():
+            export_dir = _cache_dir_for(model_name_or_path, cache_dir)
+            onnx_path = export_dir / "model.onnx"
+            if not onnx_path.exists():
+                export_onnx(model_name_or_path, export_dir)
+        if quantize:
+            quantized_path = onnx_path.with_name("model.int8.onnx")
+            onnx_path = quantized_path if quantized_path.exists() else quantize_onnx(onnx_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.INFERENCE_TORCH_THREADS:
+            options.intra_op_num_threads = settings.INFERENCE_TORCH_THREADS
+        session = ort.InferenceSession(str(onnx_path), options, providers=["CPUExecutionProvider"])
+        config = AutoConfig.from_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        pipeline = cls(session, tokenizer, {int(k): v for k, v in config.id2label.items()})
+        stat = onnx_path.stat()
+        pipeline.size_bytes = stat.st_size
+        pipeline.revision = f"{stat.st_size}-{stat.st_mtime_ns}"
+        return pipeline
+
+    def preprocess(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Tokenize a batch of texts into the inputs of the graph.
+
+        Args:
+            texts (List[str]): The texts to be tokenized.
+
+        Returns:
+            Dict[str, np.ndarray]: The input arrays of the graph, keyed by input name.
+        """
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np")
+        return {name: encoded[name].astype(np.int64) for name in self._input_names}
+
+    def forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Run the graph over tokenized inputs.
+
+        Args:
+            inputs (Dict[str, np.ndarray]): The input arrays of the graph.
+
+        Returns:
+            np.ndarray: The logits, one row per text.
+        """
+        return self.session.run(["logits"], inputs)[0]
+
+    def postprocess(self, logits: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Turn logits into the top label and its softmax score for each text.
+
+        Args:
+            logits (np.ndarray): The logits, one row per text.
+
+        Returns:
+            List[Dict[str, Any]]: The prediction for each text.
+        """
+        shifted = logits - logits.max(axis=-1, keepdims=True)
+        scores = np.exp(shifted)
+        scores /= scores.sum(axis=-1, keepdims=True)
+        best = scores.argmax(axis=-1)
+        return [
+            {"label": self.id2label[int(label)], "score": float(score)}
+            for label, score in zip(best, scores[np.arange(len(best)), best])
+        ]
+
+    def __call__(self, texts: Union[str, List[str]]) -> List[Dict[str, Any]]:
+        """
+        Classify a text or a batch of texts.
+
+        Args:
+            texts (Union[str, List[str]]): The text or texts to be classified.
+
+        Returns:
+            List[Dict[str, Any]]: The prediction for each text.
+        """
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        if not batch:
+            return []
+        return self.postprocess(self.forward(self.preprocess(batch)))
@@ -0,0 +1,225 @@
+## app/core/prediction_cache.py
+
+import hashlib
+import os
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+from app.core.cache import LRUCache, create_shared_cache
+from app.core.config import settings
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a text so that trivially different copies share a cache entry.
+
+    Args:
+        text (str): The text to be normalized.
+
+    Returns:
+        str: The NFC-normalized text with collapsed whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def model_revision(nlp_pipeline: Any) -> str:
+    """
+    Get the revision of the weights a pipeline was loaded from.
+
+    Args:
+        nlp_pipeline (Any): The loaded pipeline.
+
+    Returns:
+        str: The hub commit of the model, or the modification time of a local model.
+    """
+    revision = getattr(nlp_pipeline, "revision", None)
+    if revision:
+        return revision
+    config = getattr(getattr(nlp_pipeline, "model", None), "config", None)
+    commit_hash = getattr(config, "_commit_hash", None)
+    if commit_hash:
+        return commit_hash
+    name_or_path = getattr(config, "_name_or_path", "")
+    if name_or_path and os.path.isdir(name_or_path):
+        return str(os.stat(name_or_path).st_mtime_ns)
+    return ""
+
+
+class PredictionCache:
+    """
+    Two-tier cache of model predictions keyed by model, revision and normalized text.
+
+    The in-process LRU tier is checked first, then the optional shared tier. The
+    revision of the weights is part of every key, so entries of a model stop
+    matching as soon as it is reloaded from new weights.
+    """
+
+    def __init__(self, local: LRUCache, shared: Optional[Any] = None, ttl: float = 0):
+        """
+        Initialize a PredictionCache instance.
+
+        Args:
+            local (LRUCache): The in-process tier.
+            shared (Optional[Any]): The shared tier, None to only cache in process.
+            ttl (float): The time to live of an entry in seconds, 0 keeps entries until evicted.
+        """
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.max_size > 0 or self.shared is not None
+
+    def key(self, model: str, backend: str, revision: str, text: str) -> str:
+        """
+        Build the cache key of a prediction.
+
+        Args:
+            model (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+            revision (str): The revision of the model weights.
+            text (str): The text the prediction is for.
+
+        Returns:
+            str: The cache key.
+        """
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"prediction:{model}:{backend}:{revision}:{digest}"
+
+    def get_local(self, model: str, backend: str, revision: str, text: str) -> Optional[Any]:
+        """
+        Look a prediction up in the in-process tier only, without any I/O.
+
+        Args:
+            model (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+            revision (str): The revision of the model weights.
+            text (str): The text the prediction is for.
+
+        Returns:
+            Optional[Any]: The cached prediction or None.
+        """
+        if self.local.max_size <= 0:
+            return None
+        value = self.local.get(self.key(model, backend, revision, text))
+        if value is not None:
+            with self._lock:
+                self.local_hits += 1
+        return value
+
+    def get_many(self, model: str, backend: str, revision: str, texts: List[str]) -> List[Optional[Any]]:
+        """
+        Look predictions up in both tiers.
+
+        Args:
+            model (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+            revision (str): The revision of the model weights.
+            texts (List[str]): The texts the predictions are for.
+
+        Returns:
+            List[Optional[Any]]: The cached prediction of each text, None for misses.
+        """
+        results: List[Optional[Any]] = []
+        local_hits = shared_hits = misses = 0
+        for text in texts:
+            key = self.key(model, backend, revision, text)
+            value = self.local.get(key)
+            if value is not None:
+                local_hits += 1
+            elif self.shared is not None and (raw := self.shared.get(key)) is not None:
+                value = orjson.loads(raw)
+                self.local.set(key, value, self.ttl)
+                shared_hits += 1
+            else:
+                misses += 1
+            results.append(value)
+        with self._lock:
+            self.local_hits += local_hits
+            self.shared_hits += shared_hits
+            self.misses += misses
+        return results
+
+    def set_many(self, model: str, backend: str, revision: str, texts: List[str], predictions: List[Any]) -> None:
+        """
+        Store predictions in both tiers.
+
+        Args:
+            model (str): The name or path of the model.
+            backend (str): The inference backend of the model.
+            revision (str): The revision of the model weights.
+            texts (List[str]): The texts the predictions are for.
+            predictions (List[Any]): The prediction of each text.
+        """
+        for text, prediction in zip(texts, predictions):
+            key = self.key(model, backend, revision, text)
+            self.local.set(key, prediction, self.ttl)
+            if self.shared is not None:
+                self.shared.set(key, orjson.dumps(prediction), self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The cache statistics.
+        """
+        hits = self.local_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "local_size": len(self.local),
+        }
+
+
+def predict_with_cache(
+    nlp_pipeline: Callable[[List[str]], List[Any]],
+    model: str,
+    backend: str,
+    texts: List[str],
+    cache: Optional[PredictionCache] = None,
+) -> List[Any]:
+    """
+    Run a pipeline over the texts that are not cached yet and cache their predictions.
+
+    Args:
+        nlp_pipeline (Callable[[List[str]], List[Any]]): The pipeline of the model.
+        model (str): The name or path of the model.
+        backend (str): The inference backend of the model.
+        texts (List[str]): The texts to be processed.
+        cache (Optional[PredictionCache]): The cache to be used, defaults to the process-wide cache.
+
+    Returns:
+        List[Any]: The prediction of each text, in the same order as the texts.
+    """
+    cache = cache or prediction_cache
+    if not cache.enabled:
+        return nlp_pipeline(texts)
+    revision = model_revision(nlp_pipeline)
+    predictions = cache.get_many(model, backend, revision, texts)
+    missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        computed = nlp_pipeline(missing_texts)
+        cache.set_many(model, backend, revision, missing_texts, computed)
+        for i, prediction in zip(missing, computed):
+            predictions[i] = prediction
+    return predictions
+
+
+prediction_cache = PredictionCache(
+    LRUCache(settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_TTL),
+    create_shared_cache(settings.PREDICTION_CACHE_BACKEND, settings.PREDICTION_CACHE_DIR),
+    settings.PREDICTION_CACHE_TTL,
+)
@@ -0,0 +1,256 @@
+## app/core/recommender.py
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.feedback import Feedback
+from app.models.recommendation import Recommendation
+from app.models.user_recommendation import UserRecommendation
+
+logger = logging.getLogger("app.core.recommender")
+
+
+@dataclass
+class FactorModel:
+    """
+    The latent factors of the items, fitted on the feedback of every user.
+
+    Attributes:
+        items (List[str]): The titles of the items, in the order of the columns of factors.
+        factors (np.ndarray): The orthonormal item factors, one row per factor and one column per item.
+        watermark (int): The id of the last feedback the recommendations were computed from.
+    """
+    items: List[str]
+    factors: np.ndarray
+    watermark: int
+
+    def save(self, path: str) -> None:
+        """
+        Write the model to a file, replacing the previous one atomically.
+
+        Args:
+            path (str): The path of the .npz file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        partial = f"{path}.partial.npz"
+        np.savez(partial, items=np.array(self.items, dtype=str), factors=self.factors, watermark=np.array(self.watermark))
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["FactorModel"]:
+        """
+        Read a model written with save.
+
+        Args:
+            path (str): The path of the .npz file.
+
+        Returns:
+            Optional[FactorModel]: The model, or None if there is no file.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data["items"].tolist(), data["factors"], int(data["watermark"]))
+
+
+def build_matrix(
+    interactions: Sequence[Tuple[str, str, float]],
+    users: Optional[Sequence[str]] = None,
+    items: Optional[Sequence[str]] = None,
+) -> Tuple[List[str], List[str], sparse.csr_matrix]:
+    """
+    Build the sparse user x item matrix of the interactions.
+
+    Args:
+        interactions (Sequence[Tuple[str, str, float]]): The user, item and weight of each interaction.
+        users (Optional[Sequence[str]]): The users of the rows, those of the interactions if None.
+        items (Optional[Sequence[str]]): The items of the columns, those of the interactions if None.
+            Interactions with other users or items are left out.
+
+    Returns:
+        Tuple[List[str], List[str], sparse.csr_matrix]: The users of the rows, the items of the columns and the matrix.
+    """
+    users = list(users) if users is not None else sorted({user for user, _, _ in interactions})
+    items = list(items) if items is not None else sorted({item for _, item, _ in interactions})
+    user_index = {user: row for row, user in enumerate(users)}
+    item_index = {item: column for column, item in enumerate(items)}
+    rows, columns, values = [], [], []
+    for user, item, value in interactions:
+        if user in user_index and item in item_index:
+            rows.append(user_index[user])
+            columns.append(item_index[item])
+            values.append(value)
+    matrix = sparse.csr_matrix((values, (rows, columns)), shape=(len(users), len(items)), dtype=np.float32)
+    return users, items, matrix
+
+
+def fit_factors(matrix: sparse.csr_matrix, n_factors: int) -> np.ndarray:
+    """
+    Factorize the interaction matrix with a truncated SVD.
+
+    Args:
+        matrix (sparse.csr_matrix): The user x item interaction matrix.
+        n_factors (int): The maximum number of latent factors.
+
+    Returns:
+        np.ndarray: The item factors, one row per factor, fewer than n_factors when there are few items.
+    """
+    n_factors = min(n_factors, matrix.shape[1] - 1, matrix.shape[0])
+    if n_factors < 1:
+        return np.zeros((0, matrix.shape[1]), dtype=np.float32)
+    svd = TruncatedSVD(n_components=n_factors, algorithm="randomized", random_state=0)
+    svd.fit(matrix)
+    return svd.components_.astype(np.float32)
+
+
+def top_items(matrix: sparse.csr_matrix, factors: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+    """
+    Rank the items a user has not interacted with yet by their reconstructed affinity.
+
+    The rows of users are projected on the item factors and back, so a user
+    absent from the fit, or whose feedback changed since, is scored without
+    fitting the factors again.
+
+    Args:
+        matrix (sparse.csr_matrix): The interactions of the users, one row per user.
+        factors (np.ndarray): The item factors.
+        k (int): The maximum number of items per user.
+
+    Returns:
+        List[List[Tuple[int, float]]]: The column and score of the top items with a positive score of each user, best first.
+    """
+    scores = np.asarray(matrix @ factors.T) @ factors
+    scores[matrix.nonzero()] = -np.inf
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [[] for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+    return [[(int(column), float(scores[row, column])) for column in columns if scores[row, column] > 0] for row, columns in enumerate(top)]
+
+
+class Recommender:
+    """
+    Compute the top items of each user from their feedback into the user_recommendations table.
+
+    fit() factorizes the user x item matrix of every feedback about an existing
+    recommendation and ranks the items of every user. refresh() only ranks again
+    the users who left feedback since the previous run, with the item factors of
+    the last fit, so new items are only recommended after the next fit. Feedback is
+    only ever inserted, so those users are found by id above the last one seen.
+    Users whose feedback was all deleted lose their recommendations, other
+    deletions are taken into account by the next fit.
+    Feedback with a rating counts as that rating, feedback without as 1.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker = AsyncSessionLocal,
+        path: str = settings.RECOMMENDER_MODEL_PATH,
+        n_factors: int = settings.RECOMMENDER_FACTORS,
+        top_k: int = settings.RECOMMENDER_TOP_K,
+        batch_size: int = settings.RECOMMENDER_BATCH_SIZE,
+    ):
+        """
+        Initialize a Recommender instance.
+
+        Args:
+            sessions (async_sessionmaker): The factory of the sessions the feedback is read and the recommendations written with.
+            path (str): The file the item factors are kept in between runs.
+            n_factors (int): The maximum number of latent factors.
+            top_k (int): The number of items recommended to each user.
+            batch_size (int): The number of users ranked and written per transaction.
+        """
+        self.sessions = sessions
+        self.path = path
+        self.n_factors = n_factors
+        self.top_k = top_k
+        self.batch_size = batch_size
+
+    async def _interactions(self, db: AsyncSession, users: Optional[Sequence[str]] = None) -> List[Tuple[str, str, float]]:
+        statement = (
+            select(Feedback.user, Feedback.item, func.sum(func.coalesce(Feedback.rating, 1.0)))
+            .join(Recommendation, Recommendation.title == Feedback.item)
+            .group_by(Feedback.user, Feedback.item)
+        )
+        if users is None:
+            return [tuple(row) for row in await db.execute(statement)]
+        interactions = []
+        for start in range(0, len(users), self.batch_size):
+            result = await db.execute(statement.where(Feedback.user.in_(users[start:start + self.batch_size])))
+            interactions.extend(tuple(row) for row in result)
+        return interactions
+
+    async def _write(self, users: List[str], matrix: sparse.csr_matrix, model: FactorModel) -> None:
+        # Each batch of users is replaced in a transaction of its own, readers see either the old or the new items of a user
+        for start in range(0, len(users), self.batch_size):
+            batch = users[start:start + self.batch_size]
+            ranked = await asyncio.to_thread(top_items, matrix[start:start + self.batch_size], model.factors, self.top_k)
+            rows = [
+                {"user": user, "item": model.items[column], "score": score, "rank": rank}
+                for user, items in zip(batch, ranked)
+                for rank, (column, score) in enumerate(items)
+            ]
+            async with self.sessions() as db:
+                await db.execute(delete(UserRecommendation).where(UserRecommendation.user.in_(batch)))
+                if rows:
+                    await db.execute(insert(UserRecommendation), rows)
+                await db.commit()
+        async with self.sessions() as db:
+            await db.execute(delete(UserRecommendation).where(UserRecommendation.user.not_in(select(Feedback.user))))
+            await db.commit()
+
+    async def fit(self) -> Dict[str, int]:
+        """
+        Fit the item factors on all the feedback and rank the items of every user.
+
+        Returns:
+            Dict[str, int]: The number of users ranked, of items and of factors.
+        """
+        async with self.sessions() as db:
+            watermark = (await db.execute(select(func.max(Feedback.id)))).scalar() or 0
+            interactions = await self._interactions(db)
+        users, items, matrix = await asyncio.to_thread(build_matrix, interactions)
+        factors = await asyncio.to_thread(fit_factors, matrix, self.n_factors)
+        model = FactorModel(items, factors, watermark)
+        await self._write(users, matrix, model)
+        await asyncio.to_thread(model.save, self.path)
+        logger.info(f"Fitted {factors.shape[0]} factors on {len(users)} users and {len(items)} items")
+        return {"users": len(users), "items": len(items), "factors": factors.shape[0]}
+
+    async def refresh(self) -> Dict[str, int]:
+        """
+        Rank the items of the users who left feedback since the previous run again, fitting the model if there is none.
+
+        Returns:
+            Dict[str, int]: The number of users ranked, of items and of factors.
+        """
+        model = await asyncio.to_thread(FactorModel.load, self.path)
+        if model is None:
+            return await self.fit()
+        async with self.sessions() as db:
+            watermark = (await db.execute(select(func.max(Feedback.id)))).scalar() or 0
+            # Feedback written after the maximum id was read is left to the next run
+            statement = select(Feedback.user).distinct().where(Feedback.id > model.watermark, Feedback.id <= watermark)
+            users = list((await db.execute(statement)).scalars())
+            interactions = await self._interactions(db, users)
+        users, _, matrix = await asyncio.to_thread(build_matrix, interactions, users, model.items)
+        await self._write(users, matrix, model)
+        model.watermark = max(watermark, model.watermark)
+        await asyncio.to_thread(model.save, self.path)
+        logger.info(f"Refreshed the recommendations of {len(users)} users")
+        return {"users": len(users), "items": len(model.items), "factors": model.factors.shape[0]}
+
+
+recommender = Recommender()
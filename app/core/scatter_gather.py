@@ -0,0 +1,47 @@
+## app/core/scatter_gather.py
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+
+async def _run(call: Callable[[], Awaitable[Any]], timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        outcome = {"status": "ok", "result": await asyncio.wait_for(call(), timeout)}
+    except asyncio.TimeoutError:
+        outcome = {"status": "timeout"}
+    except Exception as e:
+        outcome = {"status": "error", "error": str(e)}
+    outcome["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return outcome
+
+
+async def scatter_gather(calls: Dict[str, Callable[[], Awaitable[Any]]], timeout: float) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run calls concurrently and yield the outcome of each one as soon as it completes.
+
+    Every call gets its own timeout, so the whole run takes about as long as the
+    slowest call or the timeout, whichever is shorter. A call that times out or
+    fails yields an outcome with a "timeout" or "error" status instead of a result,
+    the others are unaffected. Calls still running when the consumer stops
+    iterating are cancelled.
+
+    Args:
+        calls (Dict[str, Callable[[], Awaitable[Any]]]): The calls to be run, keyed by name.
+        timeout (float): The maximum time each call may take, in seconds.
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: The name of the call and its status, result or error and elapsed_ms.
+    """
+    async def run(name: str, call: Callable[[], Awaitable[Any]]) -> Tuple[str, Dict[str, Any]]:
+        return name, await _run(call, timeout)
+
+    # Tasks copy the current context, so the spans of the calls are children of the caller's
+    tasks = [asyncio.ensure_future(run(name, call)) for name, call in calls.items()]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        for task in tasks:
+            task.cancel()
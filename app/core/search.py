@@ -0,0 +1,206 @@
+## app/core/search.py
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.pagination import Page, decode_cursor, encode_cursor
+from app.db.search import HIGHLIGHT_END, HIGHLIGHT_START, InvalidSearchQuery, search_database, searchable
+
+logger = logging.getLogger("app.core.search")
+
+
+class DatabaseSearchBackend:
+    """
+    Search the full-text index the database keeps up to date on every write, FTS5 on SQLite or tsvector on PostgreSQL.
+    """
+
+    async def index(self, model: Any, rows: List[Dict[str, Any]]) -> None:
+        pass
+
+    async def delete(self, model: Any, keys: List[str]) -> None:
+        pass
+
+    async def search(self, db: AsyncSession, model: Any, query: str, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        return await search_database(db, model, query, limit, offset)
+
+    async def close(self) -> None:
+        pass
+
+
+class ElasticsearchSearchBackend:
+    """
+    Search an Elasticsearch index per model, fed by the services on every write.
+
+    The database stays the source of truth: a write that fails to reach
+    Elasticsearch is logged, and the document is indexed again with its next write.
+    """
+
+    def __init__(self, url: str, prefix: str = ""):
+        """
+        Initialize an ElasticsearchSearchBackend instance.
+
+        Args:
+            url (str): The URL of the Elasticsearch cluster.
+            prefix (str): The prefix of the index names, e.g. to share a cluster between deployments.
+        """
+        self.url = url
+        self.prefix = prefix
+        self._client: Optional[httpx.AsyncClient] = None
+        self._created = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.url, timeout=10.0)
+        return self._client
+
+    def _index_name(self, model: Any) -> str:
+        return f"{self.prefix}{model.__table__.name}"
+
+    async def _ensure_index(self, model: Any) -> None:
+        name = self._index_name(model)
+        if name in self._created:
+            return
+        mappings = {"properties": {column: {"type": "text", "analyzer": settings.SEARCH_LANGUAGE} for column in searchable[model].columns}}
+        response = await self._get_client().put(f"/{name}", json={"mappings": mappings})
+        # 400 is returned when the index already exists
+        if response.status_code not in (200, 400):
+            response.raise_for_status()
+        self._created.add(name)
+
+    async def _bulk(self, model: Any, actions: List[Dict[str, Any]]) -> None:
+        if not actions:
+            return
+        try:
+            await self._ensure_index(model)
+            body = b"".join(orjson.dumps(action) + b"\n" for action in actions)
+            response = await self._get_client().post("/_bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+            response.raise_for_status()
+            if response.json().get("errors"):
+                logger.warning(f"Some documents of {self._index_name(model)} were not written to Elasticsearch")
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to write documents of {self._index_name(model)} to Elasticsearch: {e}")
+
+    async def index(self, model: Any, rows: List[Dict[str, Any]]) -> None:
+        """
+        Index or reindex rows of a model.
+
+        Args:
+            model (Any): The ORM model.
+            rows (List[Dict[str, Any]]): The key and text columns of each row.
+        """
+        spec = searchable[model]
+        actions = []
+        for row in rows:
+            actions.append({"index": {"_index": self._index_name(model), "_id": row[spec.key]}})
+            actions.append({column: row.get(column) for column in spec.columns})
+        await self._bulk(model, actions)
+
+    async def delete(self, model: Any, keys: List[str]) -> None:
+        """
+        Remove rows of a model from the index.
+
+        Args:
+            model (Any): The ORM model.
+            keys (List[str]): The keys of the deleted rows.
+        """
+        await self._bulk(model, [{"delete": {"_index": self._index_name(model), "_id": key}} for key in keys])
+
+    async def search(self, db: AsyncSession, model: Any, query: str, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Search the index of a model, ranked by BM25.
+
+        Args:
+            db (AsyncSession): The database session, unused.
+            model (Any): The ORM model.
+            query (str): The search terms, all of which must match.
+            limit (int): The maximum number of matches.
+            offset (int): The number of best matches to skip.
+
+        Returns:
+            List[Dict[str, Any]]: The key, highlighted snippet and score of each match.
+        """
+        if not query.strip():
+            raise InvalidSearchQuery(f"No search terms in: {query!r}")
+        spec = searchable[model]
+        body = {
+            "from": offset,
+            "size": limit,
+            "_source": False,
+            "query": {"multi_match": {
+                "query": query,
+                "fields": [f"{column}^{weight}" for column, weight in zip(spec.columns, spec.weights)],
+                "operator": "and",
+            }},
+            "highlight": {
+                "pre_tags": [HIGHLIGHT_START],
+                "post_tags": [HIGHLIGHT_END],
+                # Escape the stored text around the tags, as the database backend does
+                "encoder": "html",
+                "fields": {column: {"number_of_fragments": 1, "fragment_size": settings.SEARCH_SNIPPET_TOKENS * 8} for column in spec.columns},
+            },
+        }
+        response = await self._get_client().post(f"/{self._index_name(model)}/_search", json=body)
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        hits = []
+        for hit in response.json()["hits"]["hits"]:
+            highlights = hit.get("highlight", {})
+            # Prefer a snippet of the body over one of the title
+            snippet = next((highlights[column][0] for column in reversed(spec.columns) if column in highlights), None)
+            hits.append({spec.key: hit["_id"], "snippet": snippet, "score": hit["_score"]})
+        return hits
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_search_backend(kind: str) -> Any:
+    """
+    Create the backend of the full-text search.
+
+    Args:
+        kind (str): "database" to search the database's own full-text index, or "elasticsearch".
+
+    Returns:
+        Any: The search backend.
+    """
+    if kind == "database":
+        return DatabaseSearchBackend()
+    if kind == "elasticsearch":
+        return ElasticsearchSearchBackend(settings.ELASTICSEARCH_URL, settings.SEARCH_INDEX_PREFIX)
+    raise ValueError(f"Unknown search backend: {kind}")
+
+
+search_index = create_search_backend(settings.SEARCH_BACKEND)
+
+
+async def search_page(db: AsyncSession, model: Any, query: str, limit: int, cursor: Optional[str] = None) -> Page:
+    """
+    Search one page of the rows of a model, best matches first.
+
+    Args:
+        db (AsyncSession): The database session.
+        model (Any): The ORM model indexed with full_text_index.
+        query (str): The search terms.
+        limit (int): The maximum number of matches on the page.
+        cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+
+    Returns:
+        Page: The key, highlighted snippet and score of the matches on the page and the cursor of the next page.
+
+    Raises:
+        InvalidListQuery: If the query has no search terms or the cursor is malformed.
+    """
+    # Matches are ordered by score, the cursor holds the number of matches already returned
+    offset = decode_cursor(cursor) if cursor else 0
+    # One more match than the page holds tells whether there is a next page, like paginate
+    items = await search_index.search(db, model, query, limit + 1, offset)
+    return Page(items=items[:limit], next_cursor=encode_cursor(offset + limit) if len(items) > limit else None)
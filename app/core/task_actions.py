@@ -0,0 +1,73 @@
+## app/core/task_actions.py
+
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+# Callables run for each Task.action name, async ones on the event loop and sync ones in the worker pool
+task_actions: Dict[str, Callable[[Optional[Dict[str, Any]]], Any]] = {}
+
+
+class PermanentTaskError(Exception):
+    """
+    Error of a task run that retrying cannot fix, e.g. an unknown action or invalid payload.
+    """
+
+
+def register_action(name: str) -> Callable[[Callable], Callable]:
+    """
+    Register the callable run for tasks whose action is the given name.
+
+    The callable takes the payload of the run and returns a JSON-serializable result.
+    Sync callables must be defined at module level to be run by a process pool.
+
+    Args:
+        name (str): The action name.
+
+    Returns:
+        Callable[[Callable], Callable]: A decorator registering the callable.
+    """
+    def decorator(fn: Callable) -> Callable:
+        task_actions[name] = fn
+        return fn
+
+    return decorator
+
+
+@register_action("noop")
+async def noop(payload: Optional[Dict[str, Any]]) -> Any:
+    return None
+
+
+@register_action("echo")
+async def echo(payload: Optional[Dict[str, Any]]) -> Any:
+    return payload
+
+
+@register_action("sleep")
+async def sleep(payload: Optional[Dict[str, Any]]) -> Any:
+    seconds = (payload or {}).get("seconds", 1.0)
+    if not isinstance(seconds, (int, float)) or seconds < 0:
+        raise PermanentTaskError(f"Invalid sleep duration: {seconds}")
+    await asyncio.sleep(seconds)
+    return {"slept": seconds}
+
+
+@register_action("hash")
+def hash_rounds(payload: Optional[Dict[str, Any]]) -> Any:
+    # CPU-bound, the action to be run by the process worker pool
+    payload = payload or {}
+    digest = str(payload.get("data", "")).encode()
+    for _ in range(int(payload.get("rounds", 100000))):
+        digest = hashlib.sha256(digest).digest()
+    return {"digest": digest.hex()}
+
+
+@register_action("recommendations")
+async def recommendations(payload: Optional[Dict[str, Any]]) -> Any:
+    # Imported on first run, the recommender loads scikit-learn
+    from app.core.recommender import recommender
+
+    if (payload or {}).get("full"):
+        return await recommender.fit()
+    return await recommender.refresh()
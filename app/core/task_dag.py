@@ -0,0 +1,252 @@
+## app/core/task_dag.py
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.task_queue import TaskQueue, task_queue
+from app.db.session import AsyncSessionLocal
+from app.models.pipeline_run import PipelineRun
+from app.models.task_run import TaskRun
+
+logger = logging.getLogger("app.core.task_dag")
+
+
+class TaskCycleError(ValueError):
+    """
+    Error raised when the dependencies of tasks form a cycle.
+    """
+
+    def __init__(self, cycle: List[str]):
+        """
+        Initialize a TaskCycleError instance.
+
+        Args:
+            cycle (List[str]): The names of the tasks on the cycle, the first one repeated at the end.
+        """
+        self.cycle = cycle
+        super().__init__(f"Task dependencies form a cycle: {' -> '.join(cycle)}")
+
+
+def build_dag(dependencies: Dict[str, List[str]]) -> nx.DiGraph:
+    """
+    Build the graph of tasks, with an edge from each task to the tasks depending on it.
+
+    Args:
+        dependencies (Dict[str, List[str]]): The names of the upstream tasks of each task.
+
+    Returns:
+        nx.DiGraph: The acyclic graph of the tasks.
+
+    Raises:
+        TaskCycleError: If the dependencies form a cycle.
+    """
+    graph = nx.DiGraph()
+    for name, upstream in dependencies.items():
+        graph.add_node(name)
+        graph.add_edges_from((dependency, name) for dependency in upstream)
+    try:
+        cycle = nx.find_cycle(graph)
+    except nx.NetworkXNoCycle:
+        return graph
+    raise TaskCycleError([source for source, _ in cycle] + [cycle[0][0]])
+
+
+def ready_nodes(graph: nx.DiGraph, nodes: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    List the pending tasks whose upstream tasks all succeeded, those with the most downstream tasks first.
+
+    Args:
+        graph (nx.DiGraph): The graph of the tasks.
+        nodes (Dict[str, Dict[str, Any]]): The checkpointed state of each task.
+
+    Returns:
+        List[str]: The names of the tasks ready to run.
+    """
+    ready = [
+        name for name in nx.topological_sort(graph)
+        if nodes[name]["status"] == "pending"
+        and all(nodes[dependency]["status"] == "succeeded" for dependency in graph.predecessors(name))
+    ]
+    # The stable sort keeps the topological order among tasks with as many downstream tasks
+    return sorted(ready, key=lambda name: -len(nx.descendants(graph, name)))
+
+
+class DagScheduler:
+    """
+    Run pipelines of dependent tasks through the task queue.
+
+    A pipeline runs a task after every task it transitively depends on. Each
+    task is queued as a task run as soon as its upstream tasks succeeded, so
+    independent branches run concurrently, up to the parallelism of the
+    pipeline. The state of every task is checkpointed in the pipeline run after
+    each change: resuming a failed or interrupted pipeline keeps the results of
+    the tasks that succeeded and starts again from the ones that did not.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        sessions: async_sessionmaker,
+        poll_interval: float = settings.PIPELINE_POLL_INTERVAL,
+    ):
+        """
+        Initialize a DagScheduler instance.
+
+        Args:
+            queue (TaskQueue): The queue the task runs are queued on.
+            sessions (async_sessionmaker): The factory of the sessions used by the schedulers.
+            poll_interval (float): How often the runs of the running tasks are checked, in seconds.
+        """
+        self.queue = queue
+        self.sessions = sessions
+        self.poll_interval = poll_interval
+        self._drivers: Dict[int, asyncio.Task] = {}
+
+    async def start(
+        self,
+        db: AsyncSession,
+        task_name: str,
+        tasks: Dict[str, Any],
+        payload: Optional[Dict[str, Any]] = None,
+        parallelism: int = settings.PIPELINE_PARALLELISM,
+    ) -> PipelineRun:
+        """
+        Checkpoint a new pipeline run and start scheduling its tasks.
+
+        Args:
+            db (AsyncSession): The database session.
+            task_name (str): The name of the last task of the pipeline.
+            tasks (Dict[str, Any]): The task and every task it transitively depends on, by name.
+            payload (Optional[Dict[str, Any]]): The arguments passed to the action of every task.
+            parallelism (int): The maximum number of tasks running at once.
+
+        Returns:
+            PipelineRun: The started pipeline run.
+
+        Raises:
+            TaskCycleError: If the dependencies of the tasks form a cycle.
+        """
+        build_dag({name: task.depends_on or [] for name, task in tasks.items()})
+        pipeline = PipelineRun(
+            task_name=task_name,
+            status="running",
+            parallelism=parallelism,
+            payload=payload,
+            nodes={
+                name: {"action": task.action, "depends_on": task.depends_on or [], "status": "pending", "run_id": None, "result": None, "error": None}
+                for name, task in tasks.items()
+            },
+        )
+        db.add(pipeline)
+        await db.commit()
+        await db.refresh(pipeline)
+        self._drive(pipeline.id)
+        return pipeline
+
+    async def resume(self, db: AsyncSession, pipeline: PipelineRun) -> PipelineRun:
+        """
+        Start scheduling a failed or interrupted pipeline run again, from the tasks that did not succeed.
+
+        Args:
+            db (AsyncSession): The database session the pipeline run was loaded with.
+            pipeline (PipelineRun): The pipeline run.
+
+        Returns:
+            PipelineRun: The resumed pipeline run.
+
+        Raises:
+            ValueError: If the pipeline run succeeded or is being scheduled by this process.
+        """
+        if pipeline.status == "succeeded" or pipeline.id in self._drivers:
+            raise ValueError(f"Pipeline run {pipeline.id} is {pipeline.status}")
+        # Tasks still running when the pipeline was interrupted keep their task run, which the queue still delivers
+        pipeline.nodes = {
+            name: {**node, "status": "pending", "run_id": None, "error": None} if node["status"] == "failed" else node
+            for name, node in pipeline.nodes.items()
+        }
+        pipeline.status = "running"
+        pipeline.error = None
+        pipeline.finished_at = None
+        await db.commit()
+        await db.refresh(pipeline)
+        self._drive(pipeline.id)
+        return pipeline
+
+    async def stop(self) -> None:
+        """
+        Stop scheduling, leaving the pipeline runs to be resumed.
+        """
+        drivers = list(self._drivers.values())
+        for driver in drivers:
+            driver.cancel()
+        await asyncio.gather(*drivers, return_exceptions=True)
+
+    def _drive(self, pipeline_id: int) -> None:
+        driver = asyncio.ensure_future(self._run(pipeline_id))
+        self._drivers[pipeline_id] = driver
+        driver.add_done_callback(lambda _: self._drivers.pop(pipeline_id, None))
+
+    async def _run(self, pipeline_id: int) -> None:
+        try:
+            async with self.sessions() as db:
+                await self._schedule(db, pipeline_id)
+        except Exception as e:
+            # The checkpoint is intact, the pipeline run can be resumed
+            logger.error(f"Scheduling of pipeline run {pipeline_id} failed: {e}")
+
+    async def _schedule(self, db: AsyncSession, pipeline_id: int) -> None:
+        pipeline = await db.get(PipelineRun, pipeline_id)
+        nodes = {name: dict(node) for name, node in pipeline.nodes.items()}
+        graph = build_dag({name: node["depends_on"] for name, node in nodes.items()})
+        failed = any(node["status"] == "failed" for node in nodes.values())
+        while True:
+            running = [name for name, node in nodes.items() if node["status"] == "running"]
+            # Once a task failed, the running ones are let finish but no other one is started
+            ready = [] if failed else ready_nodes(graph, nodes)[:max(pipeline.parallelism - len(running), 0)]
+            for name in ready:
+                inputs = {dependency: nodes[dependency]["result"] for dependency in graph.predecessors(name)}
+                run = await self.queue.enqueue(db, pipeline.task_name, nodes[name]["action"], {**(pipeline.payload or {}), "task": name, "inputs": inputs})
+                nodes[name].update(status="running", run_id=run.id)
+                running.append(name)
+            if ready:
+                await self._checkpoint(db, pipeline_id, nodes)
+            if not running:
+                break
+            await asyncio.sleep(self.poll_interval)
+            runs = {name: nodes[name]["run_id"] for name in running}
+            result = await db.execute(
+                select(TaskRun.id, TaskRun.status, TaskRun.result, TaskRun.error)
+                .where(TaskRun.id.in_(runs.values()), TaskRun.status.in_(("succeeded", "failed")))
+            )
+            finished = {row.id: row for row in result}
+            for name, run_id in runs.items():
+                if run_id in finished:
+                    row = finished[run_id]
+                    nodes[name].update(status=row.status, result=row.result, error=row.error)
+                    failed = failed or row.status == "failed"
+            if finished:
+                await self._checkpoint(db, pipeline_id, nodes)
+        errors = [f"{name}: {node['error']}" for name, node in nodes.items() if node["status"] == "failed"]
+        await self._checkpoint(
+            db, pipeline_id, nodes,
+            status="failed" if errors else "succeeded", error="; ".join(errors) or None, finished_at=datetime.now(timezone.utc),
+        )
+
+    async def _checkpoint(self, db: AsyncSession, pipeline_id: int, nodes: Dict[str, Dict[str, Any]], **values: Any) -> None:
+        await db.execute(
+            update(PipelineRun)
+            .where(PipelineRun.id == pipeline_id)
+            .values(nodes={name: dict(node) for name, node in nodes.items()}, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+dag_scheduler = DagScheduler(task_queue, AsyncSessionLocal)
@@ -0,0 +1,326 @@
+## app/core/task_queue.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.task_run import TaskRun
+
+logger = logging.getLogger("app.core.task_queue")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LocalTaskTransport:
+    """
+    In-process stand-in for the Kafka transport, waking the workers of this process when runs are queued.
+    """
+
+    def __init__(self):
+        """
+        Initialize a LocalTaskTransport instance.
+        """
+        self._event: Optional[asyncio.Event] = None
+
+    def _get_event(self) -> asyncio.Event:
+        if self._event is None:
+            self._event = asyncio.Event()
+        return self._event
+
+    async def start(self) -> None:
+        self._event = asyncio.Event()
+
+    async def notify(self, run_id: int) -> None:
+        self._get_event().set()
+
+    async def wait(self, timeout: float) -> None:
+        event = self._get_event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    async def close(self) -> None:
+        pass
+
+
+class KafkaTaskTransport:
+    """
+    Kafka topic waking the workers of every process when runs are queued.
+
+    The database stays the source of truth of the runs, a message only tells one
+    worker of the consumer group to claim runs now rather than at its next poll.
+    """
+
+    def __init__(self, url: str, topic: str, group_id: str = "task-workers"):
+        """
+        Initialize a KafkaTaskTransport instance.
+
+        Args:
+            url (str): The bootstrap servers of the Kafka cluster.
+            topic (str): The topic the run notifications are sent to.
+            group_id (str): The consumer group of the workers.
+        """
+        self.url = url
+        self.topic = topic
+        self.group_id = group_id
+        self._producer = None
+        self._consumer = None
+
+    async def start(self) -> None:
+        from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+
+        self._producer = AIOKafkaProducer(bootstrap_servers=self.url)
+        await self._producer.start()
+        self._consumer = AIOKafkaConsumer(self.topic, bootstrap_servers=self.url, group_id=self.group_id)
+        await self._consumer.start()
+
+    async def notify(self, run_id: int) -> None:
+        if self._producer is None:
+            from aiokafka import AIOKafkaProducer
+
+            self._producer = AIOKafkaProducer(bootstrap_servers=self.url)
+            await self._producer.start()
+        try:
+            await self._producer.send_and_wait(self.topic, str(run_id).encode())
+        except Exception as e:
+            # The run is queued in the database either way, a worker picks it up at its next poll
+            logger.warning(f"Failed to notify the workers of task run {run_id}: {e}")
+
+    async def wait(self, timeout: float) -> None:
+        if self._consumer is None:
+            await asyncio.sleep(timeout)
+            return
+        await self._consumer.getmany(timeout_ms=int(timeout * 1000))
+
+    async def close(self) -> None:
+        for client in (self._consumer, self._producer):
+            if client is not None:
+                await client.stop()
+        self._producer = self._consumer = None
+
+
+def create_task_transport(kind: str) -> Any:
+    """
+    Create the transport telling workers that runs were queued.
+
+    Args:
+        kind (str): "local" to only wake the workers of this process, or "kafka".
+
+    Returns:
+        Any: The task transport.
+    """
+    if kind == "local":
+        return LocalTaskTransport()
+    if kind == "kafka":
+        return KafkaTaskTransport(settings.KAFKA_BROKER_URL, settings.KAFKA_TASK_TOPIC)
+    raise ValueError(f"Unknown task transport: {kind}")
+
+
+class TaskQueue:
+    """
+    Durable queue of task runs stored in the task_runs table.
+
+    Workers claim runs with a single UPDATE ... RETURNING, which skips rows locked
+    by other workers on PostgreSQL (FOR UPDATE SKIP LOCKED) and is serialized by
+    the single writer on SQLite, so a run is handed to one worker at a time. A
+    claimed run is leased until its visibility timeout, which its worker extends
+    while the run goes on: if the worker dies before finishing it, the run is
+    claimed again once the lease expires. Failed runs are
+    retried with exponential backoff until they run out of attempts.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker,
+        transport: Any,
+        visibility_timeout: float = settings.TASK_VISIBILITY_TIMEOUT,
+        max_attempts: int = settings.TASK_MAX_ATTEMPTS,
+        backoff: float = settings.TASK_RETRY_BACKOFF,
+        backoff_max: float = settings.TASK_RETRY_BACKOFF_MAX,
+    ):
+        """
+        Initialize a TaskQueue instance.
+
+        Args:
+            sessions (async_sessionmaker): The factory of the sessions used by the workers.
+            transport (Any): The transport waking the workers when runs are queued.
+            visibility_timeout (float): How long a claimed run is leased to its worker, in seconds.
+            max_attempts (int): The default number of times a run is attempted.
+            backoff (float): The delay before the first retry, doubled for each later one, in seconds.
+            backoff_max (float): The maximum delay before a retry, in seconds.
+        """
+        self.sessions = sessions
+        self.transport = transport
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        task_name: str,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> TaskRun:
+        """
+        Queue a run of a task and wake a worker.
+
+        Args:
+            db (AsyncSession): The database session.
+            task_name (str): The name of the task.
+            action (str): The action of the task.
+            payload (Optional[Dict[str, Any]]): The arguments of the action.
+            priority (int): The priority of the run, higher priorities are claimed first.
+            max_attempts (Optional[int]): The number of times the run is attempted, the queue default if None.
+
+        Returns:
+            TaskRun: The queued run.
+        """
+        now = _now()
+        run = TaskRun(
+            task_name=task_name,
+            action=action,
+            payload=payload,
+            status="queued",
+            priority=priority,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            available_at=now,
+        )
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+        await self.transport.notify(run.id)
+        return run
+
+    async def claim(self, worker_id: str, limit: int = 1) -> List[TaskRun]:
+        """
+        Claim the next runs, by priority then age, and lease them to a worker.
+
+        Runs whose lease expired are claimed again, or failed if they have no attempts left.
+
+        Args:
+            worker_id (str): The identifier of the claiming worker.
+            limit (int): The maximum number of runs to be claimed.
+
+        Returns:
+            List[TaskRun]: The claimed runs, detached from any session.
+        """
+        now = _now()
+        async with self.sessions() as db:
+            await db.execute(
+                update(TaskRun)
+                .where(TaskRun.status == "running", TaskRun.locked_until < now, TaskRun.attempts >= TaskRun.max_attempts)
+                .values(status="failed", error="Visibility timeout expired", finished_at=now, locked_by=None, locked_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            claimable = (
+                select(TaskRun.id)
+                .where(or_(
+                    and_(TaskRun.status == "queued", TaskRun.available_at <= now),
+                    and_(TaskRun.status == "running", TaskRun.locked_until < now),
+                ))
+                .order_by(TaskRun.priority.desc(), TaskRun.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(TaskRun)
+                .where(TaskRun.id.in_(claimable.scalar_subquery()))
+                .values(
+                    status="running",
+                    attempts=TaskRun.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=self.visibility_timeout),
+                    started_at=now,
+                )
+                .returning(TaskRun)
+                .execution_options(synchronize_session=False)
+            )
+            runs = list(result.scalars())
+            await db.commit()
+        return sorted(runs, key=lambda run: (-run.priority, run.id))
+
+    async def extend(self, run: TaskRun, worker_id: str) -> bool:
+        """
+        Renew the lease of a running run for another visibility timeout.
+
+        Args:
+            run (TaskRun): The claimed run.
+            worker_id (str): The identifier of the worker holding the run.
+
+        Returns:
+            bool: False if the lease of the worker expired and the run was claimed again meanwhile.
+        """
+        async with self.sessions() as db:
+            outcome = await db.execute(
+                update(TaskRun)
+                .where(TaskRun.id == run.id, TaskRun.status == "running", TaskRun.locked_by == worker_id)
+                .values(locked_until=_now() + timedelta(seconds=self.visibility_timeout))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return outcome.rowcount > 0
+
+    async def complete(self, run: TaskRun, worker_id: str, result: Any) -> bool:
+        """
+        Record the result of a run.
+
+        Args:
+            run (TaskRun): The claimed run.
+            worker_id (str): The identifier of the worker holding the run.
+            result (Any): The JSON-serializable result of the action.
+
+        Returns:
+            bool: False if the lease of the worker expired and the run was claimed again meanwhile.
+        """
+        return await self._finish(run, worker_id, status="succeeded", result=result, finished_at=_now())
+
+    async def fail(self, run: TaskRun, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record the failure of a run, queueing it again after a backoff if it has attempts left.
+
+        Args:
+            run (TaskRun): The claimed run.
+            worker_id (str): The identifier of the worker holding the run.
+            error (str): Why the run failed.
+            retry (bool): False if retrying cannot succeed.
+
+        Returns:
+            bool: False if the lease of the worker expired and the run was claimed again meanwhile.
+        """
+        now = _now()
+        if retry and run.attempts < run.max_attempts:
+            delay = min(self.backoff * 2 ** (run.attempts - 1), self.backoff_max)
+            return await self._finish(run, worker_id, status="queued", error=error, available_at=now + timedelta(seconds=delay))
+        return await self._finish(run, worker_id, status="failed", error=error, finished_at=now)
+
+    async def _finish(self, run: TaskRun, worker_id: str, **values: Any) -> bool:
+        async with self.sessions() as db:
+            outcome = await db.execute(
+                update(TaskRun)
+                .where(TaskRun.id == run.id, TaskRun.status == "running", TaskRun.locked_by == worker_id)
+                .values(locked_by=None, locked_until=None, **values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if outcome.rowcount == 0:
+            logger.warning(f"Task run {run.id} was claimed by another worker after the lease of {worker_id} expired")
+            return False
+        return True
+
+
+task_queue = TaskQueue(AsyncSessionLocal, create_task_transport(settings.TASK_TRANSPORT))
@@ -0,0 +1,169 @@
+## app/core/task_workers.py
+
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import observe_task_run
+from app.core.task_actions import PermanentTaskError, task_actions
+from app.core.task_queue import TaskQueue
+from app.core.tracing import tracer
+from app.models.task_run import TaskRun
+
+logger = logging.getLogger("app.core.task_workers")
+
+
+class TaskWorkerPool:
+    """
+    Workers claiming task runs from the queue and running their actions.
+
+    Each of the concurrency workers runs one action at a time, so throughput grows
+    with the number of workers until the database or the CPU is saturated. Async
+    actions run on the event loop. Sync actions run in a thread, or in a process
+    pool of the same size when kind is "process", for CPU-bound actions.
+
+    The lease of a run is extended every third of the visibility timeout while its
+    action runs. An action running past run_timeout is failed and retried: async
+    actions are cancelled, but a sync action cannot be interrupted, so its run is
+    only failed once its thread or process returns, never while it still runs.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        concurrency: int = settings.TASK_WORKER_CONCURRENCY,
+        kind: str = settings.TASK_WORKER_KIND,
+        poll_interval: float = settings.TASK_POLL_INTERVAL,
+        run_timeout: float = settings.TASK_RUN_TIMEOUT,
+    ):
+        """
+        Initialize a TaskWorkerPool instance.
+
+        Args:
+            queue (TaskQueue): The queue the runs are claimed from.
+            concurrency (int): The number of runs executed at once.
+            kind (str): "async" to run sync actions in threads, or "process" to run them in worker processes.
+            poll_interval (float): How long an idle worker waits for a notification before polling, in seconds.
+            run_timeout (float): How long an action may run before its run is failed, in seconds.
+        """
+        if kind not in ("async", "process"):
+            raise ValueError(f"Unknown task worker kind: {kind}")
+        self.queue = queue
+        self.concurrency = concurrency
+        self.kind = kind
+        self.poll_interval = poll_interval
+        self.run_timeout = run_timeout
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        """
+        Start the workers.
+        """
+        self._stopping = False
+        await self.queue.transport.start()
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.concurrency)
+        self._workers = [asyncio.ensure_future(self._work(f"{self.worker_prefix}:{i}")) for i in range(self.concurrency)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the workers, letting running actions finish within the timeout.
+
+        Runs still running after the timeout are cancelled and claimed again once their lease expires.
+
+        Args:
+            timeout (float): How long to wait for running actions, in seconds.
+        """
+        self._stopping = True
+        if self._workers:
+            _, pending = await asyncio.wait(self._workers, timeout=timeout)
+            for worker in pending:
+                worker.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        await self.queue.transport.close()
+
+    async def _work(self, worker_id: str) -> None:
+        while not self._stopping:
+            try:
+                runs = await self.queue.claim(worker_id)
+            except Exception as e:
+                logger.error(f"Task worker {worker_id} failed to claim runs: {e}")
+                runs = []
+            if not runs:
+                await self.queue.transport.wait(self.poll_interval)
+                continue
+            for run in runs:
+                await self._execute(run, worker_id)
+
+    async def _execute(self, run: TaskRun, worker_id: str) -> None:
+        action = task_actions.get(run.action)
+        start = time.perf_counter()
+        with tracer.start_as_current_span("task.run", attributes={"task": run.task_name, "action": run.action, "attempt": run.attempts}):
+            try:
+                if action is None:
+                    raise PermanentTaskError(f"Unknown action: {run.action}")
+                result = await self._run_leased(run, worker_id, action)
+            except Exception as e:
+                retry = not isinstance(e, PermanentTaskError)
+                error = "Timed out" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+                logger.warning(f"Task run {run.id} of {run.task_name} failed on attempt {run.attempts}: {error}")
+                await self._record(self.queue.fail(run, worker_id, error, retry=retry))
+                observe_task_run(run.action if action else "unknown", "failed", time.perf_counter() - start)
+                return
+        await self._record(self.queue.complete(run, worker_id, result))
+        observe_task_run(run.action, "succeeded", time.perf_counter() - start)
+
+    async def _run_leased(self, run: TaskRun, worker_id: str, action: Any) -> Any:
+        call = asyncio.ensure_future(self._call(action, run.payload))
+        heartbeat = asyncio.ensure_future(self._heartbeat(run, worker_id))
+        try:
+            done, _ = await asyncio.wait([call], timeout=self.run_timeout)
+            if not done:
+                if inspect.iscoroutinefunction(action):
+                    call.cancel()
+                else:
+                    # Retrying now would run the action twice at once, keep the lease until it returns
+                    logger.warning(f"Task run {run.id} of {run.task_name} timed out, waiting for its action to return")
+                await asyncio.gather(call, return_exceptions=True)
+                raise asyncio.TimeoutError()
+            return call.result()
+        finally:
+            call.cancel()
+            heartbeat.cancel()
+
+    async def _heartbeat(self, run: TaskRun, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                if not await self.queue.extend(run, worker_id):
+                    logger.warning(f"Task run {run.id} was claimed by another worker after the lease of {worker_id} expired")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to extend the lease of task run {run.id}: {e}")
+
+    async def _call(self, action: Any, payload: Any) -> Any:
+        if inspect.iscoroutinefunction(action):
+            return await action(payload)
+        if self._executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, action, payload)
+        return await asyncio.to_thread(action, payload)
+
+    async def _record(self, outcome: Any) -> None:
+        try:
+            await outcome
+        except Exception as e:
+            # The lease expires and the run is claimed again
+            logger.error(f"Failed to record the outcome of a task run: {e}")
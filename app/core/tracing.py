@@ -0,0 +1,162 @@
+## app/core/tracing.py
+
+import functools
+import logging
+from typing import Any, Callable, Optional
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON, ParentBased, Sampler, TraceIdRatioBased
+from opentelemetry.trace import Status, StatusCode
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.tracing")
+
+# Proxy tracer, spans are no-ops until setup_tracing installs a provider
+tracer = trace.get_tracer("app")
+
+# Longest SQL statement recorded on a query span
+MAX_STATEMENT_LENGTH = 2048
+
+# Pipeline stages wrapped in their own span, mapped to the span name
+PIPELINE_STAGES = {"preprocess": "inference.tokenize", "forward": "inference.forward", "postprocess": "inference.postprocess"}
+
+
+def create_sampler(name: str = settings.TRACING_SAMPLER, ratio: float = settings.TRACING_SAMPLE_RATIO) -> Sampler:
+    """
+    Create the sampler deciding which traces are recorded.
+
+    Args:
+        name (str): "always_on", "always_off", "traceidratio" or "parentbased_traceidratio".
+        ratio (float): The share of traces recorded by the ratio samplers.
+
+    Returns:
+        Sampler: The sampler.
+    """
+    if name == "always_on":
+        return ALWAYS_ON
+    if name == "always_off":
+        return ALWAYS_OFF
+    if name == "traceidratio":
+        return TraceIdRatioBased(ratio)
+    if name == "parentbased_traceidratio":
+        return ParentBased(TraceIdRatioBased(ratio))
+    raise ValueError(f"Unknown tracing sampler: {name}")
+
+
+def create_exporter(kind: str = settings.TRACING_EXPORTER) -> SpanExporter:
+    """
+    Create the exporter spans are sent to.
+
+    Args:
+        kind (str): "otlp" to send spans to the collector at OTEL_EXPORTER_OTLP_ENDPOINT, or "memory" to keep them in process.
+
+    Returns:
+        SpanExporter: The exporter.
+    """
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT, insecure=True)
+    if kind == "memory":
+        return InMemorySpanExporter()
+    raise ValueError(f"Unknown tracing exporter: {kind}")
+
+
+def setup_tracing(app: Any = None, engine: Any = None, exporter: Optional[SpanExporter] = None, sampler: Optional[Sampler] = None) -> TracerProvider:
+    """
+    Install the process-wide tracer provider and instrument the app and the database engine.
+
+    Args:
+        app (Any): The FastAPI app whose requests get a server span.
+        engine (Any): The SQLAlchemy engine whose queries get a span.
+        exporter (Optional[SpanExporter]): The exporter, defaults to the configured one.
+        sampler (Optional[Sampler]): The sampler, defaults to the configured one.
+
+    Returns:
+        TracerProvider: The installed tracer provider.
+    """
+    exporter = exporter or create_exporter()
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME, "service.version": settings.VERSION}),
+        sampler=sampler or create_sampler(),
+    )
+    # Export in-memory spans synchronously so tests see them as soon as they end
+    processor = SimpleSpanProcessor(exporter) if isinstance(exporter, InMemorySpanExporter) else BatchSpanProcessor(exporter)
+    provider.add_span_processor(processor)
+    trace.set_tracer_provider(provider)
+    if app is not None:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+        FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="metrics,health,ready")
+    if engine is not None:
+        instrument_engine_tracing(engine)
+    logger.info(f"Tracing enabled with the {type(exporter).__name__} exporter")
+    return provider
+
+
+def instrument_engine_tracing(engine: Any) -> None:
+    """
+    Record a span for every query run through an engine, as a child of the current span.
+
+    Args:
+        engine (Any): The sync or async SQLAlchemy engine.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(
+            f"db.{statement.split(None, 1)[0].lower() if statement else 'query'}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={"db.system": system, "db.statement": statement[:MAX_STATEMENT_LENGTH]},
+        )
+        conn.info.setdefault("query_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_spans"].pop().end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        spans = context.connection.info.get("query_spans") if context.connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+
+def _traced_stage(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with tracer.start_as_current_span(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_pipeline(nlp_pipeline: Any) -> Any:
+    """
+    Wrap the tokenize, forward and postprocess stages of a pipeline in their own spans.
+
+    Works with transformers pipelines and OnnxTextClassificationPipeline, which
+    both run a call through preprocess, forward and postprocess methods.
+
+    Args:
+        nlp_pipeline (Any): The pipeline to be traced.
+
+    Returns:
+        Any: The same pipeline with its stages wrapped.
+    """
+    for method, span_name in PIPELINE_STAGES.items():
+        stage = getattr(nlp_pipeline, method, None)
+        if callable(stage):
+            setattr(nlp_pipeline, method, _traced_stage(span_name, stage))
+    return nlp_pipeline
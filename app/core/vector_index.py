@@ -0,0 +1,179 @@
+## app/core/vector_index.py
+
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.vector_index")
+
+
+class VectorIndex:
+    """
+    HNSW index of normalized embeddings, labelled with row ids, persisted incrementally to a directory.
+
+    Writes are applied in place: a vector added for an existing id replaces it,
+    and a deleted id is only marked, its slot being reused by a later insert.
+    persist() writes the elements changed since the previous call, rather than
+    the whole graph, so it stays cheap at millions of vectors. The capacity of
+    the index grows by doubling as vectors are added.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        max_elements: int = settings.VECTOR_INDEX_INITIAL_SIZE,
+        m: int = settings.VECTOR_INDEX_M,
+        ef_construction: int = settings.VECTOR_INDEX_EF_CONSTRUCTION,
+        ef_search: int = settings.VECTOR_INDEX_EF_SEARCH,
+    ):
+        """
+        Initialize a VectorIndex instance, loading the index persisted in path if there is one.
+
+        Args:
+            path (str): The directory the index is persisted in.
+            dim (int): The dimension of the vectors.
+            max_elements (int): The initial capacity of a new index.
+            m (int): The number of links of each element, trading memory for recall.
+            ef_construction (int): The breadth of the search for links when inserting, trading insert speed for recall.
+            ef_search (int): The breadth of the search when querying, trading query speed for recall.
+        """
+        import hnswlib
+
+        self.path = path
+        self.dim = dim
+        self.ef_search = ef_search
+        self._lock = threading.RLock()
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        if os.path.exists(os.path.join(path, "header.bin")):
+            self._index.load_index(path, is_persistent_index=True, allow_replace_deleted=True, max_elements=0)
+            logger.info(f"Loaded {self._index.get_current_count()} vectors from {path}")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._index.init_index(
+                max_elements=max_elements,
+                M=m,
+                ef_construction=ef_construction,
+                allow_replace_deleted=True,
+                is_persistent_index=True,
+                persistence_location=path,
+            )
+        self._index.set_ef(ef_search)
+
+    def __len__(self) -> int:
+        return self._index.get_current_count()
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """
+        Add vectors, replacing the vectors of ids already in the index.
+
+        Args:
+            ids (Sequence[int]): The row id of each vector.
+            vectors (np.ndarray): The vectors, one row per id.
+        """
+        if not len(ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            needed = self._index.get_current_count() + len(ids)
+            if needed > self._index.get_max_elements():
+                self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+            try:
+                self._index.add_items(vectors, list(ids), replace_deleted=True)
+            except RuntimeError:
+                # Deleted ids cannot be updated in place, restore them one by one before replacing their vector
+                for row_id, vector in zip(ids, vectors):
+                    try:
+                        self._index.add_items(vector[None], [row_id], replace_deleted=True)
+                    except RuntimeError:
+                        self._index.unmark_deleted(row_id)
+                        self._index.add_items(vector[None], [row_id])
+
+    def delete(self, ids: Sequence[int]) -> None:
+        """
+        Remove ids from the search results, ignoring those not in the index.
+
+        Args:
+            ids (Sequence[int]): The row ids to be removed.
+        """
+        with self._lock:
+            for row_id in ids:
+                try:
+                    self._index.mark_deleted(row_id)
+                except RuntimeError:
+                    pass
+
+    def get(self, row_id: int) -> Optional[np.ndarray]:
+        """
+        Get the vector of an id.
+
+        Args:
+            row_id (int): The row id.
+
+        Returns:
+            Optional[np.ndarray]: The vector, or None if the id is not in the index.
+        """
+        with self._lock:
+            try:
+                return np.asarray(self._index.get_items([row_id])[0], dtype=np.float32)
+            except RuntimeError:
+                return None
+
+    def ids(self) -> List[int]:
+        """
+        List the ids in the index, including deleted ones.
+
+        Returns:
+            List[int]: The row ids.
+        """
+        with self._lock:
+            return list(self._index.get_ids_list())
+
+    def query(self, vector: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find the ids of the vectors nearest to a vector.
+
+        Args:
+            vector (np.ndarray): The query vector.
+            k (int): The number of neighbours.
+            exclude (Optional[int]): An id left out of the results, e.g. the row the vector is from.
+
+        Returns:
+            List[Tuple[int, float]]: The id and cosine similarity of each neighbour, most similar first.
+        """
+        wanted = k
+        k = min(k + (exclude is not None), len(self))
+        # The index cannot return more neighbours than it holds live vectors, whose number deletes make unknown,
+        # which only happens while the index holds fewer vectors than asked for
+        while k > 0:
+            try:
+                with self._lock:
+                    self._index.set_ef(max(self.ef_search, k))
+                    labels, distances = self._index.knn_query(np.asarray(vector, dtype=np.float32)[None], k=k)
+                break
+            except RuntimeError:
+                k -= 1
+        else:
+            return []
+        neighbours = [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0]) if label != exclude]
+        return neighbours[:wanted]
+
+    def persist(self) -> None:
+        """
+        Write the elements changed since the previous call to disk.
+        """
+        with self._lock:
+            self._index.persist_dirty()
+
+    def close(self) -> None:
+        """
+        Persist the index and release its files.
+        """
+        with self._lock:
+            self._index.persist_dirty()
+            self._index.close_file_handles()
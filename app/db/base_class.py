@@ -0,0 +1,21 @@
+## app/db/base_class.py
+
+from sqlalchemy import Column, DateTime, func
+from sqlalchemy.orm import as_declarative, declared_attr
+
+@as_declarative()
+class Base:
+    """
+    Base class of the ORM models, naming each table after its lowercased class name.
+    """
+
+    @declared_attr
+    def __tablename__(cls) -> str:
+        return cls.__name__.lower()
+
+class TimestampMixin:
+    """
+    Creation and last update times of a row, indexed on creation for range queries.
+    """
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
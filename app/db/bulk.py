@@ -0,0 +1,147 @@
+## app/db/bulk.py
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.bulk")
+
+# Dialects whose INSERT supports ON CONFLICT
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk write.
+
+    Attributes:
+        succeeded (int): The number of items written.
+        failed (List[Dict[str, Any]]): The index and error of each item that was not written.
+    """
+    succeeded: int = 0
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+
+    def fail(self, index: int, error: Any) -> None:
+        self.failed.append({"index": index, "error": str(error)})
+
+def validate_items(schema: Type[BaseModel], items: Sequence[Any], result: BulkResult) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Validate the items of a bulk request one by one, recording the invalid ones as failures.
+
+    Args:
+        schema (Type[BaseModel]): The schema each item must match.
+        items (Sequence[Any]): The raw items of the request.
+        result (BulkResult): The result the failures are recorded in.
+
+    Returns:
+        List[Tuple[int, Dict[str, Any]]]: The index and validated fields of each valid item.
+    """
+    rows = []
+    for index, item in enumerate(items):
+        try:
+            rows.append((index, schema.parse_obj(item).dict()))
+        except ValidationError as e:
+            result.fail(index, e)
+    return rows
+
+def _insert_statement(db: AsyncSession, model: Any, rows: List[Dict[str, Any]], conflict_keys: Sequence[str]) -> Any:
+    make_insert = UPSERT_INSERTS.get(db.bind.dialect.name)
+    if not conflict_keys or make_insert is None:
+        return insert(model).values(rows)
+    statement = make_insert(model).values(rows)
+    updates = {name: statement.excluded[name] for name in rows[0] if name not in conflict_keys}
+    if not updates:
+        return statement.on_conflict_do_nothing(index_elements=list(conflict_keys))
+    # ON CONFLICT updates skip the onupdate defaults of the columns, e.g. updated_at, set them explicitly
+    for column in model.__table__.columns:
+        if column.onupdate is not None and column.onupdate.is_clause_element and column.name not in updates:
+            updates[column.name] = column.onupdate.arg
+    return statement.on_conflict_do_update(index_elements=list(conflict_keys), set_=updates)
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Any,
+    rows: Sequence[Tuple[int, Dict[str, Any]]],
+    conflict_keys: Sequence[str] = (),
+    chunk_size: int = settings.BULK_CHUNK_SIZE,
+    result: Optional[BulkResult] = None,
+) -> BulkResult:
+    """
+    Insert rows with multi-row INSERT statements, updating the rows whose conflict keys already exist.
+
+    Rows are written in chunks of chunk_size, one transaction per chunk. If a chunk
+    fails, its rows are retried one by one so that only the offending rows are
+    reported as failed. When several rows share the same conflict keys the last
+    one wins. Fields that are not columns of the model are ignored.
+
+    Args:
+        db (AsyncSession): The database session.
+        model (Any): The mapped model class of the rows.
+        rows (Sequence[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each row.
+        conflict_keys (Sequence[str]): The unique columns identifying an existing row, empty to always insert.
+        chunk_size (int): The maximum number of rows per statement and transaction.
+        result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+    Returns:
+        BulkResult: The number of rows written and the failed rows.
+    """
+    result = result or BulkResult()
+    columns = set(model.__table__.columns.keys())
+    rows = [(index, {name: value for name, value in row.items() if name in columns}) for index, row in rows]
+    if conflict_keys:
+        latest = {}
+        for index, row in rows:
+            latest[tuple(row.get(key) for key in conflict_keys)] = (index, row)
+        # Superseded duplicates count as written, the last one overwrites them anyway
+        result.succeeded += len(rows) - len(latest)
+        rows = sorted(latest.values(), key=lambda item: item[0])
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            await db.execute(_insert_statement(db, model, [row for _, row in chunk], conflict_keys))
+            await db.commit()
+            result.succeeded += len(chunk)
+            continue
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.warning(f"Bulk write of {len(chunk)} {model.__name__} rows failed, retrying row by row: {e}")
+        for index, row in chunk:
+            try:
+                await db.execute(_insert_statement(db, model, [row], conflict_keys))
+                await db.commit()
+                result.succeeded += 1
+            except SQLAlchemyError as e:
+                await db.rollback()
+                result.fail(index, getattr(e, "orig", None) or e)
+    return result
+
+async def bulk_delete(db: AsyncSession, model: Any, key: str, values: Sequence[Any], chunk_size: int = settings.BULK_CHUNK_SIZE) -> int:
+    """
+    Delete the rows whose key column holds one of the given values, in chunked transactions.
+
+    Args:
+        db (AsyncSession): The database session.
+        model (Any): The mapped model class of the rows.
+        key (str): The column identifying the rows.
+        values (Sequence[Any]): The values of the rows to be deleted.
+        chunk_size (int): The maximum number of values per statement and transaction.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    column = model.__table__.columns[key]
+    deleted = 0
+    for start in range(0, len(values), chunk_size):
+        outcome = await db.execute(delete(model).where(column.in_(values[start:start + chunk_size])))
+        await db.commit()
+        deleted += outcome.rowcount
+    return deleted
@@ -0,0 +1,182 @@
+## app/db/pagination.py
+
+import base64
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+# Suffixes of the filter keys selecting a comparison other than equality
+FILTER_OPERATORS = {
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "contains": lambda column, value: column.contains(value, autoescape=True),
+}
+
+class InvalidListQuery(ValueError):
+    pass
+
+@dataclass
+class Page:
+    """
+    One page of a keyset-paginated listing.
+
+    Attributes:
+        items (List[Dict[str, Any]]): The selected fields of each row on the page.
+        next_cursor (Optional[str]): The cursor of the next page, None on the last page.
+    """
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the key of the last row of a page into an opaque cursor.
+
+    Args:
+        last_id (int): The id of the last row of the page.
+
+    Returns:
+        str: The cursor of the next page.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps({"id": last_id})).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor into the key the next page starts after.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+
+    Returns:
+        int: The id of the last row of the previous page.
+
+    Raises:
+        InvalidListQuery: If the cursor is malformed.
+    """
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return int(payload["id"])
+    except (ValueError, TypeError, KeyError, orjson.JSONDecodeError):
+        raise InvalidListQuery(f"Invalid cursor: {cursor}")
+
+def encode_key_cursor(last_key: Sequence[Any]) -> str:
+    """
+    Encode the composite key of the last row of a page, e.g. its position and name, into an opaque cursor.
+
+    Args:
+        last_key (Sequence[Any]): The values of the key columns of the last row of the page.
+
+    Returns:
+        str: The cursor of the next page.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps({"key": list(last_key)})).decode("ascii").rstrip("=")
+
+def decode_key_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor encoded with encode_key_cursor into the composite key the next page starts after.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+        types (Sequence[type]): The type of each key column.
+
+    Returns:
+        Tuple[Any, ...]: The values of the key columns of the last row of the previous page.
+
+    Raises:
+        InvalidListQuery: If the cursor is malformed.
+    """
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key = payload["key"]
+        if not isinstance(key, list) or len(key) != len(types):
+            raise ValueError(cursor)
+        return tuple(type_(value) for type_, value in zip(types, key))
+    except (ValueError, TypeError, KeyError, orjson.JSONDecodeError):
+        raise InvalidListQuery(f"Invalid cursor: {cursor}")
+
+def _column(model: Any, name: str) -> Any:
+    columns = model.__table__.columns
+    if name not in columns:
+        raise InvalidListQuery(f"Unknown field: {name}")
+    return columns[name]
+
+def _coerce(column: Any, value: Any) -> Any:
+    # Query string values arrive as text, convert them to the type of the column
+    if not isinstance(value, str):
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        if python_type is bool:
+            return value.lower() in ("1", "true", "yes")
+        if python_type in (int, float):
+            return python_type(value)
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidListQuery(f"Invalid value for {column.name}: {value}")
+    return value
+
+async def paginate(
+    db: AsyncSession,
+    model: Any,
+    limit: int = settings.PAGE_SIZE_DEFAULT,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Page:
+    """
+    List the rows of a model one page at a time, ordered by id.
+
+    Each page seeks past the last id of the previous one through the primary key
+    index instead of skipping rows with OFFSET, so every page costs the same
+    however deep into the table it is. Only the requested columns are selected
+    and rows are returned as dicts without building ORM objects.
+
+    Args:
+        db (AsyncSession): The database session.
+        model (Any): The mapped model class to be listed.
+        limit (int): The maximum number of rows on the page.
+        cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+        fields (Optional[Sequence[str]]): The columns to be returned, None for every column.
+        filters (Optional[Dict[str, Any]]): Column conditions the rows must match, keyed by column
+            name with an optional "__gt", "__gte", "__lt", "__lte" or "__contains" suffix.
+
+    Returns:
+        Page: The rows of the page and the cursor of the next page.
+
+    Raises:
+        InvalidListQuery: If the cursor, a field or a filter is invalid.
+    """
+    if not 1 <= limit <= settings.PAGE_SIZE_MAX:
+        raise InvalidListQuery(f"limit must be between 1 and {settings.PAGE_SIZE_MAX}")
+    key = model.__table__.columns["id"]
+    names = list(fields) if fields else [column.name for column in model.__table__.columns]
+    columns = [_column(model, name) for name in names]
+
+    statement = select(key.label("_key"), *columns)
+    for name, value in (filters or {}).items():
+        column_name, _, operator = name.partition("__")
+        column = _column(model, column_name)
+        if operator and operator not in FILTER_OPERATORS:
+            raise InvalidListQuery(f"Unknown filter operator: {operator}")
+        value = _coerce(column, value)
+        statement = statement.where(FILTER_OPERATORS[operator](column, value) if operator else column == value)
+    if cursor is not None:
+        statement = statement.where(key > decode_cursor(cursor))
+    # Fetch one extra row to know whether there is a next page
+    statement = statement.order_by(key).limit(limit + 1)
+
+    rows = (await db.execute(statement)).all()
+    next_cursor = encode_cursor(rows[limit - 1]._key) if len(rows) > limit else None
+    items = [{name: row[i + 1] for i, name in enumerate(names)} for row in rows[:limit]]
+    return Page(items=items, next_cursor=next_cursor)
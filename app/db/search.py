@@ -0,0 +1,214 @@
+## app/db/search.py
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import DDL, event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.pagination import InvalidListQuery
+
+# Marks around the matched terms in the snippets
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# Marks put around the matched terms by the database, control characters that stored text
+# has no business holding, turned into the HTML marks once the snippet is escaped
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+class InvalidSearchQuery(InvalidListQuery):
+    pass
+
+@dataclass
+class SearchSpec:
+    """
+    The columns of a model indexed for full-text search.
+
+    Attributes:
+        key (str): The unique column identifying a row in the results, e.g. the title.
+        columns (Sequence[str]): The text columns searched, snippets being cut from the last one on PostgreSQL.
+        weights (Sequence[float]): The weight of each column in the ranking.
+    """
+    key: str
+    columns: Sequence[str]
+    weights: Sequence[float]
+
+# Search specification of each model indexed for full-text search
+searchable: Dict[Any, SearchSpec] = {}
+
+def _sqlite_ddl(name: str, columns: Sequence[str]) -> List[str]:
+    fts = f"{name}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{name}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+    ]
+
+def _postgresql_ddl(name: str, columns: Sequence[str], weights: Sequence[float]) -> List[str]:
+    # tsvector weights are the letters A (highest) to D, given to the columns in order of weight
+    order = sorted(range(len(columns)), key=lambda i: -weights[i])
+    letters = {columns[i]: "ABCD"[min(position, 3)] for position, i in enumerate(order)}
+    vector = " || ".join(
+        f"setweight(to_tsvector('{settings.SEARCH_LANGUAGE}', coalesce({column}, '')), '{letters[column]}')"
+        for column in columns
+    )
+    return [
+        f"ALTER TABLE {name} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{name}_search_vector ON {name} USING gin (search_vector)",
+    ]
+
+def full_text_index(model: Any, key: str, columns: Sequence[str], weights: Sequence[float]) -> None:
+    """
+    Index text columns of a model for full-text search, kept up to date by the database on every write.
+
+    On SQLite an FTS5 table mirrors the columns through triggers and ranks
+    matches by BM25. On PostgreSQL a generated tsvector column with a GIN index
+    holds the weighted terms of the columns. The index is created with the table,
+    tables created before it are indexed by setup_full_text_indexes.
+
+    Args:
+        model (Any): The ORM model.
+        key (str): The unique column identifying a row in the results.
+        columns (Sequence[str]): The text columns to be searched.
+        weights (Sequence[float]): The weight of each column in the ranking.
+    """
+    table = model.__table__
+    name = table.name
+    for statement in _sqlite_ddl(name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in _postgresql_ddl(name, columns, weights):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    event.listen(table, "after_drop", DDL(f"DROP TABLE IF EXISTS {name}_fts").execute_if(dialect="sqlite"))
+    searchable[model] = SearchSpec(key, tuple(columns), tuple(weights))
+
+def setup_full_text_indexes(connection: Connection) -> None:
+    """
+    Create the full-text indexes missing from existing tables, which create_all leaves untouched.
+
+    Every statement is idempotent, so this runs on every startup, e.g. with
+    AsyncConnection.run_sync. A SQLite index created here is filled with the rows
+    already in its table, a PostgreSQL generated column is computed for them.
+
+    Args:
+        connection (Connection): The database connection, in a transaction.
+    """
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+    for model, spec in searchable.items():
+        name = model.__table__.name
+        if not inspector.has_table(name):
+            continue
+        if dialect == "sqlite":
+            fts = f"{name}_fts"
+            created = not inspector.has_table(fts)
+            for statement in _sqlite_ddl(name, spec.columns):
+                connection.exec_driver_sql(statement)
+            if created:
+                connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        elif dialect == "postgresql":
+            for statement in _postgresql_ddl(name, spec.columns, spec.weights):
+                connection.exec_driver_sql(statement)
+
+def html_snippet(snippet: Optional[str]) -> Optional[str]:
+    """
+    Turn a snippet of stored text into HTML, escaping the text and highlighting the matched terms.
+
+    Args:
+        snippet (Optional[str]): The snippet, with the matched terms between _MATCH_START and _MATCH_END.
+
+    Returns:
+        Optional[str]: The escaped snippet with the matched terms between HIGHLIGHT_START and HIGHLIGHT_END.
+    """
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+def _terms(query: str) -> List[str]:
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        raise InvalidSearchQuery(f"No search terms in: {query!r}")
+    return terms
+
+async def search_database(db: AsyncSession, model: Any, query: str, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Search the full-text index of a model, best matches first.
+
+    Every term of the query must match, in any of the indexed columns, after stemming.
+    Ranking reads every match, so when a query matches more than
+    settings.SEARCH_MAX_CANDIDATES rows only the newest ones are ranked, which
+    bounds the latency of queries made of common terms whatever the table size.
+
+    Args:
+        db (AsyncSession): The database session.
+        model (Any): The ORM model indexed with full_text_index.
+        query (str): The search terms.
+        limit (int): The maximum number of matches.
+        offset (int): The number of best matches to skip.
+
+    Returns:
+        List[Dict[str, Any]]: The key, HTML-escaped highlighted snippet and score of each match.
+
+    Raises:
+        InvalidSearchQuery: If the query has no search terms or the database has no full-text search.
+    """
+    spec = searchable[model]
+    name = model.__table__.name
+    terms = _terms(query)
+    dialect = db.bind.dialect.name
+    candidates = settings.SEARCH_MAX_CANDIDATES or None
+    if dialect == "sqlite":
+        fts = f"{name}_fts"
+        # Quoting every term keeps the FTS5 query syntax out of user input. Sorting on bm25()
+        # rather than the rank column lets SQLite score only the candidates past the rowid bound.
+        bm25 = f"bm25({fts}, {', '.join(str(float(weight)) for weight in spec.weights)})"
+        statement = text(
+            f"SELECT {name}.{spec.key} AS key, snippet({fts}, -1, :start, :end, '…', :tokens) AS snippet, -{bm25} AS score "
+            f"FROM {fts} JOIN {name} ON {name}.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match AND {fts}.rowid >= "
+            f"(SELECT coalesce(min(rowid), 0) FROM (SELECT rowid FROM {fts} WHERE {fts} MATCH :match ORDER BY rowid DESC LIMIT :candidates)) "
+            f"ORDER BY score DESC, {fts}.rowid DESC LIMIT :limit OFFSET :offset"
+        )
+        parameters = {
+            "match": " ".join(f'"{term}"' for term in terms),
+            # A negative limit is no limit on SQLite
+            "candidates": candidates or -1,
+            "start": _MATCH_START,
+            "end": _MATCH_END,
+            "tokens": settings.SEARCH_SNIPPET_TOKENS,
+        }
+    elif dialect == "postgresql":
+        # The snippets are only built for the rows of the page, ts_headline parses the whole text
+        statement = text(
+            f"WITH q AS (SELECT plainto_tsquery(CAST(:language AS regconfig), :match) AS query), "
+            f"recent AS (SELECT coalesce(min(id), 0) AS since FROM "
+            f"(SELECT {name}.id FROM {name}, q WHERE search_vector @@ q.query ORDER BY {name}.id DESC LIMIT :candidates) AS ids), "
+            f"hits AS (SELECT {name}.id, {name}.{spec.key} AS key, {name}.{spec.columns[-1]} AS body, ts_rank_cd(search_vector, q.query) AS score "
+            f"FROM {name}, q, recent WHERE search_vector @@ q.query AND {name}.id >= recent.since "
+            f"ORDER BY score DESC, {name}.id LIMIT :limit OFFSET :offset) "
+            f"SELECT hits.key, ts_headline(CAST(:language AS regconfig), hits.body, q.query, :options) AS snippet, hits.score "
+            f"FROM hits, q ORDER BY hits.score DESC, hits.id"
+        )
+        parameters = {
+            "match": " ".join(terms),
+            "candidates": candidates,
+            "language": settings.SEARCH_LANGUAGE,
+            "options": f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxFragments=1, "
+                       f"MinWords={settings.SEARCH_SNIPPET_TOKENS // 2}, MaxWords={settings.SEARCH_SNIPPET_TOKENS}",
+        }
+    else:
+        raise InvalidSearchQuery(f"Full-text search is not supported on {dialect}")
+    result = await db.execute(statement, {**parameters, "limit": limit, "offset": offset})
+    return [{spec.key: row.key, "snippet": html_snippet(row.snippet), "score": float(row.score)} for row in result]
@@ -1,43 +1,76 @@
 ## app/db/session.py
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
 from app.core.config import settings
 
-# Create the SQLAlchemy engine for synchronous operations
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
-
-# Create the SQLAlchemy engine for asynchronous operations
-async_engine = create_async_engine(
-    settings.DATABASE_URL_ASYNC,
-    echo=True,
-)
-
-# Create a configured "Session" class for synchronous operations
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create a configured "Session" class for asynchronous operations
-AsyncSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=async_engine, class_=AsyncSession
-)
-
-# Create a base class for our models to inherit from
-Base = declarative_base()
-
-# Dependency to get DB session for synchronous operations
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# Dependency to get DB session for asynchronous operations
-async def get_async_db() -> AsyncSession:
+# Async drivers of the database URLs written with a sync or default driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """
+    Rewrite a database URL to use an async driver.
+
+    Args:
+        url (str): The database URL, e.g. settings.DATABASE_URL.
+
+    Returns:
+        str: The URL with its driver replaced by the matching async driver.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+def _enable_sqlite_wal(dbapi_connection, connection_record) -> None:
+    # WAL lets readers run concurrently with the single writer of a local SQLite database
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def create_engine(url: str = settings.DATABASE_URL) -> AsyncEngine:
+    """
+    Create the pooled async engine of a database.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        AsyncEngine: The async engine.
+    """
+    url = async_database_url(url)
+    options = {"echo": settings.DATABASE_ECHO, "pool_pre_ping": True}
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"timeout": settings.DATABASE_POOL_TIMEOUT}
+    else:
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        )
+    engine = create_async_engine(url, **options)
+    if make_url(url).get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", _enable_sqlite_wal)
+    return engine
+
+# The single connection pool of the process
+async_engine = create_engine()
+
+# Factory of the sessions handed to request handlers and services
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+# Dependency to get a DB session
+async def get_async_db() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
@@ -1,20 +1,79 @@
 ## app/main.py
 
-from fastapi import FastAPI, Depends
-from sqlalchemy.orm import Session
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from app.api.v1.endpoints import (
     agents, roles, influences, stages, groups, tasks, news, recommendations, training, feedback, scaling, ethics
 )
+from app.api.v1.responses import FastJSONResponse
 from app.core.config import settings
-from app.core.logger import setup_logger
-from app.db.session import SessionLocal
+from app.core.embeddings import embedding_indexer
+from app.core.inference_pool import inference_pool
+from app.core.logger import setup_logger, shutdown_logger
+from app.core.metrics import instrument_engine, registry
+from app.core.model_registry import model_registry
+from app.core.search import search_index
+from app.core.task_dag import dag_scheduler
+from app.core.task_queue import task_queue
+from app.core.task_workers import TaskWorkerPool
+from app.core.tracing import setup_tracing
+from app.db.search import setup_full_text_indexes
+from app.db.session import async_engine
 from app.middleware.error_handler import add_error_handlers
+from app.middleware.metrics import PrometheusMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import text
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the configured models, create missing full-text indexes and start the task workers and embedding indexer on startup, and release them, the connections and log listener on shutdown.
+
+    Models are loaded in the background unless MODEL_WARMUP_BACKGROUND is off, so
+    the worker starts serving at once and /ready reports when they are loaded.
+
+    Args:
+        app (FastAPI): The FastAPI application instance.
+    """
+    app.state.warm_up = asyncio.ensure_future(run_in_threadpool(model_registry.warm_up, settings.MODEL_WARMUP))
+    if not settings.MODEL_WARMUP_BACKGROUND:
+        await app.state.warm_up
+    # Index the searchable tables created before their full-text index
+    async with async_engine.begin() as connection:
+        await connection.run_sync(setup_full_text_indexes)
+    app.state.task_workers = TaskWorkerPool(task_queue) if settings.TASK_WORKERS_ENABLED else None
+    if app.state.task_workers is not None:
+        await app.state.task_workers.start()
+    if settings.EMBEDDINGS_ENABLED:
+        await embedding_indexer.start()
+    yield
+    # Stop scheduling pipelines, their checkpoints let them be resumed
+    await dag_scheduler.stop()
+    # Let running task actions finish, unfinished runs are claimed again after their lease
+    if app.state.task_workers is not None:
+        await app.state.task_workers.stop()
+    # Embed the rows still pending and write the vector indexes to disk
+    await embedding_indexer.stop()
+    # Let a running warm-up finish, its thread cannot be interrupted
+    await asyncio.wait([app.state.warm_up])
+    # Stop the inference workers, letting running calls finish
+    await run_in_threadpool(inference_pool.shutdown)
+    # Close the connections of the search backend and of the database pool
+    await search_index.close()
+    await async_engine.dispose()
+    # Write the log records still queued and stop the logging listener thread
+    await run_in_threadpool(shutdown_logger)
 
 # Initialize the FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Include routers for different endpoints
@@ -37,24 +96,48 @@ setup_logger()
 # Add error handlers
 add_error_handlers(app)
 
-# Dependency to get DB session
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Record request latencies and database query timings for Prometheus
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+    instrument_engine(async_engine)
+
+# Trace requests through services, database queries and inference, exported over OTLP
+if settings.TRACING_ENABLED:
+    setup_tracing(app, async_engine)
 
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Welcome to the NLP Service API"}
 
-# Health check endpoint
+# Prometheus scrape endpoint
+@app.get("/metrics", tags=["Monitoring"], include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+# Liveness endpoint, the process is up and serving requests
 @app.get("/health", tags=["Health"])
 async def health_check():
     return {"status": "healthy"}
 
+# Readiness endpoint, the configured models are loaded and the database answers
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    warm_up = getattr(app.state, "warm_up", None)
+    if warm_up is None or not warm_up.done():
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    # A model that failed to warm up would be loaded inline by the first request using it
+    missing = model_registry.missing_models(settings.MODEL_WARMUP)
+    if missing:
+        return JSONResponse(status_code=503, content={"status": "models_unavailable", "models": missing})
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(status_code=503, content={"status": "database_unavailable"})
+    models = [f"{backend}:{model}" for model, backend in model_registry.loaded_models()]
+    return {"status": "ready", "models": models}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
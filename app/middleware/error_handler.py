@@ -5,6 +5,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from app.core.inference_pool import InferenceQueueFull
 import logging
 
 # Initialize logger
@@ -54,6 +55,25 @@ def add_error_handlers(app: FastAPI):
             content={"detail": exc.errors()},
         )
 
+    @app.exception_handler(InferenceQueueFull)
+    async def inference_queue_full_handler(request: Request, exc: InferenceQueueFull):
+        """
+        Handle a full inference queue by asking the client to back off.
+
+        Args:
+            request (Request): The request instance.
+            exc (InferenceQueueFull): The inference queue full exception instance.
+
+        Returns:
+            JSONResponse: The JSON response with error details and a Retry-After header.
+        """
+        logger.warning(f"Inference queue is full, rejecting {request.url.path}")
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many inference requests, retry later."},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(SQLAlchemyError)
     async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
         """
@@ -0,0 +1,65 @@
+## app/middleware/metrics.py
+
+import time
+from typing import Any
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration, http_requests_in_flight
+
+# Route label of requests matching no route, so unknown paths do not create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Method label of requests with any other HTTP method, so made-up methods do not create new series
+OTHER_METHOD = "OTHER"
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording the latency and in-flight count of HTTP requests.
+
+    Requests are labelled with the template of the route they match, e.g.
+    /api/v1/agents/{name}, never with the raw path, and with their method folded
+    into a fixed set, which keeps the number of series bounded by the number of routes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize a PrometheusMiddleware instance.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+        """
+        self.app = app
+
+    def _route_template(self, scope: Scope) -> str:
+        for route in scope["app"].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in HTTP_METHODS else OTHER_METHOD
+        route = self._route_template(scope)
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method, route)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            http_request_duration.labels(method, route, status).observe(time.perf_counter() - start)
@@ -1,19 +1,72 @@
 ## app/models/agent.py
 
-from transformers import pipeline
+import asyncio
+from typing import Any
 
-class Agent:
-    def __init__(self, name: str, model_name_or_path: str):
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import synonym
+from app.core.batching import get_batching_engine
+from app.core.model_registry import model_registry
+from app.core.prediction_cache import model_revision, predict_with_cache, prediction_cache
+from app.db.base_class import Base, TimestampMixin
+
+class Agent(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    model = Column(String, nullable=False)
+    backend = Column(String, nullable=False, default="torch")
+    # The name used by the model registry and the prediction cache
+    model_name_or_path = synonym("model")
+
+    @property
+    def nlp_pipeline(self) -> Any:
         """
-        Initialize an Agent instance with a name and a model.
+        Get the model pipeline of the agent, taking a reference to the shared model on first use.
 
-        Args:
-            name (str): The name of the agent.
-            model_name_or_path (str): The name or path of the model to be used for processing text.
+        Loading agents from the database does not load their models, only processing text does.
+
+        Returns:
+            Any: The shared pipeline.
+        """
+        nlp_pipeline = self.__dict__.get("_nlp_pipeline")
+        if nlp_pipeline is None:
+            nlp_pipeline = model_registry.acquire(self.model_name_or_path, self.backend)
+            self.__dict__["_nlp_pipeline"] = nlp_pipeline
+        return nlp_pipeline
+
+    async def nlp_pipeline_async(self) -> Any:
+        """
+        Get the model pipeline of the agent like nlp_pipeline, loading the model off the event loop.
+
+        A first load takes seconds, during which other requests and the timeouts of
+        the caller keep running. A load outliving a cancelled caller drops its reference.
+
+        Returns:
+            Any: The shared pipeline.
+        """
+        nlp_pipeline = self.__dict__.get("_nlp_pipeline")
+        if nlp_pipeline is not None:
+            return nlp_pipeline
+        model_name_or_path, backend = self.model_name_or_path, self.backend
+        load = asyncio.ensure_future(asyncio.to_thread(model_registry.acquire, model_name_or_path, backend))
+        try:
+            nlp_pipeline = await asyncio.shield(load)
+        except asyncio.CancelledError:
+            load.add_done_callback(lambda done: done.cancelled() or done.exception() or model_registry.release(model_name_or_path, backend))
+            raise
+        if "_nlp_pipeline" in self.__dict__:
+            # A concurrent call of the same agent got there first
+            model_registry.release(model_name_or_path, backend)
+            return self.__dict__["_nlp_pipeline"]
+        self.__dict__["_nlp_pipeline"] = nlp_pipeline
+        return nlp_pipeline
+
+    def close(self) -> None:
+        """
+        Release the agent's reference to the shared model so it can be evicted when unused.
         """
-        self.name = name
-        # Initialize the NLP model pipeline for text processing
-        self.nlp_pipeline = pipeline("text-classification", model=model_name_or_path)
+        if self.__dict__.pop("_nlp_pipeline", None) is not None:
+            model_registry.release(self.model_name_or_path, self.backend)
 
     def process_text(self, text: str) -> dict:
         """
@@ -25,7 +78,27 @@ class Agent:
         Returns:
             dict: The result of the text processing, including the model's predictions.
         """
-        # Use the NLP pipeline to process the text and obtain predictions
-        predictions = self.nlp_pipeline(text)
+        # Use the NLP pipeline to process the text and obtain predictions, unless they are cached
+        prediction = predict_with_cache(self.nlp_pipeline, self.model_name_or_path, self.backend, [text])[0]
+        predictions = [prediction] if isinstance(prediction, dict) else prediction
         # Return the processed text along with the model's predictions
         return {"processed_text": text, "predictions": predictions, "model": self.name}
+
+    async def process_text_async(self, text: str) -> dict:
+        """
+        Process the given text, batching it with concurrent requests for the same model.
+
+        Args:
+            text (str): The text to be processed.
+
+        Returns:
+            dict: The result of the text processing, including the model's predictions.
+        """
+        revision = model_revision(await self.nlp_pipeline_async())
+        prediction = prediction_cache.get_local(self.model_name_or_path, self.backend, revision, text)
+        if prediction is None:
+            # The shared cache tier is checked by the batch worker, off the event loop
+            prediction = await get_batching_engine(self.model_name_or_path, self.backend).submit(text)
+        # A batched pipeline call yields one prediction per text, wrap it like a single-text call
+        predictions = [prediction] if isinstance(prediction, dict) else prediction
+        return {"processed_text": text, "predictions": predictions, "model": self.name}
@@ -1,12 +1,13 @@
 ## app/models/ethics.py
 
 from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class Ethics(Base):
     id = Column(Integer, primary_key=True, index=True)
-    principles = relationship("EthicalPrinciple", back_populates="ethics")
+    principles = relationship("EthicalPrinciple", back_populates="ethics", cascade="all, delete-orphan", order_by="EthicalPrinciple.id")
 
     def __repr__(self) -> str:
         """
@@ -17,11 +18,27 @@ class Ethics(Base):
         """
         return f"Ethics(id={self.id})"
 
+class Principle(Base):
+    # Each distinct principle text is stored once and referenced by every ethics set applying it
+    id = Column(Integer, primary_key=True, index=True)
+    text = Column(String, unique=True, nullable=False)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the principle instance.
+
+        Returns:
+            str: The string representation of the principle instance.
+        """
+        return f"Principle(id={self.id}, text={self.text})"
+
 class EthicalPrinciple(Base):
     id = Column(Integer, primary_key=True, index=True)
-    principle = Column(String, index=True)
-    ethics_id = Column(Integer, ForeignKey('ethics.id'))
+    ethics_id = Column(Integer, ForeignKey('ethics.id', ondelete="CASCADE"), index=True, nullable=False)
+    principle_id = Column(Integer, ForeignKey('principle.id'), index=True, nullable=False)
     ethics = relationship("Ethics", back_populates="principles")
+    text_ref = relationship("Principle")
+    principle = association_proxy("text_ref", "text")
 
     def __repr__(self) -> str:
         """
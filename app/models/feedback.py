@@ -1,16 +1,17 @@
 ## app/models/feedback.py
 
-class Feedback:
-    def __init__(self, user: str, content: str):
-        """
-        Initialize a Feedback instance.
-
-        Args:
-            user (str): The user who provided the feedback.
-            content (str): The content of the feedback.
-        """
-        self.user = user
-        self.content = content
+from sqlalchemy import Column, Float, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
+
+class Feedback(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    # A user may leave several feedbacks, the index is not unique
+    user = Column(String, index=True, nullable=False)
+    content = Column(Text, nullable=False)
+    # The title of the recommendation the feedback is about, if any, and the rating given to it
+    item = Column(String, index=True, nullable=True)
+    # None is an implicit positive signal, e.g. a click, weighted as a rating of 1
+    rating = Column(Float, nullable=True)
 
     def update_content(self, new_content: str) -> None:
         """
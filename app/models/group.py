@@ -1,21 +1,51 @@
 ## app/models/group.py
 
-from typing import List
+from typing import Dict, List
 
-class Group:
-    def __init__(self, name: str, members: List[str] = None):
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String, func, select
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.orderinglist import ordering_list
+from sqlalchemy.orm import column_property, relationship
+from app.db.base_class import Base, TimestampMixin
+
+class Group(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    # Groups may have tens of thousands of members, their links are never loaded implicitly:
+    # load them with selectinload(Group.member_links) for in-memory edits, or page through
+    # them with GroupService.list_members. The database deletes them with their group.
+    member_links = relationship(
+        "GroupMember",
+        back_populates="group",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+        order_by="GroupMember.position",
+        collection_class=ordering_list("position"),
+    )
+    # Member names in insertion order, backed by one group_members row per member
+    members = association_proxy("member_links", "member", creator=lambda member: GroupMember(member=member))
+
+    @property
+    def _member_index(self) -> Dict[str, "GroupMember"]:
+        # Membership link of each member, built on first use so that membership checks are O(1)
+        index = self.__dict__.get("_member_index_cache")
+        if index is None:
+            index = {link.member: link for link in self.member_links}
+            self.__dict__["_member_index_cache"] = index
+        return index
+
+    def has_member(self, member: str) -> bool:
         """
-        Initialize a Group instance.
+        Check whether a member belongs to the group.
 
         Args:
-            name (str): The name of the group.
-            members (List[str]): The members of the group, defaults to None and is set to an empty list if not provided.
+            member (str): The member to be checked.
+
+        Returns:
+            bool: True if the member belongs to the group.
         """
-        self.name = name
-        if members is None:
-            self.members = []
-        else:
-            self.members = members
+        return member in self._member_index
 
     def add_member(self, member: str) -> None:
         """
@@ -24,18 +54,25 @@ class Group:
         Args:
             member (str): The member to be added.
         """
-        if member not in self.members:
-            self.members.append(member)
+        index = self._member_index
+        if member not in index:
+            link = GroupMember(member=member)
+            self.member_links.append(link)
+            index[member] = link
 
     def remove_member(self, member: str) -> None:
         """
         Remove a member from the group.
 
+        Removing from a loaded group renumbers the positions of the members after it,
+        large groups are better edited with GroupService.remove_members.
+
         Args:
             member (str): The member to be removed.
         """
-        if member in self.members:
-            self.members.remove(member)
+        link = self._member_index.pop(member, None)
+        if link is not None:
+            self.member_links.remove(link)
 
     def get_members(self) -> List[str]:
         """
@@ -44,7 +81,7 @@ class Group:
         Returns:
             List[str]: The list of members.
         """
-        return self.members
+        return list(self.members)
 
     def __repr__(self) -> str:
         """
@@ -53,4 +90,37 @@ class Group:
         Returns:
             str: The string representation of the group.
         """
-        return f"Group(name={self.name}, members={self.members})"
+        if "member_links" not in self.__dict__:
+            return f"Group(name={self.name})"
+        return f"Group(name={self.name}, members={self.get_members()})"
+
+class GroupMember(Base):
+    __tablename__ = "group_members"
+    # The primary key serves membership checks, the indexes serve listing the members
+    # of a group in order and the groups of a member
+    __table_args__ = (
+        Index("ix_group_members_group_id_position_member", "group_id", "position", "member"),
+        Index("ix_group_members_member_group_id", "member", "group_id"),
+    )
+
+    group_id = Column(Integer, ForeignKey("group.id", ondelete="CASCADE"), primary_key=True)
+    member = Column(String, primary_key=True)
+    position = Column(Integer, nullable=False)
+    # The weight of the member's agent in the group's ensemble predictions
+    weight = Column(Float, nullable=False, default=1.0, server_default="1")
+    group = relationship("Group", back_populates="member_links")
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the group membership.
+
+        Returns:
+            str: The string representation of the group membership.
+        """
+        return f"GroupMember(group_id={self.group_id}, member={self.member})"
+
+# The number of members of a group, only counted when loaded with undefer(Group.member_count)
+Group.member_count = column_property(
+    select(func.count()).where(GroupMember.group_id == Group.id).correlate_except(GroupMember).scalar_subquery(),
+    deferred=True,
+)
@@ -1,16 +1,12 @@
 ## app/models/influence.py
 
-class Influence:
-    def __init__(self, name: str, effect: str):
-        """
-        Initialize an Influence instance.
+from sqlalchemy import Column, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
 
-        Args:
-            name (str): The name of the influence.
-            effect (str): The effect of the influence.
-        """
-        self.name = name
-        self.effect = effect
+class Influence(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    effect = Column(Text, nullable=False)
 
     def __repr__(self) -> str:
         """
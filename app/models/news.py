@@ -3,10 +3,11 @@
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.search import full_text_index
 
 class News(Base):
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    title = Column(String, unique=True, index=True)
     content = Column(Text)
 
     def update_content(self, new_content: str) -> None:
@@ -35,3 +36,6 @@ class News(Base):
             str: The string representation of the news article.
         """
         return f"News(id={self.id}, title={self.title}, content={self.content})"
+
+# Matches in the title rank ten times higher than matches in the content
+full_text_index(News, key="title", columns=("title", "content"), weights=(10.0, 1.0))
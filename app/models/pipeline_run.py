@@ -0,0 +1,30 @@
+## app/models/pipeline_run.py
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
+
+class PipelineRun(Base, TimestampMixin):
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (Index("ix_pipeline_runs_task_name_id", "task_name", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    # The task whose upstream tasks and itself are run
+    task_name = Column(String, nullable=False)
+    # running, succeeded or failed
+    status = Column(String, nullable=False, default="running")
+    # The maximum number of tasks of the pipeline running at once
+    parallelism = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=True)
+    # The checkpoint of the pipeline: the action, dependencies, status, task run and result of each of its tasks
+    nodes = Column(JSON, nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the pipeline run.
+
+        Returns:
+            str: The string representation of the pipeline run.
+        """
+        return f"PipelineRun(id={self.id}, task_name={self.task_name}, status={self.status})"
@@ -1,16 +1,12 @@
 ## app/models/recommendation.py
 
-class Recommendation:
-    def __init__(self, title: str, content: str):
-        """
-        Initialize a Recommendation instance.
+from sqlalchemy import Column, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
 
-        Args:
-            title (str): The title of the recommendation.
-            content (str): The content of the recommendation.
-        """
-        self.title = title
-        self.content = content
+class Recommendation(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, unique=True, index=True, nullable=False)
+    content = Column(Text, nullable=False)
 
     def update_content(self, new_content: str) -> None:
         """
@@ -1,16 +1,12 @@
 ## app/models/role.py
 
-class Role:
-    def __init__(self, name: str, description: str):
-        """
-        Initialize a Role instance.
+from sqlalchemy import Column, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
 
-        Args:
-            name (str): The name of the role.
-            description (str): The description of the role.
-        """
-        self.name = name
-        self.description = description
+class Role(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    description = Column(Text, nullable=False)
 
     def __repr__(self) -> str:
         """
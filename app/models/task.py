@@ -1,16 +1,14 @@
 ## app/models/task.py
 
-class Task:
-    def __init__(self, name: str, action: str):
-        """
-        Initialize a Task instance.
+from sqlalchemy import JSON, Column, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
 
-        Args:
-            name (str): The name of the task.
-            action (str): The action associated with the task.
-        """
-        self.name = name
-        self.action = action
+class Task(Base, TimestampMixin):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    action = Column(Text, nullable=False)
+    # The names of the tasks this task runs after in a pipeline
+    depends_on = Column(JSON, nullable=False, default=list, server_default="[]")
 
     def __repr__(self) -> str:
         """
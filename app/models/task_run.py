@@ -0,0 +1,41 @@
+## app/models/task_run.py
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from app.db.base_class import Base, TimestampMixin
+
+class TaskRun(Base, TimestampMixin):
+    __tablename__ = "task_runs"
+    # The first index serves claiming the next runs, the second listing the runs of a task
+    __table_args__ = (
+        Index("ix_task_runs_status_priority_available_at", "status", "priority", "available_at"),
+        Index("ix_task_runs_task_name_id", "task_name", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_name = Column(String, nullable=False)
+    action = Column(Text, nullable=False)
+    payload = Column(JSON, nullable=True)
+    # queued, running, succeeded or failed
+    status = Column(String, nullable=False, default="queued")
+    # Higher priorities are claimed first
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # When a queued run may be claimed, later than now while it backs off before a retry
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    # The worker holding a running run, and when the run is handed to another worker if it is not finished
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the task run.
+
+        Returns:
+            str: The string representation of the task run.
+        """
+        return f"TaskRun(id={self.id}, task_name={self.task_name}, status={self.status})"
@@ -2,10 +2,11 @@
 
 from sqlalchemy import Column, Integer, String, Text
 from app.db.base_class import Base
+from app.db.search import full_text_index
 
 class Training(Base):
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    title = Column(String, unique=True, index=True)
     content = Column(Text)
 
     def update_content(self, new_content: str) -> None:
@@ -34,3 +35,6 @@ class Training(Base):
             str: The string representation of the training.
         """
         return f"Training(id={self.id}, title={self.title}, content={self.content})"
+
+# Matches in the title rank ten times higher than matches in the content
+full_text_index(Training, key="title", columns=("title", "content"), weights=(10.0, 1.0))
@@ -0,0 +1,27 @@
+## app/models/user_recommendation.py
+
+from sqlalchemy import Column, Float, Index, Integer, String
+from app.db.base_class import Base, TimestampMixin
+
+class UserRecommendation(Base, TimestampMixin):
+    __tablename__ = "user_recommendations"
+    # Serves the recommendations of a user in rank order
+    __table_args__ = (Index("ix_user_recommendations_user_rank", "user", "rank", unique=True),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user = Column(String, nullable=False)
+    # The title of the recommended recommendation
+    item = Column(String, nullable=False)
+    # The predicted affinity of the user for the item
+    score = Column(Float, nullable=False)
+    # The position of the item in the recommendations of the user, from 0
+    rank = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the user recommendation.
+
+        Returns:
+            str: The string representation of the user recommendation.
+        """
+        return f"UserRecommendation(user={self.user}, item={self.item}, rank={self.rank})"
@@ -1,11 +1,21 @@
 ## app/schemas/agent.py
 
+from typing import List, Literal
+
 from pydantic import BaseModel, Field
 
 class AgentCreate(BaseModel):
     name: str = Field(..., description="The name of the agent.")
     model: str = Field(..., description="The model associated with the agent.")
+    backend: Literal["torch", "onnx", "onnx-int8"] = Field(default="torch", description="The inference backend of the model, onnx-int8 serves the dynamically quantized ONNX graph.")
 
 class Agent(BaseModel):
     name: str = Field(..., description="The name of the agent.")
     model: str = Field(..., description="The model associated with the agent.")
+    backend: str = Field(default="torch", description="The inference backend of the model.")
+
+    class Config:
+        orm_mode = True
+
+class ClassifyRequest(BaseModel):
+    texts: List[str] = Field(..., description="The texts to be classified by the agent's model.")
@@ -0,0 +1,22 @@
+## app/schemas/bulk.py
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+class BulkFailure(BaseModel):
+    index: int = Field(..., description="The position of the failed item in the request.")
+    error: str = Field(..., description="Why the item was not written.")
+
+class BulkResult(BaseModel):
+    succeeded: int = Field(..., description="The number of items written.")
+    failed: List[BulkFailure] = Field(default=[], description="The items that were not written.")
+
+    class Config:
+        orm_mode = True
+
+class BulkDelete(BaseModel):
+    keys: List[str] = Field(..., description="The names or titles of the items to be deleted.", min_items=1)
+
+class BulkDeleteResult(BaseModel):
+    deleted: int = Field(..., description="The number of items deleted.")
@@ -1,5 +1,5 @@
 ## app/schemas/ethics.py
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class EthicsCreate(BaseModel):
@@ -8,3 +8,10 @@ class EthicsCreate(BaseModel):
 class Ethics(BaseModel):
     id: int = Field(..., description="The unique identifier of the applied ethics.")
     principles: List[str] = Field(default=[], description="List of applied ethical principles.")
+
+class EthicsPage(BaseModel):
+    items: List[Ethics] = Field(..., description="The applied ethics on the page.")
+    next_cursor: Optional[str] = Field(default=None, description="The cursor of the next page, null on the last page.")
+
+    class Config:
+        orm_mode = True
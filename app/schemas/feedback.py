@@ -1,9 +1,12 @@
 ## app/schemas/feedback.py
+from typing import Optional
 from pydantic import BaseModel, Field, validator
 
 class FeedbackCreate(BaseModel):
     user: str = Field(..., description="The user who provided the feedback.", min_length=1)
     content: str = Field(..., description="The content of the feedback.", min_length=1)
+    item: Optional[str] = Field(None, description="The title of the recommendation the feedback is about.", min_length=1)
+    rating: Optional[float] = Field(None, description="The rating given to the item, None for an implicit positive signal.")
 
     @validator('user', 'content')
     def not_empty(cls, v, field):
@@ -14,9 +17,18 @@ class FeedbackCreate(BaseModel):
 class Feedback(BaseModel):
     user: str = Field(..., description="The user who provided the feedback.")
     content: str = Field(..., description="The content of the feedback.")
+    item: Optional[str] = Field(None, description="The title of the recommendation the feedback is about.")
+    rating: Optional[float] = Field(None, description="The rating given to the item, None for an implicit positive signal.")
 
     @validator('user', 'content')
     def not_empty(cls, v, field):
         if not v.strip():
             raise ValueError(f"{field.name} must not be empty")
         return v
+
+    class Config:
+        orm_mode = True
+
+class FeedbackSimilarity(BaseModel):
+    user: str = Field(..., description="The user who provided the feedback.")
+    score: float = Field(..., description="The cosine similarity of the feedback entry with the query, from -1 to 1.")
@@ -1,7 +1,7 @@
 ## app/schemas/group.py
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Literal, Optional
 
 class GroupCreate(BaseModel):
     name: str = Field(..., description="The name of the group.")
@@ -9,6 +9,58 @@ class GroupCreate(BaseModel):
 
 class Group(BaseModel):
     name: str = Field(..., description="The name of the group.")
-    members: List[str] = Field(default=[], description="The list of members in the group.")
+    members: List[str] = Field(default=[], description="The list of members in the group, up to the default page size.")
+    members_next_cursor: Optional[str] = Field(default=None, description="The cursor of the rest of the members at /groups/{name}/members, None if members lists them all.")
+    member_count: int = Field(..., description="The number of members in the group.")
+
     class Config:
         orm_mode = True
+
+class GroupMembers(BaseModel):
+    members: List[str] = Field(..., description="The members to be added or removed.", min_items=1)
+
+class GroupMembersAdded(BaseModel):
+    added: int = Field(..., description="The number of members added, members already in the group are skipped.")
+
+class GroupMembersRemoved(BaseModel):
+    removed: int = Field(..., description="The number of members removed.")
+
+class GroupProcessRequest(BaseModel):
+    text: str = Field(..., description="The text to be processed by every agent of the group.")
+    timeout: Optional[float] = Field(default=None, gt=0, description="The maximum time each agent may take, in seconds, the server default if omitted.")
+    stream: bool = Field(default=False, description="Stream each agent's answer as an NDJSON line as soon as it arrives.")
+
+class AgentAnswer(BaseModel):
+    agent: str = Field(..., description="The name of the agent.")
+    status: str = Field(..., description="ok, timeout if the agent missed the deadline, error, or missing if the member is not an agent.")
+    predictions: Optional[List[Any]] = Field(default=None, description="The predictions of the agent's model, if it answered.")
+    error: Optional[str] = Field(default=None, description="Why the agent failed, if it did.")
+    elapsed_ms: float = Field(..., description="How long the agent took to answer or fail.")
+
+class GroupProcessResult(BaseModel):
+    group: str = Field(..., description="The name of the group.")
+    results: List[AgentAnswer] = Field(..., description="The answer of each agent, in the order they arrived.")
+    complete: bool = Field(..., description="Whether every member answered in time.")
+
+class GroupWeights(BaseModel):
+    weights: Dict[str, float] = Field(..., description="The ensemble weight of each member.")
+
+    @validator('weights')
+    def weights_not_negative(cls, v):
+        if any(weight < 0 for weight in v.values()):
+            raise ValueError("weights must not be negative")
+        return v
+
+class GroupWeightsUpdated(BaseModel):
+    updated: int = Field(..., description="The number of members whose weight was set, members not in the group are skipped.")
+
+class GroupEnsembleRequest(BaseModel):
+    texts: List[str] = Field(..., description="The texts to be classified by every agent of the group.", min_items=1)
+    scheme: Literal["majority", "weighted_average", "max_confidence"] = Field(default="majority", description="How the agents' predictions are combined.")
+
+class GroupEnsembleResult(BaseModel):
+    group: str = Field(..., description="The name of the group.")
+    scheme: str = Field(..., description="How the agents' predictions were combined.")
+    agents: List[str] = Field(..., description="The agents whose predictions were combined.")
+    labels: List[str] = Field(..., description="The combined label of each text.")
+    scores: List[float] = Field(..., description="The confidence of each combined label.")
@@ -9,3 +9,6 @@ class InfluenceCreate(BaseModel):
 class Influence(BaseModel):
     name: str = Field(..., description="The name of the influence.")
     effect: str = Field(..., description="The effect of the influence.")
+
+    class Config:
+        orm_mode = True
@@ -12,3 +12,7 @@ class News(BaseModel):
 
     class Config:
         orm_mode = True
+
+class NewsSimilarity(BaseModel):
+    title: str = Field(..., description="The title of the news article.")
+    score: float = Field(..., description="The cosine similarity of the news article with the query, from -1 to 1.")
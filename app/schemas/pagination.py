@@ -0,0 +1,12 @@
+## app/schemas/pagination.py
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+class Page(BaseModel):
+    items: List[Dict[str, Any]] = Field(..., description="The selected fields of each item on the page.")
+    next_cursor: Optional[str] = Field(default=None, description="The cursor of the next page, null on the last page.")
+
+    class Config:
+        orm_mode = True
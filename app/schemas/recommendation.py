@@ -9,3 +9,11 @@ class RecommendationCreate(BaseModel):
 class Recommendation(BaseModel):
     title: str = Field(..., description="The title of the recommendation.")
     content: str = Field(..., description="The content of the recommendation.")
+
+    class Config:
+        orm_mode = True
+
+class RecommendedItem(BaseModel):
+    title: str = Field(..., description="The title of the recommendation.")
+    content: str = Field(..., description="The content of the recommendation.")
+    score: float = Field(..., description="The predicted affinity of the user for the recommendation.")
@@ -9,3 +9,6 @@ class RoleCreate(BaseModel):
 class Role(BaseModel):
     name: str = Field(..., description="The name of the role.")
     description: str = Field(..., description="The description of the role.")
+
+    class Config:
+        orm_mode = True
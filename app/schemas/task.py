@@ -1,10 +1,70 @@
 ## app/schemas/task.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
 from pydantic import BaseModel, Field
 
 class TaskCreate(BaseModel):
     name: str = Field(..., description="The name of the task.", min_length=1)
     action: str = Field(..., description="The action associated with the task.", min_length=1)
+    depends_on: List[str] = Field(default=[], description="The names of the tasks it runs after in a pipeline.")
+
+class TaskUpdate(BaseModel):
+    action: str = Field(..., description="The new action associated with the task.", min_length=1)
+    depends_on: Optional[List[str]] = Field(default=None, description="The new names of the tasks it runs after, unchanged if omitted.")
 
 class Task(BaseModel):
     name: str = Field(..., description="The name of the task.")
     action: str = Field(..., description="The action associated with the task.")
+    depends_on: List[str] = Field(default=[], description="The names of the tasks it runs after in a pipeline.")
+
+    class Config:
+        orm_mode = True
+
+class TaskRunCreate(BaseModel):
+    payload: Optional[Dict[str, Any]] = Field(default=None, description="The arguments of the task's action.")
+    priority: int = Field(default=0, description="The priority of the run, higher priorities run first.")
+    max_attempts: Optional[int] = Field(default=None, ge=1, description="The number of times the run is attempted, the server default if omitted.")
+
+class TaskRun(BaseModel):
+    id: int = Field(..., description="The id of the run.")
+    task_name: str = Field(..., description="The name of the task.")
+    action: str = Field(..., description="The action run.")
+    payload: Optional[Dict[str, Any]] = Field(default=None, description="The arguments of the action.")
+    status: str = Field(..., description="queued, running, succeeded or failed.")
+    priority: int = Field(..., description="The priority of the run.")
+    attempts: int = Field(..., description="The number of attempts started so far.")
+    max_attempts: int = Field(..., description="The number of times the run is attempted.")
+    available_at: datetime = Field(..., description="When the run may next be attempted.")
+    started_at: Optional[datetime] = Field(default=None, description="When the last attempt started.")
+    finished_at: Optional[datetime] = Field(default=None, description="When the run succeeded or finally failed.")
+    result: Optional[Any] = Field(default=None, description="The result of the action, once succeeded.")
+    error: Optional[str] = Field(default=None, description="The error of the last failed attempt.")
+
+    class Config:
+        orm_mode = True
+
+class PipelineRunCreate(BaseModel):
+    payload: Optional[Dict[str, Any]] = Field(default=None, description="The arguments passed to the action of every task of the pipeline.")
+    parallelism: Optional[int] = Field(default=None, ge=1, description="The maximum number of tasks running at once, the server default if omitted.")
+
+class PipelineNode(BaseModel):
+    action: str = Field(..., description="The action of the task.")
+    depends_on: List[str] = Field(..., description="The names of the tasks it runs after.")
+    status: str = Field(..., description="pending, running, succeeded or failed.")
+    run_id: Optional[int] = Field(default=None, description="The id of the task run, once started.")
+    result: Optional[Any] = Field(default=None, description="The result of the action, once succeeded.")
+    error: Optional[str] = Field(default=None, description="The error of the task run, once failed.")
+
+class PipelineRun(BaseModel):
+    id: int = Field(..., description="The id of the pipeline run.")
+    task_name: str = Field(..., description="The name of the last task of the pipeline.")
+    status: str = Field(..., description="running, succeeded or failed.")
+    parallelism: int = Field(..., description="The maximum number of tasks running at once.")
+    payload: Optional[Dict[str, Any]] = Field(default=None, description="The arguments passed to the action of every task.")
+    nodes: Dict[str, PipelineNode] = Field(..., description="The checkpointed state of each task of the pipeline, by name.")
+    finished_at: Optional[datetime] = Field(default=None, description="When the pipeline run succeeded or failed.")
+    error: Optional[str] = Field(default=None, description="The errors of the failed tasks.")
+
+    class Config:
+        orm_mode = True
@@ -23,3 +23,10 @@ class Training(BaseModel):
         if not v.strip():
             raise ValueError(f"{field.name} must not be empty")
         return v
+
+    class Config:
+        orm_mode = True
+
+class TrainingSimilarity(BaseModel):
+    title: str = Field(..., description="The title of the training.")
+    score: float = Field(..., description="The cosine similarity of the training with the query, from -1 to 1.")
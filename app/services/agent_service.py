@@ -1,13 +1,33 @@
 ## app/services/agent_service.py
 
+from app.core.batching import run_registry_pipeline
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.inference_pool import inference_pool
+from app.core.metrics import instrument_service
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
 from app.models.agent import Agent
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
 
+async def _chunked(items: AsyncIterator[str], size: int) -> AsyncIterator[Tuple[int, List[str]]]:
+    start = 0
+    chunk: List[str] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+@instrument_service
 class AgentService:
     @staticmethod
-    async def create_agent(db: AsyncSession, name: str, model: str) -> Agent:
+    async def create_agent(db: AsyncSession, name: str, model: str, backend: str = "torch") -> Agent:
         """
         Asynchronously create a new agent and save it to the database.
 
@@ -15,14 +35,16 @@ class AgentService:
             db (AsyncSession): The database session.
             name (str): The name of the agent.
             model (str): The model associated with the agent.
+            backend (str): The inference backend of the agent's model.
 
         Returns:
             Agent: The created agent.
         """
-        agent = Agent(name=name, model=model)
+        agent = Agent(name=name, model=model, backend=backend)
         db.add(agent)
         await db.commit()
         await db.refresh(agent)
+        await entity_cache.invalidate(Agent, name)
         return agent
 
     @staticmethod
@@ -37,9 +59,11 @@ class AgentService:
         Returns:
             Optional[Agent]: The retrieved agent or None if not found.
         """
-        result = await db.execute(select(Agent).filter(Agent.name == name))
-        agent = result.scalars().first()
-        return agent
+        async def load() -> Optional[Agent]:
+            result = await db.execute(select(Agent).filter(Agent.name == name))
+            return result.scalars().first()
+
+        return await entity_cache.get(Agent, name, load)
 
     @staticmethod
     async def delete_agent(db: AsyncSession, name: str) -> None:
@@ -55,18 +79,81 @@ class AgentService:
         if agent:
             await db.delete(agent)
             await db.commit()
+            await entity_cache.invalidate(Agent, name)
+
+    @staticmethod
+    async def bulk_upsert_agents(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create agents, or update the ones whose name already exists, in chunked multi-row upserts.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the agents.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of agents written and the failed ones.
+        """
+        result = await bulk_upsert(db, Agent, rows, conflict_keys=("name",), result=result)
+        await entity_cache.invalidate(Agent, *(row["name"] for _, row in rows))
+        return result
 
     @staticmethod
-    async def list_agents(db: AsyncSession) -> List[Agent]:
+    async def bulk_delete_agents(db: AsyncSession, names: List[str]) -> int:
         """
-        Asynchronously list all agents from the database.
+        Asynchronously delete agents by name in chunked transactions.
 
         Args:
             db (AsyncSession): The database session.
+            names (List[str]): The names of the agents to be deleted.
 
         Returns:
-            List[Agent]: A list of all agents.
+            int: The number of agents deleted.
+        """
+        deleted = await bulk_delete(db, Agent, "name", names)
+        await entity_cache.invalidate(Agent, *names)
+        return deleted
+
+    @staticmethod
+    async def list_agents(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of agents from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of agents on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the agents must match.
+
+        Returns:
+            Page: The agents on the page and the cursor of the next page.
+        """
+        return await paginate(db, Agent, limit, cursor, fields, filters)
+
+    @staticmethod
+    async def classify_texts(model: str, texts: AsyncIterator[str], backend: str = "torch", chunk_size: int = settings.CLASSIFY_CHUNK_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronously classify a stream of texts with a model, yielding predictions as each chunk completes.
+
+        Only one chunk of texts and its predictions are held in memory at a time.
+
+        Args:
+            model (str): The name or path of the model to be used.
+            texts (AsyncIterator[str]): The texts to be classified.
+            backend (str): The inference backend of the model.
+            chunk_size (int): The number of texts sent to the model per pipeline call.
+
+        Yields:
+            Dict[str, Any]: The index of each text in the input and its predictions.
         """
-        result = await db.execute(select(Agent))
-        agents = result.scalars().all()
-        return agents
+        async for start, chunk in _chunked(texts, chunk_size):
+            predictions = await inference_pool.run(run_registry_pipeline, model, chunk, backend)
+            for offset, prediction in enumerate(predictions):
+                yield {"index": start + offset, "predictions": prediction}
@@ -1,49 +1,95 @@
 ## app/services/ethics_service.py
 
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
-from app.models.ethics import Ethics, EthicalPrinciple
+from sqlalchemy.orm import joinedload, selectinload
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.metrics import instrument_service
+from app.db.pagination import Page, decode_cursor, encode_cursor
+from app.models.ethics import Ethics, EthicalPrinciple, Principle
 
+@instrument_service
 class EthicsService:
     @staticmethod
-    async def apply_ethics(db: AsyncSession, principles: List[str]) -> Ethics:
+    async def _intern_principles(db: AsyncSession, texts: List[str]) -> Dict[str, int]:
         """
-        Asynchronously apply ethics principles and save them to the database.
+        Asynchronously get the ids of principle texts, storing the texts that are new.
 
         Args:
             db (AsyncSession): The database session.
-            principles (List[str]): The list of ethics principles to be applied.
+            texts (List[str]): The distinct principle texts.
 
         Returns:
-            Ethics: The applied ethics principles.
+            Dict[str, int]: The id of each principle text.
         """
-        ethics = Ethics()
-        db.add(ethics)
-        await db.commit()
-        await db.refresh(ethics)
+        dialect = db.bind.dialect.name
+        ids: Dict[str, int] = {}
+        for start in range(0, len(texts), settings.BULK_CHUNK_SIZE):
+            chunk = texts[start:start + settings.BULK_CHUNK_SIZE]
+            if dialect in ("postgresql", "sqlite"):
+                make_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+                await db.execute(make_insert(Principle).values([{"text": text} for text in chunk]).on_conflict_do_nothing(index_elements=["text"]))
+            result = await db.execute(select(Principle.text, Principle.id).where(Principle.text.in_(chunk)))
+            ids.update(result.all())
+            missing = [text for text in chunk if text not in ids]
+            if missing:
+                await db.execute(insert(Principle), [{"text": text} for text in missing])
+                result = await db.execute(select(Principle.text, Principle.id).where(Principle.text.in_(missing)))
+                ids.update(result.all())
+        return ids
 
-        for principle in principles:
-            ethical_principle = EthicalPrinciple(principle=principle, ethics_id=ethics.id)
-            db.add(ethical_principle)
+    @staticmethod
+    async def apply_ethics(db: AsyncSession, principles: List[str]) -> Dict[str, Any]:
+        """
+        Asynchronously apply ethics principles and save them to the database in a single transaction.
 
-        await db.commit()
-        return ethics
+        Args:
+            db (AsyncSession): The database session.
+            principles (List[str]): The list of ethics principles to be applied.
+
+        Returns:
+            Dict[str, Any]: The id of the applied ethics and its principles.
+        """
+        texts = list(dict.fromkeys(principles))
+        try:
+            ids = await EthicsService._intern_principles(db, texts)
+            ethics = Ethics()
+            db.add(ethics)
+            await db.flush()
+            if texts:
+                await db.execute(insert(EthicalPrinciple), [{"ethics_id": ethics.id, "principle_id": ids[text]} for text in texts])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return {"id": ethics.id, "principles": texts}
 
     @staticmethod
-    async def get_all_ethics(db: AsyncSession) -> List[Ethics]:
+    async def get_all_ethics(db: AsyncSession, limit: int = settings.PAGE_SIZE_DEFAULT, cursor: Optional[str] = None) -> Page:
         """
-        Asynchronously retrieve all applied ethics principles from the database.
+        Asynchronously retrieve one page of applied ethics principles from the database.
+
+        The ethics of the page and all their principles are loaded in two queries.
 
         Args:
             db (AsyncSession): The database session.
+            limit (int): The maximum number of ethics on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
 
         Returns:
-            List[Ethics]: A list of all applied ethics principles.
+            Page: The applied ethics principles on the page and the cursor of the next page.
         """
-        result = await db.execute(select(Ethics))
+        statement = select(Ethics).options(selectinload(Ethics.principles).joinedload(EthicalPrinciple.text_ref))
+        if cursor is not None:
+            statement = statement.where(Ethics.id > decode_cursor(cursor))
+        result = await db.execute(statement.order_by(Ethics.id).limit(limit + 1))
         ethics_list = result.scalars().all()
-        return ethics_list
+        next_cursor = encode_cursor(ethics_list[limit - 1].id) if len(ethics_list) > limit else None
+        items = [{"id": ethics.id, "principles": [p.principle for p in ethics.principles]} for ethics in ethics_list[:limit]]
+        return Page(items=items, next_cursor=next_cursor)
 
     @staticmethod
     async def delete_ethics(db: AsyncSession, id: int) -> None:
@@ -54,8 +100,6 @@ class EthicsService:
             db (AsyncSession): The database session.
             id (int): The id of the ethics principles to be deleted.
         """
-        result = await db.execute(select(Ethics).filter(Ethics.id == id))
-        ethics = result.scalars().first()
-        if ethics:
-            await db.delete(ethics)
-            await db.commit()
+        await db.execute(delete(EthicalPrinciple).where(EthicalPrinciple.ethics_id == id))
+        await db.execute(delete(Ethics).where(Ethics.id == id))
+        await db.commit()
@@ -1,13 +1,20 @@
 ## app/services/feedback_service.py
 
+from app.core.config import settings
+from app.core.embeddings import embedding_indexer
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
 from app.models.feedback import Feedback
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict, Tuple
 
+@instrument_service
 class FeedbackService:
     @staticmethod
-    async def create_feedback(db: AsyncSession, user: str, content: str) -> Feedback:
+    async def create_feedback(db: AsyncSession, user: str, content: str, item: Optional[str] = None, rating: Optional[float] = None) -> Feedback:
         """
         Asynchronously create a new feedback entry and save it to the database.
 
@@ -15,14 +22,18 @@ class FeedbackService:
             db (AsyncSession): The database session.
             user (str): The user who provided the feedback.
             content (str): The content of the feedback.
+            item (Optional[str]): The title of the recommendation the feedback is about.
+            rating (Optional[float]): The rating given to the item, None for an implicit positive signal.
 
         Returns:
             Feedback: The created feedback entry.
         """
-        feedback = Feedback(user=user, content=content)
+        feedback = Feedback(user=user, content=content, item=item, rating=rating)
         db.add(feedback)
         await db.commit()
         await db.refresh(feedback)
+        await entity_cache.invalidate(Feedback, user)
+        embedding_indexer.submit(Feedback, [feedback.id])
         return feedback
 
     @staticmethod
@@ -37,9 +48,11 @@ class FeedbackService:
         Returns:
             Optional[Feedback]: The retrieved feedback or None if not found.
         """
-        result = await db.execute(select(Feedback).filter(Feedback.user == user))
-        feedback = result.scalars().first()
-        return feedback
+        async def load() -> Optional[Feedback]:
+            result = await db.execute(select(Feedback).filter(Feedback.user == user))
+            return result.scalars().first()
+
+        return await entity_cache.get(Feedback, user, load)
 
     @staticmethod
     async def delete_feedback(db: AsyncSession, user: str) -> None:
@@ -55,18 +68,83 @@ class FeedbackService:
         if feedback:
             await db.delete(feedback)
             await db.commit()
+            await entity_cache.invalidate(Feedback, user)
+            embedding_indexer.submit(Feedback, [feedback.id])
+
+    @staticmethod
+    async def bulk_create_feedbacks(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create feedback entries in chunked multi-row inserts.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the feedback entries.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of feedback entries written and the failed ones.
+        """
+        result = await bulk_upsert(db, Feedback, rows, result=result)
+        await entity_cache.invalidate(Feedback, *(row["user"] for _, row in rows))
+        failed = {failure["index"] for failure in result.failed}
+        # Feedback entries have no unique key, every entry of the users is submitted and those already indexed are embedded again
+        users = list({row["user"] for index, row in rows if index not in failed})
+        embedding_indexer.submit(Feedback, await embedding_indexer.row_ids(db, Feedback, users))
+        return result
+
+    @staticmethod
+    async def bulk_delete_feedbacks(db: AsyncSession, users: List[str]) -> int:
+        """
+        Asynchronously delete feedback entries by user in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            users (List[str]): The users of the feedback entries to be deleted.
+
+        Returns:
+            int: The number of feedback entries deleted.
+        """
+        ids = await embedding_indexer.row_ids(db, Feedback, users)
+        deleted = await bulk_delete(db, Feedback, "user", users)
+        embedding_indexer.submit(Feedback, ids)
+        await entity_cache.invalidate(Feedback, *users)
+        return deleted
+
+    @staticmethod
+    async def list_feedbacks(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of feedback entries from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of feedback entries on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the feedback entries must match.
+
+        Returns:
+            Page: The feedback entries on the page and the cursor of the next page.
+        """
+        return await paginate(db, Feedback, limit, cursor, fields, filters)
 
     @staticmethod
-    async def list_feedbacks(db: AsyncSession) -> List[Feedback]:
+    async def search_similar_feedbacks(db: AsyncSession, text: str, k: int = 10) -> List[Dict[str, Any]]:
         """
-        Asynchronously list all feedback entries from the database.
+        Asynchronously find the feedback entries closest in meaning to a text.
 
         Args:
             db (AsyncSession): The database session.
+            text (str): The text to be compared with the feedback entries.
+            k (int): The maximum number of feedback entries.
 
         Returns:
-            List[Feedback]: A list of all feedback entries.
+            List[Dict[str, Any]]: The user and cosine similarity of each feedback entry, most similar first.
         """
-        result = await db.execute(select(Feedback))
-        feedbacks = result.scalars().all()
-        return feedbacks
+        vector = await embedding_indexer.embed_query(text)
+        return await embedding_indexer.similar(db, Feedback, vector, k)
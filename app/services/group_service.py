@@ -1,10 +1,27 @@
 ## app/services/group_service.py
 
-from app.models.group import Group
+import asyncio
+from app.core.batching import run_registry_pipeline
+from app.core.config import settings
+from app.core.ensemble import ensemble_predictions
+from app.core.entity_cache import entity_cache
+from app.core.inference_pool import inference_pool
+from app.core.metrics import instrument_service
+from app.core.scatter_gather import scatter_gather
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, decode_cursor, decode_key_cursor, encode_cursor, encode_key_cursor, paginate
+from app.models.agent import Agent
+from app.models.group import Group, GroupMember
+from sqlalchemy import delete, func, insert, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
+from sqlalchemy.orm import undefer
+from typing import AsyncIterator, List, Optional, Any, Dict, Tuple
 
+async def _group_id(db: AsyncSession, name: str) -> Optional[int]:
+    return (await db.execute(select(Group.id).where(Group.name == name))).scalar()
+
+@instrument_service
 class GroupService:
     @staticmethod
     async def create_group(db: AsyncSession, name: str, members: List[str]) -> Group:
@@ -14,21 +31,25 @@ class GroupService:
         Args:
             db (AsyncSession): The database session.
             name (str): The name of the group.
-            members (List[str]): The members of the group.
+            members (List[str]): The members of the group, repeated members are added once.
 
         Returns:
             Group: The created group.
         """
+        members = list(dict.fromkeys(members))
         group = Group(name=name, members=members)
         db.add(group)
         await db.commit()
-        await db.refresh(group)
+        await db.refresh(group, ["id", "name", "created_at", "updated_at", "member_count"])
+        await entity_cache.invalidate(Group, name)
         return group
 
     @staticmethod
     async def get_group(db: AsyncSession, name: str) -> Optional[Group]:
         """
-        Asynchronously retrieve a group by name from the database.
+        Asynchronously retrieve a group by name from the database, with its number of members but not the members.
+
+        The members are listed one page at a time with list_members.
 
         Args:
             db (AsyncSession): The database session.
@@ -37,9 +58,13 @@ class GroupService:
         Returns:
             Optional[Group]: The retrieved group or None if not found.
         """
-        result = await db.execute(select(Group).filter(Group.name == name))
-        group = result.scalars().first()
-        return group
+        async def load() -> Optional[Group]:
+            # A group already in the session keeps the count it was loaded with unless it is overwritten
+            statement = select(Group).options(undefer(Group.member_count)).filter(Group.name == name)
+            result = await db.execute(statement.execution_options(populate_existing=True))
+            return result.scalars().first()
+
+        return await entity_cache.get(Group, name, load)
 
     @staticmethod
     async def delete_group(db: AsyncSession, name: str) -> None:
@@ -55,18 +80,335 @@ class GroupService:
         if group:
             await db.delete(group)
             await db.commit()
+            await entity_cache.invalidate(Group, name)
+
+    @staticmethod
+    async def bulk_upsert_groups(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create groups, or update the ones whose name already exists, in chunked multi-row upserts.
+
+        The members of each written group replace its previous members.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the groups.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of groups written and the failed ones.
+        """
+        result = await bulk_upsert(db, Group, rows, conflict_keys=("name",), result=result)
+        # Later rows for the same name win, as they do for the group rows
+        members = {row["name"]: list(dict.fromkeys(row.get("members") or [])) for _, row in rows}
+        names = list(members)
+        for start in range(0, len(names), settings.BULK_CHUNK_SIZE):
+            chunk = names[start:start + settings.BULK_CHUNK_SIZE]
+            ids = dict((await db.execute(select(Group.name, Group.id).where(Group.name.in_(chunk)))).all())
+            await db.execute(delete(GroupMember).where(GroupMember.group_id.in_(ids.values())))
+            links = [
+                {"group_id": ids[name], "member": member, "position": position}
+                for name in chunk if name in ids
+                for position, member in enumerate(members[name])
+            ]
+            if links:
+                await db.execute(insert(GroupMember), links)
+            await db.commit()
+        await entity_cache.invalidate(Group, *names)
+        return result
+
+    @staticmethod
+    async def bulk_delete_groups(db: AsyncSession, names: List[str]) -> int:
+        """
+        Asynchronously delete groups by name in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            names (List[str]): The names of the groups to be deleted.
+
+        Returns:
+            int: The number of groups deleted.
+        """
+        deleted = await bulk_delete(db, Group, "name", names)
+        await entity_cache.invalidate(Group, *names)
+        return deleted
+
+    @staticmethod
+    async def list_groups(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of groups from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of groups on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the groups must match.
+
+        Returns:
+            Page: The groups on the page and the cursor of the next page.
+        """
+        return await paginate(db, Group, limit, cursor, fields, filters)
+
+    @staticmethod
+    async def add_members(db: AsyncSession, name: str, members: List[str]) -> Optional[int]:
+        """
+        Asynchronously add members to a group in chunked inserts, without loading its current members.
+
+        Members already in the group are skipped, the new ones are appended in order.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the group.
+            members (List[str]): The members to be added.
+
+        Returns:
+            Optional[int]: The number of members added, None if the group does not exist.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        members = list(dict.fromkeys(members))
+        position = (await db.execute(select(func.max(GroupMember.position)).where(GroupMember.group_id == group_id))).scalar()
+        position = -1 if position is None else position
+        added = 0
+        for start in range(0, len(members), settings.BULK_CHUNK_SIZE):
+            chunk = members[start:start + settings.BULK_CHUNK_SIZE]
+            existing = set((await db.execute(
+                select(GroupMember.member).where(GroupMember.group_id == group_id, GroupMember.member.in_(chunk))
+            )).scalars())
+            links = []
+            for member in chunk:
+                if member not in existing:
+                    position += 1
+                    links.append({"group_id": group_id, "member": member, "position": position})
+            if links:
+                await db.execute(insert(GroupMember), links)
+            await db.commit()
+            added += len(links)
+        await entity_cache.invalidate(Group, name)
+        return added
 
     @staticmethod
-    async def list_groups(db: AsyncSession) -> List[Group]:
+    async def remove_members(db: AsyncSession, name: str, members: List[str]) -> Optional[int]:
         """
-        Asynchronously list all groups from the database.
+        Asynchronously remove members from a group in chunked deletes, without loading its current members.
 
         Args:
             db (AsyncSession): The database session.
+            name (str): The name of the group.
+            members (List[str]): The members to be removed.
 
         Returns:
-            List[Group]: A list of all groups.
+            Optional[int]: The number of members removed, None if the group does not exist.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        members = list(dict.fromkeys(members))
+        removed = 0
+        for start in range(0, len(members), settings.BULK_CHUNK_SIZE):
+            chunk = members[start:start + settings.BULK_CHUNK_SIZE]
+            outcome = await db.execute(
+                delete(GroupMember).where(GroupMember.group_id == group_id, GroupMember.member.in_(chunk))
+            )
+            await db.commit()
+            removed += outcome.rowcount
+        await entity_cache.invalidate(Group, name)
+        return removed
+
+    @staticmethod
+    async def list_members(
+        db: AsyncSession,
+        name: str,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+    ) -> Optional[Page]:
         """
-        result = await db.execute(select(Group))
-        groups = result.scalars().all()
-        return groups
+        Asynchronously list one page of the members of a group, in the order they were added.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the group.
+            limit (int): The maximum number of members on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+
+        Returns:
+            Optional[Page]: The members on the page and the cursor of the next page, None if the group does not exist.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        statement = select(GroupMember.position, GroupMember.member, GroupMember.weight).where(GroupMember.group_id == group_id)
+        # Concurrent add_members calls may give members the same position, the member name breaks the tie
+        if cursor is not None:
+            statement = statement.where(tuple_(GroupMember.position, GroupMember.member) > decode_key_cursor(cursor, (int, str)))
+        rows = (await db.execute(statement.order_by(GroupMember.position, GroupMember.member).limit(limit + 1))).all()
+        next_cursor = encode_key_cursor((rows[limit - 1].position, rows[limit - 1].member)) if len(rows) > limit else None
+        return Page(items=[{"member": row.member, "weight": row.weight} for row in rows[:limit]], next_cursor=next_cursor)
+
+    @staticmethod
+    async def list_groups_by_member(
+        db: AsyncSession,
+        member: str,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of the groups a member belongs to.
+
+        Args:
+            db (AsyncSession): The database session.
+            member (str): The member whose groups are listed.
+            limit (int): The maximum number of groups on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+
+        Returns:
+            Page: The names of the groups on the page and the cursor of the next page.
+        """
+        statement = select(Group.id, Group.name).join(GroupMember, GroupMember.group_id == Group.id).where(GroupMember.member == member)
+        if cursor is not None:
+            statement = statement.where(GroupMember.group_id > decode_cursor(cursor))
+        rows = (await db.execute(statement.order_by(GroupMember.group_id).limit(limit + 1))).all()
+        next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+        return Page(items=[{"name": row.name} for row in rows[:limit]], next_cursor=next_cursor)
+
+    @staticmethod
+    async def get_member_agents(db: AsyncSession, name: str) -> Optional[Dict[str, Optional[Agent]]]:
+        """
+        Asynchronously load the agents named by the members of a group.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the group.
+
+        Returns:
+            Optional[Dict[str, Optional[Agent]]]: The agent of each member in member order, None for members
+                that are not agents, or None if the group does not exist.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        members = (await db.execute(
+            select(GroupMember.member).where(GroupMember.group_id == group_id).order_by(GroupMember.position, GroupMember.member)
+        )).scalars().all()
+        agents: Dict[str, Optional[Agent]] = dict.fromkeys(members)
+        for start in range(0, len(members), settings.BULK_CHUNK_SIZE):
+            chunk = members[start:start + settings.BULK_CHUNK_SIZE]
+            for agent in (await db.execute(select(Agent).where(Agent.name.in_(chunk)))).scalars():
+                agents[agent.name] = agent
+        return agents
+
+    @staticmethod
+    async def process_text(agents: Dict[str, Optional[Agent]], text: str, timeout: float = settings.GROUP_AGENT_TIMEOUT) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronously run a text through every agent of a group at once, yielding each answer as it arrives.
+
+        The whole run takes about as long as the slowest agent, at most the timeout.
+        Agents that miss the timeout or fail are reported with a "timeout" or "error"
+        status, members that are not agents with a "missing" status.
+
+        Args:
+            agents (Dict[str, Optional[Agent]]): The agent of each member, as returned by get_member_agents.
+            text (str): The text to be processed.
+            timeout (float): The maximum time each agent may take, in seconds.
+
+        Yields:
+            Dict[str, Any]: The name of the agent, the status of its answer, its predictions or error and elapsed_ms.
+        """
+        for member, agent in agents.items():
+            if agent is None:
+                yield {"agent": member, "status": "missing", "elapsed_ms": 0.0}
+        calls = {member: (lambda agent=agent: agent.process_text_async(text)) for member, agent in agents.items() if agent is not None}
+        try:
+            async for member, outcome in scatter_gather(calls, timeout):
+                result = outcome.pop("result", None)
+                if result is not None:
+                    outcome["predictions"] = result["predictions"]
+                yield {"agent": member, **outcome}
+        finally:
+            for agent in agents.values():
+                if agent is not None:
+                    agent.close()
+
+    @staticmethod
+    async def set_member_weights(db: AsyncSession, name: str, weights: Dict[str, float]) -> Optional[int]:
+        """
+        Asynchronously set the ensemble weights of members of a group.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the group.
+            weights (Dict[str, float]): The new weight of each member, members not in the group are skipped.
+
+        Returns:
+            Optional[int]: The number of members updated, None if the group does not exist.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        members = list(weights)
+        updated = 0
+        for start in range(0, len(members), settings.BULK_CHUNK_SIZE):
+            chunk = members[start:start + settings.BULK_CHUNK_SIZE]
+            existing = (await db.execute(
+                select(GroupMember.member).where(GroupMember.group_id == group_id, GroupMember.member.in_(chunk))
+            )).scalars().all()
+            if existing:
+                # Bulk UPDATE by primary key, one executemany per chunk
+                await db.execute(update(GroupMember), [{"group_id": group_id, "member": member, "weight": weights[member]} for member in existing])
+            await db.commit()
+            updated += len(existing)
+        return updated
+
+    @staticmethod
+    async def ensemble_classify(db: AsyncSession, name: str, texts: List[str], scheme: str) -> Optional[Dict[str, Any]]:
+        """
+        Asynchronously classify texts with every agent of a group and combine their predictions per text.
+
+        Each distinct model of the group runs once over the texts, in chunks, and the
+        models run concurrently. The predictions are combined with vectorized NumPy
+        operations using the members' weights, see app.core.ensemble.combine.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the group.
+            texts (List[str]): The texts to be classified.
+            scheme (str): The ensemble scheme, "majority", "weighted_average" or "max_confidence".
+
+        Returns:
+            Optional[Dict[str, Any]]: The agents used, and the label and score of each text, None if the group does not exist.
+
+        Raises:
+            ValueError: If no member of the group is an agent, or the weights are invalid.
+        """
+        group_id = await _group_id(db, name)
+        if group_id is None:
+            return None
+        rows = (await db.execute(
+            select(Agent.name, Agent.model, Agent.backend, GroupMember.weight)
+            .join(GroupMember, GroupMember.member == Agent.name)
+            .where(GroupMember.group_id == group_id)
+            .order_by(GroupMember.position, GroupMember.member)
+        )).all()
+        if not rows:
+            raise ValueError(f"Group {name} has no agents")
+
+        async def classify(model: str, backend: str) -> List[Any]:
+            predictions: List[Any] = []
+            for start in range(0, len(texts), settings.CLASSIFY_CHUNK_SIZE):
+                predictions += await inference_pool.run(run_registry_pipeline, model, texts[start:start + settings.CLASSIFY_CHUNK_SIZE], backend)
+            return predictions
+
+        # Agents sharing a model and backend share its predictions
+        models = list(dict.fromkeys((row.model, row.backend) for row in rows))
+        outputs = dict(zip(models, await asyncio.gather(*(classify(model, backend) for model, backend in models))))
+        labels, scores = await inference_pool.run(
+            ensemble_predictions, [outputs[(row.model, row.backend)] for row in rows], [row.weight for row in rows], scheme
+        )
+        return {"group": name, "scheme": scheme, "agents": [row.name for row in rows], "labels": labels, "scores": scores}
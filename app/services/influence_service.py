@@ -1,10 +1,15 @@
 ## app/services/influence_service.py
 
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.db.pagination import Page, paginate
 from app.models.influence import Influence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict
 
+@instrument_service
 class InfluenceService:
     @staticmethod
     async def create_influence(db: AsyncSession, name: str, effect: str) -> Influence:
@@ -23,6 +28,7 @@ class InfluenceService:
         db.add(influence)
         await db.commit()
         await db.refresh(influence)
+        await entity_cache.invalidate(Influence, name)
         return influence
 
     @staticmethod
@@ -37,9 +43,11 @@ class InfluenceService:
         Returns:
             Optional[Influence]: The retrieved influence or None if not found.
         """
-        result = await db.execute(select(Influence).filter(Influence.name == name))
-        influence = result.scalars().first()
-        return influence
+        async def load() -> Optional[Influence]:
+            result = await db.execute(select(Influence).filter(Influence.name == name))
+            return result.scalars().first()
+
+        return await entity_cache.get(Influence, name, load)
 
     @staticmethod
     async def delete_influence(db: AsyncSession, name: str) -> None:
@@ -55,18 +63,27 @@ class InfluenceService:
         if influence:
             await db.delete(influence)
             await db.commit()
+            await entity_cache.invalidate(Influence, name)
 
     @staticmethod
-    async def get_all_influences(db: AsyncSession) -> List[Influence]:
+    async def get_all_influences(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
         """
-        Asynchronously list all influences from the database.
+        Asynchronously list one page of influences from the database.
 
         Args:
             db (AsyncSession): The database session.
+            limit (int): The maximum number of influences on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the influences must match.
 
         Returns:
-            List[Influence]: A list of all influences.
+            Page: The influences on the page and the cursor of the next page.
         """
-        result = await db.execute(select(Influence))
-        influences = result.scalars().all()
-        return influences
+        return await paginate(db, Influence, limit, cursor, fields, filters)
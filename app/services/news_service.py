@@ -2,9 +2,17 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
+from typing import List, Optional, Any, Dict, Tuple
+from app.core.config import settings
+from app.core.embeddings import embedding_indexer
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.core.search import search_index, search_page
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
 from app.models.news import News
 
+@instrument_service
 class NewsService:
     @staticmethod
     async def create_news(db: AsyncSession, title: str, content: str) -> News:
@@ -23,6 +31,9 @@ class NewsService:
         db.add(news)
         await db.commit()
         await db.refresh(news)
+        await entity_cache.invalidate(News, title)
+        await search_index.index(News, [{"title": title, "content": content}])
+        embedding_indexer.submit(News, [news.id])
         return news
 
     @staticmethod
@@ -37,9 +48,11 @@ class NewsService:
         Returns:
             Optional[News]: The retrieved news article or None if not found.
         """
-        result = await db.execute(select(News).filter(News.title == title))
-        news = result.scalars().first()
-        return news
+        async def load() -> Optional[News]:
+            result = await db.execute(select(News).filter(News.title == title))
+            return result.scalars().first()
+
+        return await entity_cache.get(News, title, load)
 
     @staticmethod
     async def delete_news(db: AsyncSession, title: str) -> None:
@@ -55,18 +68,120 @@ class NewsService:
         if news:
             await db.delete(news)
             await db.commit()
+            await entity_cache.invalidate(News, title)
+            await search_index.delete(News, [title])
+            embedding_indexer.submit(News, [news.id])
+
+    @staticmethod
+    async def bulk_upsert_news(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create news articles, or update the ones whose title already exists, in chunked multi-row upserts.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the news articles.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of news articles written and the failed ones.
+        """
+        result = await bulk_upsert(db, News, rows, conflict_keys=("title",), result=result)
+        await entity_cache.invalidate(News, *(row["title"] for _, row in rows))
+        failed = {failure["index"] for failure in result.failed}
+        written = [row for index, row in rows if index not in failed]
+        await search_index.index(News, written)
+        embedding_indexer.submit(News, await embedding_indexer.row_ids(db, News, [row["title"] for row in written]))
+        return result
+
+    @staticmethod
+    async def bulk_delete_news(db: AsyncSession, titles: List[str]) -> int:
+        """
+        Asynchronously delete news articles by title in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            titles (List[str]): The titles of the news articles to be deleted.
+
+        Returns:
+            int: The number of news articles deleted.
+        """
+        ids = await embedding_indexer.row_ids(db, News, titles)
+        deleted = await bulk_delete(db, News, "title", titles)
+        embedding_indexer.submit(News, ids)
+        await entity_cache.invalidate(News, *titles)
+        await search_index.delete(News, titles)
+        return deleted
+
+    @staticmethod
+    async def list_news(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of news articles from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of news articles on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the news articles must match.
+
+        Returns:
+            Page: The news articles on the page and the cursor of the next page.
+        """
+        return await paginate(db, News, limit, cursor, fields, filters)
+
+    @staticmethod
+    async def search_news(db: AsyncSession, query: str, limit: int = settings.PAGE_SIZE_DEFAULT, cursor: Optional[str] = None) -> Page:
+        """
+        Asynchronously search the titles and contents of the news articles, best matches first.
+
+        Args:
+            db (AsyncSession): The database session.
+            query (str): The search terms, all of which must match.
+            limit (int): The maximum number of news articles on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+
+        Returns:
+            Page: The title, highlighted snippet and score of the news articles on the page and the cursor of the next page.
+        """
+        return await search_page(db, News, query, limit, cursor)
 
     @staticmethod
-    async def list_news(db: AsyncSession) -> List[News]:
+    async def search_similar_news(db: AsyncSession, text: str, k: int = 10) -> List[Dict[str, Any]]:
         """
-        Asynchronously list all news articles from the database.
+        Asynchronously find the news articles closest in meaning to a text.
 
         Args:
             db (AsyncSession): The database session.
+            text (str): The text to be compared with the news articles.
+            k (int): The maximum number of news articles.
 
         Returns:
-            List[News]: A list of all news articles.
+            List[Dict[str, Any]]: The title and cosine similarity of each news article, most similar first.
+        """
+        vector = await embedding_indexer.embed_query(text)
+        return await embedding_indexer.similar(db, News, vector, k)
+
+    @staticmethod
+    async def get_similar_news(db: AsyncSession, title: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
         """
-        result = await db.execute(select(News))
-        news_list = result.scalars().all()
-        return news_list
+        Asynchronously find the news articles closest in meaning to a news article.
+
+        Args:
+            db (AsyncSession): The database session.
+            title (str): The title of the news article.
+            k (int): The maximum number of news articles.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The title and cosine similarity of each other news article, most similar first, or None if the news article is not found.
+        """
+        result = await db.execute(select(News).filter(News.title == title))
+        news = result.scalars().first()
+        if news is None:
+            return None
+        return await embedding_indexer.similar_to(db, News, news, k)
@@ -1,10 +1,17 @@
 ## app/services/recommendation_service.py
 
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
 from app.models.recommendation import Recommendation
+from app.models.user_recommendation import UserRecommendation
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict, Tuple
 
+@instrument_service
 class RecommendationService:
     @staticmethod
     async def create_recommendation(db: AsyncSession, title: str, content: str) -> Recommendation:
@@ -23,6 +30,7 @@ class RecommendationService:
         db.add(recommendation)
         await db.commit()
         await db.refresh(recommendation)
+        await entity_cache.invalidate(Recommendation, title)
         return recommendation
 
     @staticmethod
@@ -37,9 +45,11 @@ class RecommendationService:
         Returns:
             Optional[Recommendation]: The retrieved recommendation or None if not found.
         """
-        result = await db.execute(select(Recommendation).filter(Recommendation.title == title))
-        recommendation = result.scalars().first()
-        return recommendation
+        async def load() -> Optional[Recommendation]:
+            result = await db.execute(select(Recommendation).filter(Recommendation.title == title))
+            return result.scalars().first()
+
+        return await entity_cache.get(Recommendation, title, load)
 
     @staticmethod
     async def delete_recommendation(db: AsyncSession, title: str) -> None:
@@ -55,18 +65,82 @@ class RecommendationService:
         if recommendation:
             await db.delete(recommendation)
             await db.commit()
+            await entity_cache.invalidate(Recommendation, title)
+
+    @staticmethod
+    async def bulk_upsert_recommendations(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create recommendations, or update the ones whose title already exists, in chunked multi-row upserts.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the recommendations.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of recommendations written and the failed ones.
+        """
+        result = await bulk_upsert(db, Recommendation, rows, conflict_keys=("title",), result=result)
+        await entity_cache.invalidate(Recommendation, *(row["title"] for _, row in rows))
+        return result
+
+    @staticmethod
+    async def bulk_delete_recommendations(db: AsyncSession, titles: List[str]) -> int:
+        """
+        Asynchronously delete recommendations by title in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            titles (List[str]): The titles of the recommendations to be deleted.
+
+        Returns:
+            int: The number of recommendations deleted.
+        """
+        deleted = await bulk_delete(db, Recommendation, "title", titles)
+        await entity_cache.invalidate(Recommendation, *titles)
+        return deleted
+
+    @staticmethod
+    async def list_recommendations(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of recommendations from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of recommendations on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the recommendations must match.
+
+        Returns:
+            Page: The recommendations on the page and the cursor of the next page.
+        """
+        return await paginate(db, Recommendation, limit, cursor, fields, filters)
 
     @staticmethod
-    async def list_recommendations(db: AsyncSession) -> List[Recommendation]:
+    async def recommend_for_user(db: AsyncSession, user: str, limit: int = settings.RECOMMENDER_TOP_K) -> List[Dict[str, Any]]:
         """
-        Asynchronously list all recommendations from the database.
+        Asynchronously get the recommendations precomputed for a user from their feedback, best first.
 
         Args:
             db (AsyncSession): The database session.
+            user (str): The user.
+            limit (int): The maximum number of recommendations.
 
         Returns:
-            List[Recommendation]: A list of all recommendations.
+            List[Dict[str, Any]]: The title, content and score of each recommendation, none if the user has no feedback yet.
         """
-        result = await db.execute(select(Recommendation))
-        recommendations = result.scalars().all()
-        return recommendations
+        result = await db.execute(
+            select(Recommendation.title, Recommendation.content, UserRecommendation.score)
+            .join(Recommendation, Recommendation.title == UserRecommendation.item)
+            .filter(UserRecommendation.user == user)
+            .order_by(UserRecommendation.rank)
+            .limit(limit)
+        )
+        return [{"title": title, "content": content, "score": score} for title, content, score in result]
@@ -2,9 +2,14 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.db.pagination import Page, paginate
 from app.models.role import Role
 
+@instrument_service
 class RoleService:
     @staticmethod
     async def create_role(db: AsyncSession, name: str, description: str) -> Role:
@@ -23,6 +28,7 @@ class RoleService:
         db.add(role)
         await db.commit()
         await db.refresh(role)
+        await entity_cache.invalidate(Role, name)
         return role
 
     @staticmethod
@@ -37,9 +43,11 @@ class RoleService:
         Returns:
             Optional[Role]: The retrieved role or None if not found.
         """
-        result = await db.execute(select(Role).filter(Role.name == name))
-        role = result.scalars().first()
-        return role
+        async def load() -> Optional[Role]:
+            result = await db.execute(select(Role).filter(Role.name == name))
+            return result.scalars().first()
+
+        return await entity_cache.get(Role, name, load)
 
     @staticmethod
     async def delete_role(db: AsyncSession, name: str) -> None:
@@ -55,18 +63,27 @@ class RoleService:
         if role:
             await db.delete(role)
             await db.commit()
+            await entity_cache.invalidate(Role, name)
 
     @staticmethod
-    async def list_roles(db: AsyncSession) -> List[Role]:
+    async def list_roles(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
         """
-        Asynchronously list all roles from the database.
+        Asynchronously list one page of roles from the database.
 
         Args:
             db (AsyncSession): The database session.
+            limit (int): The maximum number of roles on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the roles must match.
 
         Returns:
-            List[Role]: A list of all roles.
+            Page: The roles on the page and the cursor of the next page.
         """
-        result = await db.execute(select(Role))
-        roles = result.scalars().all()
-        return roles
+        return await paginate(db, Role, limit, cursor, fields, filters)
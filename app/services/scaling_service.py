@@ -1,10 +1,14 @@
 ## app/services/scaling_service.py
 
+from app.core.config import settings
+from app.core.metrics import instrument_service
+from app.db.pagination import Page, paginate
 from app.models.scaling import Scaling
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
+from typing import List, Optional, Any, Dict
 
+@instrument_service
 class ScalingService:
     @staticmethod
     async def apply_scaling(db: AsyncSession, strategy: str) -> Scaling:
@@ -56,16 +60,24 @@ class ScalingService:
             await db.commit()
 
     @staticmethod
-    async def list_scalings(db: AsyncSession) -> List[Scaling]:
+    async def list_scalings(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
         """
-        Asynchronously list all scaling strategies from the database.
+        Asynchronously list one page of scaling strategies from the database.
 
         Args:
             db (AsyncSession): The database session.
+            limit (int): The maximum number of scaling strategies on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the scaling strategies must match.
 
         Returns:
-            List[Scaling]: A list of all scaling strategies.
+            Page: The scaling strategies on the page and the cursor of the next page.
         """
-        result = await db.execute(select(Scaling))
-        scalings = result.scalars().all()
-        return scalings
+        return await paginate(db, Scaling, limit, cursor, fields, filters)
@@ -1,13 +1,93 @@
 ## app/services/task_service.py
 
+from app.core.config import settings
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.core.task_dag import TaskCycleError, build_dag, dag_scheduler
+from app.core.task_queue import task_queue
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
+from app.models.pipeline_run import PipelineRun
 from app.models.task import Task
+from app.models.task_run import TaskRun
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict, Tuple
 
+async def _upstream_tasks(db: AsyncSession, names: List[str]) -> Tuple[Dict[str, Task], List[str]]:
+    """
+    Load the given tasks and every task they transitively depend on, one query per level of dependencies.
+
+    Args:
+        db (AsyncSession): The database session.
+        names (List[str]): The names of the tasks.
+
+    Returns:
+        Tuple[Dict[str, Task], List[str]]: The tasks found by name, and the names of the ones not found.
+    """
+    tasks: Dict[str, Task] = {}
+    seen = set(names)
+    frontier = set(names)
+    while frontier:
+        result = await db.execute(select(Task).filter(Task.name.in_(frontier)))
+        found = result.scalars().all()
+        tasks.update((task.name, task) for task in found)
+        frontier = {dependency for task in found for dependency in task.depends_on or []} - seen
+        seen |= frontier
+    return tasks, sorted(seen - tasks.keys())
+
+async def _check_dependencies(db: AsyncSession, name: str, depends_on: List[str]) -> None:
+    """
+    Check that a task depending on the given tasks would not depend on itself.
+
+    Args:
+        db (AsyncSession): The database session.
+        name (str): The name of the task.
+        depends_on (List[str]): The names of its upstream tasks.
+
+    Raises:
+        TaskCycleError: If the dependencies would form a cycle.
+    """
+    upstream, _ = await _upstream_tasks(db, depends_on)
+    build_dag({**{task.name: task.depends_on or [] for task in upstream.values()}, name: depends_on})
+
+async def _acyclic_rows(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: BulkResult) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Drop the rows of a bulk upsert whose dependencies would form a cycle with the stored tasks and the rows before them.
+
+    Args:
+        db (AsyncSession): The database session.
+        rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the tasks.
+        result (BulkResult): The result the rejected rows are recorded in.
+
+    Returns:
+        List[Tuple[int, Dict[str, Any]]]: The rows that can be written.
+    """
+    names = {row["name"] for _, row in rows} | {dependency for _, row in rows for dependency in row.get("depends_on") or []}
+    upstream, _ = await _upstream_tasks(db, sorted(names))
+    dependencies = {task.name: task.depends_on or [] for task in upstream.values()}
+    try:
+        build_dag({**dependencies, **{row["name"]: row.get("depends_on") or [] for _, row in rows}})
+        return list(rows)
+    except TaskCycleError:
+        pass
+    # Only a batch with a cycle is checked row by row, to reject the rows closing it
+    accepted = []
+    for index, row in rows:
+        candidate = {**dependencies, row["name"]: row.get("depends_on") or []}
+        try:
+            build_dag(candidate)
+        except TaskCycleError as e:
+            result.fail(index, e)
+            continue
+        dependencies = candidate
+        accepted.append((index, row))
+    return accepted
+
+@instrument_service
 class TaskService:
     @staticmethod
-    async def create_task(db: AsyncSession, name: str, action: str) -> Task:
+    async def create_task(db: AsyncSession, name: str, action: str, depends_on: Optional[List[str]] = None) -> Task:
         """
         Asynchronously create a new task and save it to the database.
 
@@ -15,14 +95,21 @@ class TaskService:
             db (AsyncSession): The database session.
             name (str): The name of the task.
             action (str): The action associated with the task.
+            depends_on (Optional[List[str]]): The names of the tasks it runs after in a pipeline.
 
         Returns:
             Task: The created task.
+
+        Raises:
+            TaskCycleError: If the dependencies would form a cycle.
         """
-        task = Task(name=name, action=action)
+        depends_on = depends_on or []
+        await _check_dependencies(db, name, depends_on)
+        task = Task(name=name, action=action, depends_on=depends_on)
         db.add(task)
         await db.commit()
         await db.refresh(task)
+        await entity_cache.invalidate(Task, name)
         return task
 
     @staticmethod
@@ -37,8 +124,39 @@ class TaskService:
         Returns:
             Optional[Task]: The retrieved task or None if not found.
         """
+        async def load() -> Optional[Task]:
+            result = await db.execute(select(Task).filter(Task.name == name))
+            return result.scalars().first()
+
+        return await entity_cache.get(Task, name, load)
+
+    @staticmethod
+    async def update_task(db: AsyncSession, name: str, action: str, depends_on: Optional[List[str]] = None) -> Optional[Task]:
+        """
+        Asynchronously update the action, and optionally the dependencies, of a task in the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the task to be updated.
+            action (str): The new action associated with the task.
+            depends_on (Optional[List[str]]): The new names of the tasks it runs after, None to keep them.
+
+        Returns:
+            Optional[Task]: The updated task or None if not found.
+
+        Raises:
+            TaskCycleError: If the dependencies would form a cycle.
+        """
         result = await db.execute(select(Task).filter(Task.name == name))
         task = result.scalars().first()
+        if task:
+            if depends_on is not None:
+                await _check_dependencies(db, name, depends_on)
+                task.depends_on = depends_on
+            task.action = action
+            await db.commit()
+            await db.refresh(task)
+            await entity_cache.invalidate(Task, name)
         return task
 
     @staticmethod
@@ -55,18 +173,202 @@ class TaskService:
         if task:
             await db.delete(task)
             await db.commit()
+            await entity_cache.invalidate(Task, name)
 
     @staticmethod
-    async def list_tasks(db: AsyncSession) -> List[Task]:
+    async def bulk_upsert_tasks(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
         """
-        Asynchronously list all tasks from the database.
+        Asynchronously create tasks, or update the ones whose name already exists, in chunked multi-row upserts.
+
+        Tasks whose dependencies would form a cycle, with the stored tasks or the tasks
+        before them in the request, are reported as failed and not written.
 
         Args:
             db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the tasks.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
 
         Returns:
-            List[Task]: A list of all tasks.
+            BulkResult: The number of tasks written and the failed ones.
+        """
+        result = result or BulkResult()
+        rows = await _acyclic_rows(db, rows, result)
+        result = await bulk_upsert(db, Task, rows, conflict_keys=("name",), result=result)
+        await entity_cache.invalidate(Task, *(row["name"] for _, row in rows))
+        return result
+
+    @staticmethod
+    async def bulk_delete_tasks(db: AsyncSession, names: List[str]) -> int:
+        """
+        Asynchronously delete tasks by name in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            names (List[str]): The names of the tasks to be deleted.
+
+        Returns:
+            int: The number of tasks deleted.
+        """
+        deleted = await bulk_delete(db, Task, "name", names)
+        await entity_cache.invalidate(Task, *names)
+        return deleted
+
+    @staticmethod
+    async def list_tasks(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of tasks from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of tasks on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the tasks must match.
+
+        Returns:
+            Page: The tasks on the page and the cursor of the next page.
+        """
+        return await paginate(db, Task, limit, cursor, fields, filters)
+
+    @staticmethod
+    async def enqueue_run(
+        db: AsyncSession,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[TaskRun]:
+        """
+        Asynchronously queue a run of a task's action, to be executed by the task workers.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the task.
+            payload (Optional[Dict[str, Any]]): The arguments of the action.
+            priority (int): The priority of the run, higher priorities run first.
+            max_attempts (Optional[int]): The number of times the run is attempted, settings.TASK_MAX_ATTEMPTS if None.
+
+        Returns:
+            Optional[TaskRun]: The queued run or None if the task is not found.
+        """
+        task = await TaskService.get_task(db, name)
+        if task is None:
+            return None
+        return await task_queue.enqueue(db, task.name, task.action, payload, priority, max_attempts)
+
+    @staticmethod
+    async def get_run(db: AsyncSession, name: str, run_id: int) -> Optional[TaskRun]:
+        """
+        Asynchronously retrieve a run of a task from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the task.
+            run_id (int): The id of the run.
+
+        Returns:
+            Optional[TaskRun]: The retrieved run or None if not found.
+        """
+        result = await db.execute(select(TaskRun).filter(TaskRun.id == run_id, TaskRun.task_name == name))
+        return result.scalars().first()
+
+    @staticmethod
+    async def list_runs(
+        db: AsyncSession,
+        name: str,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of the runs of a task, oldest first.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the task.
+            limit (int): The maximum number of runs on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the runs must match, e.g. {"status": "failed"}.
+
+        Returns:
+            Page: The runs on the page and the cursor of the next page.
+        """
+        return await paginate(db, TaskRun, limit, cursor, fields, {**(filters or {}), "task_name": name})
+
+    @staticmethod
+    async def start_pipeline(
+        db: AsyncSession,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        parallelism: int = settings.PIPELINE_PARALLELISM,
+    ) -> Optional[PipelineRun]:
+        """
+        Asynchronously start a pipeline running a task after every task it transitively depends on.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the last task of the pipeline.
+            payload (Optional[Dict[str, Any]]): The arguments passed to the action of every task.
+            parallelism (int): The maximum number of tasks running at once.
+
+        Returns:
+            Optional[PipelineRun]: The started pipeline run or None if the task is not found.
+
+        Raises:
+            ValueError: If an upstream task is not found, or a TaskCycleError if the dependencies form a cycle.
+        """
+        tasks, missing = await _upstream_tasks(db, [name])
+        if name not in tasks:
+            return None
+        if missing:
+            raise ValueError(f"Unknown upstream tasks: {', '.join(missing)}")
+        return await dag_scheduler.start(db, name, tasks, payload, parallelism)
+
+    @staticmethod
+    async def get_pipeline(db: AsyncSession, name: str, pipeline_id: int) -> Optional[PipelineRun]:
+        """
+        Asynchronously retrieve a pipeline run of a task, with the checkpointed state of each of its tasks.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the last task of the pipeline.
+            pipeline_id (int): The id of the pipeline run.
+
+        Returns:
+            Optional[PipelineRun]: The retrieved pipeline run or None if not found.
+        """
+        result = await db.execute(
+            select(PipelineRun)
+            .filter(PipelineRun.id == pipeline_id, PipelineRun.task_name == name)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def resume_pipeline(db: AsyncSession, name: str, pipeline_id: int) -> Optional[PipelineRun]:
+        """
+        Asynchronously resume a failed or interrupted pipeline run from the tasks that did not succeed.
+
+        Args:
+            db (AsyncSession): The database session.
+            name (str): The name of the last task of the pipeline.
+            pipeline_id (int): The id of the pipeline run.
+
+        Returns:
+            Optional[PipelineRun]: The resumed pipeline run or None if not found.
+
+        Raises:
+            ValueError: If the pipeline run succeeded or is still being scheduled.
         """
-        result = await db.execute(select(Task))
-        tasks = result.scalars().all()
-        return tasks
+        pipeline = await TaskService.get_pipeline(db, name, pipeline_id)
+        if pipeline is None:
+            return None
+        return await dag_scheduler.resume(db, pipeline)
@@ -1,10 +1,18 @@
 ## app/services/training_service.py
 
+from app.core.config import settings
+from app.core.embeddings import embedding_indexer
+from app.core.entity_cache import entity_cache
+from app.core.metrics import instrument_service
+from app.core.search import search_index, search_page
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert
+from app.db.pagination import Page, paginate
 from app.models.training import Training
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from typing import Optional, List, Any, Dict, Tuple
 
+@instrument_service
 class TrainingService:
     @staticmethod
     async def create_training(db: AsyncSession, title: str, content: str) -> Training:
@@ -23,6 +31,9 @@ class TrainingService:
         db.add(training)
         await db.commit()
         await db.refresh(training)
+        await entity_cache.invalidate(Training, title)
+        await search_index.index(Training, [{"title": title, "content": content}])
+        embedding_indexer.submit(Training, [training.id])
         return training
 
     @staticmethod
@@ -37,9 +48,11 @@ class TrainingService:
         Returns:
             Optional[Training]: The retrieved training or None if not found.
         """
-        result = await db.execute(select(Training).filter(Training.title == title))
-        training = result.scalars().first()
-        return training
+        async def load() -> Optional[Training]:
+            result = await db.execute(select(Training).filter(Training.title == title))
+            return result.scalars().first()
+
+        return await entity_cache.get(Training, title, load)
 
     @staticmethod
     async def delete_training(db: AsyncSession, title: str) -> None:
@@ -55,18 +68,120 @@ class TrainingService:
         if training:
             await db.delete(training)
             await db.commit()
+            await entity_cache.invalidate(Training, title)
+            await search_index.delete(Training, [title])
+            embedding_indexer.submit(Training, [training.id])
+
+    @staticmethod
+    async def bulk_upsert_trainings(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]], result: Optional[BulkResult] = None) -> BulkResult:
+        """
+        Asynchronously create trainings, or update the ones whose title already exists, in chunked multi-row upserts.
+
+        Args:
+            db (AsyncSession): The database session.
+            rows (List[Tuple[int, Dict[str, Any]]]): The index in the request and the fields of each of the trainings.
+            result (Optional[BulkResult]): The result to add to, e.g. one holding validation failures.
+
+        Returns:
+            BulkResult: The number of trainings written and the failed ones.
+        """
+        result = await bulk_upsert(db, Training, rows, conflict_keys=("title",), result=result)
+        await entity_cache.invalidate(Training, *(row["title"] for _, row in rows))
+        failed = {failure["index"] for failure in result.failed}
+        written = [row for index, row in rows if index not in failed]
+        await search_index.index(Training, written)
+        embedding_indexer.submit(Training, await embedding_indexer.row_ids(db, Training, [row["title"] for row in written]))
+        return result
+
+    @staticmethod
+    async def bulk_delete_trainings(db: AsyncSession, titles: List[str]) -> int:
+        """
+        Asynchronously delete trainings by title in chunked transactions.
+
+        Args:
+            db (AsyncSession): The database session.
+            titles (List[str]): The titles of the trainings to be deleted.
+
+        Returns:
+            int: The number of trainings deleted.
+        """
+        ids = await embedding_indexer.row_ids(db, Training, titles)
+        deleted = await bulk_delete(db, Training, "title", titles)
+        embedding_indexer.submit(Training, ids)
+        await entity_cache.invalidate(Training, *titles)
+        await search_index.delete(Training, titles)
+        return deleted
+
+    @staticmethod
+    async def list_trainings(
+        db: AsyncSession,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Page:
+        """
+        Asynchronously list one page of trainings from the database.
+
+        Args:
+            db (AsyncSession): The database session.
+            limit (int): The maximum number of trainings on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+            fields (Optional[List[str]]): The fields to be returned, None for every field.
+            filters (Optional[Dict[str, Any]]): The field conditions the trainings must match.
+
+        Returns:
+            Page: The trainings on the page and the cursor of the next page.
+        """
+        return await paginate(db, Training, limit, cursor, fields, filters)
+
+    @staticmethod
+    async def search_trainings(db: AsyncSession, query: str, limit: int = settings.PAGE_SIZE_DEFAULT, cursor: Optional[str] = None) -> Page:
+        """
+        Asynchronously search the titles and contents of the trainings, best matches first.
+
+        Args:
+            db (AsyncSession): The database session.
+            query (str): The search terms, all of which must match.
+            limit (int): The maximum number of trainings on the page.
+            cursor (Optional[str]): The cursor returned with the previous page, None for the first page.
+
+        Returns:
+            Page: The title, highlighted snippet and score of the trainings on the page and the cursor of the next page.
+        """
+        return await search_page(db, Training, query, limit, cursor)
 
     @staticmethod
-    async def list_trainings(db: AsyncSession) -> List[Training]:
+    async def search_similar_trainings(db: AsyncSession, text: str, k: int = 10) -> List[Dict[str, Any]]:
         """
-        Asynchronously list all trainings from the database.
+        Asynchronously find the trainings closest in meaning to a text.
 
         Args:
             db (AsyncSession): The database session.
+            text (str): The text to be compared with the trainings.
+            k (int): The maximum number of trainings.
 
         Returns:
-            List[Training]: A list of all trainings.
+            List[Dict[str, Any]]: The title and cosine similarity of each training, most similar first.
+        """
+        vector = await embedding_indexer.embed_query(text)
+        return await embedding_indexer.similar(db, Training, vector, k)
+
+    @staticmethod
+    async def get_similar_trainings(db: AsyncSession, title: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
         """
-        result = await db.execute(select(Training))
-        trainings = result.scalars().all()
-        return trainings
+        Asynchronously find the trainings closest in meaning to a training.
+
+        Args:
+            db (AsyncSession): The database session.
+            title (str): The title of the training.
+            k (int): The maximum number of trainings.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The title and cosine similarity of each other training, most similar first, or None if the training is not found.
+        """
+        result = await db.execute(select(Training).filter(Training.title == title))
+        training = result.scalars().first()
+        if training is None:
+            return None
+        return await embedding_indexer.similar_to(db, Training, training, k)
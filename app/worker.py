@@ -0,0 +1,46 @@
+## app/worker.py
+
+"""
+Run task workers without the API, to scale them apart from the web workers.
+
+Usage:
+    python -m app.worker --concurrency 16 --kind process
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.core.logger import setup_logger, shutdown_logger
+from app.core.task_queue import task_queue
+from app.core.task_workers import TaskWorkerPool
+from app.db.session import async_engine
+
+
+async def run(concurrency: int, kind: str) -> None:
+    pool = TaskWorkerPool(task_queue, concurrency=concurrency, kind=kind)
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await pool.start()
+    await stopped.wait()
+    await pool.stop()
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=settings.TASK_WORKER_CONCURRENCY, help="The number of runs executed at once.")
+    parser.add_argument("--kind", choices=("async", "process"), default=settings.TASK_WORKER_KIND, help="Where sync actions run.")
+    args = parser.parse_args()
+    setup_logger()
+    try:
+        asyncio.run(run(args.concurrency, args.kind))
+    finally:
+        shutdown_logger()
+
+
+if __name__ == "__main__":
+    main()
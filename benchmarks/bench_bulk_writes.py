@@ -0,0 +1,62 @@
+## benchmarks/bench_bulk_writes.py
+
+"""
+Compare the rows/s of one-transaction-per-row creates with chunked bulk upserts.
+
+The chunk size of the bulk path is BULK_CHUNK_SIZE.
+
+Usage:
+    python -m benchmarks.bench_bulk_writes --rows 20000 --database-url sqlite:///./bench.db
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.base_class import Base
+from app.db.session import create_engine
+from app.models.training import Training
+from app.services.training_service import TrainingService
+
+
+async def run(database_url: str, rows: int) -> None:
+    engine = create_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(delete(Training))
+
+    print(f"{'path':<12} {'rows':>8} {'seconds':>8} {'rows/s':>10}")
+    async with sessions() as db:
+        start = time.perf_counter()
+        for i in range(rows):
+            await TrainingService.create_training(db, f"single-{i}", "benchmark content")
+        elapsed = time.perf_counter() - start
+        print(f"{'per-row':<12} {rows:>8} {elapsed:>8.2f} {rows / elapsed:>10.1f}")
+
+        items = [(i, {"title": f"bulk-{i}", "content": "benchmark content"}) for i in range(rows)]
+        start = time.perf_counter()
+        result = await TrainingService.bulk_upsert_trainings(db, items)
+        elapsed = time.perf_counter() - start
+        print(f"{'bulk':<12} {result.succeeded:>8} {elapsed:>8.2f} {rows / elapsed:>10.1f}")
+
+        start = time.perf_counter()
+        result = await TrainingService.bulk_upsert_trainings(db, items)
+        elapsed = time.perf_counter() - start
+        print(f"{'bulk-update':<12} {result.succeeded:>8} {elapsed:>8.2f} {rows / elapsed:>10.1f}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000, help="The number of rows written by each path.")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="The database to write to.")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.rows))
+
+
+if __name__ == "__main__":
+    main()
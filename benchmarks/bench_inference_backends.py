@@ -0,0 +1,64 @@
+## benchmarks/bench_inference_backends.py
+
+"""
+Compare latency and throughput of the torch, onnx and onnx-int8 agent backends.
+
+Usage:
+    python -m benchmarks.bench_inference_backends --model distilbert-base-uncased-finetuned-sst-2-english
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from app.core.model_registry import BACKENDS, load_text_classification_pipeline
+
+SAMPLE_TEXTS = [
+    "The new release fixed every issue we reported, great work.",
+    "Support never answered and the product kept crashing.",
+    "Delivery was on time.",
+    "I am not sure whether the update changed anything at all, the dashboard looks the same as before.",
+]
+
+
+def measure_latency(nlp_pipeline: Callable, texts: List[str]) -> List[float]:
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        nlp_pipeline(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def measure_throughput(nlp_pipeline: Callable, texts: List[str], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        nlp_pipeline(texts[i:i + batch_size])
+    return len(texts) / (time.perf_counter() - start)
+
+
+def percentile(values: List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", required=True, help="The name or path of the model to be benchmarked.")
+    parser.add_argument("--texts", type=int, default=512, help="The number of texts per measurement.")
+    parser.add_argument("--batch-size", type=int, default=32, help="The batch size of the throughput measurement.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.texts)]
+    print(f"{'backend':<10} {'p50 ms':>8} {'p99 ms':>8} {'texts/s':>10}")
+    for backend in args.backends:
+        nlp_pipeline = load_text_classification_pipeline(args.model, backend)
+        nlp_pipeline(texts[:args.batch_size])  # warm-up
+        latencies = measure_latency(nlp_pipeline, texts)
+        throughput = measure_throughput(nlp_pipeline, texts, args.batch_size)
+        print(f"{backend:<10} {percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f} {throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
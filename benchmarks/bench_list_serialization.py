@@ -0,0 +1,90 @@
+## benchmarks/bench_list_serialization.py
+
+"""
+Compare the latency of a large list endpoint rendered through its response_model and JSONResponse with page_response.
+
+Both routes list the same news rows with NewsService.list_news; "before" returns the
+page and lets FastAPI validate it against the Page schema and encode it with
+jsonable_encoder and JSONResponse, "after" returns page_response(page).
+
+Usage:
+    python -m benchmarks.bench_list_serialization --rows 20000 --repeat 20 --database-url sqlite:///./bench.db
+"""
+
+import os
+
+# Allow pages as large as the benchmark, settings are read at import
+os.environ.setdefault("PAGE_SIZE_MAX", "1000000")
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.v1.responses import page_response
+from app.db.base_class import Base
+from app.db.session import create_engine
+from app.models.news import News
+from app.schemas.pagination import Page
+from app.services.news_service import NewsService
+
+
+def build_app(sessions: async_sessionmaker) -> FastAPI:
+    app = FastAPI()
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    @app.get("/before", response_model=Page, response_class=JSONResponse)
+    async def list_before(limit: int, db: AsyncSession = Depends(get_db)):
+        return await NewsService.list_news(db=db, limit=limit)
+
+    @app.get("/after", response_model=Page)
+    async def list_after(limit: int, db: AsyncSession = Depends(get_db)):
+        return page_response(await NewsService.list_news(db=db, limit=limit))
+
+    return app
+
+
+async def run(database_url: str, rows: int, repeat: int) -> None:
+    engine = create_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(delete(News))
+    async with sessions() as db:
+        items = [(i, {"title": f"news-{i}", "content": f"benchmark content {i} " * 8}) for i in range(rows)]
+        await NewsService.bulk_upsert_news(db, items)
+
+    transport = httpx.ASGITransport(app=build_app(sessions))
+    print(f"{'route':<8} {'rows':>8} {'bytes':>10} {'p50 ms':>8} {'max ms':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route in ("before", "after"):
+            latencies = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.get(f"/{route}", params={"limit": rows})
+                latencies.append((time.perf_counter() - start) * 1000)
+            size = len(response.content)
+            print(f"{route:<8} {len(response.json()['items']):>8} {size:>10} {statistics.median(latencies):>8.1f} {max(latencies):>8.1f}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000, help="The number of rows on the listed page.")
+    parser.add_argument("--repeat", type=int, default=20, help="The number of requests per route.")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="The database to read from.")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
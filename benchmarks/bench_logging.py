@@ -0,0 +1,107 @@
+## benchmarks/bench_logging.py
+
+"""
+Compare the request latency of an async route that logs, with logging off, writing synchronously and writing through the queue.
+
+Each request logs one info record and every tenth one an error, to a log file
+and the console handler (pointed at /dev/null so the terminal is not the bottleneck).
+--sink-delay-ms adds a delay to every flush of the handlers, standing in for a
+slow disk or a log collector reading stdout too slowly.
+
+Usage:
+    python -m benchmarks.bench_logging --requests 5000 --concurrency 50 --sink-delay-ms 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.logger import logger, setup_logger, shutdown_logger
+
+app = FastAPI()
+route_logger = logging.getLogger("app.bench")
+
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int):
+    route_logger.info(f"Serving item {item_id}")
+    if item_id % 10 == 0:
+        route_logger.error(f"Item {item_id} is out of stock")
+    return {"id": item_id}
+
+
+def configure(mode: str, log_dir: str) -> None:
+    shutdown_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    if mode == "off":
+        logger.disabled = True
+        return
+    logger.disabled = False
+    # Errors repeat with different ids, so the rate limit does not hide the I/O being measured
+    setup_logger(log_dir=log_dir, log_format="json", use_queue=mode == "queue", sample_rates={})
+
+
+def percentile(samples, share: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * share))]
+
+
+async def run(mode: str, requests: int, concurrency: int) -> None:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(item_id: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await client.get(f"/items/{item_id}")
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+    p50, p99 = percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000
+    print(f"{mode:<8} {requests / elapsed:>10.1f} {p50:>8.2f} {p99:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000, help="The number of requests per mode.")
+    parser.add_argument("--concurrency", type=int, default=50, help="The number of requests in flight.")
+    parser.add_argument("--sink-delay-ms", type=float, default=0.0, help="The delay added to every handler flush.")
+    args = parser.parse_args()
+
+    if args.sink_delay_ms:
+        flush = logging.StreamHandler.flush
+
+        def slow_flush(handler: logging.StreamHandler) -> None:
+            time.sleep(args.sink_delay_ms / 1000)
+            flush(handler)
+
+        logging.StreamHandler.flush = slow_flush
+
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+    try:
+        with tempfile.TemporaryDirectory() as log_dir:
+            print(f"{'mode':<8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+            for mode in ("off", "sync", "queue"):
+                configure(mode, log_dir)
+                asyncio.run(run(mode, args.requests, args.concurrency))
+            configure("off", log_dir)
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+
+if __name__ == "__main__":
+    main()
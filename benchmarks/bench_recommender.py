@@ -0,0 +1,93 @@
+## benchmarks/bench_recommender.py
+
+"""
+Measure the time of a full fit and of an incremental refresh of the recommendations, and the latency of serving them.
+
+Users interact with items drawn mostly from one of a set of topics, so the
+factorization has structure to find. After the full fit, a share of the users
+leave new feedback and the recommendations are refreshed for them only.
+
+Usage:
+    python -m benchmarks.bench_recommender --users 100000 --items 5000 --interactions 20 --database-url sqlite:///./bench.db
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.recommender import Recommender
+from app.db.base_class import Base
+from app.db.session import create_engine
+from app.models.feedback import Feedback
+from app.models.recommendation import Recommendation
+from app.services.recommendation_service import RecommendationService
+
+TOPICS = 50
+
+
+def interactions(rng: random.Random, user: int, items: int, count: int) -> list:
+    topic = user % TOPICS
+    # Four in five interactions are with items of the topic of the user
+    picks = {rng.randrange(topic, items, TOPICS) if rng.random() < 0.8 else rng.randrange(items) for _ in range(count)}
+    return [{"user": f"u{user}", "content": "liked", "item": f"i{item}", "rating": float(rng.randint(1, 5))} for item in picks]
+
+
+async def run(database_url: str, users: int, items: int, count: int, changed: float, queries: int, path: str) -> None:
+    engine = create_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    rng = random.Random(0)
+    async with sessions() as db:
+        await db.execute(insert(Recommendation), [{"title": f"i{item}", "content": f"Item {item}"} for item in range(items)])
+        for start in range(0, users, 1000):
+            rows = [row for user in range(start, min(start + 1000, users)) for row in interactions(rng, user, items, count)]
+            await db.execute(insert(Feedback), rows)
+            await db.commit()
+
+    recommender = Recommender(sessions, path)
+    start = time.perf_counter()
+    stats = await recommender.fit()
+    print(f"fit: {stats} in {time.perf_counter() - start:.1f}s")
+
+    async with sessions() as db:
+        rows = [row for user in rng.sample(range(users), int(users * changed)) for row in interactions(rng, user, items, 2)]
+        await db.execute(insert(Feedback), rows)
+        await db.commit()
+    start = time.perf_counter()
+    stats = await recommender.refresh()
+    print(f"refresh: {stats} in {time.perf_counter() - start:.1f}s")
+
+    latencies = []
+    async with sessions() as db:
+        for _ in range(queries):
+            user = f"u{rng.randrange(users)}"
+            start = time.perf_counter()
+            await RecommendationService.recommend_for_user(db, user)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"serve: p50 {statistics.median(latencies):6.2f} ms  p95 {latencies[int(len(latencies) * 0.95)]:6.2f} ms")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100000, help="The number of users.")
+    parser.add_argument("--items", type=int, default=5000, help="The number of items.")
+    parser.add_argument("--interactions", type=int, default=20, help="The number of interactions per user.")
+    parser.add_argument("--changed", type=float, default=0.01, help="The share of users leaving feedback after the fit.")
+    parser.add_argument("--queries", type=int, default=1000, help="The number of recommendation lookups.")
+    parser.add_argument("--model-path", default="./bench_recommender.npz", help="The file the item factors are written to.")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="The database holding the feedback.")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.users, args.items, args.interactions, args.changed, args.queries, args.model_path))
+
+
+if __name__ == "__main__":
+    main()
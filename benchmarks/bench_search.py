@@ -0,0 +1,84 @@
+## benchmarks/bench_search.py
+
+"""
+Measure the latency of full-text searches over a large news table.
+
+The articles are made of words drawn from a Zipf-distributed vocabulary, so some
+query terms match a large share of the rows and others only a few. Rows are
+written with bulk inserts, which the triggers of the full-text index follow like
+any other write.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000 --queries 200 --database-url sqlite:///./bench.db
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.db.base_class import Base
+from app.db.search import search_database
+from app.db.session import create_engine
+from app.models.news import News
+
+VOCABULARY = [f"w{i}" for i in range(50000)]
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def article(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=words))
+
+
+async def run(database_url: str, rows: int, queries: int, limit: int) -> None:
+    engine = create_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    rng = random.Random(0)
+    async with sessions() as db:
+        existing = (await db.execute(select(func.count()).select_from(News))).scalar()
+        start = time.perf_counter()
+        for offset in range(existing, rows, 10000):
+            batch = [
+                {"title": f"{article(rng, 6)} {i}", "content": article(rng, 120)}
+                for i in range(offset, min(offset + 10000, rows))
+            ]
+            await db.execute(insert(News), batch)
+            await db.commit()
+        if rows > existing:
+            print(f"Indexed {rows - existing} articles in {time.perf_counter() - start:.1f}s")
+
+        for name, terms in (("frequent", 1), ("rare", 1), ("two terms", 2)):
+            latencies = []
+            for _ in range(queries):
+                pool = VOCABULARY[:20] if name == "frequent" else VOCABULARY[1000:]
+                query = " ".join(rng.sample(pool, terms))
+                start = time.perf_counter()
+                await search_database(db, News, query, limit)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+            print(
+                f"{name:>10}: p50 {statistics.median(latencies):7.1f} ms  "
+                f"p95 {latencies[int(len(latencies) * 0.95)]:7.1f} ms  max {latencies[-1]:7.1f} ms"
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000, help="The number of articles in the table.")
+    parser.add_argument("--queries", type=int, default=200, help="The number of searches per kind of query.")
+    parser.add_argument("--limit", type=int, default=20, help="The number of matches per search.")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="The database holding the articles.")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.rows, args.queries, args.limit))
+
+
+if __name__ == "__main__":
+    main()
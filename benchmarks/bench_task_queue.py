@@ -0,0 +1,68 @@
+## benchmarks/bench_task_queue.py
+
+"""
+Measure the throughput of the task workers for increasing worker counts.
+
+Each round queues --runs runs of the "sleep" action, an I/O-bound stand-in for
+real actions, and times a fresh worker pool draining them.
+
+Usage:
+    python -m benchmarks.bench_task_queue --runs 400 --sleep-ms 20 --workers 1 2 4 8 16 --database-url sqlite:///./bench.db
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.task_queue import LocalTaskTransport, TaskQueue
+from app.core.task_workers import TaskWorkerPool
+from app.db.base_class import Base
+from app.db.session import create_engine
+from app.models.task_run import TaskRun
+
+
+async def run(database_url: str, runs: int, sleep_ms: float, workers: list) -> None:
+    engine = create_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    queue = TaskQueue(sessions, LocalTaskTransport())
+    print(f"{'workers':>8} {'runs':>6} {'seconds':>8} {'runs/s':>8} {'speedup':>8}")
+    baseline = None
+    for concurrency in workers:
+        async with sessions() as db:
+            await db.execute(delete(TaskRun))
+            await db.commit()
+            for _ in range(runs):
+                db.add(TaskRun(task_name="bench", action="sleep", payload={"seconds": sleep_ms / 1000}, status="queued",
+                               priority=0, attempts=0, max_attempts=1, available_at=func.now()))
+            await db.commit()
+        pool = TaskWorkerPool(queue, concurrency=concurrency, poll_interval=0.01)
+        start = time.perf_counter()
+        await pool.start()
+        async with sessions() as db:
+            while (await db.execute(select(func.count()).where(TaskRun.status == "succeeded"))).scalar() < runs:
+                await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        await pool.stop()
+        throughput = runs / elapsed
+        baseline = baseline or throughput
+        print(f"{concurrency:>8} {runs:>6} {elapsed:>8.2f} {throughput:>8.1f} {throughput / baseline:>8.1f}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=400, help="The number of runs queued per round.")
+    parser.add_argument("--sleep-ms", type=float, default=20, help="The duration of each run.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="The worker counts to be measured.")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="The database holding the queue.")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.runs, args.sleep_ms, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+## benchmarks/bench_vector_index.py
+
+"""
+Measure the latency of nearest-neighbour queries and the recall of the HNSW vector index.
+
+Random normalized vectors of the embedding dimension, scattered around a
+thousand topics, are inserted in batches as the embedding indexer does, then
+queried for their top-k neighbours. Recall is measured against an exact search
+over a sample of the queries. The index is persisted in the given directory and
+reused by later runs.
+
+Usage:
+    python -m benchmarks.bench_vector_index --vectors 1000000 --queries 1000 --directory ./bench_vectors
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.vector_index import VectorIndex
+
+TOPICS = 1000
+
+
+def random_vectors(seed: int, count: int, dim: int) -> np.ndarray:
+    # Embeddings of texts cluster by topic, uniformly random vectors would have no neighbours worth the name
+    centers = np.random.default_rng(0).normal(size=(TOPICS, dim)).astype(np.float32)
+    rng = np.random.default_rng(seed)
+    vectors = centers[rng.integers(0, TOPICS, count)] + rng.normal(scale=1.0, size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_neighbours(queries: np.ndarray, count: int, dim: int, k: int, batch_size: int) -> np.ndarray:
+    # Every batch is regenerated from its seed rather than kept in memory
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+    for offset in range(0, count, batch_size):
+        batch = random_vectors(offset, min(batch_size, count - offset), dim)
+        ids = np.concatenate([best_ids, np.broadcast_to(np.arange(offset, offset + len(batch)), (len(queries), len(batch)))], axis=1)
+        scores = np.concatenate([best_scores, queries @ batch.T], axis=1)
+        top = np.argsort(-scores, axis=1)[:, :k]
+        best_ids, best_scores = np.take_along_axis(ids, top, 1), np.take_along_axis(scores, top, 1)
+    return best_ids
+
+
+def run(directory: str, count: int, dim: int, queries: int, k: int, batch_size: int) -> None:
+    index = VectorIndex(directory, dim)
+    existing = len(index)
+    start = time.perf_counter()
+    # Batches are aligned on batch_size, so that an interrupted run is resumed with the same vectors
+    for offset in range(existing - existing % batch_size, count, batch_size):
+        size = min(batch_size, count - offset)
+        index.upsert(list(range(offset, offset + size)), random_vectors(offset, size, dim))
+    index.persist()
+    if count > existing:
+        print(f"Indexed {count - existing} vectors in {time.perf_counter() - start:.1f}s")
+
+    vectors = random_vectors(-1 % 2**32, queries, dim)
+    latencies = []
+    results = []
+    for vector in vectors:
+        start = time.perf_counter()
+        results.append(index.query(vector, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+    sample = min(queries, 100)
+    exact = exact_neighbours(vectors[:sample], count, dim, k, batch_size)
+    hits = sum(len(set(exact[i].tolist()) & {row_id for row_id, _ in results[i]}) for i in range(sample))
+    latencies.sort()
+    print(
+        f"top-{k} of {count} vectors: p50 {statistics.median(latencies):6.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)]:6.2f} ms  max {latencies[-1]:6.2f} ms  "
+        f"recall@{k} {hits / (sample * k):.3f}"
+    )
+    index.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=1000000, help="The number of vectors in the index.")
+    parser.add_argument("--dim", type=int, default=settings.EMBEDDING_DIM, help="The dimension of the vectors.")
+    parser.add_argument("--queries", type=int, default=1000, help="The number of queries.")
+    parser.add_argument("--k", type=int, default=10, help="The number of neighbours per query.")
+    parser.add_argument("--batch-size", type=int, default=10000, help="The number of vectors per insert.")
+    parser.add_argument("--directory", default="./bench_vectors", help="The directory the index is persisted in.")
+    args = parser.parse_args()
+    run(args.directory, args.vectors, args.dim, args.queries, args.k, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
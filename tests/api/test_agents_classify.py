@@ -0,0 +1,76 @@
+## tests/api/test_agents_classify.py
+
+import orjson
+import pytest
+from app.api.v1.endpoints import agents
+from app.core.inference_pool import InferenceQueueFull
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the agents router, with an agent of the test model.
+    """
+    async with api_client(agents.router, "/agents") as client:
+        await client.post('/agents/', json={'name': 'test_agent', 'model': 'test_model'})
+        yield client
+
+def upper(model, texts, backend):
+    return [{'label': text.upper(), 'score': 1.0} for text in texts]
+
+def lines(response):
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+async def test_classify_streams_ndjson_predictions(client, monkeypatch):
+    """
+    Test that an NDJSON body of texts and objects is classified into one NDJSON line per text.
+    """
+    monkeypatch.setattr('app.services.agent_service.run_registry_pipeline', upper)
+    body = b'"first"\n{"text": "second"}\n\n"third"\n'
+    response = await client.post('/agents/test_agent/classify', content=body, headers={'content-type': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert [(line['index'], line['predictions']['label']) for line in lines(response)] == [(0, 'FIRST'), (1, 'SECOND'), (2, 'THIRD')]
+
+async def test_classify_accepts_json_lists_and_multipart_uploads(client, monkeypatch):
+    """
+    Test that texts are read from a JSON object, a JSON list and the file of a multipart upload.
+    """
+    monkeypatch.setattr('app.services.agent_service.run_registry_pipeline', upper)
+    for request in ({'json': {'texts': ['a', 'b']}}, {'json': ['a', 'b']}, {'files': {'file': ('texts.ndjson', b'"a"\n"b"\n')}}):
+        response = await client.post('/agents/test_agent/classify', **request)
+        assert [line['predictions']['label'] for line in lines(response)] == ['A', 'B']
+    response = await client.post('/agents/test_agent/classify', files={'other': ('texts.ndjson', b'"a"\n')})
+    assert response.status_code == 400
+    response = await client.post('/agents/test_agent/classify', json={'texts': 'a'})
+    assert response.status_code == 400
+    response = await client.post('/agents/missing_agent/classify', json={'texts': ['a']})
+    assert response.status_code == 404
+
+async def test_classify_reports_errors_in_band(client, monkeypatch):
+    """
+    Test that invalid lines, a full inference queue and failures after streaming started end the body with an error line.
+    """
+    monkeypatch.setattr('app.services.agent_service.run_registry_pipeline', upper)
+    response = await client.post('/agents/test_agent/classify', content=b'"a"\n42\n', headers={'content-type': 'application/x-ndjson'})
+    assert 'error' in lines(response)[-1]
+
+    calls = []
+    def saturated_after_first_chunk(model, texts, backend):
+        calls.append(texts)
+        if len(calls) > 1:
+            raise InferenceQueueFull(3)
+        return upper(model, texts, backend)
+    monkeypatch.setattr('app.services.agent_service.run_registry_pipeline', saturated_after_first_chunk)
+    texts = [f"text{i}" for i in range(100)]
+    response = await client.post('/agents/test_agent/classify', json={'texts': texts})
+    assert response.status_code == 200
+    assert lines(response)[-1] == {'error': 'Too many inference requests, retry later.', 'retry_after': 3}
+    assert [line['index'] for line in lines(response)[:-1]] == list(range(len(calls[0])))
+
+    def broken(model, texts, backend):
+        raise RuntimeError("CUDA out of memory")
+    monkeypatch.setattr('app.services.agent_service.run_registry_pipeline', broken)
+    response = await client.post('/agents/test_agent/classify', json={'texts': ['a']})
+    assert lines(response) == [{'error': 'An internal server error occurred.'}]
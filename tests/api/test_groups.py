@@ -1,33 +1,155 @@
 ## tests/api/test_groups.py
 
-from fastapi.testclient import TestClient
-from app.main import app
+import asyncio
+import orjson
+import pytest
+from app.api.v1.endpoints import groups
+from app.core.inference_pool import inference_pool
+from app.models.agent import Agent
+from app.services.agent_service import AgentService
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
-def test_create_group():
-    response = client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the groups router.
+    """
+    async with api_client(groups.router, "/api/v1/groups") as client:
+        yield client
+
+async def test_create_group(client):
+    response = await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
     assert response.status_code == 201
     assert response.json()['name'] == 'test_group'
     assert response.json()['members'] == ['member1', 'member2']
 
-def test_get_group():
+async def test_get_group(client):
     # First, create the group to ensure it exists
-    client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
-    
-    response = client.get('/api/v1/groups/test_group')
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
+
+    response = await client.get('/api/v1/groups/test_group')
     assert response.status_code == 200
     assert response.json()['name'] == 'test_group'
     assert response.json()['members'] == ['member1', 'member2']
 
-def test_delete_group():
+async def test_delete_group(client):
     # First, create the group to ensure it exists
-    client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
-    
-    response = client.delete('/api/v1/groups/test_group')
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'member2']})
+
+    response = await client.delete('/api/v1/groups/test_group')
     assert response.status_code == 204
 
     # Verify the group has been deleted
-    response = client.get('/api/v1/groups/test_group')
+    response = await client.get('/api/v1/groups/test_group')
     assert response.status_code == 404
     assert response.json()['detail'] == 'Group not found'
+
+async def test_bulk_members_and_reverse_lookup(client):
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1']})
+    await client.post('/api/v1/groups/', json={'name': 'other_group', 'members': ['member2']})
+    response = await client.post('/api/v1/groups/test_group/members', json={'members': ['member2', 'member1', 'member3']})
+    assert response.status_code == 200
+    assert response.json()['added'] == 2
+    response = await client.get('/api/v1/groups/test_group')
+    assert response.json()['members'] == ['member1', 'member2', 'member3'] and response.json()['member_count'] == 3
+
+    response = await client.get('/api/v1/groups/test_group/members', params={'limit': 2})
+    assert response.json()['items'] == [{'member': 'member1', 'weight': 1.0}, {'member': 'member2', 'weight': 1.0}]
+    response = await client.get('/api/v1/groups/test_group/members', params={'limit': 2, 'cursor': response.json()['next_cursor']})
+    assert response.json()['items'] == [{'member': 'member3', 'weight': 1.0}]
+    response = await client.get('/api/v1/groups/missing_group/members')
+    assert response.status_code == 404
+
+    response = await client.get('/api/v1/groups/by-member/member2')
+    assert sorted(item['name'] for item in response.json()['items']) == ['other_group', 'test_group']
+    response = await client.get('/api/v1/groups/by-member/member2', params={'limit': 1})
+    assert len(response.json()['items']) == 1 and response.json()['next_cursor']
+    response = await client.get('/api/v1/groups/by-member/missing_member')
+    assert response.json()['items'] == []
+
+    response = await client.post('/api/v1/groups/test_group/members/delete', json={'members': ['member2', 'missing_member']})
+    assert response.json()['removed'] == 1
+    response = await client.get('/api/v1/groups/by-member/member2')
+    assert response.json()['items'] == [{'name': 'other_group'}]
+    response = await client.post('/api/v1/groups/missing_group/members', json={'members': ['member1']})
+    assert response.status_code == 404
+    response = await client.post('/api/v1/groups/test_group/members', json={'members': []})
+    assert response.status_code == 422
+
+async def test_large_groups_list_their_first_members(client, monkeypatch):
+    monkeypatch.setattr(groups.settings, 'PAGE_SIZE_DEFAULT', 2)
+    members = ['member1', 'member2', 'member3']
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': members})
+    group = (await client.get('/api/v1/groups/test_group')).json()
+    assert group['member_count'] == 3 and group['members'] == members[:2]
+    response = await client.get('/api/v1/groups/test_group/members', params={'cursor': group['members_next_cursor']})
+    assert [item['member'] for item in response.json()['items']] == members[2:]
+    await client.post('/api/v1/groups/', json={'name': 'small_group', 'members': members[:2]})
+    assert (await client.get('/api/v1/groups/small_group')).json()['members_next_cursor'] is None
+
+async def test_process_text_gathers_agent_answers(client, db, monkeypatch):
+    async def process_text_async(self, text):
+        if self.name == 'slow_agent':
+            await asyncio.sleep(5)
+        return {'processed_text': text, 'predictions': [{'label': self.name}], 'model': self.name}
+
+    monkeypatch.setattr(Agent, 'process_text_async', process_text_async)
+    for name in ('agent1', 'agent2', 'slow_agent'):
+        await AgentService.create_agent(db, name, 'test_model')
+    await client.post('/api/v1/groups/', json={'name': 'agents', 'members': ['agent1', 'agent2']})
+    response = await client.post('/api/v1/groups/agents/process', json={'text': 'hello'})
+    assert response.status_code == 200
+    assert response.json()['group'] == 'agents' and response.json()['complete'] is True
+    assert sorted((answer['agent'], answer['predictions']) for answer in response.json()['results']) == [
+        ('agent1', [{'label': 'agent1'}]), ('agent2', [{'label': 'agent2'}]),
+    ]
+
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['member1', 'agent1', 'slow_agent']})
+    response = await client.post('/api/v1/groups/test_group/process', json={'text': 'hello', 'timeout': 0.2})
+    assert response.json()['complete'] is False
+    assert {answer['agent']: answer['status'] for answer in response.json()['results']} == {'member1': 'missing', 'agent1': 'ok', 'slow_agent': 'timeout'}
+    response = await client.post('/api/v1/groups/test_group/process', json={'text': 'hello', 'timeout': 0.2, 'stream': True})
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [line['agent'] for line in lines] == ['member1', 'agent1', 'slow_agent']
+
+    response = await client.post('/api/v1/groups/missing_group/process', json={'text': 'hello'})
+    assert response.status_code == 404
+    response = await client.post('/api/v1/groups/test_group/process', json={'text': 'hello', 'timeout': 0})
+    assert response.status_code == 422
+    monkeypatch.setattr(inference_pool, 'is_saturated', lambda: True)
+    response = await client.post('/api/v1/groups/test_group/process', json={'text': 'hello'})
+    assert response.status_code == 429 and 'retry-after' in response.headers
+
+async def test_set_weights_and_ensemble_classify(client, db, monkeypatch):
+    def infer(model, texts, backend):
+        return [{'label': 'POSITIVE' if model == 'model_a' else 'NEGATIVE', 'score': 0.9} for _ in texts]
+
+    monkeypatch.setattr('app.services.group_service.run_registry_pipeline', infer)
+    for name, model in (('agent1', 'model_a'), ('agent2', 'model_b'), ('agent3', 'model_b')):
+        await AgentService.create_agent(db, name, model)
+    await client.post('/api/v1/groups/', json={'name': 'test_group', 'members': ['agent1', 'agent2', 'agent3', 'member1']})
+    response = await client.post('/api/v1/groups/test_group/ensemble', json={'texts': ['a', 'b']})
+    assert response.status_code == 200
+    assert response.json()['labels'] == ['NEGATIVE', 'NEGATIVE']
+
+    response = await client.put('/api/v1/groups/test_group/weights', json={'weights': {'agent1': 3.0, 'missing': 1.0}})
+    assert response.json()['updated'] == 1
+    response = await client.post('/api/v1/groups/test_group/ensemble', json={'texts': ['a', 'b'], 'scheme': 'weighted_average'})
+    assert response.json()['group'] == 'test_group' and response.json()['scheme'] == 'weighted_average'
+    assert response.json()['agents'] == ['agent1', 'agent2', 'agent3']
+    assert response.json()['labels'] == ['POSITIVE', 'POSITIVE']
+    assert response.json()['scores'] == pytest.approx([0.54, 0.54])
+
+    response = await client.put('/api/v1/groups/test_group/weights', json={'weights': {'agent1': -1.0}})
+    assert response.status_code == 422
+    response = await client.put('/api/v1/groups/missing_group/weights', json={'weights': {'agent1': 1.0}})
+    assert response.status_code == 404
+    response = await client.post('/api/v1/groups/test_group/ensemble', json={'texts': ['a'], 'scheme': 'unknown'})
+    assert response.status_code == 422
+    response = await client.post('/api/v1/groups/missing_group/ensemble', json={'texts': ['a']})
+    assert response.status_code == 404
+    await client.post('/api/v1/groups/', json={'name': 'no_agents', 'members': ['member1']})
+    response = await client.post('/api/v1/groups/no_agents/ensemble', json={'texts': ['a']})
+    assert response.status_code == 400
@@ -1,33 +1,84 @@
 ## tests/api/test_news.py
 
-from fastapi.testclient import TestClient
-from app.main import app
+import pytest
+from app.api.v1.endpoints import news
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
-def test_create_news():
-    response = client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the news router.
+    """
+    async with api_client(news.router, "/api/v1/news") as client:
+        yield client
+
+async def test_create_news(client):
+    response = await client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
     assert response.status_code == 201
     assert response.json()['title'] == 'test_news'
     assert response.json()['content'] == 'test_content'
 
-def test_get_news():
+async def test_get_news(client):
     # First, create the news to ensure it exists
-    client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
-    
-    response = client.get('/api/v1/news/test_news')
+    await client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
+
+    response = await client.get('/api/v1/news/test_news')
     assert response.status_code == 200
     assert response.json()['title'] == 'test_news'
     assert response.json()['content'] == 'test_content'
 
-def test_delete_news():
+async def test_delete_news(client):
     # First, create the news to ensure it exists
-    client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
-    
-    response = client.delete('/api/v1/news/test_news')
+    await client.post('/api/v1/news/', json={'title': 'test_news', 'content': 'test_content'})
+
+    response = await client.delete('/api/v1/news/test_news')
     assert response.status_code == 204
 
     # Verify the news has been deleted
-    response = client.get('/api/v1/news/test_news')
+    response = await client.get('/api/v1/news/test_news')
+    assert response.status_code == 404
+    assert response.json()['detail'] == 'News not found'
+
+async def test_search_news(client):
+    await client.post('/api/v1/news/', json={'title': 'searchable_news', 'content': 'Astronomers spotted a <b>comet</b>.'})
+    await client.post('/api/v1/news/', json={'title': 'other_news', 'content': 'A comet was named.'})
+    await client.post('/api/v1/news/', json={'title': 'unrelated_news', 'content': 'The markets closed higher.'})
+    response = await client.get('/api/v1/news/search', params={'q': 'comet astronomers'})
+    assert response.status_code == 200
+    assert [item['title'] for item in response.json()['items']] == ['searchable_news']
+    snippet = response.json()['items'][0]['snippet']
+    assert '<mark>' in snippet and '<b>' not in snippet and '&lt;b&gt;' in snippet
+
+    response = await client.get('/api/v1/news/search', params={'q': 'comet', 'limit': 1})
+    assert len(response.json()['items']) == 1 and response.json()['next_cursor']
+    response = await client.get('/api/v1/news/search', params={'q': 'comet', 'limit': 1, 'cursor': response.json()['next_cursor']})
+    assert len(response.json()['items']) == 1 and response.json()['next_cursor'] is None
+
+    await client.delete('/api/v1/news/searchable_news')
+    response = await client.get('/api/v1/news/search', params={'q': 'astronomers'})
+    assert response.json()['items'] == []
+    response = await client.get('/api/v1/news/search', params={'q': '!!'})
+    assert response.status_code == 400
+    response = await client.get('/api/v1/news/search', params={'q': ''})
+    assert response.status_code == 422
+
+async def test_similar_news(client, indexer):
+    await client.post('/api/v1/news/', json={'title': 'rate_cut', 'content': 'The central bank cut interest rates'})
+    await client.post('/api/v1/news/bulk', json=[
+        {'title': 'rates_hold', 'content': 'The central bank held interest rates'},
+        {'title': 'cup_final', 'content': 'The home team won the football cup final'},
+    ])
+    await indexer.flush()
+    response = await client.get('/api/v1/news/similar', params={'q': 'interest rates of the central bank', 'k': 2})
+    assert response.status_code == 200
+    assert {item['title'] for item in response.json()} == {'rate_cut', 'rates_hold'}
+    assert response.json()[0]['score'] >= response.json()[1]['score']
+    response = await client.get('/api/v1/news/rate_cut/similar', params={'k': 1})
+    assert [item['title'] for item in response.json()] == ['rates_hold']
+
+    response = await client.get('/api/v1/news/missing_news/similar')
     assert response.status_code == 404
     assert response.json()['detail'] == 'News not found'
+    response = await client.get('/api/v1/news/similar', params={'q': 'comet', 'k': 0})
+    assert response.status_code == 422
@@ -1,33 +1,65 @@
 ## tests/api/test_recommendations.py
 
-from fastapi.testclient import TestClient
-from app.main import app
+import pytest
+from app.api.v1.endpoints import recommendations
+from app.core.recommender import Recommender
+from app.db.session import AsyncSessionLocal
+from app.models.feedback import Feedback
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
-def test_create_recommendation():
-    response = client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the recommendations router.
+    """
+    async with api_client(recommendations.router, "/api/v1/recommendations") as client:
+        yield client
+
+async def test_create_recommendation(client):
+    response = await client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
     assert response.status_code == 201
     assert response.json()['title'] == 'test_recommendation'
     assert response.json()['content'] == 'test_content'
 
-def test_get_recommendation():
+async def test_get_recommendation(client):
     # First, create the recommendation to ensure it exists
-    client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
-    
-    response = client.get('/api/v1/recommendations/test_recommendation')
+    await client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
+
+    response = await client.get('/api/v1/recommendations/test_recommendation')
     assert response.status_code == 200
     assert response.json()['title'] == 'test_recommendation'
     assert response.json()['content'] == 'test_content'
 
-def test_delete_recommendation():
+async def test_delete_recommendation(client):
     # First, create the recommendation to ensure it exists
-    client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
-    
-    response = client.delete('/api/v1/recommendations/test_recommendation')
+    await client.post('/api/v1/recommendations/', json={'title': 'test_recommendation', 'content': 'test_content'})
+
+    response = await client.delete('/api/v1/recommendations/test_recommendation')
     assert response.status_code == 204
 
     # Verify the recommendation has been deleted
-    response = client.get('/api/v1/recommendations/test_recommendation')
+    response = await client.get('/api/v1/recommendations/test_recommendation')
     assert response.status_code == 404
     assert response.json()['detail'] == 'Recommendation not found'
+
+async def test_recommend_for_user(client, db, tmp_path):
+    items = ['football', 'tennis', 'rugby', 'physics', 'biology', 'chemistry']
+    await client.post('/api/v1/recommendations/bulk', json=[{'title': item, 'content': f'All about {item}'} for item in items])
+    # Sports fans like the sports items, but sports0 has not seen rugby yet
+    likes = {'sports0': items[:2], 'sports1': items[:3], 'sports2': items[:3], 'science0': items[3:], 'science1': items[3:]}
+    db.add_all(Feedback(user=user, content='liked', item=item, rating=5.0) for user, liked in likes.items() for item in liked)
+    await db.commit()
+    await Recommender(AsyncSessionLocal, str(tmp_path / 'recommender.npz'), n_factors=2, top_k=3).fit()
+
+    response = await client.get('/api/v1/recommendations/for/sports0')
+    assert response.status_code == 200
+    assert response.json()[0]['title'] == 'rugby'
+    assert not {'football', 'tennis'} & {item['title'] for item in response.json()}
+    response = await client.get('/api/v1/recommendations/for/sports0', params={'limit': 1})
+    assert [item['title'] for item in response.json()] == ['rugby']
+    response = await client.get('/api/v1/recommendations/for/unknown_user')
+    assert response.status_code == 200
+    assert response.json() == []
+    response = await client.get('/api/v1/recommendations/for/unknown_user', params={'limit': 0})
+    assert response.status_code == 422
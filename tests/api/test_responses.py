@@ -0,0 +1,35 @@
+## tests/api/test_responses.py
+
+from datetime import datetime
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.api.v1.responses import FastJSONResponse, page_response
+from app.db.pagination import Page as PageRows
+from app.schemas.pagination import Page
+
+ROWS = [{"id": i, "title": f"item {i}", "created_at": datetime(2024, 1, 1, 12, 0, i)} for i in range(3)]
+
+def test_page_response_matches_response_model_rendering():
+    """
+    Test that a page rendered from its rows is identical to the page validated and encoded by FastAPI.
+    """
+    app = FastAPI()
+
+    @app.get("/before", response_model=Page, response_class=JSONResponse)
+    async def before():
+        return PageRows(items=ROWS, next_cursor="abc")
+
+    @app.get("/after", response_model=Page)
+    async def after():
+        return page_response(PageRows(items=ROWS, next_cursor="abc"))
+
+    client = TestClient(app)
+    assert client.get("/after").json() == client.get("/before").json()
+
+def test_unsupported_values_fall_back_to_jsonable_encoder():
+    """
+    Test that values orjson cannot serialize are encoded like FastAPI encodes them.
+    """
+    assert FastJSONResponse({"price": Decimal("1.5"), 1: "a"}).body == b'{"price":1.5,"1":"a"}'
@@ -1,33 +1,129 @@
 ## tests/api/test_tasks.py
 
-from fastapi.testclient import TestClient
-from app.main import app
+import asyncio
+import time
+import pytest
+from app.api.v1.endpoints import tasks
+from app.core.task_actions import PermanentTaskError, register_action
+from app.core.task_dag import dag_scheduler
+from app.core.task_queue import task_queue
+from app.core.task_workers import TaskWorkerPool
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
-def test_create_task():
-    response = client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
+FAILED = set()
+
+@register_action("test_api_fail_once")
+async def fail_once(payload):
+    if payload["task"] not in FAILED:
+        FAILED.add(payload["task"])
+        raise PermanentTaskError("not yet")
+    return payload["inputs"]
+
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the tasks router.
+    """
+    async with api_client(tasks.router, "/api/v1/tasks") as client:
+        yield client
+
+@pytest.fixture
+async def workers(db):
+    """
+    Fixture to provide workers executing the runs queued through the API.
+    """
+    pool = TaskWorkerPool(task_queue, concurrency=2, poll_interval=0.02)
+    await pool.start()
+    yield pool
+    await dag_scheduler.stop()
+    await pool.stop()
+
+async def _wait_for(client, path: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = await client.get(path)
+        if response.json()['status'] not in ('queued', 'running'):
+            return response.json()
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"{path} did not finish")
+
+async def test_create_task(client):
+    response = await client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
     assert response.status_code == 201
     assert response.json()['name'] == 'test_task'
     assert response.json()['action'] == 'test_action'
 
-def test_get_task():
+async def test_get_task(client):
     # First, create the task to ensure it exists
-    client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
-    
-    response = client.get('/api/v1/tasks/test_task')
+    await client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
+
+    response = await client.get('/api/v1/tasks/test_task')
     assert response.status_code == 200
     assert response.json()['name'] == 'test_task'
     assert response.json()['action'] == 'test_action'
 
-def test_delete_task():
+async def test_delete_task(client):
     # First, create the task to ensure it exists
-    client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
-    
-    response = client.delete('/api/v1/tasks/test_task')
+    await client.post('/api/v1/tasks/', json={'name': 'test_task', 'action': 'test_action'})
+
+    response = await client.delete('/api/v1/tasks/test_task')
     assert response.status_code == 204
 
     # Verify the task has been deleted
-    response = client.get('/api/v1/tasks/test_task')
+    response = await client.get('/api/v1/tasks/test_task')
     assert response.status_code == 404
     assert response.json()['detail'] == 'Task not found'
+
+async def test_task_runs(client, workers):
+    await client.post('/api/v1/tasks/', json={'name': 'run_task', 'action': 'echo'})
+    response = await client.post('/api/v1/tasks/run_task/runs', json={'payload': {'value': 1}, 'priority': 1})
+    assert response.status_code == 202
+    assert response.json()['status'] == 'queued' and response.json()['action'] == 'echo'
+    run_id = response.json()['id']
+    run = await _wait_for(client, f'/api/v1/tasks/run_task/runs/{run_id}')
+    assert run['status'] == 'succeeded' and run['result'] == {'value': 1} and run['attempts'] == 1
+
+    await client.post('/api/v1/tasks/', json={'name': 'broken_task', 'action': 'missing_action'})
+    response = await client.post('/api/v1/tasks/broken_task/runs', json={'max_attempts': 1})
+    run = await _wait_for(client, f"/api/v1/tasks/broken_task/runs/{response.json()['id']}")
+    assert run['status'] == 'failed' and run['error']
+
+    response = await client.get('/api/v1/tasks/run_task/runs')
+    assert [run['id'] for run in response.json()['items']] == [run_id]
+    response = await client.get('/api/v1/tasks/broken_task/runs', params={'status': 'succeeded'})
+    assert response.json()['items'] == []
+    response = await client.get(f'/api/v1/tasks/broken_task/runs/{run_id}')
+    assert response.status_code == 404
+    response = await client.post('/api/v1/tasks/missing_task/runs', json={})
+    assert response.status_code == 404
+
+async def test_task_pipelines(client, workers):
+    await client.post('/api/v1/tasks/', json={'name': 'pipeline_ingest', 'action': 'echo'})
+    response = await client.post('/api/v1/tasks/', json={'name': 'pipeline_classify', 'action': 'test_api_fail_once', 'depends_on': ['pipeline_ingest']})
+    assert response.json()['depends_on'] == ['pipeline_ingest']
+    response = await client.put('/api/v1/tasks/pipeline_ingest', json={'action': 'echo', 'depends_on': ['pipeline_classify']})
+    assert response.status_code == 400
+
+    response = await client.post('/api/v1/tasks/pipeline_classify/pipelines', json={'payload': {'text': 'hello'}})
+    assert response.status_code == 202
+    pipeline = response.json()
+    assert set(pipeline['nodes']) == {'pipeline_ingest', 'pipeline_classify'} and pipeline['status'] == 'running'
+    pipeline = await _wait_for(client, f"/api/v1/tasks/pipeline_classify/pipelines/{pipeline['id']}")
+    assert pipeline['status'] == 'failed'
+    assert pipeline['nodes']['pipeline_ingest']['status'] == 'succeeded' and pipeline['nodes']['pipeline_classify']['error']
+
+    response = await client.post(f"/api/v1/tasks/pipeline_classify/pipelines/{pipeline['id']}/resume")
+    assert response.status_code == 202
+    pipeline = await _wait_for(client, f"/api/v1/tasks/pipeline_classify/pipelines/{pipeline['id']}")
+    assert pipeline['status'] == 'succeeded'
+    assert pipeline['nodes']['pipeline_classify']['result'] == {'pipeline_ingest': {'text': 'hello', 'task': 'pipeline_ingest', 'inputs': {}}}
+    response = await client.post(f"/api/v1/tasks/pipeline_classify/pipelines/{pipeline['id']}/resume")
+    assert response.status_code == 409
+
+    response = await client.get('/api/v1/tasks/pipeline_classify/pipelines/0')
+    assert response.status_code == 404
+    response = await client.get(f"/api/v1/tasks/pipeline_ingest/pipelines/{pipeline['id']}")
+    assert response.status_code == 404
+    response = await client.post('/api/v1/tasks/missing_task/pipelines', json={})
+    assert response.status_code == 404
@@ -1,33 +1,72 @@
 ## tests/api/test_training.py
 
-from fastapi.testclient import TestClient
-from app.main import app
+import pytest
+from app.api.v1.endpoints import training
 
-client = TestClient(app)
+pytestmark = pytest.mark.anyio
 
-def test_create_training():
-    response = client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
+@pytest.fixture
+async def client(api_client):
+    """
+    Fixture to provide a client of the training router.
+    """
+    async with api_client(training.router, "/api/v1/training") as client:
+        yield client
+
+async def test_create_training(client):
+    response = await client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
     assert response.status_code == 201
     assert response.json()['title'] == 'test_training'
     assert response.json()['content'] == 'test_content'
 
-def test_get_training():
+async def test_get_training(client):
     # First, create the training to ensure it exists
-    client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
-    
-    response = client.get('/api/v1/training/test_training')
+    await client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
+
+    response = await client.get('/api/v1/training/test_training')
     assert response.status_code == 200
     assert response.json()['title'] == 'test_training'
     assert response.json()['content'] == 'test_content'
 
-def test_delete_training():
+async def test_delete_training(client):
     # First, create the training to ensure it exists
-    client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
-    
-    response = client.delete('/api/v1/training/test_training')
+    await client.post('/api/v1/training/', json={'title': 'test_training', 'content': 'test_content'})
+
+    response = await client.delete('/api/v1/training/test_training')
     assert response.status_code == 204
 
     # Verify the training has been deleted
-    response = client.get('/api/v1/training/test_training')
+    response = await client.get('/api/v1/training/test_training')
     assert response.status_code == 404
     assert response.json()['detail'] == 'Training not found'
+
+async def test_search_trainings(client):
+    await client.post('/api/v1/training/bulk', json=[
+        {'title': 'searchable_training', 'content': 'Calibrate the telescopes.'},
+        {'title': 'other_training', 'content': 'Clean the lenses.'},
+    ])
+    response = await client.get('/api/v1/training/search', params={'q': 'telescope'})
+    assert response.status_code == 200
+    assert [item['title'] for item in response.json()['items']] == ['searchable_training']
+    assert '<mark>' in response.json()['items'][0]['snippet']
+
+    await client.post('/api/v1/training/bulk', json=[{'title': 'other_training', 'content': 'Point the telescope north.'}])
+    response = await client.get('/api/v1/training/search', params={'q': 'telescope'})
+    assert {item['title'] for item in response.json()['items']} == {'searchable_training', 'other_training'}
+    response = await client.get('/api/v1/training/search', params={'q': '!!'})
+    assert response.status_code == 400
+
+async def test_similar_trainings(client, indexer):
+    await client.post('/api/v1/training/bulk', json=[
+        {'title': 'telescopes', 'content': 'Calibrate the telescopes before observing'},
+        {'title': 'mirrors', 'content': 'Clean the telescope mirrors before observing'},
+        {'title': 'payroll', 'content': 'Submit the monthly payroll report'},
+    ])
+    await indexer.flush()
+    response = await client.get('/api/v1/training/similar', params={'q': 'payroll report', 'k': 1})
+    assert response.status_code == 200
+    assert [item['title'] for item in response.json()] == ['payroll']
+    response = await client.get('/api/v1/training/telescopes/similar', params={'k': 1})
+    assert [item['title'] for item in response.json()] == ['mirrors']
+    response = await client.get('/api/v1/training/missing_training/similar')
+    assert response.status_code == 404
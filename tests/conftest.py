@@ -0,0 +1,87 @@
+## tests/conftest.py
+
+import re
+import zlib
+import httpx
+import numpy as np
+import pytest
+from fastapi import APIRouter, FastAPI
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.api.v1.responses import FastJSONResponse
+from app.core.embeddings import EmbeddingIndexer
+from app.core.entity_cache import entity_cache
+from app.db.base_class import Base
+from app.db.session import AsyncSessionLocal, create_engine, get_async_db
+from app.middleware.error_handler import add_error_handlers
+from app.services import feedback_service, news_service, training_service
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """
+    Fixture to run the async tests on asyncio only.
+    """
+    return "asyncio"
+
+@pytest.fixture(scope="session", autouse=True)
+def test_engine(tmp_path_factory) -> AsyncEngine:
+    """
+    Fixture to run the tests on a database of their own, never on the one DATABASE_URL points the app at.
+
+    The sessions of the app, AsyncSessionLocal, are bound to it for the whole test run.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('database') / 'test.db'}")
+    AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+@pytest.fixture
+async def db(test_engine: AsyncEngine) -> AsyncSession:
+    """
+    Fixture to provide a database session for the tests.
+    """
+    async with test_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with test_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    # Rows cached by one test are gone with its tables
+    entity_cache.local.clear()
+    # Pooled connections are bound to the event loop of the test that opened them
+    await test_engine.dispose()
+
+@pytest.fixture
+def api_client(db: AsyncSession):
+    """
+    Fixture to build a client of a bare app mounting only the router under test, on the session of the db fixture.
+
+    The client runs the app in the event loop of the test, which the session is bound to.
+    """
+    def api_client(router: APIRouter, prefix: str = "") -> httpx.AsyncClient:
+        app = FastAPI(default_response_class=FastJSONResponse)
+        app.include_router(router, prefix=prefix)
+        add_error_handlers(app)
+        app.dependency_overrides[get_async_db] = lambda: db
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return api_client
+
+def embed(texts):
+    """
+    Embed texts as their normalized bags of words, so texts sharing words are similar.
+    """
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"\w+", text.lower()):
+            vectors[row, zlib.crc32(word.encode()) % 64] += 1
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+@pytest.fixture
+async def indexer(db: AsyncSession, tmp_path, monkeypatch) -> EmbeddingIndexer:
+    """
+    Fixture to provide a running embedding indexer with bag-of-words embeddings, fed by the services.
+    """
+    indexer = EmbeddingIndexer(AsyncSessionLocal, str(tmp_path), embed=embed, dim=64, batch_size=2, flush_interval=0.02)
+    for service in (news_service, training_service, feedback_service):
+        monkeypatch.setattr(service, "embedding_indexer", indexer)
+    await indexer.start()
+    yield indexer
+    await indexer.stop()
@@ -0,0 +1,73 @@
+## tests/core/test_batching.py
+
+import asyncio
+from app.core.batching import BatchingEngine
+
+def test_concurrent_submissions_are_batched():
+    """
+    Test that concurrent submissions end up in one pipeline call and each caller gets its own result.
+    """
+    calls = []
+
+    def infer(model, texts, backend):
+        calls.append(list(texts))
+        return [{"label": text.upper(), "score": 1.0} for text in texts]
+
+    async def run():
+        engine = BatchingEngine("test_model", max_batch_size=8, max_wait_ms=50, infer=infer)
+        results = await asyncio.gather(*(engine.submit(f"text{i}") for i in range(5)))
+        return engine, results
+
+    engine, results = asyncio.run(run())
+    assert calls == [[f"text{i}" for i in range(5)]]
+    assert [r["label"] for r in results] == [f"TEXT{i}" for i in range(5)]
+    assert engine.stats()["batch_size_histogram"]["8"] == 1
+    assert engine.stats()["queue_depth"] == 0
+
+def test_batches_are_capped_at_max_batch_size():
+    """
+    Test that a batch never exceeds the configured maximum size.
+    """
+    sizes = []
+
+    def infer(model, texts, backend):
+        sizes.append(len(texts))
+        return texts
+
+    async def run():
+        engine = BatchingEngine("test_model", max_batch_size=4, max_wait_ms=50, infer=infer)
+        return await asyncio.gather(*(engine.submit(str(i)) for i in range(10)))
+
+    results = asyncio.run(run())
+    assert results == [str(i) for i in range(10)]
+    assert max(sizes) <= 4
+    assert sum(sizes) == 10
+
+def test_inference_errors_reach_every_caller():
+    """
+    Test that a failing batch raises the error in every waiting caller.
+    """
+    def infer(model, texts, backend):
+        raise ValueError("boom")
+
+    async def run():
+        engine = BatchingEngine("test_model", max_batch_size=4, max_wait_ms=10, infer=infer)
+        return await asyncio.gather(engine.submit("a"), engine.submit("b"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+def test_missing_predictions_fail_every_caller():
+    """
+    Test that a batch getting fewer predictions than texts fails its callers rather than leaving some waiting.
+    """
+    def infer(model, texts, backend):
+        return texts[:-1]
+
+    async def run():
+        engine = BatchingEngine("test_model", max_batch_size=4, max_wait_ms=10, infer=infer)
+        gathered = asyncio.gather(engine.submit("a"), engine.submit("b"), return_exceptions=True)
+        return await asyncio.wait_for(gathered, 5)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
@@ -0,0 +1,40 @@
+## tests/core/test_elasticsearch.py
+
+import json
+import httpx
+import pytest
+from app.core.search import ElasticsearchSearchBackend
+from app.models.news import News
+
+pytestmark = pytest.mark.anyio
+
+async def test_elasticsearch_backend_requests():
+    """
+    Test the documents written to and the query sent to Elasticsearch, and the parsing of the hits.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/_search"):
+            hits = [{"_id": "Markets", "_score": 3.5, "highlight": {"content": ["<mark>Stocks</mark> rallied"]}}]
+            return httpx.Response(200, json={"hits": {"hits": hits}})
+        return httpx.Response(200, json={"errors": False})
+
+    backend = ElasticsearchSearchBackend("http://elasticsearch", prefix="test-")
+    backend._client = httpx.AsyncClient(base_url=backend.url, transport=httpx.MockTransport(handler))
+    await backend.index(News, [{"title": "Markets", "content": "Stocks rallied."}])
+    await backend.delete(News, ["Weather"])
+    hits = await backend.search(None, News, "stocks", limit=5, offset=10)
+    await backend.close()
+
+    assert [(request.method, request.url.path) for request in requests] == [
+        ("PUT", "/test-news"), ("POST", "/_bulk"), ("POST", "/_bulk"), ("POST", "/test-news/_search"),
+    ]
+    lines = [json.loads(line) for line in requests[1].content.splitlines()]
+    assert lines == [{"index": {"_index": "test-news", "_id": "Markets"}}, {"title": "Markets", "content": "Stocks rallied."}]
+    query = json.loads(requests[3].content)
+    assert (query["from"], query["size"]) == (10, 5)
+    assert query["query"]["multi_match"]["fields"] == ["title^10.0", "content^1.0"]
+    assert query["highlight"]["encoder"] == "html"
+    assert hits == [{"title": "Markets", "snippet": "<mark>Stocks</mark> rallied", "score": 3.5}]
@@ -0,0 +1,94 @@
+## tests/core/test_embeddings.py
+
+import asyncio
+import threading
+import time
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.embeddings import EMBEDDING_SOURCES, EmbeddingIndexer
+from app.core.vector_index import VectorIndex
+from app.models.feedback import Feedback
+from app.models.news import News
+from app.services.feedback_service import FeedbackService
+from app.services.news_service import NewsService
+
+pytestmark = pytest.mark.anyio
+
+async def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "The indexer did not catch up"
+        await asyncio.sleep(0.02)
+
+async def test_written_rows_are_embedded_in_the_background(db: AsyncSession, indexer: EmbeddingIndexer):
+    """
+    Test that created, bulk upserted and deleted rows reach the index and that similar rows are found by text or row.
+    """
+    await NewsService.create_news(db, "Rate cut", "The central bank cut interest rates")
+    await NewsService.bulk_upsert_news(db, [
+        (0, {"title": "Rates hold", "content": "The central bank held interest rates"}),
+        (1, {"title": "Cup final", "content": "The home team won the football cup final"}),
+    ])
+    await _wait_for(lambda: len(indexer.index(News)) == 3)
+
+    similar = await NewsService.search_similar_news(db, "interest rates of the central bank", k=2)
+    assert {row["title"] for row in similar} == {"Rate cut", "Rates hold"}
+    assert similar[0]["score"] >= similar[1]["score"]
+    similar = await NewsService.get_similar_news(db, "Rate cut", k=5)
+    assert [row["title"] for row in similar][0] == "Rates hold" and "Rate cut" not in {row["title"] for row in similar}
+    assert await NewsService.get_similar_news(db, "Missing", k=5) is None
+
+    await NewsService.bulk_upsert_news(db, [(0, {"title": "Rates hold", "content": "The football team held the cup"})])
+    await NewsService.delete_news(db, "Rate cut")
+    await indexer.flush()
+    similar = await NewsService.search_similar_news(db, "football cup", k=5)
+    assert [row["title"] for row in similar][:2] in (["Cup final", "Rates hold"], ["Rates hold", "Cup final"])
+    assert "Rate cut" not in {row["title"] for row in similar}
+
+async def test_missing_rows_are_embedded_on_start(db: AsyncSession, indexer: EmbeddingIndexer, tmp_path):
+    """
+    Test that rows written while the indexer was stopped are embedded when it starts, from the index persisted on stop.
+    """
+    await FeedbackService.create_feedback(db, "alice", "The search results are great")
+    await _wait_for(lambda: len(indexer.index(Feedback)) == 1)
+    await indexer.stop()
+    await FeedbackService.create_feedback(db, "bob", "The search is too slow")
+    await indexer.start()
+    await _wait_for(lambda: len(indexer.index(Feedback)) == 2)
+    similar = await FeedbackService.search_similar_feedbacks(db, "slow search", k=1)
+    assert similar[0]["user"] == "bob"
+
+async def test_indexes_are_loaded_on_start_and_queried_off_the_event_loop(db: AsyncSession, indexer: EmbeddingIndexer, monkeypatch):
+    """
+    Test that start loads every index and that queries and lookups of the index run outside the event loop thread.
+    """
+    assert set(indexer._indexes) == set(EMBEDDING_SOURCES)
+    await NewsService.create_news(db, "Rate cut", "The central bank cut interest rates")
+    await NewsService.create_news(db, "Rates hold", "The central bank held interest rates")
+    await _wait_for(lambda: len(indexer.index(News)) == 2)
+
+    threads = []
+    for name in ("query", "get"):
+        def record(self, *args, _method=getattr(VectorIndex, name)):
+            threads.append(threading.current_thread())
+            return _method(self, *args)
+        monkeypatch.setattr(VectorIndex, name, record)
+    similar = await NewsService.get_similar_news(db, "Rate cut", k=1)
+    assert [row["title"] for row in similar] == ["Rates hold"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+
+async def test_flush_waits_for_rows_taken_by_the_background_loop(db: AsyncSession, indexer: EmbeddingIndexer, monkeypatch):
+    """
+    Test that a flush returns only once the rows being embedded by the background loop are indexed.
+    """
+    apply = indexer._apply
+
+    async def slow_apply(model, ids):
+        await asyncio.sleep(0.2)
+        await apply(model, ids)
+
+    monkeypatch.setattr(indexer, "_apply", slow_apply)
+    await NewsService.create_news(db, "Rate cut", "The central bank cut interest rates")
+    await _wait_for(lambda: not indexer._pending[News])
+    await indexer.flush()
+    assert len(indexer.index(News)) == 1
@@ -0,0 +1,64 @@
+## tests/core/test_ensemble.py
+
+import time
+import numpy as np
+import pytest
+from app.core.ensemble import combine, ensemble_predictions, stack_predictions
+
+MODEL_A = [{"label": "POSITIVE", "score": 0.9}, {"label": "NEGATIVE", "score": 0.6}, {"label": "POSITIVE", "score": 0.55}]
+MODEL_B = [{"label": "NEGATIVE", "score": 0.7}, {"label": "NEGATIVE", "score": 0.8}, {"label": "NEGATIVE", "score": 0.99}]
+MODEL_C = [
+    [{"label": "NEGATIVE", "score": 0.4}, {"label": "POSITIVE", "score": 0.6}],
+    [{"label": "NEGATIVE", "score": 0.3}, {"label": "POSITIVE", "score": 0.7}],
+    [{"label": "NEUTRAL", "score": 1.0}],
+]
+
+def test_stack_predictions_aligns_labels():
+    """
+    Test that top-1 and multi-label predictions are stacked into one label vocabulary.
+    """
+    scores, labels = stack_predictions([MODEL_A, MODEL_C])
+    assert labels == ["NEGATIVE", "NEUTRAL", "POSITIVE"]
+    assert scores.shape == (2, 3, 3)
+    np.testing.assert_allclose(scores[0, 0], [0, 0, 0.9])
+    np.testing.assert_allclose(scores[1, 1], [0.3, 0, 0.7])
+
+@pytest.mark.parametrize("scheme, weights, expected", [
+    ("majority", [1, 1, 1], (["POSITIVE", "NEGATIVE", "NEGATIVE"], [2 / 3, 2 / 3, 1 / 3])),
+    ("majority", [1, 3, 1], (["NEGATIVE", "NEGATIVE", "NEGATIVE"], [0.6, 0.8, 0.6])),
+    ("weighted_average", [1, 1, 2], (["POSITIVE", "NEGATIVE", "NEUTRAL"], [0.525, 0.5, 0.5])),
+    ("max_confidence", [1, 1, 1], (["POSITIVE", "NEGATIVE", "NEUTRAL"], [0.9, 0.8, 1.0])),
+])
+def test_ensemble_schemes(scheme, weights, expected):
+    """
+    Test each combination scheme, with and without weights.
+    """
+    labels, scores = ensemble_predictions([MODEL_A, MODEL_B, MODEL_C], weights, scheme)
+    assert labels == expected[0]
+    np.testing.assert_allclose(scores, expected[1], rtol=1e-5)
+
+def test_invalid_weights_and_scheme():
+    """
+    Test that mismatched weights and unknown schemes are rejected.
+    """
+    scores, _ = stack_predictions([MODEL_A, MODEL_B])
+    with pytest.raises(ValueError):
+        combine(scores, np.array([1.0]), "majority")
+    with pytest.raises(ValueError):
+        combine(scores, np.array([1.0, 1.0]), "unknown")
+
+def test_large_batches_are_vectorized():
+    """
+    Test that 100k texts from several models are combined in well under a second per scheme.
+    """
+    rng = np.random.default_rng(0)
+    texts = 100_000
+    predictions = [
+        [{"label": label, "score": float(score)} for label, score in zip(rng.choice(["A", "B", "C"], texts), rng.random(texts))]
+        for _ in range(5)
+    ]
+    for scheme in ("majority", "weighted_average", "max_confidence"):
+        start = time.perf_counter()
+        labels, scores = ensemble_predictions(predictions, [1, 2, 1, 1, 0.5], scheme)
+        assert len(labels) == len(scores) == texts
+        assert time.perf_counter() - start < 2.0
@@ -0,0 +1,84 @@
+## tests/core/test_entity_cache.py
+
+import asyncio
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import InMemorySharedCache, LRUCache
+from app.core.entity_cache import EntityCache, LocalInvalidationBus, entity_cache
+from app.models.group import Group
+from app.models.task import Task
+from app.services.group_service import GroupService
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.anyio
+
+class Loader:
+    def __init__(self, row):
+        self.row = row
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.row
+
+async def test_repeated_lookups_are_served_from_cache():
+    """
+    Test that only the first lookup of a row loads it and that missing rows are not cached.
+    """
+    cache = EntityCache(LRUCache(100))
+    loader = Loader(Task(id=1, name="t", action="run"))
+    first, second = await asyncio.gather(cache.get(Task, "t", loader), cache.get(Task, "t", loader))
+    cached = await cache.get(Task, "t", loader)
+    assert loader.calls == 1
+    assert (first.name, second.name, cached.action) == ("t", "t", "run")
+    missing = Loader(None)
+    assert await cache.get(Task, "none", missing) is None
+    assert await cache.get(Task, "none", missing) is None
+    assert missing.calls == 2
+    assert cache.stats()["local_hits"] == 1
+
+async def test_invalidation_reaches_every_node():
+    """
+    Test that a write on one node drops the row from the shared tier and the local tier of the others.
+    """
+    shared, bus = InMemorySharedCache(), LocalInvalidationBus()
+    first, second = EntityCache(LRUCache(100), shared, bus), EntityCache(LRUCache(100), shared, bus)
+    group = Group(id=1, name="g", members=["a", "b"])
+    await first.get(Group, "g", Loader(group), extra_fields=("members",))
+    loader = Loader(group)
+    cached = await second.get(Group, "g", loader, extra_fields=("members",))
+    assert loader.calls == 0 and cached.members == ["a", "b"]
+    assert second.stats()["shared_hits"] == 1
+    await first.invalidate(Group, "g")
+    assert len(second.local) == 0
+    await second.get(Group, "g", loader, extra_fields=("members",))
+    assert loader.calls == 1
+
+async def test_service_writes_invalidate_lookups(db: AsyncSession):
+    """
+    Test that repeated lookups skip the database and that updates, bulk writes and deletes are seen.
+    """
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    try:
+        await TaskService.create_task(db, "t", "run")
+        await TaskService.get_task(db, "t")
+        queries = len(statements)
+        assert (await TaskService.get_task(db, "t")).action == "run"
+        assert len(statements) == queries
+    finally:
+        event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+    await TaskService.update_task(db, "t", "stop")
+    assert (await TaskService.get_task(db, "t")).action == "stop"
+    await GroupService.create_group(db, "g", ["a"])
+    assert (await GroupService.get_group(db, "g")).member_count == 1
+    await GroupService.bulk_upsert_groups(db, [(0, {"name": "g", "members": ["b", "c"]})])
+    # The session still holds the group loaded before the bulk write
+    db.expire_all()
+    assert (await GroupService.get_group(db, "g")).member_count == 2
+    await TaskService.delete_task(db, "t")
+    assert await TaskService.get_task(db, "t") is None
+    assert entity_cache.stats()["invalidations"] >= 4
@@ -0,0 +1,52 @@
+## tests/core/test_inference_pool.py
+
+import asyncio
+import threading
+import pytest
+from app.core.inference_pool import InferencePool, InferenceQueueFull
+
+def test_run_executes_off_the_event_loop():
+    """
+    Test that functions run in a worker thread and their result is returned.
+    """
+    pool = InferencePool(max_workers=1, max_queue=1, kind="thread", torch_threads=1)
+
+    async def run():
+        return await pool.run(lambda: threading.current_thread() is threading.main_thread())
+
+    try:
+        assert asyncio.run(run()) is False
+    finally:
+        pool.shutdown()
+
+def test_full_queue_is_rejected():
+    """
+    Test that calls beyond the workers and the queue are rejected with a retry hint.
+    """
+    pool = InferencePool(max_workers=1, max_queue=1, kind="thread", torch_threads=1, retry_after=3)
+    release = threading.Event()
+
+    async def run():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.is_saturated()
+        with pytest.raises(InferenceQueueFull) as exc_info:
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        return exc_info.value
+
+    try:
+        error = asyncio.run(run())
+        assert error.retry_after == 3
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+def test_unknown_pool_kind():
+    """
+    Test that an unknown worker kind is refused.
+    """
+    with pytest.raises(ValueError):
+        InferencePool(kind="fiber")
@@ -0,0 +1,70 @@
+## tests/core/test_logger.py
+
+import logging
+import sys
+import time
+import orjson
+import pytest
+from app.core.logger import JsonFormatter, LoggerSettings, RateLimitFilter, SamplingFilter, logger, setup_logger, shutdown_logger
+
+def _record(name="app.test", level=logging.ERROR, msg="boom %s", args=(1,), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+@pytest.fixture
+def app_logger():
+    yield logger
+    shutdown_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+def test_records_are_formatted_as_json():
+    """
+    Test that a record becomes one JSON object holding its message, extra fields and traceback.
+    """
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = _record(request_id="abc")
+        record.exc_info = sys.exc_info()
+    payload = orjson.loads(JsonFormatter().format(record))
+    assert payload["message"] == "boom 1"
+    assert payload["level"] == "ERROR"
+    assert payload["request_id"] == "abc"
+    assert "ValueError: bad" in payload["exception"]
+
+def test_repeated_errors_are_rate_limited():
+    """
+    Test that copies of an error past the limit are dropped and counted on the next record let through.
+    """
+    rate_limit = RateLimitFilter(limit=2, interval=0.05)
+    assert [rate_limit.filter(_record()) for _ in range(4)] == [True, True, False, False]
+    assert rate_limit.filter(_record(msg="other %s")) is True
+    assert rate_limit.filter(_record(level=logging.INFO)) is True
+    time.sleep(0.06)
+    record = _record()
+    assert rate_limit.filter(record) is True
+    assert record.suppressed == 2
+
+def test_sampling_applies_per_logger():
+    """
+    Test that the most specific sampling rate of a logger applies and that warnings are never sampled out.
+    """
+    sampling = SamplingFilter({"app": 1.0, "app.noisy": 0.0})
+    assert sampling.filter(_record(name="app.noisy.child", level=logging.INFO)) is False
+    assert sampling.filter(_record(name="app.noisy", level=logging.WARNING)) is True
+    assert sampling.filter(_record(name="app.quiet", level=logging.INFO)) is True
+
+def test_queue_mode_writes_json_lines_from_the_listener(tmp_path, app_logger):
+    """
+    Test that records logged in queue mode reach the log file once the listener is stopped.
+    """
+    setup_logger(log_dir=str(tmp_path), log_format="json", use_queue=True, sample_rates={})
+    logging.getLogger("app.test").warning("queued %s", "record", extra={"user": "u1"})
+    shutdown_logger()
+    lines = [orjson.loads(line) for line in (tmp_path / LoggerSettings.LOG_FILE).read_text().splitlines()]
+    record = next(line for line in lines if line["logger"] == "app.test")
+    assert record["message"] == "queued record"
+    assert record["user"] == "u1"
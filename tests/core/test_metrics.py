@@ -0,0 +1,81 @@
+## tests/core/test_metrics.py
+
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core.metrics import LabelLimiter, OVERFLOW_LABEL, instrument_engine, instrument_service, registry
+from app.db.session import create_engine
+from app.middleware.metrics import PrometheusMiddleware
+
+def _sample(name, labels):
+    return registry.get_sample_value(name, labels) or 0
+
+def test_label_limiter_bounds_cardinality():
+    """
+    Test that label values past the limit are folded into the overflow label.
+    """
+    limit = LabelLimiter(2)
+    assert [limit(value) for value in ("a", "b", "c", "a")] == ["a", "b", OVERFLOW_LABEL, "a"]
+
+def test_requests_are_labelled_by_route_template():
+    """
+    Test that request latencies are recorded per route template, never per raw path.
+    """
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/items/{name}")
+    async def get_item(name: str):
+        return {"name": name}
+
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/items/{name}", "status": "200"}
+    before = _sample("http_request_duration_seconds_count", labels)
+    client.get("/items/a")
+    client.get("/items/b")
+    client.get("/unknown/path")
+    assert _sample("http_request_duration_seconds_count", labels) == before + 2
+    assert _sample("http_request_duration_seconds_count", {"method": "GET", "route": "<unmatched>", "status": "404"}) >= 1
+    client.request("BREW", "/items/a")
+    assert _sample("http_request_duration_seconds_count", {"method": "BREW", "route": "<unmatched>", "status": "405"}) == 0
+    assert _sample("http_request_duration_seconds_count", {"method": "OTHER", "route": "<unmatched>", "status": "405"}) >= 1
+
+def test_service_calls_and_their_queries_are_timed(tmp_path):
+    """
+    Test that service methods are timed and the queries they run are labelled with them, failed queries aside.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine)
+
+    @instrument_service
+    class ProbeService:
+        @staticmethod
+        async def ping() -> int:
+            async with engine.connect() as connection:
+                return (await connection.execute(text("SELECT 1"))).scalar()
+
+        @staticmethod
+        async def fail() -> dict:
+            async with engine.connect() as connection:
+                with pytest.raises(OperationalError):
+                    await connection.execute(text("SELECT * FROM missing"))
+                await connection.execute(text("SELECT 1"))
+                return dict(connection.info)
+
+    async def run():
+        result = await ProbeService.ping()
+        info = await ProbeService.fail()
+        await engine.dispose()
+        return result, info
+
+    labels = {"service": "ProbeService", "method": "ping"}
+    result, info = asyncio.run(run())
+    assert result == 1
+    # A failed query is not timed and leaves nothing behind on its pooled connection
+    assert _sample("db_query_duration_seconds_count", {"service": "ProbeService", "method": "fail"}) == 1
+    assert info == {}
+    assert _sample("service_call_duration_seconds_count", labels) == 1
+    assert _sample("db_query_duration_seconds_count", labels) >= 1
@@ -0,0 +1,103 @@
+## tests/core/test_model_registry.py
+
+import pytest
+from app.core.model_registry import ModelRegistry
+
+class FakePipeline:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, text):
+        return [{"label": self.name, "score": 1.0}]
+
+@pytest.fixture
+def loads() -> list:
+    """
+    Fixture to record every model load performed by the registry.
+    """
+    return []
+
+@pytest.fixture
+def registry(loads: list) -> ModelRegistry:
+    """
+    Fixture to provide a registry with a fake loader and a budget of two 10-byte models.
+    """
+    def loader(name: str, backend: str) -> FakePipeline:
+        loads.append(name)
+        return FakePipeline(name)
+
+    return ModelRegistry(memory_budget_bytes=20, loader=loader, sizer=lambda p: 10)
+
+def test_acquire_shares_pipeline(registry: ModelRegistry, loads: list):
+    """
+    Test that a model is loaded once and shared between acquirers.
+    """
+    first = registry.acquire("model_a")
+    second = registry.acquire("model_a")
+    assert first is second
+    assert loads == ["model_a"]
+    assert registry.refcount("model_a") == 2
+
+def test_release_decrements_refcount(registry: ModelRegistry):
+    """
+    Test that releasing a model drops its reference count without unloading it.
+    """
+    registry.acquire("model_a")
+    registry.release("model_a")
+    assert registry.refcount("model_a") == 0
+    assert registry.get("model_a") is not None
+
+def test_lru_eviction_skips_referenced_models(registry: ModelRegistry):
+    """
+    Test that the least recently used unreferenced model is evicted when over budget.
+    """
+    registry.acquire("model_a")
+    registry.acquire("model_b")
+    registry.release("model_b")
+    registry.acquire("model_c")
+    assert ("model_a", "torch") in registry.loaded_models()
+    assert ("model_b", "torch") not in registry.loaded_models()
+    assert ("model_c", "torch") in registry.loaded_models()
+
+def test_warm_up_loads_without_references(registry: ModelRegistry, loads: list):
+    """
+    Test that warm-up loads models without holding references to them.
+    """
+    registry.warm_up(["model_a", "model_b"])
+    assert loads == ["model_a", "model_b"]
+    assert registry.refcount("model_a") == 0
+    registry.acquire("model_a")
+    assert loads == ["model_a", "model_b"]
+
+def test_backends_are_loaded_separately(registry: ModelRegistry, loads: list):
+    """
+    Test that the same model served by two backends is loaded once per backend.
+    """
+    torch_pipeline = registry.acquire("model_a")
+    onnx_pipeline = registry.acquire("model_a", "onnx")
+    assert torch_pipeline is not onnx_pipeline
+    assert loads == ["model_a", "model_a"]
+    assert registry.refcount("model_a", "onnx") == 1
+
+def test_warm_up_reads_backend_prefix(registry: ModelRegistry):
+    """
+    Test that warm-up entries may select a backend with a prefix.
+    """
+    registry.warm_up(["onnx-int8:model_a", "model_b"])
+    assert set(registry.loaded_models()) == {("model_a", "onnx-int8"), ("model_b", "torch")}
+
+def test_warm_up_reports_models_that_failed_to_load(loads: list):
+    """
+    Test that warm-up returns the models it could not load and that they are reported missing until loaded.
+    """
+    def loader(name: str, backend: str) -> FakePipeline:
+        if name == "broken" and not loads:
+            loads.append(name)
+            raise OSError("model not found")
+        return FakePipeline(name)
+
+    registry = ModelRegistry(loader=loader, sizer=lambda p: 10)
+    assert registry.warm_up(["model_a", "onnx:broken"]) == ["onnx:broken"]
+    assert registry.missing_models(["model_a", "onnx:broken"]) == ["onnx:broken"]
+    registry.acquire("broken", "onnx")
+    assert registry.missing_models(["model_a", "onnx:broken"]) == []
@@ -0,0 +1,80 @@
+## tests/core/test_onnx_backend.py
+
+import pytest
+
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("torch")
+pytest.importorskip("onnxruntime")
+
+from app.core.onnx_backend import OnnxTextClassificationPipeline
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcdefghijklmnopqrstuvwxyz") + ["the", "service", "support", "text"]
+TEXTS = [
+    "The service answered quickly and correctly.",
+    "Nothing worked and support never replied.",
+    "short",
+    "A much longer text that needs padding against the shorter ones in the same batch, " * 4,
+]
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory) -> str:
+    """
+    Fixture to provide a tiny randomly initialized classifier saved to disk.
+    """
+    path = tmp_path_factory.mktemp("model")
+    vocab_file = path / "vocab.txt"
+    vocab_file.write_text("\n".join(VOCAB))
+    transformers.DistilBertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(path)
+    config = transformers.DistilBertConfig(
+        vocab_size=len(VOCAB), dim=32, n_layers=2, n_heads=2, hidden_dim=64, num_labels=3,
+        id2label={0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}, label2id={"NEGATIVE": 0, "NEUTRAL": 1, "POSITIVE": 2},
+    )
+    transformers.DistilBertForSequenceClassification(config).save_pretrained(path)
+    return str(path)
+
+@pytest.fixture(scope="module")
+def torch_pipeline(model_dir: str):
+    """
+    Fixture to provide the reference torch pipeline.
+    """
+    return transformers.pipeline("text-classification", model=model_dir)
+
+@pytest.fixture(scope="module")
+def cache_dir(tmp_path_factory) -> str:
+    """
+    Fixture to provide a cache directory shared by the exported graphs of the module.
+    """
+    return str(tmp_path_factory.mktemp("onnx"))
+
+def test_onnx_matches_torch(model_dir: str, torch_pipeline, cache_dir: str):
+    """
+    Test that the exported ONNX graph predicts the same labels and scores as torch.
+    """
+    onnx_pipeline = OnnxTextClassificationPipeline.from_pretrained(model_dir, cache_dir=cache_dir)
+    expected = torch_pipeline(TEXTS)
+    actual = onnx_pipeline(TEXTS)
+    assert [p["label"] for p in actual] == [p["label"] for p in expected]
+    for a, e in zip(actual, expected):
+        assert a["score"] == pytest.approx(e["score"], abs=1e-4)
+
+def test_single_text_call_matches_transformers_shape(model_dir: str, cache_dir: str):
+    """
+    Test that a single text yields a list with one prediction, like a transformers pipeline.
+    """
+    onnx_pipeline = OnnxTextClassificationPipeline.from_pretrained(model_dir, cache_dir=cache_dir)
+    predictions = onnx_pipeline("one text")
+    assert len(predictions) == 1
+    assert set(predictions[0]) == {"label", "score"}
+
+def test_quantized_graph_stays_close(model_dir: str, torch_pipeline, cache_dir: str):
+    """
+    Test that the int8 graph is smaller and its scores stay close to torch.
+    """
+    onnx_pipeline = OnnxTextClassificationPipeline.from_pretrained(model_dir, cache_dir=cache_dir)
+    quantized_pipeline = OnnxTextClassificationPipeline.from_pretrained(model_dir, quantize=True, cache_dir=cache_dir)
+    assert quantized_pipeline.size_bytes < onnx_pipeline.size_bytes
+    expected = torch_pipeline(TEXTS)
+    actual = quantized_pipeline(TEXTS)
+    for a, e in zip(actual, expected):
+        if a["label"] == e["label"]:
+            assert a["score"] == pytest.approx(e["score"], abs=0.05)
@@ -0,0 +1,65 @@
+## tests/core/test_prediction_cache.py
+
+import time
+from app.core.cache import InMemorySharedCache, LRUCache
+from app.core.prediction_cache import PredictionCache, predict_with_cache
+
+class FakePipeline:
+    def __init__(self, revision="rev1"):
+        self.revision = revision
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [{"label": text.strip().upper(), "score": 1.0} for text in texts]
+
+def test_repeated_texts_are_served_from_cache():
+    """
+    Test that only uncached texts reach the pipeline and that near-identical texts share an entry.
+    """
+    cache = PredictionCache(LRUCache(100))
+    nlp_pipeline = FakePipeline()
+    predict_with_cache(nlp_pipeline, "test_model", "torch", ["hello world", "other"], cache)
+    results = predict_with_cache(nlp_pipeline, "test_model", "torch", ["hello   world ", "new"], cache)
+    assert nlp_pipeline.calls == [["hello world", "other"], ["new"]]
+    assert [r["label"] for r in results] == ["HELLO WORLD", "NEW"]
+    assert cache.stats()["local_hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+def test_model_revision_changes_the_key():
+    """
+    Test that a new model revision misses the entries of the old one.
+    """
+    cache = PredictionCache(LRUCache(100))
+    predict_with_cache(FakePipeline("rev1"), "test_model", "torch", ["text"], cache)
+    updated = FakePipeline("rev2")
+    predict_with_cache(updated, "test_model", "torch", ["text"], cache)
+    assert updated.calls == [["text"]]
+    predict_with_cache(FakePipeline("rev1"), "test_model", "torch", ["text"], cache)
+    assert cache.stats()["local_hits"] == 1
+
+def test_shared_tier_is_used_across_processes():
+    """
+    Test that a prediction cached by one process is served from the shared tier to another.
+    """
+    shared = InMemorySharedCache()
+    first, second = PredictionCache(LRUCache(100), shared), PredictionCache(LRUCache(100), shared)
+    predict_with_cache(FakePipeline(), "test_model", "torch", ["text"], first)
+    nlp_pipeline = FakePipeline()
+    predict_with_cache(nlp_pipeline, "test_model", "torch", ["text"], second)
+    assert nlp_pipeline.calls == []
+    assert second.stats()["shared_hits"] == 1
+
+def test_entries_expire_after_ttl():
+    """
+    Test that the LRU tier evicts the least recently used entry and expires entries after their TTL.
+    """
+    cache = LRUCache(2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
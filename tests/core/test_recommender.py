@@ -0,0 +1,72 @@
+## tests/core/test_recommender.py
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.recommender import FactorModel, Recommender, build_matrix, top_items
+from app.db.session import AsyncSessionLocal
+from app.models.feedback import Feedback
+from app.models.recommendation import Recommendation
+from app.models.user_recommendation import UserRecommendation
+from app.services.feedback_service import FeedbackService
+from app.services.recommendation_service import RecommendationService
+
+pytestmark = pytest.mark.anyio
+
+# Two groups of users, each liking the items of its own group
+GROUPS = {"sports": ["football", "tennis", "rugby"], "science": ["physics", "biology", "chemistry"]}
+
+@pytest.fixture
+async def recommender(db: AsyncSession, tmp_path) -> Recommender:
+    """
+    Fixture to provide a recommender over six items and the feedback of eight users.
+    """
+    db.add_all(Recommendation(title=item, content=f"All about {item}") for items in GROUPS.values() for item in items)
+    for group, items in GROUPS.items():
+        for i in range(4):
+            # Every user misses one item of the group, the last one of them misses two
+            liked = [item for j, item in enumerate(items) if j != i % 3 and not (i == 3 and j == 2)]
+            db.add_all(Feedback(user=f"{group}{i}", content="liked", item=item, rating=5.0) for item in liked)
+    db.add(Feedback(user="sports0", content="about an unknown item", item="cooking"))
+    await db.commit()
+    return Recommender(AsyncSessionLocal, str(tmp_path / "recommender.npz"), n_factors=2, top_k=3, batch_size=3)
+
+def test_top_items_skips_seen_items():
+    """
+    Test that the items of a row are ranked by reconstructed score without those already interacted with.
+    """
+    users, items, matrix = build_matrix([("a", "x", 1.0), ("a", "y", 1.0), ("b", "x", 1.0)], items=["x", "y", "z"])
+    assert users == ["a", "b"] and matrix.shape == (2, 3)
+    ranked = top_items(matrix, np.array([[0.6, 0.8, 0.0]], dtype=np.float32), 2)
+    assert ranked[0] == []
+    assert [column for column, _ in ranked[1]] == [1]
+
+async def test_fit_recommends_items_of_similar_users(db: AsyncSession, recommender: Recommender):
+    """
+    Test that users are recommended the items liked by the users with the same tastes.
+    """
+    stats = await recommender.fit()
+    assert stats == {"users": 8, "items": 6, "factors": 2}
+    for group, items in GROUPS.items():
+        recommended = await RecommendationService.recommend_for_user(db, f"{group}1")
+        assert [row["title"] for row in recommended][:1] == [items[1]]
+    recommended = await RecommendationService.recommend_for_user(db, "sports3")
+    assert recommended[0]["title"] == "rugby" and recommended[0]["score"] > recommended[-1]["score"]
+    assert await RecommendationService.recommend_for_user(db, "nobody") == []
+
+async def test_refresh_only_ranks_users_with_new_feedback(db: AsyncSession, recommender: Recommender):
+    """
+    Test that a refresh ranks the users whose feedback changed with the fitted factors, and drops users without feedback.
+    """
+    assert (await recommender.refresh())["users"] == 8
+    await FeedbackService.create_feedback(db, "newcomer", "liked", item="physics", rating=5.0)
+    await FeedbackService.create_feedback(db, "newcomer", "liked", item="biology")
+    await FeedbackService.bulk_delete_feedbacks(db, ["science0"])
+    model = FactorModel.load(recommender.path)
+    assert (await recommender.refresh())["users"] == 1
+    recommended = await RecommendationService.recommend_for_user(db, "newcomer")
+    assert [row["title"] for row in recommended][:1] == ["chemistry"]
+    assert await RecommendationService.recommend_for_user(db, "science0") == []
+    assert (await db.execute(select(UserRecommendation.user).filter(UserRecommendation.user == "science1"))).first() is not None
+    assert FactorModel.load(recommender.path).watermark == model.watermark + 2
@@ -0,0 +1,50 @@
+## tests/core/test_startup.py
+
+import os
+import subprocess
+import sys
+
+# Modules imported by app.main on startup; stages is left out, its schema and service modules do not exist yet
+STARTUP_MODULES = [
+    *(f"app.api.v1.endpoints.{name}" for name in (
+        "agents", "roles", "influences", "groups", "tasks", "news", "recommendations", "training", "feedback", "scaling", "ethics"
+    )),
+    "app.core.logger",
+    "app.core.metrics",
+    "app.core.tracing",
+    "app.middleware.error_handler",
+    "app.middleware.metrics",
+]
+
+# Libraries that must only be imported once a model is loaded
+HEAVY_MODULES = ("torch", "transformers", "onnxruntime", "onnx")
+
+# Cold import budget of the startup modules, generous enough for a slow CI machine
+IMPORT_BUDGET_SECONDS = float(os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", "1.5"))
+
+def _import_times():
+    # Import the startup modules in a fresh interpreter, yielding (name, cumulative microseconds, is top-level)
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), HF_HUB_OFFLINE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(STARTUP_MODULES)}"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        yield name.strip(), int(cumulative), len(name) - len(name.lstrip()) == 1
+
+def test_startup_does_not_import_ml_libraries():
+    """
+    Test that importing the app does not import torch, transformers or onnxruntime.
+    """
+    imported = {name.split(".")[0] for name, _, _ in _import_times()}
+    assert not imported & set(HEAVY_MODULES)
+
+def test_startup_import_time_within_budget():
+    """
+    Test that a cold import of the startup modules stays within the import time budget.
+    """
+    total = sum(cumulative for _, cumulative, top_level in _import_times() if top_level) / 1e6
+    assert total < IMPORT_BUDGET_SECONDS, f"startup imports took {total:.2f}s, budget is {IMPORT_BUDGET_SECONDS}s"
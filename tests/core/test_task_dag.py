@@ -0,0 +1,104 @@
+## tests/core/test_task_dag.py
+
+import asyncio
+import time
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.task_actions import PermanentTaskError, register_action
+from app.core.task_dag import DagScheduler, TaskCycleError, build_dag, ready_nodes
+from app.core.task_queue import LocalTaskTransport, TaskQueue
+from app.core.task_workers import TaskWorkerPool
+from app.db.session import AsyncSessionLocal
+from app.models.pipeline_run import PipelineRun
+from app.models.task import Task
+
+pytestmark = pytest.mark.anyio
+
+FAIL_ONCE = set()
+
+@register_action("test_fail_once")
+async def fail_once(payload):
+    if payload["task"] not in FAIL_ONCE:
+        FAIL_ONCE.add(payload["task"])
+        raise PermanentTaskError("not yet")
+    return payload["inputs"]
+
+@pytest.fixture
+async def scheduler():
+    """
+    Fixture to provide a scheduler whose task runs are executed by four workers.
+    """
+    queue = TaskQueue(AsyncSessionLocal, LocalTaskTransport(), visibility_timeout=10, backoff=0)
+    pool = TaskWorkerPool(queue, concurrency=4, poll_interval=0.02)
+    await pool.start()
+    yield DagScheduler(queue, AsyncSessionLocal, poll_interval=0.02)
+    await pool.stop()
+
+def _pipeline(**actions):
+    # ingest -> classify, summarize -> recommend
+    depends_on = {"ingest": [], "classify": ["ingest"], "summarize": ["ingest"], "recommend": ["classify", "summarize"]}
+    return {name: Task(name=name, action=actions.get(name, "echo"), depends_on=depends_on[name]) for name in depends_on}
+
+async def _wait_for(db: AsyncSession, pipeline_id: int, timeout: float = 10.0) -> PipelineRun:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pipeline = await db.get(PipelineRun, pipeline_id, populate_existing=True)
+        if pipeline.status != "running":
+            return pipeline
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"Pipeline run did not finish: {pipeline.nodes}")
+
+def test_build_dag_detects_cycles():
+    """
+    Test that the graph orders the tasks and that a cycle is reported with its tasks.
+    """
+    graph = build_dag({name: task.depends_on for name, task in _pipeline().items()})
+    nodes = {name: {"status": "pending"} for name in graph}
+    assert ready_nodes(graph, nodes) == ["ingest"]
+    nodes["ingest"]["status"] = "succeeded"
+    assert sorted(ready_nodes(graph, nodes)) == ["classify", "summarize"]
+    with pytest.raises(TaskCycleError) as e:
+        build_dag({"a": ["c"], "b": ["a"], "c": ["b"]})
+    assert set(e.value.cycle) == {"a", "b", "c"} and e.value.cycle[0] == e.value.cycle[-1]
+
+async def test_pipeline_passes_results_downstream(db: AsyncSession, scheduler: DagScheduler):
+    """
+    Test that every task runs after its upstream tasks and receives their results.
+    """
+    pipeline = await scheduler.start(db, "recommend", _pipeline(), {"text": "hello"})
+    pipeline = await _wait_for(db, pipeline.id)
+    assert pipeline.status == "succeeded" and pipeline.error is None
+    assert pipeline.nodes["ingest"]["result"] == {"text": "hello", "task": "ingest", "inputs": {}}
+    recommend = pipeline.nodes["recommend"]["result"]
+    assert set(recommend["inputs"]) == {"classify", "summarize"}
+    assert recommend["inputs"]["classify"]["inputs"]["ingest"]["task"] == "ingest"
+
+async def test_independent_tasks_run_concurrently(db: AsyncSession, scheduler: DagScheduler):
+    """
+    Test that the ready tasks run at once up to the parallelism of the pipeline.
+    """
+    elapsed = {}
+    for parallelism in (1, 2):
+        tasks = {f"t{i}": Task(name=f"t{i}", action="sleep", depends_on=[]) for i in range(4)}
+        start = time.perf_counter()
+        pipeline = await scheduler.start(db, "t0", tasks, {"seconds": 0.3}, parallelism=parallelism)
+        assert (await _wait_for(db, pipeline.id)).status == "succeeded"
+        elapsed[parallelism] = time.perf_counter() - start
+    assert elapsed[2] < elapsed[1] * 0.75
+
+async def test_failed_pipeline_resumes_from_failing_task(db: AsyncSession, scheduler: DagScheduler):
+    """
+    Test that resuming a failed pipeline reruns the failed task and its downstream tasks only.
+    """
+    pipeline = await scheduler.start(db, "recommend", _pipeline(summarize="test_fail_once"))
+    pipeline = await _wait_for(db, pipeline.id)
+    assert pipeline.status == "failed" and "summarize" in pipeline.error
+    assert pipeline.nodes["recommend"]["status"] == "pending"
+    done = {name: node["run_id"] for name, node in pipeline.nodes.items() if node["status"] == "succeeded"}
+    assert set(done) == {"ingest", "classify"}
+    pipeline = await scheduler.resume(db, pipeline)
+    pipeline = await _wait_for(db, pipeline.id)
+    assert pipeline.status == "succeeded"
+    assert {name: pipeline.nodes[name]["run_id"] for name in done} == done
+    with pytest.raises(ValueError):
+        await scheduler.resume(db, pipeline)
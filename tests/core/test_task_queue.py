@@ -0,0 +1,144 @@
+## tests/core/test_task_queue.py
+
+import asyncio
+import time
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.task_actions import register_action
+from app.core.task_queue import LocalTaskTransport, TaskQueue
+from app.core.task_workers import TaskWorkerPool
+from app.db.session import AsyncSessionLocal
+from app.models.task_run import TaskRun
+
+pytestmark = pytest.mark.anyio
+
+ATTEMPTS = []
+
+@register_action("test_flaky")
+async def flaky(payload):
+    ATTEMPTS.append(payload["key"])
+    if ATTEMPTS.count(payload["key"]) < payload["succeed_on"]:
+        raise RuntimeError("try again")
+    return {"attempts": ATTEMPTS.count(payload["key"])}
+
+CALLS = {"running": 0, "overlapping": 0, "count": 0}
+
+@register_action("test_blocking")
+def blocking(payload):
+    CALLS["overlapping"] += CALLS["running"] > 0
+    CALLS["running"] += 1
+    CALLS["count"] += 1
+    try:
+        time.sleep(payload["seconds"])
+    finally:
+        CALLS["running"] -= 1
+    return {"count": CALLS["count"]}
+
+@pytest.fixture
+def queue() -> TaskQueue:
+    """
+    Fixture to provide a queue retrying at once and leasing runs for a second.
+    """
+    return TaskQueue(AsyncSessionLocal, LocalTaskTransport(), visibility_timeout=1, max_attempts=3, backoff=0)
+
+async def _wait_for(db: AsyncSession, run_ids, statuses=("succeeded", "failed"), timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        runs = [await db.get(TaskRun, run_id, populate_existing=True) for run_id in run_ids]
+        if all(run.status in statuses for run in runs):
+            return runs
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"Runs did not finish: {[(run.id, run.status) for run in runs]}")
+
+async def test_runs_are_claimed_by_priority_then_age(db: AsyncSession, queue: TaskQueue):
+    """
+    Test that higher priorities are claimed first and that a claimed run is not handed out twice.
+    """
+    low = await queue.enqueue(db, "task", "noop", priority=0)
+    high = await queue.enqueue(db, "task", "noop", priority=5)
+    later = await queue.enqueue(db, "task", "noop", priority=5)
+    claimed = await queue.claim("worker1", limit=2)
+    assert [run.id for run in claimed] == [high.id, later.id]
+    assert all(run.status == "running" and run.attempts == 1 for run in claimed)
+    assert [run.id for run in await queue.claim("worker2", limit=5)] == [low.id]
+    assert await queue.claim("worker3") == []
+
+async def test_expired_leases_are_claimed_again(db: AsyncSession, queue: TaskQueue):
+    """
+    Test that a run whose worker disappeared is redelivered after the visibility timeout, and failed once out of attempts.
+    """
+    queue.max_attempts = 2
+    run = await queue.enqueue(db, "task", "noop")
+    [first] = await queue.claim("worker1")
+    await asyncio.sleep(1.1)
+    [second] = await queue.claim("worker2")
+    assert second.id == run.id and second.attempts == 2
+    # The first worker lost its lease and cannot record an outcome any more
+    assert await queue.complete(first, "worker1", None) is False
+    await asyncio.sleep(1.1)
+    assert await queue.claim("worker3") == []
+    [run] = await _wait_for(db, [run.id])
+    assert run.status == "failed" and run.error == "Visibility timeout expired"
+
+async def test_workers_retry_and_record_results(db: AsyncSession, queue: TaskQueue):
+    """
+    Test that the worker pool retries failing runs, fails unknown actions at once and records results.
+    """
+    pool = TaskWorkerPool(queue, concurrency=2, poll_interval=0.05)
+    await pool.start()
+    try:
+        retried = await queue.enqueue(db, "task", "test_flaky", {"key": "a", "succeed_on": 2})
+        exhausted = await queue.enqueue(db, "task", "test_flaky", {"key": "b", "succeed_on": 5})
+        unknown = await queue.enqueue(db, "task", "missing_action")
+        echoed = await queue.enqueue(db, "task", "echo", {"value": 1})
+        retried, exhausted, unknown, echoed = await _wait_for(db, [retried.id, exhausted.id, unknown.id, echoed.id])
+    finally:
+        await pool.stop()
+    assert (retried.status, retried.attempts, retried.result) == ("succeeded", 2, {"attempts": 2})
+    assert (exhausted.status, exhausted.attempts) == ("failed", 3)
+    assert exhausted.error == "RuntimeError: try again"
+    assert (unknown.status, unknown.attempts) == ("failed", 1)
+    assert echoed.result == {"value": 1}
+
+async def test_throughput_grows_with_workers(db: AsyncSession, queue: TaskQueue):
+    """
+    Test that I/O-bound runs complete about as many times faster as there are workers.
+    """
+    elapsed = {}
+    for concurrency in (1, 4):
+        runs = [await queue.enqueue(db, "task", "sleep", {"seconds": 0.05}) for _ in range(8)]
+        pool = TaskWorkerPool(queue, concurrency=concurrency, poll_interval=0.05)
+        start = time.perf_counter()
+        await pool.start()
+        try:
+            await _wait_for(db, [run.id for run in runs])
+        finally:
+            await pool.stop()
+        elapsed[concurrency] = time.perf_counter() - start
+    assert elapsed[4] < elapsed[1] / 2
+
+async def test_long_sync_actions_are_never_run_twice_at_once(db: AsyncSession, queue: TaskQueue):
+    """
+    Test that the lease of a run outliving the visibility timeout is extended, and that a timed-out sync action is retried only once it returned.
+    """
+    CALLS.update(running=0, overlapping=0, count=0)
+    pool = TaskWorkerPool(queue, concurrency=2, poll_interval=0.05)
+    await pool.start()
+    try:
+        run = await queue.enqueue(db, "task", "test_blocking", {"seconds": 2.5})
+        [run] = await _wait_for(db, [run.id])
+    finally:
+        await pool.stop()
+    assert (run.status, run.attempts, run.result) == ("succeeded", 1, {"count": 1})
+
+    CALLS.update(running=0, overlapping=0, count=0)
+    queue.max_attempts = 2
+    pool = TaskWorkerPool(queue, concurrency=2, poll_interval=0.05, run_timeout=0.2)
+    await pool.start()
+    try:
+        run = await queue.enqueue(db, "task", "test_blocking", {"seconds": 0.6})
+        [run] = await _wait_for(db, [run.id])
+    finally:
+        await pool.stop()
+    assert (run.status, run.attempts, run.error) == ("failed", 2, "Timed out")
+    assert CALLS["count"] == 2 and CALLS["overlapping"] == 0
@@ -0,0 +1,113 @@
+## tests/core/test_tracing.py
+
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased
+from sqlalchemy import text
+from app.core.batching import BatchingEngine
+from app.core.inference_pool import InferencePool
+from app.core.metrics import instrument_service
+from app.core.tracing import create_sampler, instrument_engine_tracing, setup_tracing, trace_pipeline, tracer
+from app.db.session import create_engine
+
+# The tracer provider can only be installed once per process
+exporter = InMemorySpanExporter()
+setup_tracing(exporter=exporter, sampler=ALWAYS_ON)
+
+class FakePipeline:
+    def preprocess(self, text):
+        return text.lower()
+
+    def forward(self, tokens):
+        return tokens.upper()
+
+    def postprocess(self, outputs):
+        return {"label": outputs}
+
+    def __call__(self, texts):
+        return [self.postprocess(self.forward(self.preprocess(text))) for text in texts]
+
+@pytest.fixture(autouse=True)
+def clear_spans():
+    exporter.clear()
+    yield
+
+def _spans():
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+def test_request_service_and_query_spans_are_nested(tmp_path):
+    """
+    Test that a request span parents the span of the service it calls, which parents its query spans.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracing.db'}")
+    instrument_engine_tracing(engine)
+
+    @instrument_service
+    class ProbeService:
+        @staticmethod
+        async def ping() -> int:
+            async with engine.connect() as connection:
+                return (await connection.execute(text("SELECT 1"))).scalar()
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"result": await ProbeService.ping()}
+
+    FastAPIInstrumentor.instrument_app(app)
+    assert TestClient(app).get("/ping").json() == {"result": 1}
+    asyncio.run(engine.dispose())
+
+    spans = _spans()
+    request, service, query = spans["GET /ping"], spans["ProbeService.ping"], spans["db.select"]
+    assert service.parent.span_id == request.context.span_id
+    assert query.parent.span_id == service.context.span_id
+    assert query.attributes["db.statement"] == "SELECT 1"
+
+def test_pipeline_stages_get_their_own_spans():
+    """
+    Test that tokenization, the forward pass and postprocessing are traced separately.
+    """
+    nlp_pipeline = trace_pipeline(FakePipeline())
+    with tracer.start_as_current_span("inference"):
+        assert nlp_pipeline(["Text"]) == [{"label": "TEXT"}]
+    spans = _spans()
+    for name in ("inference.tokenize", "inference.forward", "inference.postprocess"):
+        assert spans[name].parent.span_id == spans["inference"].context.span_id
+
+def test_batches_are_linked_to_the_requests_they_serve():
+    """
+    Test that a batch runs in its own trace, linked to each request span, with inference spans inside it.
+    """
+    nlp_pipeline = trace_pipeline(FakePipeline())
+    engine = BatchingEngine("test_model", max_wait_ms=20, infer=lambda model, texts, backend: nlp_pipeline(texts), pool=InferencePool(max_workers=1))
+
+    async def request(text):
+        with tracer.start_as_current_span("request"):
+            return await engine.submit(text)
+
+    async def run():
+        return await asyncio.gather(request("a"), request("b"))
+
+    assert asyncio.run(run()) == [{"label": "A"}, {"label": "B"}]
+    finished = exporter.get_finished_spans()
+    batch = next(span for span in finished if span.name == "inference.batch")
+    requests = [span for span in finished if span.name == "request"]
+    assert batch.parent is None
+    assert {link.context.span_id for link in batch.links} == {span.context.span_id for span in requests}
+    forward = [span for span in finished if span.name == "inference.forward"]
+    assert len(forward) == 2 and all(span.context.trace_id == batch.context.trace_id for span in forward)
+
+def test_sampler_is_configurable():
+    """
+    Test that the configured sampler name selects the sampler.
+    """
+    assert create_sampler("always_on") is ALWAYS_ON
+    assert isinstance(create_sampler("parentbased_traceidratio", 0.5), ParentBased)
+    with pytest.raises(ValueError):
+        create_sampler("unknown")
@@ -0,0 +1,47 @@
+## tests/core/test_vector_index.py
+
+import numpy as np
+from app.core.vector_index import VectorIndex
+
+def _vectors(count: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def test_upsert_query_and_delete(tmp_path):
+    """
+    Test that queries find the nearest vectors, that upserts replace vectors and that deleted ids are left out.
+    """
+    index = VectorIndex(str(tmp_path), dim=16, max_elements=4)
+    vectors = _vectors(50)
+    index.upsert(list(range(50)), vectors)
+    assert len(index) == 50
+    neighbours = index.query(vectors[7], k=3)
+    assert len(neighbours) == 3 and neighbours[0][0] == 7 and neighbours[0][1] > 0.99
+    assert index.query(vectors[7], k=3, exclude=7) == index.query(vectors[7], k=4)[1:]
+
+    index.upsert([7], vectors[8][None])
+    assert {row_id for row_id, _ in index.query(vectors[8], k=2)} == {7, 8}
+    index.delete([8, 1000])
+    assert 8 not in {row_id for row_id, _ in index.query(vectors[8], k=10)}
+    index.upsert([8], vectors[8][None])
+    assert index.query(vectors[8], k=1)[0][0] in (7, 8)
+    assert len(index.query(vectors[0], k=100)) == 50
+    index.close()
+
+def test_index_is_reloaded_from_disk(tmp_path):
+    """
+    Test that the vectors and deletions persisted by an index are found by an index loaded from the same directory.
+    """
+    vectors = _vectors(20)
+    index = VectorIndex(str(tmp_path), dim=16)
+    index.upsert(list(range(20)), vectors)
+    index.persist()
+    index.delete([3])
+    index.close()
+
+    reloaded = VectorIndex(str(tmp_path), dim=16)
+    assert np.allclose(reloaded.get(5), vectors[5], atol=1e-6)
+    assert reloaded.get(100) is None
+    assert reloaded.query(vectors[5], k=1)[0][0] == 5
+    assert 3 not in {row_id for row_id, _ in reloaded.query(vectors[3], k=5)}
+    reloaded.close()
@@ -0,0 +1,49 @@
+## tests/db/test_bulk.py
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.bulk import BulkResult, bulk_delete, bulk_upsert, validate_items
+from app.models.training import Training
+from app.schemas.training import TrainingCreate
+
+pytestmark = pytest.mark.anyio
+
+async def _contents(db: AsyncSession) -> dict:
+    result = await db.execute(select(Training.title, Training.content))
+    return dict(result.all())
+
+async def test_upsert_inserts_and_updates_in_chunks(db: AsyncSession):
+    """
+    Test that new rows are inserted, existing ones updated, and the last duplicate wins.
+    """
+    rows = list(enumerate({"title": f"t{i}", "content": "v1"} for i in range(7)))
+    result = await bulk_upsert(db, Training, rows, conflict_keys=("title",), chunk_size=3)
+    assert result.succeeded == 7 and result.failed == []
+    rows = [(0, {"title": "t0", "content": "v2"}), (1, {"title": "t7", "content": "v1"}), (2, {"title": "t0", "content": "v3"})]
+    result = await bulk_upsert(db, Training, rows, conflict_keys=("title",), chunk_size=3)
+    assert result.succeeded == 3
+    contents = await _contents(db)
+    assert len(contents) == 8
+    assert contents["t0"] == "v3"
+
+async def test_failures_are_reported_per_item(db: AsyncSession):
+    """
+    Test that invalid items and rows rejected by the database are reported without losing the others.
+    """
+    await bulk_upsert(db, Training, [(0, {"title": "taken", "content": "x"})])
+    result = BulkResult()
+    items = [{"title": "a", "content": "x"}, {"title": " ", "content": "x"}, {"title": "taken", "content": "y"}, {"title": "b", "content": "x"}]
+    rows = validate_items(TrainingCreate, items, result)
+    result = await bulk_upsert(db, Training, rows, result=result)
+    assert result.succeeded == 2
+    assert [failure["index"] for failure in result.failed] == [1, 2]
+    assert set(await _contents(db)) == {"taken", "a", "b"}
+
+async def test_bulk_delete(db: AsyncSession):
+    """
+    Test deleting rows by key in chunks.
+    """
+    await bulk_upsert(db, Training, list(enumerate({"title": f"t{i}", "content": "x"} for i in range(5))))
+    assert await bulk_delete(db, Training, "title", ["t0", "t1", "t2", "missing"], chunk_size=2) == 3
+    assert set(await _contents(db)) == {"t3", "t4"}
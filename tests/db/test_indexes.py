@@ -0,0 +1,56 @@
+## tests/db/test_indexes.py
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.agent import Agent
+from app.models.feedback import Feedback
+from app.models.group import Group, GroupMember
+from app.models.influence import Influence
+from app.models.recommendation import Recommendation
+from app.models.role import Role
+from app.models.task import Task
+from app.services.group_service import GroupService
+
+pytestmark = pytest.mark.anyio
+
+LOOKUPS = [
+    (Task, Task.name == "x"),
+    (Role, Role.name == "x"),
+    (Influence, Influence.name == "x"),
+    (Agent, Agent.name == "x"),
+    (Group, Group.name == "x"),
+    (Recommendation, Recommendation.title == "x"),
+    (Feedback, Feedback.user == "x"),
+    (GroupMember, GroupMember.member == "x"),
+    (GroupMember, GroupMember.group_id == 1),
+    (GroupMember, (GroupMember.group_id == 1) & (GroupMember.position > 10)),
+    (Task, Task.created_at >= "2024-01-01"),
+]
+
+async def _query_plan(db: AsyncSession, statement) -> str:
+    compiled = statement.compile(db.bind, compile_kwargs={"literal_binds": True})
+    rows = (await db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+    return " | ".join(row[-1] for row in rows)
+
+@pytest.mark.parametrize("model, condition", LOOKUPS)
+async def test_key_lookups_use_an_index(db: AsyncSession, model, condition):
+    """
+    Test that looking a row up by its key is an index search, not a table scan.
+    """
+    if db.bind.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific")
+    plan = await _query_plan(db, select(model).where(condition))
+    assert "USING" in plan and "INDEX" in plan, plan
+    assert not plan.startswith("SCAN"), plan
+
+async def test_bulk_group_upsert_replaces_members(db: AsyncSession):
+    """
+    Test that bulk-upserted groups get the members of their last row, in order.
+    """
+    rows = [(0, {"name": "g1", "members": ["b", "a"]}), (1, {"name": "g2", "members": ["c"]}), (2, {"name": "g1", "members": ["z", "a", "z"]})]
+    result = await GroupService.bulk_upsert_groups(db, rows)
+    assert result.succeeded == 3
+    db.expire_all()
+    assert [item["member"] for item in (await GroupService.list_members(db, "g1")).items] == ["z", "a"]
+    assert [item["member"] for item in (await GroupService.list_members(db, "g2")).items] == ["c"]
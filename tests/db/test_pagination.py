@@ -0,0 +1,50 @@
+## tests/db/test_pagination.py
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.pagination import InvalidListQuery, paginate
+from app.models.training import Training
+
+pytestmark = pytest.mark.anyio
+
+async def _add_trainings(db: AsyncSession, count: int) -> None:
+    db.add_all([Training(title=f"training{i}", content="even" if i % 2 == 0 else "odd") for i in range(count)])
+    await db.commit()
+
+async def test_pages_cover_every_row_once(db: AsyncSession):
+    """
+    Test that following the cursors returns every row exactly once, in id order.
+    """
+    await _add_trainings(db, 25)
+    titles, cursor, pages = [], None, 0
+    while True:
+        page = await paginate(db, Training, limit=10, cursor=cursor)
+        titles.extend(item["title"] for item in page.items)
+        pages += 1
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert pages == 3
+    assert titles == [f"training{i}" for i in range(25)]
+
+async def test_projection_and_filters(db: AsyncSession):
+    """
+    Test that only the requested fields are returned and filters are applied in the query.
+    """
+    await _add_trainings(db, 10)
+    page = await paginate(db, Training, limit=3, fields=["title"], filters={"content": "even", "id__gt": "2"})
+    assert page.items == [{"title": "training2"}, {"title": "training4"}, {"title": "training6"}]
+    page = await paginate(db, Training, limit=3, cursor=page.next_cursor, fields=["title"], filters={"content": "even", "id__gt": "2"})
+    assert page.items == [{"title": "training8"}]
+    assert page.next_cursor is None
+
+async def test_invalid_queries_are_rejected(db: AsyncSession):
+    """
+    Test that unknown fields, unknown operators and malformed cursors are rejected.
+    """
+    with pytest.raises(InvalidListQuery):
+        await paginate(db, Training, fields=["password"])
+    with pytest.raises(InvalidListQuery):
+        await paginate(db, Training, filters={"title__regex": "x"})
+    with pytest.raises(InvalidListQuery):
+        await paginate(db, Training, cursor="not-a-cursor")
@@ -0,0 +1,78 @@
+## tests/db/test_search.py
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.search import HIGHLIGHT_END, HIGHLIGHT_START, InvalidSearchQuery, search_database, setup_full_text_indexes
+from app.models.news import News
+from app.services.news_service import NewsService
+
+pytestmark = pytest.mark.anyio
+
+async def _titles(db: AsyncSession, query: str):
+    return [hit["title"] for hit in await search_database(db, News, query, limit=10)]
+
+async def test_index_follows_writes(db: AsyncSession):
+    """
+    Test that rows are searchable after being created, updated by an upsert and deleted, and that terms are stemmed.
+    """
+    await NewsService.create_news(db, "Markets", "Stocks rallied as investors cheered the rate cuts.")
+    await NewsService.create_news(db, "Weather", "Heavy rains are expected over the weekend.")
+    assert await _titles(db, "rally stock") == ["Markets"]
+    assert await _titles(db, "stocks snow") == []
+    await NewsService.bulk_upsert_news(db, [(0, {"title": "Markets", "content": "Bonds slumped."})])
+    assert await _titles(db, "stocks") == []
+    assert await _titles(db, "bonds") == ["Markets"]
+    await NewsService.delete_news(db, "Weather")
+    assert await _titles(db, "rains") == []
+
+async def test_ranking_and_snippets(db: AsyncSession):
+    """
+    Test that title matches outrank content matches and that the snippets highlight the matched terms.
+    """
+    await NewsService.create_news(db, "Local elections", "Turnout was high in every district.")
+    await NewsService.create_news(db, "Sports", "The elections of the club board were postponed " + "again " * 50)
+    hits = await search_database(db, News, "elections", limit=10)
+    assert [hit["title"] for hit in hits] == ["Local elections", "Sports"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert f"{HIGHLIGHT_START}elections{HIGHLIGHT_END}" in hits[1]["snippet"]
+    # Operators of the query syntax are searched as plain terms
+    assert await _titles(db, '"elections -(') == ["Local elections", "Sports"]
+    with pytest.raises(InvalidSearchQuery):
+        await search_database(db, News, "?!", limit=10)
+
+async def test_snippets_are_escaped(db: AsyncSession):
+    """
+    Test that the stored text of a snippet is HTML-escaped around the highlight marks.
+    """
+    await NewsService.create_news(db, "Alert", 'Beware <script>alert("elections")</script> & more elections')
+    [hit] = await search_database(db, News, "elections", limit=10)
+    assert "<script>" not in hit["snippet"] and "&lt;script&gt;" in hit["snippet"] and "&amp;" in hit["snippet"]
+    assert f"{HIGHLIGHT_START}elections{HIGHLIGHT_END}" in hit["snippet"]
+
+async def test_existing_tables_are_indexed_on_setup(db: AsyncSession):
+    """
+    Test that setup indexes the rows of a table created before its full-text index, and can run again.
+    """
+    await NewsService.create_news(db, "Markets", "Stocks rallied.")
+    for statement in ("DROP TRIGGER news_fts_insert", "DROP TRIGGER news_fts_delete", "DROP TRIGGER news_fts_update", "DROP TABLE news_fts"):
+        await db.execute(text(statement))
+    await db.commit()
+    connection = await db.connection()
+    await connection.run_sync(setup_full_text_indexes)
+    await connection.run_sync(setup_full_text_indexes)
+    await db.commit()
+    await NewsService.create_news(db, "Bonds", "Bonds rallied.")
+    assert sorted(await _titles(db, "rallied")) == ["Bonds", "Markets"]
+
+async def test_candidates_are_capped(db: AsyncSession, monkeypatch):
+    """
+    Test that only the newest matches are ranked when a query matches more rows than the cap.
+    """
+    for i in range(5):
+        await NewsService.create_news(db, f"news_{i}", "Common words " * (5 - i))
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 2)
+    assert await _titles(db, "common") == ["news_3", "news_4"]
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 0)
+    assert len(await _titles(db, "common")) == 5
@@ -0,0 +1,25 @@
+## tests/db/test_session.py
+
+import pytest
+from sqlalchemy import text
+from app.db.session import async_database_url, create_engine
+
+pytestmark = pytest.mark.anyio
+
+def test_database_urls_are_rewritten_to_async_drivers():
+    """
+    Test that sync database URLs are rewritten to their async drivers and async ones are kept.
+    """
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert async_database_url("postgresql://user:secret@db/app") == "postgresql+asyncpg://user:secret@db/app"
+    assert async_database_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
+
+async def test_sqlite_connections_use_wal(tmp_path):
+    """
+    Test that connections to a local SQLite database are switched to WAL mode.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    async with engine.connect() as connection:
+        journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+    await engine.dispose()
+    assert journal_mode == "wal"
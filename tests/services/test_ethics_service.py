@@ -0,0 +1,46 @@
+## tests/services/test_ethics_service.py
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.ethics import Principle
+from app.services.ethics_service import EthicsService
+
+pytestmark = pytest.mark.anyio
+
+async def test_apply_ethics(db: AsyncSession):
+    """
+    Test applying ethics principles, deduplicating their texts across ethics sets.
+    """
+    first = await EthicsService.apply_ethics(db, ["fairness", "privacy", "fairness"])
+    second = await EthicsService.apply_ethics(db, ["privacy", "transparency"])
+    assert first["principles"] == ["fairness", "privacy"]
+    assert second["principles"] == ["privacy", "transparency"]
+    assert (await db.execute(select(func.count()).select_from(Principle))).scalar() == 3
+
+async def test_get_all_ethics_uses_two_queries(db: AsyncSession):
+    """
+    Test that listing ethics loads every principle without a query per ethics set.
+    """
+    for i in range(5):
+        await EthicsService.apply_ethics(db, [f"principle{i}", "shared"])
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    try:
+        page = await EthicsService.get_all_ethics(db, limit=3)
+    finally:
+        event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+    assert len(statements) == 2
+    assert [item["principles"] for item in page.items] == [[f"principle{i}", "shared"] for i in range(3)]
+    page = await EthicsService.get_all_ethics(db, limit=3, cursor=page.next_cursor)
+    assert len(page.items) == 2 and page.next_cursor is None
+
+async def test_delete_ethics(db: AsyncSession):
+    """
+    Test deleting applied ethics principles by id.
+    """
+    ethics = await EthicsService.apply_ethics(db, ["fairness"])
+    await EthicsService.delete_ethics(db, ethics["id"])
+    page = await EthicsService.get_all_ethics(db)
+    assert page.items == []
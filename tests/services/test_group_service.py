@@ -1,54 +1,222 @@
 ## tests/services/test_group_service.py
 
+import asyncio
+import time
 import pytest
-from sqlalchemy.orm import Session
-from app.models.group import Group
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.inference_pool import inference_pool
+from app.core.model_registry import model_registry
+from app.db.pagination import InvalidListQuery, Page
+from app.models.agent import Agent
+from app.models.group import Group, GroupMember
+from app.services.agent_service import AgentService
 from app.services.group_service import GroupService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
+async def test_create_group(db: AsyncSession):
     """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_group(db: Session):
-    """
-    Test the creation of a group.
+    Test the creation of a group, adding repeated members once.
     """
     group_name = "test_group"
     group_members = ["member1", "member2"]
-    group = GroupService.create_group(db, group_name, group_members)
+    group = await GroupService.create_group(db, group_name, group_members + ["member1"])
     assert group.name == group_name
     assert group.members == group_members
+    assert group.member_count == 2
 
-def test_get_group(db: Session):
+async def test_get_group(db: AsyncSession):
     """
     Test retrieving a group by name.
     """
     group_name = "test_group"
     group_members = ["member1", "member2"]
-    GroupService.create_group(db, group_name, group_members)
-    group = GroupService.get_group(db, group_name)
+    await GroupService.create_group(db, group_name, group_members)
+    group = await GroupService.get_group(db, group_name)
     assert group is not None
     assert group.name == group_name
-    assert group.members == group_members
+    assert group.member_count == len(group_members)
+    assert [item["member"] for item in (await GroupService.list_members(db, group_name)).items] == group_members
+    cached = await GroupService.get_group(db, group_name)
+    assert cached.member_count == len(group_members)
 
-def test_delete_group(db: Session):
+async def test_delete_group(db: AsyncSession):
     """
     Test deleting a group by name.
     """
     group_name = "test_group"
     group_members = ["member1", "member2"]
-    GroupService.create_group(db, group_name, group_members)
-    GroupService.delete_group(db, group_name)
-    group = GroupService.get_group(db, group_name)
+    await GroupService.create_group(db, group_name, group_members)
+    await GroupService.delete_group(db, group_name)
+    group = await GroupService.get_group(db, group_name)
     assert group is None
+    assert await GroupService.list_groups_by_member(db, "member1") == Page(items=[], next_cursor=None)
+
+async def test_add_and_remove_members(db: AsyncSession):
+    """
+    Test adding and removing members in bulk, skipping members already in the group.
+    """
+    await GroupService.create_group(db, "test_group", ["member1"])
+    assert await GroupService.add_members(db, "test_group", ["member2", "member1", "member3", "member2"]) == 2
+    assert await GroupService.remove_members(db, "test_group", ["member1", "missing"]) == 1
+    assert await GroupService.add_members(db, "missing_group", ["member1"]) is None
+    page = await GroupService.list_members(db, "test_group")
+    assert [item["member"] for item in page.items] == ["member2", "member3"]
+
+async def test_list_members_and_groups_by_member(db: AsyncSession):
+    """
+    Test paging through the members of a group and the groups of a member.
+    """
+    members = [f"member{i}" for i in range(5)]
+    await GroupService.create_group(db, "group1", members)
+    await GroupService.create_group(db, "group2", ["member3"])
+    await GroupService.create_group(db, "group3", ["member3", "member4"])
+    listed, cursor = [], None
+    while True:
+        page = await GroupService.list_members(db, "group1", limit=2, cursor=cursor)
+        listed += [item["member"] for item in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert listed == members
+    with pytest.raises(InvalidListQuery):
+        await GroupService.list_members(db, "group1", cursor="bad")
+    page = await GroupService.list_groups_by_member(db, "member3", limit=2)
+    assert [item["name"] for item in page.items] == ["group1", "group2"]
+    page = await GroupService.list_groups_by_member(db, "member3", limit=2, cursor=page.next_cursor)
+    assert [item["name"] for item in page.items] == ["group3"] and page.next_cursor is None
+
+async def test_members_sharing_a_position_are_all_listed(db: AsyncSession):
+    """
+    Test that members given the same position by concurrent adds are neither skipped nor repeated across pages.
+    """
+    group = await GroupService.create_group(db, "group1", ["member0"])
+    await db.execute(insert(GroupMember), [{"group_id": group.id, "member": f"member{i}", "position": 1} for i in (3, 1, 2)])
+    await db.commit()
+    listed, cursor = [], None
+    while True:
+        page = await GroupService.list_members(db, "group1", limit=1, cursor=cursor)
+        listed += [item["member"] for item in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert listed == ["member0", "member1", "member2", "member3"]
+
+def test_group_membership_is_set_backed():
+    """
+    Test that a group keeps its member order while checking membership through its index.
+    """
+    group = Group(name="test_group", members=["member1", "member2"])
+    group.add_member("member1")
+    group.add_member("member3")
+    group.remove_member("member2")
+    assert group.get_members() == ["member1", "member3"]
+    assert group.has_member("member3") and not group.has_member("member2")
+
+class SlowAgent:
+    def __init__(self, name, delay, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.closed = False
+
+    async def process_text_async(self, text):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError("model failed")
+        return {"processed_text": text, "predictions": [{"label": self.name}], "model": self.name}
+
+    def close(self):
+        self.closed = True
+
+async def test_process_text_scatters_across_agents():
+    """
+    Test that agents answer concurrently in completion order and that slow agents time out without failing the run.
+    """
+    agents = {
+        "slow": SlowAgent("slow", 0.2),
+        "fast": SlowAgent("fast", 0.01),
+        "late": SlowAgent("late", 5),
+        "broken": SlowAgent("broken", 0.01, fail=True),
+        "member": None,
+    }
+    start = time.perf_counter()
+    answers = [answer async for answer in GroupService.process_text(agents, "text", timeout=0.3)]
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6
+    assert [answer["agent"] for answer in answers][0] == "member"
+    by_agent = {answer["agent"]: answer for answer in answers}
+    assert [answer["agent"] for answer in answers].index("fast") < [answer["agent"] for answer in answers].index("slow")
+    assert by_agent["fast"]["predictions"] == [{"label": "fast"}]
+    assert by_agent["late"]["status"] == "timeout"
+    assert by_agent["broken"] == {"agent": "broken", "status": "error", "error": "model failed", "elapsed_ms": by_agent["broken"]["elapsed_ms"]}
+    assert by_agent["member"]["status"] == "missing"
+    assert all(agent.closed for agent in agents.values() if agent is not None)
+
+async def test_process_text_loads_models_off_the_event_loop(monkeypatch):
+    """
+    Test that agents load their models concurrently without blocking the event loop, so slow loads time out.
+    """
+    def loader(name, backend):
+        time.sleep(0.3 if name != "huge" else 2)
+        return lambda texts: [{"label": name, "score": 1.0} for _ in texts]
+
+    monkeypatch.setattr(model_registry, "_loader", loader)
+    # Start the inference workers, the first one imports torch
+    await inference_pool.run(len, "")
+    agents = {name: Agent(name=name, model=f"{name}_model" if name != "huge_agent" else "huge", backend="torch") for name in ("a", "b", "huge_agent")}
+    start = time.perf_counter()
+    answers = {answer["agent"]: answer async for answer in GroupService.process_text(agents, "text", timeout=1)}
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.5
+    assert answers["a"]["predictions"] == [{"label": "a_model", "score": 1.0}] and answers["b"]["status"] == "ok"
+    assert answers["huge_agent"]["status"] == "timeout"
+    # The load outliving its caller does not keep a reference to the model
+    await asyncio.sleep(1.2)
+    assert model_registry.refcount("huge") == 0 and model_registry.refcount("a_model") == 0
+
+async def test_get_member_agents(db: AsyncSession):
+    """
+    Test that the members of a group are resolved to agents in member order.
+    """
+    await AgentService.create_agent(db, "agent1", "test_model")
+    await GroupService.create_group(db, "test_group", ["member1", "agent1"])
+    agents = await GroupService.get_member_agents(db, "test_group")
+    assert list(agents) == ["member1", "agent1"]
+    assert agents["member1"] is None and agents["agent1"].model == "test_model"
+    assert await GroupService.get_member_agents(db, "missing_group") is None
+
+async def test_set_member_weights(db: AsyncSession):
+    """
+    Test that member weights are stored and listed, skipping members not in the group.
+    """
+    await GroupService.create_group(db, "test_group", ["member1", "member2"])
+    assert await GroupService.set_member_weights(db, "test_group", {"member2": 2.5, "missing": 1.0}) == 1
+    page = await GroupService.list_members(db, "test_group")
+    assert [item["weight"] for item in page.items] == [1.0, 2.5]
+    assert await GroupService.set_member_weights(db, "missing_group", {"member1": 1.0}) is None
+
+async def test_ensemble_classify(db: AsyncSession, monkeypatch):
+    """
+    Test that each distinct model of a group runs once and that the predictions are combined with the weights.
+    """
+    calls = []
+
+    def infer(model, texts, backend):
+        calls.append(model)
+        return [{"label": "POSITIVE" if model == "model_a" else "NEGATIVE", "score": 0.9} for _ in texts]
+
+    monkeypatch.setattr("app.services.group_service.run_registry_pipeline", infer)
+    for name, model in (("agent1", "model_a"), ("agent2", "model_b"), ("agent3", "model_b")):
+        await AgentService.create_agent(db, name, model)
+    await GroupService.create_group(db, "test_group", ["agent1", "agent2", "agent3", "member1"])
+    await GroupService.set_member_weights(db, "test_group", {"agent1": 3.0})
+    result = await GroupService.ensemble_classify(db, "test_group", ["a", "b"], "majority")
+    assert sorted(calls) == ["model_a", "model_b"]
+    assert result["agents"] == ["agent1", "agent2", "agent3"]
+    assert result["labels"] == ["POSITIVE", "POSITIVE"]
+    assert result["scores"].tolist() == pytest.approx([0.6, 0.6])
+    assert await GroupService.ensemble_classify(db, "missing_group", ["a"], "majority") is None
+    with pytest.raises(ValueError):
+        await GroupService.ensemble_classify(db, "test_group", ["a"], "unknown")
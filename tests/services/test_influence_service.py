@@ -1,54 +1,41 @@
 ## tests/services/test_influence_service.py
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.influence import Influence
 from app.services.influence_service import InfluenceService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
-    """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_influence(db: Session):
+async def test_create_influence(db: AsyncSession):
     """
     Test the creation of an influence.
     """
     influence_name = "test_influence"
     influence_effect = "test_effect"
-    influence = InfluenceService.create_influence(db, influence_name, influence_effect)
+    influence = await InfluenceService.create_influence(db, influence_name, influence_effect)
     assert influence.name == influence_name
     assert influence.effect == influence_effect
 
-def test_get_influence(db: Session):
+async def test_get_influence(db: AsyncSession):
     """
     Test retrieving an influence by name.
     """
     influence_name = "test_influence"
     influence_effect = "test_effect"
-    InfluenceService.create_influence(db, influence_name, influence_effect)
-    influence = InfluenceService.get_influence(db, influence_name)
+    await InfluenceService.create_influence(db, influence_name, influence_effect)
+    influence = await InfluenceService.get_influence(db, influence_name)
     assert influence is not None
     assert influence.name == influence_name
     assert influence.effect == influence_effect
 
-def test_delete_influence(db: Session):
+async def test_delete_influence(db: AsyncSession):
     """
     Test deleting an influence by name.
     """
     influence_name = "test_influence"
     influence_effect = "test_effect"
-    InfluenceService.create_influence(db, influence_name, influence_effect)
-    InfluenceService.delete_influence(db, influence_name)
-    influence = InfluenceService.get_influence(db, influence_name)
+    await InfluenceService.create_influence(db, influence_name, influence_effect)
+    await InfluenceService.delete_influence(db, influence_name)
+    influence = await InfluenceService.get_influence(db, influence_name)
     assert influence is None
@@ -1,54 +1,52 @@
 ## tests/services/test_news_service.py
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.news import News
 from app.services.news_service import NewsService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
-    """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_news(db: Session):
+async def test_create_news(db: AsyncSession):
     """
     Test the creation of a news article.
     """
     news_title = "test_news"
     news_content = "test_content"
-    news = NewsService.create_news(db, news_title, news_content)
+    news = await NewsService.create_news(db, news_title, news_content)
     assert news.title == news_title
     assert news.content == news_content
 
-def test_get_news(db: Session):
+async def test_get_news(db: AsyncSession):
     """
     Test retrieving a news article by title.
     """
     news_title = "test_news"
     news_content = "test_content"
-    NewsService.create_news(db, news_title, news_content)
-    news = NewsService.get_news(db, news_title)
+    await NewsService.create_news(db, news_title, news_content)
+    news = await NewsService.get_news(db, news_title)
     assert news is not None
     assert news.title == news_title
     assert news.content == news_content
 
-def test_delete_news(db: Session):
+async def test_delete_news(db: AsyncSession):
     """
     Test deleting a news article by title.
     """
     news_title = "test_news"
     news_content = "test_content"
-    NewsService.create_news(db, news_title, news_content)
-    NewsService.delete_news(db, news_title)
-    news = NewsService.get_news(db, news_title)
+    await NewsService.create_news(db, news_title, news_content)
+    await NewsService.delete_news(db, news_title)
+    news = await NewsService.get_news(db, news_title)
     assert news is None
+
+async def test_search_news(db: AsyncSession):
+    """
+    Test searching news articles one page at a time.
+    """
+    for i in range(3):
+        await NewsService.create_news(db, f"news_{i}", f"The central bank held rates, report {i}.")
+    page = await NewsService.search_news(db, "bank rates", limit=2)
+    assert len(page.items) == 2 and page.next_cursor is not None
+    page = await NewsService.search_news(db, "bank rates", limit=2, cursor=page.next_cursor)
+    assert len(page.items) == 1 and page.next_cursor is None
@@ -1,54 +1,59 @@
 ## tests/services/test_recommendation_service.py
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.recommendation import Recommendation
+from app.models.user_recommendation import UserRecommendation
 from app.services.recommendation_service import RecommendationService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
-    """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_recommendation(db: Session):
+async def test_create_recommendation(db: AsyncSession):
     """
     Test the creation of a recommendation.
     """
     recommendation_title = "test_recommendation"
     recommendation_content = "test_content"
-    recommendation = RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
+    recommendation = await RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
     assert recommendation.title == recommendation_title
     assert recommendation.content == recommendation_content
 
-def test_get_recommendation(db: Session):
+async def test_get_recommendation(db: AsyncSession):
     """
     Test retrieving a recommendation by title.
     """
     recommendation_title = "test_recommendation"
     recommendation_content = "test_content"
-    RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
-    recommendation = RecommendationService.get_recommendation(db, recommendation_title)
+    await RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
+    recommendation = await RecommendationService.get_recommendation(db, recommendation_title)
     assert recommendation is not None
     assert recommendation.title == recommendation_title
     assert recommendation.content == recommendation_content
 
-def test_delete_recommendation(db: Session):
+async def test_delete_recommendation(db: AsyncSession):
     """
     Test deleting a recommendation by title.
     """
     recommendation_title = "test_recommendation"
     recommendation_content = "test_content"
-    RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
-    RecommendationService.delete_recommendation(db, recommendation_title)
-    recommendation = RecommendationService.get_recommendation(db, recommendation_title)
+    await RecommendationService.create_recommendation(db, recommendation_title, recommendation_content)
+    await RecommendationService.delete_recommendation(db, recommendation_title)
+    recommendation = await RecommendationService.get_recommendation(db, recommendation_title)
     assert recommendation is None
+
+async def test_recommend_for_user(db: AsyncSession):
+    """
+    Test that the recommendations precomputed for a user are served in rank order, without deleted recommendations.
+    """
+    for title in ("first", "second", "third"):
+        await RecommendationService.create_recommendation(db, title, f"{title}_content")
+    db.add_all(UserRecommendation(user="test_user", item=title, score=3.0 - rank, rank=rank) for rank, title in enumerate(("first", "second", "third")))
+    await db.commit()
+    await RecommendationService.delete_recommendation(db, "second")
+    recommended = await RecommendationService.recommend_for_user(db, "test_user", limit=5)
+    assert recommended == [
+        {"title": "first", "content": "first_content", "score": 3.0},
+        {"title": "third", "content": "third_content", "score": 1.0},
+    ]
+    assert len(await RecommendationService.recommend_for_user(db, "test_user", limit=1)) == 1
+    assert await RecommendationService.recommend_for_user(db, "other_user") == []
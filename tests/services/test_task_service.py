@@ -1,54 +1,93 @@
 ## tests/services/test_task_service.py
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.task_dag import TaskCycleError
 from app.models.task import Task
 from app.services.task_service import TaskService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
-    """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_task(db: Session):
+async def test_create_task(db: AsyncSession):
     """
     Test the creation of a task.
     """
     task_name = "test_task"
     task_action = "test_action"
-    task = TaskService.create_task(db, task_name, task_action)
+    task = await TaskService.create_task(db, task_name, task_action)
     assert task.name == task_name
     assert task.action == task_action
 
-def test_get_task(db: Session):
+async def test_get_task(db: AsyncSession):
     """
     Test retrieving a task by name.
     """
     task_name = "test_task"
     task_action = "test_action"
-    TaskService.create_task(db, task_name, task_action)
-    task = TaskService.get_task(db, task_name)
+    await TaskService.create_task(db, task_name, task_action)
+    task = await TaskService.get_task(db, task_name)
     assert task is not None
     assert task.name == task_name
     assert task.action == task_action
 
-def test_delete_task(db: Session):
+async def test_delete_task(db: AsyncSession):
     """
     Test deleting a task by name.
     """
     task_name = "test_task"
     task_action = "test_action"
-    TaskService.create_task(db, task_name, task_action)
-    TaskService.delete_task(db, task_name)
-    task = TaskService.get_task(db, task_name)
+    await TaskService.create_task(db, task_name, task_action)
+    await TaskService.delete_task(db, task_name)
+    task = await TaskService.get_task(db, task_name)
     assert task is None
+
+async def test_enqueue_and_list_runs(db: AsyncSession):
+    """
+    Test queueing runs of a task and listing them by status.
+    """
+    await TaskService.create_task(db, "test_task", "echo")
+    run = await TaskService.enqueue_run(db, "test_task", {"value": 1}, priority=2)
+    assert (run.action, run.status, run.priority, run.payload) == ("echo", "queued", 2, {"value": 1})
+    assert await TaskService.enqueue_run(db, "missing_task") is None
+    assert (await TaskService.get_run(db, "test_task", run.id)).id == run.id
+    assert await TaskService.get_run(db, "other_task", run.id) is None
+    page = await TaskService.list_runs(db, "test_task", filters={"status": "queued"}, fields=["id", "status"])
+    assert page.items == [{"id": run.id, "status": "queued"}]
+
+async def test_task_dependencies(db: AsyncSession):
+    """
+    Test that dependencies forming a cycle are rejected and that pipelines need every upstream task.
+    """
+    await TaskService.create_task(db, "ingest", "echo")
+    await TaskService.create_task(db, "classify", "echo", depends_on=["ingest"])
+    task = await TaskService.create_task(db, "recommend", "echo", depends_on=["classify", "summarize"])
+    assert task.depends_on == ["classify", "summarize"]
+    with pytest.raises(TaskCycleError):
+        await TaskService.update_task(db, "ingest", "echo", depends_on=["recommend"])
+    assert (await TaskService.update_task(db, "ingest", "noop")).depends_on == []
+    with pytest.raises(ValueError, match="summarize"):
+        await TaskService.start_pipeline(db, "recommend")
+    assert await TaskService.start_pipeline(db, "missing_task") is None
+
+async def test_bulk_upsert_rejects_dependency_cycles(db: AsyncSession):
+    """
+    Test that bulk-upserted tasks closing a cycle, with the stored tasks or earlier rows, are reported as failed and not written.
+    """
+    await TaskService.create_task(db, "ingest", "echo")
+    await TaskService.create_task(db, "classify", "echo", depends_on=["ingest"])
+    result = await TaskService.bulk_upsert_tasks(db, [
+        (0, {"name": "summarize", "action": "echo", "depends_on": ["classify"]}),
+        (1, {"name": "ingest", "action": "echo", "depends_on": ["summarize"]}),
+        (2, {"name": "recommend", "action": "echo", "depends_on": ["report"]}),
+        (3, {"name": "report", "action": "echo", "depends_on": ["recommend"]}),
+        (4, {"name": "classify", "action": "noop", "depends_on": ["ingest"]}),
+    ])
+    assert result.succeeded == 3
+    assert [failure["index"] for failure in result.failed] == [1, 3]
+    assert "cycle" in result.failed[0]["error"]
+    db.expire_all()
+    assert (await TaskService.get_task(db, "ingest")).depends_on == []
+    assert (await TaskService.get_task(db, "classify")).action == "noop"
+    assert await TaskService.get_task(db, "report") is None
+    result = await TaskService.bulk_upsert_tasks(db, [(0, {"name": "report", "action": "echo", "depends_on": ["classify"]})])
+    assert result.succeeded == 1 and result.failed == []
@@ -1,54 +1,51 @@
 ## tests/services/test_training_service.py
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.training import Training
 from app.services.training_service import TrainingService
-from app.db.session import SessionLocal, Base, engine
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+pytestmark = pytest.mark.anyio
 
-@pytest.fixture(scope="module")
-def db() -> Session:
-    """
-    Fixture to provide a database session for the tests.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def test_create_training(db: Session):
+async def test_create_training(db: AsyncSession):
     """
     Test the creation of a training.
     """
     training_title = "test_training"
     training_content = "test_content"
-    training = TrainingService.create_training(db, training_title, training_content)
+    training = await TrainingService.create_training(db, training_title, training_content)
     assert training.title == training_title
     assert training.content == training_content
 
-def test_get_training(db: Session):
+async def test_get_training(db: AsyncSession):
     """
     Test retrieving a training by title.
     """
     training_title = "test_training"
     training_content = "test_content"
-    TrainingService.create_training(db, training_title, training_content)
-    training = TrainingService.get_training(db, training_title)
+    await TrainingService.create_training(db, training_title, training_content)
+    training = await TrainingService.get_training(db, training_title)
     assert training is not None
     assert training.title == training_title
     assert training.content == training_content
 
-def test_delete_training(db: Session):
+async def test_delete_training(db: AsyncSession):
     """
     Test deleting a training by title.
     """
     training_title = "test_training"
     training_content = "test_content"
-    TrainingService.create_training(db, training_title, training_content)
-    TrainingService.delete_training(db, training_title)
-    training = TrainingService.get_training(db, training_title)
+    await TrainingService.create_training(db, training_title, training_content)
+    await TrainingService.delete_training(db, training_title)
+    training = await TrainingService.get_training(db, training_title)
     assert training is None
+
+async def test_search_trainings(db: AsyncSession):
+    """
+    Test searching trainings by title and content.
+    """
+    await TrainingService.create_training(db, "Onboarding", "Learn how to deploy the service.")
+    await TrainingService.create_training(db, "Security", "Rotate the keys before deploying.")
+    page = await TrainingService.search_trainings(db, "deploy")
+    assert {item["title"] for item in page.items} == {"Onboarding", "Security"}
+    assert all("<mark>" in item["snippet"] for item in page.items)